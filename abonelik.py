@@ -0,0 +1,132 @@
+from collections import defaultdict
+from sinyal import sinyal_mesaji
+
+# Desteklenen indikatörler
+INDIKATORLER = ('MACD', 'ALPHATREND')
+
+
+def abone_ekle(conn, chat_id: int, hisse_kodlari: list, indikatorler=INDIKATORLER):
+    """Sohbeti abone olarak kaydeder ve izleme listesine hisseleri ekler"""
+    cur = None
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            INSERT INTO aboneler (chat_id, aktif)
+            VALUES (%s, TRUE)
+            ON CONFLICT (chat_id) DO UPDATE SET aktif = TRUE
+        """, (chat_id,))
+        cur.executemany("""
+            INSERT INTO abone_izleme_listeleri (chat_id, hisse_kodu, indikator)
+            VALUES (%s, %s, %s)
+            ON CONFLICT DO NOTHING
+        """, [(chat_id, hisse.upper(), indikator) for hisse in hisse_kodlari for indikator in indikatorler])
+        conn.commit()
+    except Exception as e:
+        print(f"Abone kaydetme hatası ({chat_id}): {e}")
+        conn.rollback()
+    finally:
+        if cur:
+            cur.close()
+
+
+def abone_cikar(conn, chat_id: int):
+    """Sohbetin aboneliğini pasif hale getirir"""
+    cur = None
+    try:
+        cur = conn.cursor()
+        cur.execute("UPDATE aboneler SET aktif = FALSE WHERE chat_id = %s", (chat_id,))
+        conn.commit()
+    except Exception as e:
+        print(f"Abonelik iptal hatası ({chat_id}): {e}")
+        conn.rollback()
+    finally:
+        if cur:
+            cur.close()
+
+
+class AbonelikKaydi:
+    """
+    (hisse, indikatör) çiftlerini o çifti izleyen sohbetlere eşler.
+    Tarayıcı her hissenin sinyalini bir kez hesaplar; bu kayıt sinyalleri
+    ilgili tüm abonelere yönlendirir.
+    """
+
+    def __init__(self, eslesmeler: dict = None, varsayilan_chat_id=None):
+        """
+        Args:
+            eslesmeler (dict): {(hisse_kodu, indikator): {chat_id, ...}}
+            varsayilan_chat_id: Hiç abone yoksa tüm sinyallerin gideceği sohbet
+        """
+        self.eslesmeler = defaultdict(set)
+        for anahtar, chat_idler in (eslesmeler or {}).items():
+            self.eslesmeler[anahtar].update(chat_idler)
+        self.varsayilan_chat_id = varsayilan_chat_id
+
+    @classmethod
+    def veritabanindan(cls, conn, varsayilan_chat_id=None):
+        """Aktif abonelerin izleme listelerini tek sorguyla yükler"""
+        kayit = cls(varsayilan_chat_id=varsayilan_chat_id)
+        if conn is None:
+            return kayit
+        cur = None
+        try:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT l.hisse_kodu, l.indikator, l.chat_id
+                FROM abone_izleme_listeleri l
+                JOIN aboneler a ON a.chat_id = l.chat_id
+                WHERE a.aktif
+            """)
+            for hisse_kodu, indikator, chat_id in cur.fetchall():
+                kayit.eslesmeler[(hisse_kodu, indikator)].add(chat_id)
+        except Exception as e:
+            print(f"Abonelik yükleme hatası: {e}")
+            conn.rollback()
+        finally:
+            if cur:
+                cur.close()
+        return kayit
+
+    def bos_mu(self) -> bool:
+        return not any(self.eslesmeler.values())
+
+    def hisseler(self, indikator: str) -> list:
+        """İndikatör için en az bir abonesi olan hisseleri döndürür"""
+        return sorted({hisse for (hisse, ind), chat_idler in self.eslesmeler.items()
+                       if ind == indikator and chat_idler})
+
+    def aboneler(self, hisse_kodu: str, indikator: str) -> set:
+        return self.eslesmeler.get((hisse_kodu, indikator), set())
+
+    def yonlendir(self, sinyaller: list) -> dict:
+        """
+        Sinyalleri sohbetlere dağıtır.
+
+        Returns:
+            dict: {chat_id: [Sinyal, ...]}
+        """
+        if self.bos_mu():
+            if self.varsayilan_chat_id is None or not sinyaller:
+                return {}
+            return {self.varsayilan_chat_id: list(sinyaller)}
+
+        sohbetler = defaultdict(list)
+        for sinyal in sinyaller:
+            for chat_id in self.aboneler(sinyal.hisse_kodu, sinyal.indikator):
+                sohbetler[chat_id].append(sinyal)
+        return dict(sohbetler)
+
+
+async def sinyalleri_dagit(kayit: AbonelikKaydi, sinyaller: list, dagitici, baslik: str) -> int:
+    """
+    Her aboneye yalnızca izlediği hisselerin sinyallerini tek mesajda gönderir.
+    Mesajlar dağıtıcının sınırlı kuyruğuna eklenir; eşzamanlı gönderim ve hız
+    sınırları dağıtıcının işçileri tarafından uygulanır.
+
+    Returns:
+        int: Mesaj gönderilen sohbet sayısı
+    """
+    sohbetler = kayit.yonlendir(sinyaller)
+    for chat_id, sohbet_sinyalleri in sohbetler.items():
+        await dagitici.gonder(sinyal_mesaji(baslik, sohbet_sinyalleri), chat_id)
+    return len(sohbetler)
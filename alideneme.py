@@ -3,7 +3,8 @@ import numpy as np
 from scipy.stats import norm
 import matplotlib.pyplot as plt
 import datetime as dt
-import yfinance as yf
+from portfolio_data import fetch_history
+from price_archive import PriceArchive
 
 def get_data():
     """
@@ -13,21 +14,24 @@ def get_data():
     tickers = ['SPY', 'GLD', 'BTC-USD']
     end_date = dt.datetime.now()
     start_date = end_date - dt.timedelta(days=365*3)
-    adj_close_df = pd.DataFrame()
+    archive = PriceArchive()
 
     for ticker in tickers:  
-        data = yf.download(ticker, start=start_date, end=end_date)
+        # Yalnızca arşivde eksik olan günler indirilir
+        archive.update(ticker, fetch_history, start_date, end_date)
+        data = archive.read(ticker, start_date, end_date, fields=['Close'])
         data['Close'].plot(figsize=(10, 5))
         plt.title(f'{ticker} Fiyatları')
         plt.xlabel('Tarih')
         plt.ylabel('Fiyat')
         plt.show()
-        adj_close_df[ticker] = data['Close']
-        adj_close_df.dropna(inplace=True)
-        adj_close_df.sort_index(inplace=True)
-        adj_close_df.to_csv('adj_close_df.csv')
         print(f'{ticker} verileri kaydedildi.')
-        print(adj_close_df)
+        
+    # Borsa günlerine tek seferde hizalanır; BTC'nin hafta sonu hareketi
+    # pazartesi getirisine eklenir (tekrarlanan dropna yerine)
+    adj_close_df = archive.panel(tickers, start_date, end_date, policy='aggregate').frame().copy()
+    adj_close_df.to_csv('adj_close_df.csv')
+    print(adj_close_df)
         
     return adj_close_df
 
@@ -0,0 +1,92 @@
+"""
+Kompakt (float32) panel modunun bellek kazancı ve float64 sonuçlara göre
+sayısal sapması. Aynı sentetik fiyatlar iki modda yüklenir; optimizer
+fiyat/getiri tabloları ile MACD paneli ölçülür, risk modeli, ağırlıklar,
+VaR ve MACD karşılaştırılır.
+
+Kullanım:
+    python -m benchmarks.compact --symbols 100 1000 --years 10
+"""
+import argparse
+import contextlib
+import io
+import json
+import sys
+import numpy as np
+import synthetic_data
+
+
+def _frame_bytes(frame):
+    """Tablonun değer belleği (indeks hariç)"""
+    return int(frame.memory_usage(index=False).sum())
+
+
+def _run(panel, slsqp):
+    from macd_analiz import macd_hesapla
+    from portfolio_optimization import PortfolioOptimizer
+
+    optimizer = PortfolioOptimizer(panel)
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = optimizer.risk_model()
+        optimizer.weights = optimizer.optimize_portfolio() if slsqp else optimizer.optimize_hrp()
+        var = optimizer.calculate_var(0.95)
+    macd = macd_hesapla(panel)
+    return {
+        'bytes': _frame_bytes(optimizer.data) + _frame_bytes(optimizer.returns) + macd.nbytes,
+        'mean': model.mean, 'cov': model.cov, 'weights': optimizer.weights,
+        'sharpe': model.sharpe(optimizer.weights), 'var': var, 'macd': macd.field('MACD'),
+    }
+
+
+def _relative(a, b):
+    """En büyük mutlak farkın referansın en büyük mutlak değerine oranı"""
+    a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    scale = np.nanmax(np.abs(b))
+    return float(np.nanmax(np.abs(a - b)) / scale) if scale > 0 else 0.0
+
+
+def measure_compact(n_symbols=100, years=5, seed=0, slsqp_max=200):
+    """
+    Bir hisse sayısı için iki modun bellek ve sapma ölçümü.
+
+    Returns:
+        dict: {'symbols', 'days', 'bytes_float64', 'bytes_float32', 'memory_ratio',
+        'mean', 'cov', 'weights', 'sharpe', 'var', 'macd'} (sapmalar göreli)
+    """
+    from price_panel import PricePanel
+
+    full = PricePanel.from_frame(synthetic_data.price_frame(n_symbols, years, seed))
+    slsqp = n_symbols <= slsqp_max
+    reference, compact = _run(full, slsqp), _run(full.compact(), slsqp)
+    return {
+        'symbols': n_symbols,
+        'days': len(full.dates),
+        'bytes_float64': reference['bytes'],
+        'bytes_float32': compact['bytes'],
+        'memory_ratio': compact['bytes'] / reference['bytes'],
+        **{key: _relative(compact[key], reference[key]) for key in ('mean', 'cov', 'weights', 'sharpe', 'var', 'macd')},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kompakt panel bellek ve sapma ölçümü")
+    parser.add_argument('--symbols', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--years', type=float, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args(argv)
+
+    rows = [measure_compact(n, args.years, args.seed) for n in args.symbols]
+    for row in rows:
+        print(f"[symbols={row['symbols']}, days={row['days']}] bellek {row['bytes_float64'] / 2**20:8.1f} MiB -> "
+              f"{row['bytes_float32'] / 2**20:8.1f} MiB ({row['memory_ratio']:.0%})  göreli sapma: "
+              f"ortalama {row['mean']:.1e}, kovaryans {row['cov']:.1e}, ağırlık {row['weights']:.1e}, "
+              f"Sharpe {row['sharpe']:.1e}, VaR {row['var']:.1e}, MACD {row['macd']:.1e}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
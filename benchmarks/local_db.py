@@ -0,0 +1,129 @@
+import sqlite3
+
+# Benchmark ve testlerde PostgreSQL yerine kullanılan bellek içi SQLite.
+# psycopg2'nin %s yer tutucularını SQLite'ın ? biçimine çevirir; ON CONFLICT
+# ... DO UPDATE sözdizimi SQLite 3.24+ ile aynıdır.
+
+HISSE_VERILERI = """
+    CREATE TABLE IF NOT EXISTS hisse_verileri (
+        id INTEGER PRIMARY KEY,
+        hisse_kodu VARCHAR(10) NOT NULL,
+        tarih DATE NOT NULL,
+        acilis DECIMAL(10,2) NOT NULL,
+        kapanis DECIMAL(10,2) NOT NULL,
+        en_yuksek DECIMAL(10,2) NOT NULL,
+        en_dusuk DECIMAL(10,2) NOT NULL,
+        hacim BIGINT NOT NULL,
+        UNIQUE(hisse_kodu, tarih)
+    )
+"""
+
+HISSE_EVRENI = """
+    CREATE TABLE IF NOT EXISTS hisse_evreni (
+        hisse_kodu VARCHAR(10) PRIMARY KEY,
+        gun_sayisi INTEGER NOT NULL,
+        islem_hacmi DOUBLE PRECISION NOT NULL,
+        oynaklik DOUBLE PRECISION,
+        tamlik DOUBLE PRECISION NOT NULL,
+        son_tarih DATE NOT NULL,
+        guncelleme TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+# schema.sql'deki portföy sonuç tabloları
+PORTFOY_METRIKLERI = """
+    CREATE TABLE IF NOT EXISTS portfoy_metrikleri (
+        calistirma VARCHAR(40) NOT NULL,
+        portfoy VARCHAR(100) NOT NULL,
+        baslangic DATE NOT NULL,
+        bitis DATE NOT NULL,
+        portfoy_degeri DECIMAL(18,2) NOT NULL,
+        beklenen_getiri DOUBLE PRECISION NOT NULL,
+        risk DOUBLE PRECISION NOT NULL,
+        sharpe DOUBLE PRECISION NOT NULL,
+        olusturma TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (calistirma, portfoy)
+    )
+"""
+
+PORTFOY_RISK_SEVIYELERI = """
+    CREATE TABLE IF NOT EXISTS portfoy_risk_seviyeleri (
+        calistirma VARCHAR(40) NOT NULL,
+        portfoy VARCHAR(100) NOT NULL,
+        guven_seviyesi DECIMAL(4,3) NOT NULL,
+        var DECIMAL(18,2) NOT NULL,
+        cvar DECIMAL(18,2) NOT NULL,
+        PRIMARY KEY (calistirma, portfoy, guven_seviyesi),
+        FOREIGN KEY (calistirma, portfoy) REFERENCES portfoy_metrikleri (calistirma, portfoy) ON DELETE CASCADE
+    )
+"""
+
+PORTFOY_AGIRLIKLARI = """
+    CREATE TABLE IF NOT EXISTS portfoy_agirliklari (
+        calistirma VARCHAR(40) NOT NULL,
+        portfoy VARCHAR(100) NOT NULL,
+        hisse_kodu VARCHAR(20) NOT NULL,
+        agirlik DOUBLE PRECISION NOT NULL,
+        PRIMARY KEY (calistirma, portfoy, hisse_kodu),
+        FOREIGN KEY (calistirma, portfoy) REFERENCES portfoy_metrikleri (calistirma, portfoy) ON DELETE CASCADE
+    )
+"""
+
+PORTFOY_TABLOLARI = (PORTFOY_METRIKLERI, PORTFOY_RISK_SEVIYELERI, PORTFOY_AGIRLIKLARI)
+
+
+def execute_values(cur, sql, argslist):
+    """
+    psycopg2.extras.execute_values'in SQLite karşılığı: `VALUES %s` satır
+    başına yer tutucu grubuna açılır ve executemany ile çalıştırılır.
+    """
+    argslist = list(argslist)
+    if not argslist:
+        return
+    grup = '(' + ', '.join(['%s'] * len(argslist[0])) + ')'
+    cur.executemany(sql.replace('VALUES %s', f'VALUES {grup}', 1), argslist)
+
+
+class SqliteCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(sql.replace('%s', '?'), params)
+
+    def executemany(self, sql, seq):
+        self._cursor.executemany(sql.replace('%s', '?'), seq)
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def close(self):
+        self._cursor.close()
+
+
+class SqliteBaglanti:
+    """psycopg2 bağlantısı gibi davranan bellek içi SQLite bağlantısı"""
+
+    def __init__(self, path=':memory:', tablolar=(HISSE_VERILERI,)):
+        self._conn = sqlite3.connect(path)
+        for tablo in tablolar:
+            self._conn.execute(tablo)
+
+    def cursor(self):
+        return SqliteCursor(self._conn.cursor())
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,252 @@
+"""
+Sıcak yolların (portföy metrikleri, optimizasyon, etkin sınır örneklemesi,
+VaR/CVaR, MACD, AlphaTrend, veritabanı yazımı) ve çekirdek modülün içe
+aktarma süresinin (`python -X importtime`) performans ölçümleri.
+
+Kullanım:
+    python -m benchmarks.run --profile quick --output bench_results.json
+    python -m benchmarks.run --baseline baseline.json --threshold 0.25
+
+Temel çizgiye göre eşikten fazla yavaşlayan ölçüm varsa çıkış kodu 1 olur.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import synthetic_data
+from benchmarks.local_db import SqliteBaglanti
+
+PROFILES = {
+    'quick': {'symbols': (5, 50), 'years': (1, 5)},
+    'full': {'symbols': (5, 50, 200, 1000), 'years': (1, 5, 20)},
+}
+
+# Ölçüm en az bu kadar sürene ya da MAX_RUNS tekrara kadar yinelenir
+MIN_TIME = 0.2
+MAX_RUNS = 7
+
+# Çok küçük ölçümlerde zamanlayıcı gürültüsünü gerileme saymamak için alt sınır (sn)
+NOISE_FLOOR = 0.001
+
+# İçe aktarma ölçümünden önce yüklenen (süresi ölçüme girmeyen) bağımlılıklar
+IMPORT_EXCLUDED = ('numpy', 'pandas')
+
+# İçe aktarma süresi alt süreçte ölçülür; disk önbelleği ve süreç başlatma
+# oynaklığı daha büyük olduğundan gerileme alt sınırı daha yüksektir (sn)
+IMPORT_NOISE_FLOOR = 0.005
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class Case:
+    """Tek bir ölçüm: setup(hisse, yıl) durumu hazırlar, run(durum) ölçülür"""
+    name: str
+    setup: object
+    run: object
+    max_symbols: int = None
+    per_symbol: bool = True
+    per_year: bool = True
+    # run(durum) süreyi kendisi ölçüp saniye olarak döndürür
+    timed: bool = False
+    noise_floor: float = NOISE_FLOOR
+
+
+def _optimizer(n, years):
+    from portfolio_optimization import PortfolioOptimizer
+    from price_panel import PricePanel
+
+    optimizer = PortfolioOptimizer(PricePanel.from_frame(synthetic_data.price_frame(n, years)))
+    optimizer.weights = np.full(n, 1 / n)
+    return optimizer
+
+
+def _panel(n, years):
+    return synthetic_data.ohlc_panel(n, years)
+
+
+def _macd(panel):
+    from macd_analiz import macd_hesapla
+    return macd_hesapla(panel)
+
+
+def _alpha_trend(panel):
+    from bist_alpha_trend import alpha_trend
+    return alpha_trend(panel)
+
+
+def _db(n, years):
+    return SqliteBaglanti(), synthetic_data.ohlc_frame(int(years * synthetic_data.TRADING_DAYS))
+
+
+def _veri_kaydet(state):
+    from macd_analiz import veri_kaydet
+    conn, df = state
+    veri_kaydet(conn, 'S0000', df)
+
+
+def import_times(module, preload=()):
+    """
+    Modülü temiz bir süreçte `python -X importtime` ile içe aktarır. preload
+    modülleri önce yüklenir; böylece ölçülen modülün süresine girmezler.
+
+    Returns:
+        dict: {modül adı: kümülatif süre (sn)}
+    """
+    code = ''.join(f'import {name}; ' for name in preload) + f'import {module}'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True, check=True, cwd=REPO_DIR)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def _import_own_time(module):
+    """Modülün numpy/pandas hariç kümülatif içe aktarma süresi (sn)"""
+    return import_times(module, preload=IMPORT_EXCLUDED)[module]
+
+
+CASES = [
+    Case('calculate_portfolio_metrics', _optimizer, lambda o: o.calculate_portfolio_metrics(o.weights)),
+    # SLSQP analitik gradyanla çalışır; süreyi her iterasyonun yoğun O(n³) QP alt
+    # problemi belirler: 500 hissede ~4 sn, 1000 hissede ~40 sn
+    Case('optimize_portfolio', _optimizer, lambda o: o.optimize_portfolio(), max_symbols=200),
+    Case('optimize_hrp', _optimizer, lambda o: o.optimize_hrp()),
+    Case('optimize_cardinality', _optimizer, lambda o: o.optimize_cardinality(15), max_symbols=1000),
+    # Örnek başına NNLS; 100 örnek, tek süreç
+    Case('optimize_resampled', _optimizer, lambda o: o.optimize_resampled(100, workers=1, seed=0), max_symbols=200),
+    Case('sample_random_portfolios', _optimizer, lambda o: o.sample_random_portfolios(1000)),
+    Case('calculate_var', _optimizer, lambda o: o.calculate_var(0.95)),
+    Case('calculate_cvar', _optimizer, lambda o: o.calculate_cvar(0.95)),
+    Case('macd_hesapla', _panel, _macd),
+    Case('alpha_trend', _panel, _alpha_trend),
+    Case('veri_kaydet', _db, _veri_kaydet, per_symbol=False),
+    # Ağır grafik/indirme/çözücü paketleri tembel yüklenmeli; biri yeniden
+    # modül düzeyine taşınırsa bu süre katlanır
+    Case('import_portfolio_optimization', lambda n, years: 'portfolio_optimization', _import_own_time,
+         per_symbol=False, per_year=False, timed=True, noise_floor=IMPORT_NOISE_FLOOR),
+]
+
+
+def measure(fn, state, min_time=MIN_TIME, max_runs=MAX_RUNS, timed=False):
+    """
+    Fonksiyonu ısındıktan sonra tekrar tekrar çalıştırıp süreleri ölçer.
+    timed ise fn kendi ölçtüğü süreyi döndürür.
+
+    Returns:
+        dict: {'min', 'median', 'runs'} (saniye)
+    """
+    fn(state)
+    times = []
+    while len(times) < max_runs and (not times or sum(times) < min_time):
+        start = time.perf_counter()
+        elapsed = fn(state)
+        times.append(elapsed if timed else time.perf_counter() - start)
+    return {'min': min(times), 'median': float(np.median(times)), 'runs': len(times)}
+
+
+def case_key(name, n, years):
+    if n is None and years is None:
+        return name
+    return f"{name}[symbols={n},years={years}]"
+
+
+def run_benchmarks(profile='quick', filter=None, min_time=MIN_TIME, log=print):
+    """
+    Seçilen profildeki tüm ölçümleri çalıştırır.
+
+    Returns:
+        dict: {'meta': ortam bilgisi, 'results': {ölçüm anahtarı: süreler}}
+    """
+    sizes = PROFILES[profile]
+    results = {}
+    for case in CASES:
+        if filter and filter not in case.name:
+            continue
+        symbol_sizes = sizes['symbols'] if case.per_symbol else (1,)
+        year_sizes = sizes['years'] if case.per_year else (None,)
+        for n in symbol_sizes:
+            if case.max_symbols and n > case.max_symbols:
+                continue
+            for years in year_sizes:
+                key = case_key(case.name, n if case.per_symbol or case.per_year else None, years)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    state = case.setup(n, years)
+                    results[key] = measure(case.run, state, min_time, timed=case.timed)
+                if case.noise_floor != NOISE_FLOOR:
+                    results[key]['noise_floor'] = case.noise_floor
+                log(f"{key}: {results[key]['min'] * 1000:.2f} ms")
+    return {
+        'meta': {
+            'profile': profile,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=0.25):
+    """
+    Sonuçları temel çizgiyle karşılaştırır (en iyi süreler üzerinden).
+
+    Returns:
+        list: Eşikten fazla yavaşlayan (anahtar, temel, güncel, oran) kayıtları
+    """
+    regressions = []
+    for key, result in current['results'].items():
+        base = baseline['results'].get(key)
+        if base is None:
+            continue
+        ratio = result['min'] / base['min'] if base['min'] else float('inf')
+        if ratio > 1 + threshold and result['min'] - base['min'] > result.get('noise_floor', NOISE_FLOOR):
+            regressions.append((key, base['min'], result['min'], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sıcak yol performans ölçümleri")
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='quick')
+    parser.add_argument('--filter', help="Yalnızca adında bu metin geçen ölçümler")
+    parser.add_argument('--output', default='bench_results.json', help="Sonuç JSON dosyası")
+    parser.add_argument('--baseline', help="Karşılaştırılacak temel çizgi JSON dosyası")
+    parser.add_argument('--threshold', type=float, default=0.25, help="İzin verilen yavaşlama oranı")
+    parser.add_argument('--min-time', type=float, default=MIN_TIME)
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.profile, args.filter, args.min_time)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(current, f, indent=2)
+    print(f"Sonuçlar {args.output} dosyasına kaydedildi")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(current, baseline, args.threshold)
+    for key, base, now, ratio in regressions:
+        print(f"GERİLEME {key}: {base * 1000:.2f} ms -> {now * 1000:.2f} ms ({ratio:.2f}x)")
+    if regressions:
+        return 1
+    print(f"Gerileme yok (eşik %{args.threshold * 100:.0f})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
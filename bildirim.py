@@ -0,0 +1,249 @@
+import os
+import time
+import asyncio
+from telegram import Bot
+from telegram.error import RetryAfter
+from dotenv import load_dotenv
+import izleme
+
+# .env dosyasından değişkenleri yükle
+load_dotenv()
+
+# Telegram sınırları
+MESAJ_LIMITI = 4096          # Tek mesajdaki en fazla karakter
+GLOBAL_HIZ = 30.0            # Bot başına saniyede en fazla mesaj
+SOHBET_HIZI = 1.0            # Sohbet başına saniyede en fazla mesaj
+
+# gonder() çağrısında parse_mode verilmediğini belirtir
+_VARSAYILAN = object()
+
+
+class TokenBucket:
+    """Belirli bir hızda dolan jeton kovası ile hız sınırlaması yapar"""
+
+    def __init__(self, hiz: float, kapasite: float = None, saat=time.monotonic):
+        """
+        Args:
+            hiz (float): Saniyede eklenen jeton sayısı
+            kapasite (float): Kovadaki en fazla jeton sayısı (varsayılan: hiz)
+            saat (callable): Saniye cinsinden zaman döndüren fonksiyon
+        """
+        self.hiz = hiz
+        self.kapasite = kapasite if kapasite is not None else max(hiz, 1.0)
+        self.saat = saat
+        self.jetonlar = self.kapasite
+        self.son_zaman = saat()
+
+    def _doldur(self):
+        simdi = self.saat()
+        self.jetonlar = min(self.kapasite, self.jetonlar + (simdi - self.son_zaman) * self.hiz)
+        self.son_zaman = simdi
+
+    def bekleme_suresi(self) -> float:
+        """Jeton varsa harcar ve 0 döndürür, yoksa beklenmesi gereken süreyi döndürür"""
+        self._doldur()
+        if self.jetonlar >= 1:
+            self.jetonlar -= 1
+            return 0.0
+        return (1 - self.jetonlar) / self.hiz
+
+    async def al(self):
+        """Bir jeton alınana kadar bekler"""
+        while True:
+            bekleme = self.bekleme_suresi()
+            if bekleme <= 0:
+                return
+            await asyncio.sleep(bekleme)
+
+
+def mesaj_bol(mesaj: str, limit: int = MESAJ_LIMITI) -> list:
+    """
+    Mesajı Telegram karakter sınırını aşmayacak parçalara böler.
+    Satırlar bölünmez; böylece HTML etiketleri parçalanmaz. Tek başına sınırı
+    aşan satırlar ise karakter bazında bölünür.
+    """
+    if len(mesaj) <= limit:
+        return [mesaj]
+
+    parcalar = []
+    parca = ""
+    for satir in mesaj.split("\n"):
+        while len(satir) > limit:
+            if parca:
+                parcalar.append(parca)
+                parca = ""
+            parcalar.append(satir[:limit])
+            satir = satir[limit:]
+
+        aday = f"{parca}\n{satir}" if parca else satir
+        if len(aday) > limit:
+            parcalar.append(parca)
+            parca = satir
+        else:
+            parca = aday
+
+    if parca:
+        parcalar.append(parca)
+    return parcalar
+
+
+def _saniye(retry_after) -> float:
+    """RetryAfter süresini saniyeye çevirir (int veya timedelta olabilir)"""
+    if hasattr(retry_after, "total_seconds"):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+class BildirimDagitici:
+    """
+    Kalıcı bot oturumu ve sınırlı bir giden kuyruk üzerinden Telegram
+    mesajlarını gönderir. Global ve sohbet başına hız sınırlarına uyar,
+    RetryAfter hatalarında belirtilen süre kadar bekleyip tekrar dener.
+    """
+
+    def __init__(self, bot=None, token: str = None, varsayilan_chat_id=None,
+                 kuyruk_boyutu: int = 1000, eszamanlilik: int = 8,
+                 global_hiz: float = GLOBAL_HIZ, sohbet_hizi: float = SOHBET_HIZI,
+                 max_deneme: int = 5, parse_mode: str = 'HTML', saat=time.monotonic):
+        """
+        Args:
+            bot: Telegram Bot nesnesi (testlerde sahte bot verilebilir)
+            token (str): Bot verilmezse oluşturulacak botun token'ı
+            varsayilan_chat_id: Chat ID verilmeyen mesajların gideceği sohbet
+            kuyruk_boyutu (int): Giden kuyruğun en fazla eleman sayısı
+            eszamanlilik (int): Aynı anda mesaj gönderen işçi sayısı
+            global_hiz (float): Saniyede gönderilebilecek toplam mesaj sayısı
+            sohbet_hizi (float): Bir sohbete saniyede gönderilebilecek mesaj sayısı
+            max_deneme (int): RetryAfter sonrası en fazla deneme sayısı
+            parse_mode (str): Mesaj biçimi
+        """
+        self.bot = bot
+        self.token = token
+        self.varsayilan_chat_id = varsayilan_chat_id
+        self.kuyruk_boyutu = kuyruk_boyutu
+        self.eszamanlilik = eszamanlilik
+        self.sohbet_hizi = sohbet_hizi
+        self.max_deneme = max_deneme
+        self.parse_mode = parse_mode
+        self.saat = saat
+        self.global_kova = TokenBucket(global_hiz, saat=saat)
+        self.sohbet_kovalari = {}
+        self.sohbet_kilitleri = {}
+        self.kuyruk = None
+        self.isciler = []
+        self.gonderilen = 0
+        self.basarisiz = 0
+        self._bot_bizim = bot is None
+
+    async def baslat(self):
+        """Bot oturumunu açar ve gönderim işçilerini başlatır"""
+        if self.kuyruk is not None:
+            return
+        if self.bot is None:
+            self.bot = Bot(token=self.token)
+        if hasattr(self.bot, "initialize"):
+            await self.bot.initialize()
+        self.kuyruk = asyncio.Queue(maxsize=self.kuyruk_boyutu)
+        self.isciler = [asyncio.create_task(self._isci()) for _ in range(self.eszamanlilik)]
+
+    async def gonder(self, mesaj: str, chat_id=None, parse_mode=_VARSAYILAN):
+        """
+        Mesajı kuyruğa ekler. Kuyruk doluysa yer açılana kadar bekler.
+        Uzun mesajlar sırası korunarak parçalara bölünür.
+        """
+        if self.kuyruk is None:
+            await self.baslat()
+        chat_id = chat_id if chat_id is not None else self.varsayilan_chat_id
+        parse_mode = self.parse_mode if parse_mode is _VARSAYILAN else parse_mode
+        await self.kuyruk.put((chat_id, mesaj_bol(mesaj), parse_mode))
+
+    async def bekle(self):
+        """Kuyruktaki tüm mesajlar işlenene kadar bekler"""
+        if self.kuyruk is not None:
+            await self.kuyruk.join()
+
+    async def durdur(self):
+        """Kuyruğu boşaltır, işçileri durdurur ve bot oturumunu kapatır"""
+        if self.kuyruk is None:
+            return
+        await self.bekle()
+        for isci in self.isciler:
+            isci.cancel()
+        await asyncio.gather(*self.isciler, return_exceptions=True)
+        self.isciler = []
+        self.kuyruk = None
+        if self._bot_bizim and hasattr(self.bot, "shutdown"):
+            try:
+                await self.bot.shutdown()
+            except Exception:
+                pass
+
+    async def __aenter__(self):
+        await self.baslat()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.durdur()
+
+    def _sohbet_kovasi(self, chat_id) -> TokenBucket:
+        if chat_id not in self.sohbet_kovalari:
+            self.sohbet_kovalari[chat_id] = TokenBucket(self.sohbet_hizi, kapasite=1, saat=self.saat)
+            self.sohbet_kilitleri[chat_id] = asyncio.Lock()
+        return self.sohbet_kovalari[chat_id]
+
+    async def _isci(self):
+        while True:
+            chat_id, parcalar, parse_mode = await self.kuyruk.get()
+            try:
+                kova = self._sohbet_kovasi(chat_id)
+                # Aynı sohbete giden parçaların sırasını korumak için kilit
+                async with self.sohbet_kilitleri[chat_id]:
+                    for parca in parcalar:
+                        await self._parca_gonder(chat_id, parca, parse_mode, kova)
+            finally:
+                self.kuyruk.task_done()
+
+    async def _parca_gonder(self, chat_id, metin: str, parse_mode, kova: TokenBucket):
+        for deneme in range(1, self.max_deneme + 1):
+            await kova.al()
+            await self.global_kova.al()
+            try:
+                izleme.sayac('telegram_istekleri')
+                with izleme.aralik('notify'):
+                    await self.bot.send_message(chat_id=chat_id, text=metin, parse_mode=parse_mode)
+                self.gonderilen += 1
+                return
+            except RetryAfter as e:
+                izleme.sayac('telegram_tekrar_denemeleri')
+                bekleme = _saniye(e.retry_after)
+                print(f"Telegram hız sınırı: {bekleme:.0f} saniye sonra tekrar denenecek ({deneme}/{self.max_deneme}).")
+                await asyncio.sleep(bekleme)
+            except Exception as e:
+                print(f"Mesaj gönderilirken hata oluştu ({chat_id}): {e}")
+                break
+        self.basarisiz += 1
+        izleme.sayac('telegram_basarisiz')
+
+
+# Süreç boyunca paylaşılan dağıtıcı
+_varsayilan_dagitici = None
+
+
+async def varsayilan_dagitici() -> BildirimDagitici:
+    """Ortam değişkenlerindeki bot bilgileriyle paylaşılan dağıtıcıyı döndürür"""
+    global _varsayilan_dagitici
+    if _varsayilan_dagitici is None:
+        _varsayilan_dagitici = BildirimDagitici(
+            token=os.getenv('TELEGRAM_BOT_TOKEN'),
+            varsayilan_chat_id=os.getenv('TELEGRAM_CHAT_ID')
+        )
+        await _varsayilan_dagitici.baslat()
+    return _varsayilan_dagitici
+
+
+async def kapat():
+    """Paylaşılan dağıtıcıyı kuyruğu boşalttıktan sonra kapatır"""
+    global _varsayilan_dagitici
+    if _varsayilan_dagitici is not None:
+        await _varsayilan_dagitici.durdur()
+        _varsayilan_dagitici = None
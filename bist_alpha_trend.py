@@ -3,11 +3,18 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import asyncio
-from telegram import Bot
 from dotenv import load_dotenv
-import schedule
+import bildirim
+import data_providers
+import hisse_evreni
+import izleme
+from abonelik import AbonelikKaydi, sinyalleri_dagit
+from db_sorgu import db_baglanti
+from price_panel import PricePanel
+from sinyal import Sinyal
+from sinyal_durumu import SinyalDurumDeposu, tarama_kaydet
+from zamanlayici import BistTakvimi, Zamanlayici
 import time
-import requests
 import json
 import warnings
 
@@ -27,108 +34,124 @@ HISSELER = [
     'EREGL.IS', 'BIMAS.IS', 'AKBNK.IS', 'YKBNK.IS', 'PGSUS.IS'
 ]
 
+# Abone listesi yoksa taranacak en likit hisse sayısı (hisse_evreni)
+EVREN_LIMITI = 30
+
+# Varsayılan veri kaynağı (Yahoo Finance chart API)
+_YAHOO = data_providers.YahooChartProvider()
+
 def get_stock_data(symbol: str, period1: int, period2: int) -> pd.DataFrame:
     """
-    Yahoo Finance'den hisse verilerini çeker
+    Yahoo Finance'den hisse verilerini çeker. data_providers ile başka bir
+    kaynak ayarlanmışsa (sentetik, kayıtlı) veri oradan okunur.
+    """
+    provider = data_providers.get_provider(_YAHOO)
+    return provider.history(symbol, pd.Timestamp(period1, unit='s'), pd.Timestamp(period2, unit='s'))
+
+def alpha_trend_dizisi(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                       period: int = 14, multiplier: float = 2.0) -> np.ndarray:
     """
-    url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+    AlphaTrend değerlerini numpy dizileri üzerinde hesaplar. Diziler tek hisse
+    için (gün,) ya da çok hisse için (gün, hisse) boyutlu olabilir.
     
-    params = {
-        "period1": period1,
-        "period2": period2,
-        "interval": "1d",
-        "events": "history"
-    }
+    Returns:
+        ndarray: 1 (yukarı trend), -1 (aşağı trend) veya NaN
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
     
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
+    # TR (True Range) hesaplama; ilk gün yalnızca h-l kullanılır
+    prev_close = np.full_like(close, np.nan)
+    prev_close[1:] = close[:-1]
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
     
-    response = requests.get(url, params=params, headers=headers)
-    data = response.json()
+    # ATR hesaplama
+    atr = pd.DataFrame(tr).rolling(period).mean().to_numpy().reshape(tr.shape)
     
-    if "chart" not in data or "result" not in data["chart"] or not data["chart"]["result"]:
-        raise ValueError(f"Veri alınamadı: {symbol}")
+    # Bantlar: önceki gün kapanış bandın dışındaysa bant bir önceki
+    # günün (ilk) bant değerinden geriye gitmez
+    up = low - (multiplier * atr)
+    down = high + (multiplier * atr)
+    with np.errstate(invalid='ignore'):
+        up_kosul = (close[period - 1:-1] > up[period - 1:-1]) & (close[period:] > up[period:])
+        down_kosul = (close[period - 1:-1] < down[period - 1:-1]) & (close[period:] < down[period:])
+        up[period:] = np.where(up_kosul, np.maximum(up[period:], up[period - 1:-1]), up[period:])
+        down[period:] = np.where(down_kosul, np.minimum(down[period:], down[period - 1:-1]), down[period:])
         
-    result = data["chart"]["result"][0]
-    quotes = result["indicators"]["quote"][0]
-    
-    df = pd.DataFrame({
-        "Open": quotes["open"],
-        "High": quotes["high"],
-        "Low": quotes["low"],
-        "Close": quotes["close"],
-        "Volume": quotes["volume"]
-    }, index=pd.to_datetime(result["timestamp"], unit="s"))
-    
-    return df
+        # Trend belirleme
+        trend = np.full_like(close, np.nan)
+        trend[close > down] = 1   # Yukarı trend
+        trend[close < up] = -1    # Aşağı trend
+    return trend
 
 def alpha_trend(data: pd.DataFrame, period: int = 14, multiplier: float = 2.0) -> pd.DataFrame:
     """
     AlphaTrend indikatörünü hesaplar
+
+    PricePanel verilirse tüm hisseler tek seferde hesaplanır ve AlphaTrend
+    alanını içeren yeni bir panel döndürülür.
     """
-    high = data['High']
-    low = data['Low']
-    close = data['Close']
-    
-    # TR (True Range) hesaplama
-    tr = pd.DataFrame()
-    tr['h-l'] = high - low
-    tr['h-pc'] = abs(high - close.shift(1))
-    tr['l-pc'] = abs(low - close.shift(1))
-    tr['tr'] = tr[['h-l', 'h-pc', 'l-pc']].max(axis=1)
-    
-    # ATR hesaplama
-    atr = tr['tr'].rolling(period).mean()
-    
-    # AlphaTrend hesaplama
-    up = low - (multiplier * atr)
-    up1 = up.copy()
-    
-    for i in range(period, len(up)):
-        if close[i-1] > up1[i-1] and close[i] > up[i]:
-            up[i] = max(up[i], up1[i-1])
-        elif close[i] > up[i]:
-            up[i] = up[i]
-        else:
-            up[i] = up[i]
-    
-    down = high + (multiplier * atr)
-    down1 = down.copy()
-    
-    for i in range(period, len(down)):
-        if close[i-1] < down1[i-1] and close[i] < down[i]:
-            down[i] = min(down[i], down1[i-1])
-        elif close[i] < down[i]:
-            down[i] = down[i]
-        else:
-            down[i] = down[i]
-    
-    # Trend belirleme
-    data['AlphaTrend'] = np.nan
-    data.loc[close > down, 'AlphaTrend'] = 1  # Yukarı trend
-    data.loc[close < up, 'AlphaTrend'] = -1   # Aşağı trend
+    if isinstance(data, PricePanel):
+        trend = alpha_trend_dizisi(data.field('High'), data.field('Low'), data.field('Close'), period, multiplier)
+        return PricePanel(trend.astype(data.dtype, copy=False), data.symbols, data.dates, ('AlphaTrend',))
     
+    data['AlphaTrend'] = alpha_trend_dizisi(data['High'], data['Low'], data['Close'], period, multiplier)
     return data
 
+class ArtimliAlphaTrend:
+    """
+    Canlı akışta her bar kapanışında güncellenen AlphaTrend. Son `period`
+    barın TR değerleri sabit boyutlu bir halkada tutulur; bant kuralı
+    alpha_trend_dizisi ile aynıdır (önceki günün ilk bant değeri).
+    """
+    __slots__ = ('period', 'multiplier', 'tr', 'bar_sayisi', 'onceki_kapanis', 'onceki_up', 'onceki_down', 'trend')
+
+    def __init__(self, period: int = 14, multiplier: float = 2.0):
+        self.period = period
+        self.multiplier = multiplier
+        self.tr = np.zeros(period)
+        self.bar_sayisi = 0
+        self.onceki_kapanis = self.onceki_up = self.onceki_down = np.nan
+        self.trend = np.nan
+
+    def guncelle(self, acilis, yuksek, dusuk, kapanis):
+        """Kapanan barla trendi günceller ve durumu ('AL'/'SAT'/None) döndürür"""
+        tr = np.fmax(yuksek - dusuk, np.fmax(abs(yuksek - self.onceki_kapanis), abs(dusuk - self.onceki_kapanis)))
+        self.tr[self.bar_sayisi % self.period] = tr
+        self.bar_sayisi += 1
+        atr = self.tr.mean() if self.bar_sayisi >= self.period else np.nan
+
+        up_ham = dusuk - self.multiplier * atr
+        down_ham = yuksek + self.multiplier * atr
+        up, down = up_ham, down_ham
+        if self.onceki_kapanis > self.onceki_up and kapanis > up_ham:
+            up = max(up_ham, self.onceki_up)
+        if self.onceki_kapanis < self.onceki_down and kapanis < down_ham:
+            down = min(down_ham, self.onceki_down)
+        self.onceki_kapanis, self.onceki_up, self.onceki_down = kapanis, up_ham, down_ham
+
+        self.trend = -1 if kapanis < up else 1 if kapanis > down else np.nan
+        return trend_durumu(self.trend)
+
 async def sinyal_gonder(mesaj: str):
-    """Telegram üzerinden sinyal gönderir"""
-    try:
-        bot = Bot(token=TELEGRAM_BOT_TOKEN)
-        await bot.send_message(
-            chat_id=TELEGRAM_CHAT_ID,
-            text=mesaj,
-            parse_mode='HTML'  # HTML formatında mesaj gönder
-        )
-    except Exception as e:
-        print(f"Sinyal gönderilirken hata oluştu: {e}")
-    finally:
-        if bot:
-            await bot.close()
+    """Telegram üzerinden sinyal gönderir (kalıcı bot oturumu ve giden kuyruk ile)"""
+    dagitici = await bildirim.varsayilan_dagitici()
+    await dagitici.gonder(mesaj, TELEGRAM_CHAT_ID)
 
-def hisse_analiz_et(hisse_kodu: str) -> str:
+def trend_durumu(trend) -> str:
+    """AlphaTrend değerini sinyal durumuna çevirir (1: 'AL', -1: 'SAT')"""
+    if trend == 1:
+        return 'AL'
+    if trend == -1:
+        return 'SAT'
+    return None
+
+def hisse_analiz_et(hisse_kodu: str, durum_deposu: SinyalDurumDeposu = None) -> Sinyal:
     """
-    Bir hisse senedi için AlphaTrend analizi yapar
+    Bir hisse senedi için AlphaTrend analizi yapar. Trend yön değiştirdiğinde
+    sinyal döndürür; depo verilirse aynı kesişim sonraki taramalarda tekrar
+    gönderilmez.
     """
     try:
         # Tarih aralığını belirle
@@ -154,41 +177,83 @@ def hisse_analiz_et(hisse_kodu: str) -> str:
         if len(son_iki_gun) < 2:
             return None
             
-        onceki_trend = son_iki_gun.iloc[0]['AlphaTrend']
-        guncel_trend = son_iki_gun.iloc[1]['AlphaTrend']
+        onceki_durum = trend_durumu(son_iki_gun.iloc[0]['AlphaTrend'])
+        guncel_durum = trend_durumu(son_iki_gun.iloc[1]['AlphaTrend'])
         guncel_fiyat = son_iki_gun.iloc[1]['Close']
         
         # Sinyal kontrolü
         temiz_kod = hisse_kodu.replace('.IS', '')
-        if onceki_trend == -1 and guncel_trend == 1:
-            return f"🟢 <b>AL Sinyali:</b> {temiz_kod} - Fiyat: {guncel_fiyat:.2f} TL"
-        elif onceki_trend == 1 and guncel_trend == -1:
-            return f"🔴 <b>SAT Sinyali:</b> {temiz_kod} - Fiyat: {guncel_fiyat:.2f} TL"
-            
-        return None
+        if durum_deposu is not None:
+            kesisim = durum_deposu.gecis_mi(temiz_kod, 'ALPHATREND', guncel_durum, onceki_durum)
+        else:
+            kesisim = None not in (onceki_durum, guncel_durum) and onceki_durum != guncel_durum
+        
+        if not kesisim:
+            return None
+        
+        if guncel_durum == 'AL':
+            metin = f"🟢 <b>AL Sinyali:</b> {temiz_kod} - Fiyat: {guncel_fiyat:.2f} TL"
+        else:
+            metin = f"🔴 <b>SAT Sinyali:</b> {temiz_kod} - Fiyat: {guncel_fiyat:.2f} TL"
+        return Sinyal(temiz_kod, 'ALPHATREND', guncel_durum, float(guncel_fiyat), metin, son_iki_gun.index[1])
         
     except Exception as e:
         print(f"Hata: {hisse_kodu} analiz edilirken bir sorun oluştu - {e}")
         return None
 
+# Süreç boyunca bellekte tutulan son sinyal durumları
+_durum_deposu = None
+
 async def tum_hisseleri_tara():
     """
-    Tüm hisseleri tarar ve sinyalleri gönderir
+    Tüm hisseleri tarar ve yalnızca yeni kesişimleri gönderir
     """
+    global _durum_deposu
     print(f"Tarama başladı: {datetime.now()}")
     
-    sinyaller = []
-    for hisse in HISSELER:
-        sinyal = hisse_analiz_et(hisse)
-        if sinyal:
-            sinyaller.append(sinyal)
+    conn = db_baglanti()
+    try:
+        # Abone izleme listelerini yükle; abone yoksa tek sohbete gönderilir
+        kayit = AbonelikKaydi.veritabanindan(conn, varsayilan_chat_id=TELEGRAM_CHAT_ID)
+        if _durum_deposu is None:
+            _durum_deposu = SinyalDurumDeposu.veritabanindan(conn)
+        
+        # Her hisse, kaç abone izlerse izlesin, bir kez analiz edilir
+        # abone yoksa hisse evreninin en likit hisseleri, o da boşsa sabit liste
+        hisseler = [f"{hisse}.IS" for hisse in
+                    kayit.hisseler('ALPHATREND') or hisse_evreni.likit_hisseler(conn, EVREN_LIMITI)] or HISSELER
+        
+        sinyaller = []
+        for hisse in hisseler:
+            sinyal = hisse_analiz_et(hisse, _durum_deposu)
+            if sinyal:
+                sinyaller.append(sinyal)
+        
+        # Kesişimleri ve değişen durumları tek seferde yaz
+        tarama_kaydet(
+            conn, _durum_deposu,
+            alpha_trend_satirlari=[(s.hisse_kodu, s.sinyal_tipi, s.fiyat) for s in sinyaller]
+        )
+    finally:
+        if conn:
+            conn.close()
     
     if sinyaller:
-        mesaj = "🔔 <b>AlphaTrend Sinyalleri</b> 🔔\n\n" + "\n".join(sinyaller)
-        mesaj += f"\n\n📅 <i>Tarama Zamanı: {datetime.now().strftime('%Y-%m-%d %H:%M')}</i>"
-        await sinyal_gonder(mesaj)
+        dagitici = await bildirim.varsayilan_dagitici()
+        sohbet_sayisi = await sinyalleri_dagit(kayit, sinyaller, dagitici, "AlphaTrend Sinyalleri")
+        print(f"{len(sinyaller)} sinyal {sohbet_sayisi} sohbete gönderilmek üzere kuyruğa eklendi.")
     else:
-        print("Sinyal bulunamadı.")
+        print("Yeni kesişim bulunamadı.")
+
+def gorevleri_ekle(zamanlayici: Zamanlayici, takvim: BistTakvimi = None):
+    """AlphaTrend taramasını işlem günlerinde 10:00-18:00 arası her saat başına zamanlar"""
+    zamanlayici.ekle(
+        "AlphaTrend taraması",
+        tum_hisseleri_tara,
+        [f"{saat:02d}:00" for saat in range(10, 19)],
+        takvim=takvim or BistTakvimi(),
+        cakisma='atla'  # Önceki tarama sürüyorsa yenisi yığılmaz
+    )
 
 async def main():
     """
@@ -200,19 +265,19 @@ async def main():
     # İlk taramayı hemen yap
     await tum_hisseleri_tara()
     
-    # Piyasa saatleri içinde her saat başı tarama yap (10:00-18:00)
-    for saat in range(10, 19):
-        schedule.every().day.at(f"{saat:02d}:00").do(
-            lambda: asyncio.create_task(tum_hisseleri_tara())
-        )
+    zamanlayici = Zamanlayici()
+    gorevleri_ekle(zamanlayici)
     
-    while True:
-        schedule.run_pending()
-        await asyncio.sleep(60)  # Her dakika kontrol et
+    try:
+        await zamanlayici.calistir()
+    finally:
+        # Kuyrukta bekleyen mesajları gönder ve bot oturumunu kapat
+        await bildirim.kapat()
 
 if __name__ == "__main__":
     print("Bot başlatılıyor...")
     try:
-        asyncio.run(main())
+        with izleme.ortamdan_yapilandir():
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("\nBot kullanıcı tarafından durduruldu.") 
\ No newline at end of file
@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+from price_panel import PricePanel
+
+# Farklı takvimlerdeki (7/24 işlem gören kripto, borsa günleri, eksik
+# günleri olan hisseler) serileri tek geçişte ortak bir tarih eksenine
+# hizalar. Tarihler int64 nanosaniye dizileri olarak işlenir; her sembol
+# için hedef takvimde "o güne kadarki son gözlemin" satır numarası bulunur
+# ve tüm alanlar bu indeksle toplanır.
+#
+# Politikalar:
+#   'intersection' - yalnızca tüm sembollerin işlem gördüğü günler
+#   'ffill'        - tüm günlerin birleşimi; eksik günler son değerle
+#                    doldurulur (limit: en fazla kaç satır taşınacağı)
+#   'aggregate'    - sembollerin çoğunluğunun işlem gördüğü günler; araya
+#                    düşen (hafta sonu gibi) günlerin hareketi bir sonraki
+#                    takvim gününün getirisinde birikir
+
+POLICIES = ('intersection', 'ffill', 'aggregate')
+
+# Optimizer'ın son gözlemi en fazla taşıdığı takvim satırı: tatil ve kısa
+# işlem durdurmaları doldurulur; işlemden kalkan ya da uzun süre askıya
+# alınan hissenin fiyatı taşınmaz, yoksa her doldurulan gün sahte bir %0
+# getiri olur ve hisse olduğundan az riskli görünür
+DEFAULT_FILL_LIMIT = 5
+
+
+def to_stamps(index):
+    """
+    Tarih indeksini int64 nanosaniye dizisine çevirir. Saat dilimli indeksler
+    (ör. yfinance) yerel duvar saatiyle alınır, böylece farklı borsaların
+    aynı takvim günü eşleşir.
+    """
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.values.astype('datetime64[ns]').view(np.int64)
+
+
+def build_calendar(dates_list, policy='intersection'):
+    """
+    Sembollerin (sıralı, tekrarsız) tarih dizilerinden hedef takvimi üretir.
+
+    Returns:
+        ndarray: int64 nanosaniye takvim
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Bilinmeyen hizalama politikası: {policy} ({', '.join(POLICIES)})")
+    if not dates_list:
+        return np.empty(0, dtype=np.int64)
+    days, counts = np.unique(np.concatenate(dates_list), return_counts=True)
+    n = len(dates_list)
+    if policy == 'intersection':
+        return days[counts == n]
+    if policy == 'aggregate':
+        return days[counts * 2 > n]
+    return days
+
+
+def alignment_index(dates_list, policy='intersection', calendar=None, limit=None):
+    """
+    Her sembolün hedef takvimdeki satırlarını bulur.
+
+    Args:
+        dates_list (list): Sembol başına sıralı int64 tarih dizileri
+        policy (str): Hizalama politikası (POLICIES)
+        calendar (array): Hedef takvim (verilmezse politikaya göre üretilir)
+        limit (int): Son gözlemin en fazla kaç takvim satırı taşınacağı
+            (None: sınırsız; 'intersection' için her zaman 0)
+
+    Returns:
+        tuple: (takvim, (takvim, sembol) boyutlu indeks dizisi; eksikler -1)
+    """
+    if calendar is None:
+        calendar = build_calendar(dates_list, policy)
+    else:
+        calendar = to_stamps(calendar)
+        if policy == 'intersection':
+            calendar = np.intersect1d(calendar, build_calendar(dates_list, policy), assume_unique=True)
+    if policy == 'intersection':
+        limit = 0
+
+    rows = np.arange(len(calendar))
+    index = np.full((len(calendar), len(dates_list)), -1, dtype=np.int64)
+    for k, dates in enumerate(dates_list):
+        if not len(dates):
+            continue
+        # Takvim gününe kadar (o gün dahil) görülen son gözlem
+        last = np.searchsorted(dates, calendar, side='right') - 1
+        valid = last >= 0
+        if limit is not None:
+            # Gözlemin düştüğü ilk takvim satırından bu yana geçen satır sayısı
+            seen = np.searchsorted(calendar, dates[np.maximum(last, 0)], side='left')
+            valid &= rows - seen <= limit
+        index[valid, k] = last[valid]
+    return calendar, index
+
+
+def take(values, index):
+    """Hizalama indeksiyle değerleri toplar; eksik satırlar NaN olur."""
+    values = np.asarray(values, dtype=np.float64)
+    out = values[np.maximum(index, 0)] if len(values) else np.full(index.shape, np.nan)
+    out[index < 0] = np.nan
+    return out
+
+
+def align(series, policy='intersection', calendar=None, limit=None, field='Close'):
+    """
+    {sembol: tarih indeksli Series} sözlüğünü tek geçişte hizalar.
+
+    Returns:
+        PricePanel: Hizalanmış tek alanlı panel
+    """
+    symbols, dates_list, values_list = [], [], []
+    for symbol, s in series.items():
+        s = s.dropna()
+        if not s.index.is_monotonic_increasing:
+            s = s.sort_index()
+        s = s[~s.index.duplicated(keep='last')]
+        symbols.append(symbol)
+        dates_list.append(to_stamps(s.index))
+        values_list.append(s.to_numpy(dtype=np.float64))
+
+    calendar, index = alignment_index(dates_list, policy, calendar, limit)
+    values = np.empty((len(calendar), len(symbols)))
+    for k, v in enumerate(values_list):
+        values[:, k] = take(v, index[:, k])
+    return PricePanel(values, symbols, calendar.view('datetime64[ns]'), (field,))
@@ -0,0 +1,427 @@
+import asyncio
+import json
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import bildirim
+import izleme
+from abonelik import AbonelikKaydi, sinyalleri_dagit
+from sinyal import Sinyal
+from sinyal_durumu import SinyalDurumDeposu
+
+# Gün içi canlı fiyat akışı. Tick'ler takılabilir bir kaynaktan (WebSocket ya
+# da kayıtlı tekrar) okunur, her hisse için sabit boyutlu NumPy halkalarında
+# tutulur ve anında barlara birleştirilir. Her bar kapanışında stratejilerin
+# artımlı göstergeleri (ArtimliMacd, ArtimliAlphaTrend) O(1) güncellenir;
+# veritabanına gidilmeden kesişimler aynı bildirim hattından gönderilir.
+# Bellek kullanımı hisse sayısı × halka boyutuyla sınırlıdır.
+
+TICK_ALANLARI = ('zaman', 'fiyat', 'hacim')
+BAR_ALANLARI = ('zaman', 'Open', 'High', 'Low', 'Close', 'Volume')
+
+
+@dataclass(frozen=True)
+class Tick:
+    """Tek fiyat güncellemesi"""
+    hisse_kodu: str
+    zaman: float        # Unix zamanı (saniye)
+    fiyat: float
+    hacim: float = 0.0
+
+
+class HalkaTampon:
+    """
+    Sabit kapasiteli, NumPy dizisi üzerinde halka tampon. Dolunca en eski
+    satırın üzerine yazılır; ekleme bellek ayırmaz.
+    """
+
+    def __init__(self, kapasite: int, alanlar):
+        self.kapasite = kapasite
+        self.alanlar = tuple(alanlar)
+        self.veri = np.full((kapasite, len(self.alanlar)), np.nan)
+        self.yazilan = 0
+
+    def ekle(self, satir):
+        self.veri[self.yazilan % self.kapasite] = satir
+        self.yazilan += 1
+
+    def __len__(self):
+        return min(self.yazilan, self.kapasite)
+
+    def son(self, n: int = None) -> np.ndarray:
+        """Son n satırı eskiden yeniye sıralı kopya olarak döndürür"""
+        n = len(self) if n is None else min(n, len(self))
+        return self.veri[np.arange(self.yazilan - n, self.yazilan) % self.kapasite]
+
+    def frame(self, n: int = None) -> pd.DataFrame:
+        """Son n satırı zaman indeksli DataFrame olarak döndürür"""
+        satirlar = self.son(n)
+        index = pd.to_datetime(satirlar[:, 0], unit='s')
+        return pd.DataFrame(satirlar[:, 1:], index=index, columns=self.alanlar[1:])
+
+
+class SembolAkisi:
+    """Bir hissenin tick halkası, bar halkası ve açık (henüz kapanmamış) barı"""
+
+    def __init__(self, aralik: float, tick_kapasitesi: int, bar_kapasitesi: int):
+        self.aralik = aralik
+        self.tickler = HalkaTampon(tick_kapasitesi, TICK_ALANLARI)
+        self.barlar = HalkaTampon(bar_kapasitesi, BAR_ALANLARI)
+        self.acik = None   # [başlangıç, açılış, yüksek, düşük, kapanış, hacim]
+
+    @property
+    def bitis(self) -> float:
+        return self.acik[0] + self.aralik if self.acik is not None else math.inf
+
+    def ekle(self, zaman: float, fiyat: float, hacim: float):
+        """
+        Tick'i halkaya ve açık bara ekler. Tick yeni bir bar aralığına
+        düşüyorsa önceki bar kapatılır ve döndürülür; yoksa None.
+        """
+        self.tickler.ekle((zaman, fiyat, hacim))
+        baslangic = zaman - zaman % self.aralik
+        kapanan = None
+        if self.acik is not None and baslangic != self.acik[0]:
+            if baslangic < self.acik[0]:
+                # Sırası bozuk gelen eski tick kapanmış barları değiştirmez
+                izleme.sayac('canli_gec_tick')
+                return None
+            kapanan = self.kapat()
+        if self.acik is None:
+            self.acik = [baslangic, fiyat, fiyat, fiyat, fiyat, hacim]
+        else:
+            bar = self.acik
+            bar[2] = max(bar[2], fiyat)
+            bar[3] = min(bar[3], fiyat)
+            bar[4] = fiyat
+            bar[5] += hacim
+        return kapanan
+
+    def kapat(self):
+        """Açık barı bar halkasına yazar ve döndürür"""
+        bar = tuple(self.acik)
+        self.barlar.ekle(bar)
+        self.acik = None
+        return bar
+
+
+class TickKaynagi(ABC):
+    """Canlı akış kaynaklarının temel sınıfı"""
+
+    @abstractmethod
+    def akis(self):
+        """Tick üreten async üreteç (alt sınıflarda `async def` + `yield`)"""
+
+
+class TekrarKaynagi(TickKaynagi):
+    """
+    Kayıtlı tick'leri sırayla oynatır (testler ve geriye dönük deneme).
+
+    Args:
+        tickler: Tick listesi ya da hisse_kodu, zaman, fiyat, hacim sütunlu DataFrame
+        hiz (float): Gerçek zamana göre oynatma hızı (None: beklemeden)
+    """
+
+    def __init__(self, tickler, hiz: float = None):
+        if isinstance(tickler, pd.DataFrame):
+            tickler = [Tick(h, float(z), float(f), float(v)) for h, z, f, v in
+                       tickler[['hisse_kodu', 'zaman', 'fiyat', 'hacim']].itertuples(index=False)]
+        self.tickler = list(tickler)
+        self.hiz = hiz
+
+    async def akis(self):
+        onceki = None
+        for i, tick in enumerate(self.tickler):
+            if self.hiz and onceki is not None:
+                await asyncio.sleep(max(tick.zaman - onceki, 0) / self.hiz)
+            elif i % 1000 == 0:
+                await asyncio.sleep(0)
+            onceki = tick.zaman
+            yield tick
+
+
+def json_tickleri(mesaj) -> list:
+    """
+    {"hisse_kodu", "zaman", "fiyat", "hacim"} nesnesi ya da bu nesnelerin
+    listesi olan JSON mesajını Tick listesine çevirir.
+    """
+    veri = json.loads(mesaj)
+    if isinstance(veri, dict):
+        veri = [veri]
+    return [Tick(d['hisse_kodu'], float(d['zaman']), float(d['fiyat']), float(d.get('hacim', 0))) for d in veri]
+
+
+def _websocket_baglan(url):
+    try:
+        import websockets
+    except ImportError:
+        raise ImportError("Canlı akış için websockets gerekir: pip install .[live] (ya da pip install websockets)") from None
+    return websockets.connect(url)
+
+
+def _baglanti_hatalari():
+    """Yeniden bağlanılan hatalar; websockets kuruluysa anormal kapanış ve reddedilen el sıkışma da"""
+    try:
+        from websockets.exceptions import WebSocketException
+    except ImportError:
+        return (OSError, ConnectionError)
+    return (OSError, ConnectionError, WebSocketException)
+
+
+class WebSocketKaynagi(TickKaynagi):
+    """
+    WebSocket üzerinden gelen fiyat mesajlarını okur. Bağlantı koparsa
+    `yeniden_baglan` saniye sonra tekrar bağlanır.
+
+    Args:
+        url (str): Akış adresi
+        abonelik (str): Bağlantı açılınca gönderilecek mesaj (ör. hisse listesi)
+        cozumle (callable): Mesajı Tick listesine çeviren fonksiyon
+        baglan (callable): url alıp async bağlam yöneticisi döndüren fonksiyon
+            (varsayılan websockets.connect; testlerde sahte bağlantı verilir)
+        yeniden_baglan (float): Yeniden bağlanma beklemesi (None: bağlantı kapanınca dur)
+    """
+
+    def __init__(self, url: str, abonelik: str = None, cozumle=json_tickleri, baglan=None,
+                 yeniden_baglan: float = 5.0):
+        self.url = url
+        self.abonelik = abonelik
+        self.cozumle = cozumle
+        self.baglan = baglan or _websocket_baglan
+        self.yeniden_baglan = yeniden_baglan
+
+    async def _baglanti_tickleri(self):
+        """Tek bağlantı boyunca gelen tickler; çözümlenemeyen mesajlar atlanır"""
+        async with self.baglan(self.url) as ws:
+            if self.abonelik is not None:
+                await ws.send(self.abonelik)
+            async for mesaj in ws:
+                try:
+                    tickler = self.cozumle(mesaj)
+                except (ValueError, KeyError, TypeError) as e:
+                    print(f"Akış mesajı çözümlenemedi: {e}")
+                    continue
+                for tick in tickler:
+                    yield tick
+
+    async def akis(self):
+        hatalar = _baglanti_hatalari()
+        while True:
+            try:
+                async for tick in self._baglanti_tickleri():
+                    yield tick
+            except hatalar as e:
+                print(f"Akış bağlantısı koptu: {e!r}")
+                if self.yeniden_baglan is None:
+                    raise
+            if self.yeniden_baglan is None:
+                return
+            await asyncio.sleep(self.yeniden_baglan)
+
+
+class CanliTarayici:
+    """
+    Tick akışını barlara birleştirip her bar kapanışında stratejilerin
+    artımlı göstergelerini güncelleyen gün içi tarayıcı.
+
+    Args:
+        stratejiler (list): canli_gosterge() destekleyen tarayici.Strateji nesneleri
+        kaynak (TickKaynagi): Tick kaynağı
+        aralik (float): Bar uzunluğu (saniye)
+        tick_kapasitesi (int): Hisse başına tutulan en fazla tick
+        bar_kapasitesi (int): Hisse başına tutulan en fazla bar
+        kayit (AbonelikKaydi): Sinyallerin yönlendirileceği abonelikler
+        evren (list): Abone listesi olmayan stratejilerin izlediği hisseler
+        dagitici (BildirimDagitici): Verilmezse paylaşılan dağıtıcı kullanılır
+        saat (callable): Duvar saati (Unix zamanı); verilirse tick gelmese de
+            süresi dolan barlar kapatılır. Tekrar kaynaklarında None bırakılır.
+    """
+
+    def __init__(self, stratejiler, kaynak: TickKaynagi, aralik: float = 60.0, tick_kapasitesi: int = 4096,
+                 bar_kapasitesi: int = 512, kayit: AbonelikKaydi = None, evren=(), dagitici=None, saat=None):
+        self.kaynak = kaynak
+        self.aralik = aralik
+        self.kayit = kayit or AbonelikKaydi()
+        self.dagitici = dagitici
+        self.saat = saat
+        self.durum_deposu = SinyalDurumDeposu()
+        self.stratejiler = {}    # indikatör -> strateji
+        self.hedefler = {}       # hisse -> [strateji, ...]
+        self.gostergeler = {}    # (hisse, indikatör) -> artımlı gösterge
+        for strateji in stratejiler:
+            if strateji.canli_gosterge() is None:
+                continue
+            self.stratejiler[strateji.indikator] = strateji
+            hisseler = self.kayit.hisseler(strateji.indikator) or (strateji.evrenden and evren) or strateji.hisseler
+            for hisse_kodu in hisseler:
+                self.hedefler.setdefault(hisse_kodu, []).append(strateji)
+                self.gostergeler[(hisse_kodu, strateji.indikator)] = strateji.canli_gosterge()
+        self.akislar = {h: SembolAkisi(aralik, tick_kapasitesi, bar_kapasitesi) for h in self.hedefler}
+        self._sonraki_bitis = math.inf
+
+    def isit(self, hisse_kodu: str, df: pd.DataFrame):
+        """
+        Göstergeleri kayıtlı gün içi barlarla (Open, High, Low, Close) ısıtır;
+        son durumlar depoya sinyal üretilmeden yazılır.
+        """
+        for satir in df[['Open', 'High', 'Low', 'Close']].itertuples(index=False):
+            for strateji in self.hedefler.get(hisse_kodu, ()):
+                durum = self.gostergeler[(hisse_kodu, strateji.indikator)].guncelle(*satir)
+                self.durum_deposu.gecis_mi(hisse_kodu, strateji.indikator, durum)
+
+    def _bar_kapandi(self, hisse_kodu: str, bar) -> list:
+        sinyaller = []
+        _, acilis, yuksek, dusuk, kapanis, _ = bar
+        with izleme.aralik('indicator', hisse_kodu):
+            for strateji in self.hedefler[hisse_kodu]:
+                durum = self.gostergeler[(hisse_kodu, strateji.indikator)].guncelle(acilis, yuksek, dusuk, kapanis)
+                if self.durum_deposu.gecis_mi(hisse_kodu, strateji.indikator, durum):
+                    sinyaller.append(Sinyal(
+                        hisse_kodu, strateji.indikator, durum, kapanis,
+                        strateji.sinyal_metni(hisse_kodu, durum, kapanis),
+                        datetime.fromtimestamp(bar[0] + self.aralik)
+                    ))
+        izleme.sayac('canli_bar')
+        return sinyaller
+
+    def isle(self, tick: Tick) -> list:
+        """
+        Tick'i ilgili hissenin halkasına ekler; kapanan barlar için
+        göstergeleri günceller ve oluşan sinyalleri döndürür.
+        """
+        akis = self.akislar.get(tick.hisse_kodu)
+        if akis is None:
+            return []
+        izleme.sayac('canli_tick')
+        sinyaller = []
+        bar = akis.ekle(tick.zaman, tick.fiyat, tick.hacim)
+        if bar is not None:
+            sinyaller += self._bar_kapandi(tick.hisse_kodu, bar)
+        if tick.zaman >= self._sonraki_bitis:
+            sinyaller += self.kapanmislari_kapat(tick.zaman)
+        self._sonraki_bitis = min(self._sonraki_bitis, akis.bitis)
+        return sinyaller
+
+    def kapanmislari_kapat(self, simdi: float = math.inf) -> list:
+        """Aralığı `simdi` itibarıyla dolmuş açık barları kapatır (tick gelmeyen hisseler)"""
+        sinyaller = []
+        sonraki = math.inf
+        for hisse_kodu, akis in self.akislar.items():
+            if akis.bitis <= simdi:
+                sinyaller += self._bar_kapandi(hisse_kodu, akis.kapat())
+            sonraki = min(sonraki, akis.bitis)
+        self._sonraki_bitis = sonraki
+        return sinyaller
+
+    def barlar(self, hisse_kodu: str, n: int = None) -> pd.DataFrame:
+        """Hissenin kapanmış son n barı"""
+        return self.akislar[hisse_kodu].barlar.frame(n)
+
+    def _bekleme(self):
+        """Duvar saatine göre ilk barın kapanmasına kalan süre (saat yoksa None)"""
+        if self.saat is None or self._sonraki_bitis == math.inf:
+            return None
+        return max(self._sonraki_bitis - self.saat(), 0)
+
+    async def _yayinla(self, sinyaller: list) -> int:
+        if sinyaller:
+            await self._dagit(sinyaller)
+        return len(sinyaller)
+
+    async def _dagit(self, sinyaller: list):
+        dagitici = self.dagitici or await bildirim.varsayilan_dagitici()
+        with izleme.aralik('notify'):
+            for indikator, strateji in self.stratejiler.items():
+                grup = [s for s in sinyaller if s.indikator == indikator]
+                if grup:
+                    await sinyalleri_dagit(self.kayit, grup, dagitici, strateji.baslik)
+
+    async def calistir(self) -> int:
+        """
+        Kaynak bitene (ya da görev iptal edilene) kadar akışı işler.
+
+        Returns:
+            int: Gönderilen sinyal sayısı
+        """
+        kuyruk = asyncio.Queue(maxsize=10_000)
+        bitti = object()
+
+        async def oku():
+            try:
+                async for tick in self.kaynak.akis():
+                    await kuyruk.put(tick)
+            finally:
+                await kuyruk.put(bitti)
+
+        okuyucu = asyncio.create_task(oku())
+        toplam = 0
+        try:
+            while True:
+                try:
+                    tick = await asyncio.wait_for(kuyruk.get(), self._bekleme())
+                except asyncio.TimeoutError:
+                    sinyaller = self.kapanmislari_kapat(self.saat())
+                else:
+                    if tick is bitti:
+                        await okuyucu   # Kaynak hatayla bittiyse hata burada yükselir
+                        break
+                    sinyaller = self.isle(tick)
+                toplam += await self._yayinla(sinyaller)
+            # Akış bittiğinde açık barlar kapatılır
+            toplam += await self._yayinla(self.kapanmislari_kapat())
+        finally:
+            okuyucu.cancel()
+            await asyncio.gather(okuyucu, return_exceptions=True)
+        return toplam
+
+
+class CanliGorev:
+    """
+    CanliTarayici'yi arka plan görevi olarak çalıştırır. Görev hatayla ya da
+    kaynak bittiği için sonlanırsa hata loglanır ve `yeniden_baslat` saniye
+    sonra yeniden başlatılır; zamanlanmış taramalar sessizce tek başına kalmaz.
+
+    Args:
+        tarayici (CanliTarayici): Çalıştırılacak tarayıcı
+        yeniden_baslat (float): Yeniden başlatma beklemesi (saniye)
+    """
+
+    def __init__(self, tarayici: CanliTarayici, yeniden_baslat: float = 30.0):
+        self.tarayici = tarayici
+        self.yeniden_baslat = yeniden_baslat
+        self.gorev = None
+        self.baslatma_sayisi = 0
+        self._zamanlanmis = None
+        self._durduruldu = False
+
+    def baslat(self):
+        self._zamanlanmis = None
+        if self._durduruldu:
+            return
+        self.baslatma_sayisi += 1
+        self.gorev = asyncio.create_task(self.tarayici.calistir())
+        self.gorev.add_done_callback(self._bitti)
+
+    def _bitti(self, gorev):
+        if gorev.cancelled() or self._durduruldu:
+            return
+        hata = gorev.exception()
+        if hata is not None:
+            print(f"Canlı akış hatayla durdu: {hata!r}")
+            izleme.sayac('canli_akis_hatasi')
+        else:
+            print("Canlı akış kaynağı kapandı")
+        print(f"Canlı akış {self.yeniden_baslat:g} sn sonra yeniden başlatılacak")
+        self._zamanlanmis = asyncio.get_running_loop().call_later(self.yeniden_baslat, self.baslat)
+
+    async def durdur(self):
+        """Görevi iptal eder ve bitmesini bekler"""
+        self._durduruldu = True
+        if self._zamanlanmis is not None:
+            self._zamanlanmis.cancel()
+        if self.gorev is not None:
+            self.gorev.cancel()
+            await asyncio.gather(self.gorev, return_exceptions=True)
@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+import numpy as np
+from covariance import RiskModel
+
+# En fazla K hisseli, hisse başına en küçük ağırlıklı (lot) en yüksek Sharpe
+# portföyü. Karma tamsayılı çözücü yerine sezgisel arama kullanılır:
+#
+#   1. İleri seçim: mevcut çözümde Sharpe gradyanı en büyük birkaç aday
+#      denenir, en iyisi eklenir; ekleme Sharpe'ı artırmıyorsa durulur.
+#   2. Yerel takas: tutulan her hisse, gradyanı en büyük adaylarla
+#      değiştirilerek denenir; iyileşme kalmayana kadar sürer.
+#
+# Her alt problem yalnızca seçilen hisselerin momentleriyle (tam modelden
+# dilimlenerek) çözülür ve önceki çözümden başlatılır; aynı hisse kümesinin
+# sonucu önbellekte tutulur.
+
+
+@dataclass
+class CardinalityResult:
+    """Kısıtlı çözüm ve arama istatistikleri"""
+    __slots__ = ('weights', 'sharpe', 'holdings', 'subproblems')
+    weights: np.ndarray    # Tüm hisseler için ağırlıklar (tutulmayanlar 0)
+    sharpe: float
+    holdings: list         # Tutulan hisselerin indeksleri
+    subproblems: int       # Çözülen alt problem sayısı
+
+
+class CardinalitySearch:
+    """
+    Args:
+        model (RiskModel): Tüm hisselerin yıllık risk modeli
+        max_holdings (int): En fazla hisse sayısı (K)
+        min_weight (float | array): Tutulan hisse başına en küçük ağırlık
+        candidates (int): Her adımda denenen aday sayısı
+        max_swaps (int): Yerel aramada en fazla kabul edilen takas
+    """
+
+    def __init__(self, model, max_holdings=15, min_weight=0.01, candidates=5, max_swaps=100):
+        self.model = model
+        self.max_holdings = max_holdings
+        self.min_weight = np.broadcast_to(np.asarray(min_weight, dtype=float), len(model.mean))
+        self.candidates = candidates
+        self.max_swaps = max_swaps
+        self._solutions = {}   # frozenset(hisseler) -> (ağırlıklar, sharpe)
+
+    def solve_subset(self, holdings, start=None):
+        """Seçilen hisseler üzerinde kısıtlı en yüksek Sharpe (sonuç önbelleklenir)"""
+        from portfolio_optimization import solve_max_sharpe
+
+        key = frozenset(holdings)
+        if key not in self._solutions:
+            idx = np.array(sorted(key))
+            lower = self.min_weight[idx]
+            if lower.sum() > 1:
+                self._solutions[key] = (None, -np.inf)
+            else:
+                model = RiskModel(self.model.mean[idx], self.model.cov[np.ix_(idx, idx)])
+                if start is not None:
+                    start = np.maximum(start[idx], lower)
+                    start /= start.sum()
+                weights, _ = solve_max_sharpe(model, start, lower)
+                full = np.zeros(len(self.model.mean))
+                full[idx] = weights
+                self._solutions[key] = (full, model.sharpe(weights))
+        return self._solutions[key]
+
+    def _ranked_candidates(self, weights, holdings):
+        """Tutulmayan hisseler, mevcut çözümdeki Sharpe gradyanına göre azalan sırada"""
+        _, grad = self.model.neg_sharpe_and_grad(weights)
+        gain = -grad
+        gain[list(holdings)] = -np.inf
+        order = np.argsort(gain)[::-1]
+        return [int(j) for j in order[:self.candidates] if np.isfinite(gain[j])]
+
+    def run(self):
+        mean, cov = self.model.mean, self.model.cov
+        single = mean / np.sqrt(np.clip(np.diag(cov), np.finfo(float).tiny, None))
+        # Başlangıç hissesi yalnızca en küçük ağırlığı tek başına sağlanabilenlerden seçilir
+        single = np.where(self.min_weight <= 1, single, -np.inf)
+        holdings = {int(np.argmax(single))}
+        weights, sharpe = self.solve_subset(holdings)
+
+        # 1. İleri seçim
+        while len(holdings) < self.max_holdings:
+            best = None
+            for j in self._ranked_candidates(weights, holdings):
+                start = weights.copy()
+                start[j] = self.min_weight[j] or 1 / (len(holdings) + 1)
+                trial_weights, trial_sharpe = self.solve_subset(holdings | {j}, start)
+                if trial_sharpe > (best[2] if best else sharpe):
+                    best = (j, trial_weights, trial_sharpe)
+            if best is None:
+                break
+            holdings.add(best[0])
+            weights, sharpe = best[1], best[2]
+
+        # 2. Yerel takas: en küçük ağırlıklı hisselerden başlanır
+        swaps, improved = 0, True
+        while improved and swaps < self.max_swaps:
+            improved = False
+            ranked = self._ranked_candidates(weights, holdings)
+            for i in sorted(holdings, key=lambda h: weights[h]):
+                for j in ranked:
+                    trial = (holdings - {i}) | {j}
+                    start = weights.copy()
+                    start[j], start[i] = max(weights[i], self.min_weight[j]), 0.0
+                    trial_weights, trial_sharpe = self.solve_subset(trial, start)
+                    if trial_sharpe > sharpe + 1e-9:
+                        holdings, weights, sharpe = trial, trial_weights, trial_sharpe
+                        swaps += 1
+                        improved = True
+                        break
+                if improved:
+                    break
+        return CardinalityResult(weights, float(sharpe), sorted(holdings), len(self._solutions))
+
+
+def max_sharpe_cardinality(model, max_holdings=15, min_weight=0.01, candidates=5, max_swaps=100):
+    """
+    En fazla `max_holdings` hisseli ve tutulan her hissede en az `min_weight`
+    ağırlıklı en yüksek Sharpe portföyünü sezgisel olarak bulur.
+
+    Returns:
+        CardinalityResult: Ağırlıklar, Sharpe oranı ve tutulan hisseler
+    """
+    min_weight = np.broadcast_to(np.asarray(min_weight, dtype=float), len(model.mean))
+    if np.sort(min_weight)[:1].sum() > 1:
+        raise ValueError("Hiçbir hisse en küçük ağırlık kısıtını sağlayamıyor")
+    return CardinalitySearch(model, max_holdings, min_weight, candidates, max_swaps).run()
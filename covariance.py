@@ -0,0 +1,122 @@
+import numpy as np
+
+# Örneklem kovaryansı, eksik gözlemlerle ikili (pairwise) hesaplandığında ya
+# da neredeyse doğrusal bağımlı hisselerde (ör. aynı sektördeki bankalar)
+# belirsiz (indefinite) olabilir; bu durumda w'Σw negatif ya da NaN çıkar ve
+# optimizasyon bozulur. Kovaryans bir kez hazırlanır: Cholesky ayrışımı
+# denenir, başarısız olursa özdeğerler kırpılarak en yakın pozitif yarı
+# tanımlı matrise onarılır. Risk ||L'w|| olarak hesaplandığından hiçbir
+# zaman negatif ya da NaN olmaz.
+
+# Özdeğer alt sınırı, en büyük özdeğere oranla
+EIGEN_FLOOR = 1e-10
+
+# float32 getirilerin float64'e çevrilerek biriktirildiği satır parçası
+MOMENT_CHUNK_ROWS = 4096
+
+
+def nearest_psd(cov, floor=EIGEN_FLOOR):
+    """
+    Simetrik matrisi özdeğer kırpmayla en yakın pozitif tanımlı matrise onarır.
+    Varyanslar (köşegen) korunur; böylece tek hisse riskleri değişmez.
+
+    Args:
+        cov (ndarray): Kovaryans matrisi
+        floor (float): En büyük özdeğere göre göreli özdeğer alt sınırı
+
+    Returns:
+        ndarray: Onarılmış kovaryans matrisi
+    """
+    cov = np.nan_to_num(np.asarray(cov, dtype=float))
+    cov = (cov + cov.T) / 2
+    values, vectors = np.linalg.eigh(cov)
+    values = np.maximum(values, max(values[-1], 0) * floor + np.finfo(float).tiny)
+    repaired = (vectors * values) @ vectors.T
+
+    # Köşegeni orijinal varyanslara geri ölçekle
+    variances = np.diag(cov)
+    scale = np.sqrt(np.where(variances > 0, variances, np.diag(repaired)) / np.diag(repaired))
+    repaired = repaired * scale[:, None] * scale[None, :]
+    return (repaired + repaired.T) / 2
+
+
+def cholesky_factor(cov, floor=EIGEN_FLOOR):
+    """
+    Kovaryansın alt üçgen Cholesky çarpanını döndürür; matris pozitif tanımlı
+    değilse önce nearest_psd ile onarır.
+
+    Returns:
+        tuple: (alt üçgen L, kullanılan kovaryans, onarıldı mı)
+    """
+    cov = np.asarray(cov, dtype=float)
+    if np.isfinite(cov).all():
+        try:
+            return np.linalg.cholesky(cov), cov, False
+        except np.linalg.LinAlgError:
+            pass
+    repaired = nearest_psd(cov, floor)
+    try:
+        return np.linalg.cholesky(repaired), repaired, True
+    except np.linalg.LinAlgError:
+        # Yuvarlama hatası kalırsa köşegene küçük bir pay eklenir
+        jitter = np.eye(len(repaired)) * np.abs(np.diag(repaired)).mean() * 1e-10
+        return np.linalg.cholesky(repaired + jitter), repaired + jitter, True
+
+
+class RiskModel:
+    """
+    Yıllık beklenen getiriler ve Cholesky çarpanı hazırlanmış kovaryans.
+    Optimizasyonun her adımında yeniden hesaplanmadan kullanılır.
+
+    Args:
+        mean (ndarray): Yıllık beklenen getiriler
+        cov (ndarray): Yıllık kovaryans matrisi
+    """
+
+    def __init__(self, mean, cov):
+        self.mean = np.asarray(mean, dtype=float)
+        self.chol, self.cov, self.repaired = cholesky_factor(cov)
+
+    @classmethod
+    def from_returns(cls, returns, periods=252, chunk_rows=MOMENT_CHUNK_ROWS):
+        """
+        Günlük getiri tablosundan yıllık risk modeli oluşturur. float32
+        (kompakt) getirilerde ortalama ve kovaryans, tablo bütünüyle kopyalanmadan
+        satır parçaları float64'e çevrilerek biriktirilir.
+        """
+        values = returns.to_numpy(copy=False)
+        if values.dtype == np.float64 or np.isnan(values).any():
+            return cls(returns.mean().values * periods, returns.cov().values * periods)
+
+        from streaming_moments import Moments
+
+        moments = Moments(values.shape[1])
+        for start in range(0, len(values), chunk_rows):
+            moments.update(values[start:start + chunk_rows])
+        return cls(moments.mean * periods, moments.covariance() * periods)
+
+    def risk(self, weights):
+        """Portföy standart sapması ||L'w||"""
+        return float(np.linalg.norm(self.chol.T @ weights))
+
+    def risks(self, weights):
+        """(portföy, hisse) ağırlık matrisindeki her portföyün riski"""
+        return np.linalg.norm(weights @ self.chol, axis=1)
+
+    def sharpe(self, weights):
+        risk = self.risk(weights)
+        return float(self.mean @ weights) / risk if risk != 0 else 0.0
+
+    def neg_sharpe_and_grad(self, weights):
+        """
+        Negatif Sharpe oranı ve analitik gradyanı. Gradyan verildiğinde SLSQP
+        her iterasyonda hisse başına sayısal türev değerlendirmesi yapmaz.
+        """
+        projected = self.chol.T @ weights
+        risk = np.linalg.norm(projected)
+        if risk == 0:
+            return 0.0, -self.mean
+        ret = self.mean @ weights
+        cov_w = self.chol @ projected
+        grad = -(self.mean * risk - ret * cov_w / risk) / risk ** 2
+        return -ret / risk, grad
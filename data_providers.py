@@ -0,0 +1,281 @@
+import contextlib
+import os
+import re
+import zlib
+from abc import ABC, abstractmethod
+import numpy as np
+import pandas as pd
+import izleme
+
+# fetch_data, get_stock_data ve get_spy_data'nın arkasındaki veri kaynakları.
+# Varsayılan olarak her çağrı kendi Yahoo kaynağını kullanır; set_provider()
+# / use_provider() ya da DATA_PROVIDER ortam değişkeniyle tüm çağrılar
+# sentetik veya kayıtlı (fixture) bir kaynağa yönlendirilebilir. Böylece
+# testler ve performans ölçümleri ağ erişimi olmadan çalışır.
+#
+#   DATA_PROVIDER=synthetic          (veya synthetic:<tohum>)
+#   DATA_PROVIDER=fixture:<klasör>
+
+OHLCV = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+YAHOO_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                   "Chrome/91.0.4472.124 Safari/537.36")
+}
+
+
+class DataProvider(ABC):
+    """Veri kaynaklarının ortak arayüzü"""
+
+    @abstractmethod
+    def history(self, symbol, start, end) -> pd.DataFrame:
+        """
+        Sembolün [start, end) aralığındaki günlük OHLCV barlarını döndürür.
+
+        Returns:
+            pandas.DataFrame: Open, High, Low, Close, Volume sütunları
+        """
+
+    def close_prices(self, symbols, start, end) -> pd.DataFrame:
+        """
+        Sembollerin kapanış fiyatlarını tek tabloda döndürür; verisi
+        olmayan semboller uyarıyla atlanır.
+        """
+        data = {}
+        for symbol in symbols:
+            df = self.history(symbol, start, end)
+            if df is not None and not df.empty:
+                data[symbol] = df['Close']
+            else:
+                print(f"Uyarı: {symbol} için veri çekilemedi!")
+
+        if not data:
+            raise Exception("Hiçbir hisse senedi için veri çekilemedi!")
+
+        return pd.DataFrame(data)
+
+
+class YahooChartProvider(DataProvider):
+    """Yahoo Finance chart API'sinden doğrudan HTTP ile veri çeker"""
+
+    URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+
+    def __init__(self, suffix=''):
+        self.suffix = suffix
+
+    def history(self, symbol, start, end):
+        import requests
+
+        params = {
+            "period1": int(pd.Timestamp(start).timestamp()),
+            "period2": int(pd.Timestamp(end).timestamp()),
+            "interval": "1d",
+            "events": "history"
+        }
+        etiket = symbol.replace('.IS', '')
+
+        izleme.sayac('http_istekleri')
+        with izleme.aralik('fetch', etiket):
+            response = requests.get(self.URL.format(symbol=f"{symbol}{self.suffix}"),
+                                    params=params, headers=YAHOO_HEADERS)
+
+        with izleme.aralik('parse', etiket):
+            data = response.json()
+
+            if "chart" not in data or "result" not in data["chart"] or not data["chart"]["result"]:
+                raise ValueError(f"Veri alınamadı: {symbol}")
+
+            result = data["chart"]["result"][0]
+            quotes = result["indicators"]["quote"][0]
+
+            return pd.DataFrame({
+                "Open": quotes["open"],
+                "High": quotes["high"],
+                "Low": quotes["low"],
+                "Close": quotes["close"],
+                "Volume": quotes["volume"]
+            }, index=pd.to_datetime(result["timestamp"], unit="s"))
+
+
+class YFinanceProvider(DataProvider):
+    """
+    yfinance ile veri çeker. yfinance yalnızca ilk istekte yüklenir; böylece
+    yalnızca hesaplama yapan işler indirme bağımlılıklarının maliyetini ödemez.
+    """
+
+    def __init__(self, suffix=''):
+        self.suffix = suffix
+
+    def history(self, symbol, start, end):
+        import yfinance as yf
+
+        ticker_symbol = symbol if symbol.endswith(self.suffix) else f"{symbol}{self.suffix}"
+        izleme.sayac('http_istekleri')
+        with izleme.aralik('fetch', symbol):
+            df = yf.Ticker(ticker_symbol).history(start=start, end=end)
+        return df[[c for c in OHLCV if c in df.columns]]
+
+
+class SyntheticProvider(DataProvider):
+    """
+    Tohumla tekrarlanabilir, ilişkili geometrik Brown hareketi fiyatları.
+
+    Her sembolün getirisi ortak bir piyasa faktörü ile sembole özgü bir
+    bileşenden oluşur. Sembolün serisi hangi sembollerle birlikte istendiğinden
+    bağımsızdır; aynı tohum ve sembol her zaman aynı fiyatları verir.
+
+    Args:
+        seed (int): Rastgele sayı tohumu
+        origin (str): Serilerin başladığı tarih (tüm tarihler buna göre üretilir)
+        gaps (dict): {sembol: [tarih, ...]} verisi eksik bırakılacak günler
+        gap_rate (float): Her sembolde rastgele eksik bırakılacak gün oranı
+        missing (iterable): Hiç veri döndürmeyecek semboller
+    """
+
+    def __init__(self, seed=0, origin='2000-01-03', gaps=None, gap_rate=0.0, missing=()):
+        self.seed = seed
+        self.origin = pd.Timestamp(origin)
+        self.gaps = {s: pd.DatetimeIndex(d) for s, d in (gaps or {}).items()}
+        self.gap_rate = gap_rate
+        self.missing = set(missing)
+        self._market = np.empty(0)
+
+    def _calendar(self, end):
+        return pd.bdate_range(self.origin, pd.Timestamp(end), name='Date')
+
+    def _market_factor(self, n):
+        # Faktör, istenen en uzun ufka kadar bir kez üretilir ve önbellekte tutulur
+        if len(self._market) < n:
+            rng = np.random.default_rng([self.seed, 0])
+            self._market = rng.normal(0, 0.011, max(n, 2 * len(self._market)))
+        return self._market[:n]
+
+    def _rng(self, symbol, stream):
+        # Her dizi ayrı akıştan çekilir; böylece bir günün değeri istenen
+        # bitiş tarihine (dizi uzunluğuna) bağlı değildir
+        return np.random.default_rng([self.seed, zlib.crc32(symbol.encode()), stream])
+
+    def _close(self, symbol, n):
+        """Sembolün başlangıç fiyatı ve ilk n günlük kapanışları"""
+        rng = self._rng(symbol, 0)
+        beta, sigma, start_price = rng.uniform(0.5, 1.5), rng.uniform(0.01, 0.025), rng.uniform(10, 300)
+        mu = rng.normal(0.0004, 0.0002)
+        noise = self._rng(symbol, 1).standard_normal(n)
+        log_returns = mu - 0.5 * sigma ** 2 + beta * self._market_factor(n) + sigma * noise
+        return start_price, start_price * np.exp(np.cumsum(log_returns))
+
+    def _mask(self, symbol, calendar, start, end):
+        mask = (calendar >= pd.Timestamp(start)) & (calendar < pd.Timestamp(end))
+        if self.gap_rate:
+            mask &= self._rng(symbol, 2).random(len(calendar)) >= self.gap_rate
+        if symbol in self.gaps:
+            mask &= ~calendar.isin(self.gaps[symbol])
+        return mask
+
+    def history(self, symbol, start, end):
+        if symbol in self.missing:
+            return pd.DataFrame(columns=OHLCV)
+        calendar = self._calendar(end)
+        n = len(calendar)
+        start_price, close = self._close(symbol, n)
+        open_ = np.concatenate([[start_price], close[:-1]]) * (1 + self._rng(symbol, 3).normal(0, 0.003, n))
+        spread = np.abs(self._rng(symbol, 4).normal(0, 0.008, n))
+        df = pd.DataFrame({
+            'Open': open_,
+            'High': np.maximum(open_, close) * (1 + spread),
+            'Low': np.minimum(open_, close) * (1 - spread),
+            'Close': close,
+            'Volume': self._rng(symbol, 5).lognormal(13, 0.6, n).astype(np.int64),
+        }, index=calendar)
+        return df[self._mask(symbol, calendar, start, end)]
+
+    def close_prices(self, symbols, start, end):
+        """Kapanışları tek matriste üretir; binlerce hissede de hızlıdır."""
+        symbols = [s for s in symbols if s not in self.missing]
+        if not symbols:
+            raise Exception("Hiçbir hisse senedi için veri çekilemedi!")
+        calendar = self._calendar(end)
+        window = (calendar >= pd.Timestamp(start)) & (calendar < pd.Timestamp(end))
+        prices = np.empty((int(window.sum()), len(symbols)))
+        for j, symbol in enumerate(symbols):
+            column = self._close(symbol, len(calendar))[1]
+            if self.gap_rate or symbol in self.gaps:
+                column = np.where(self._mask(symbol, calendar, start, end), column, np.nan)
+            prices[:, j] = column[window]
+        df = pd.DataFrame(prices, index=calendar[window], columns=symbols)
+        # Hiçbir hissenin işlem görmediği günler history() birleşiminde de yer almaz
+        return df.dropna(how='all')
+
+
+class FixtureProvider(DataProvider):
+    """
+    Kayıtlı CSV dosyalarından (<klasör>/<sembol>.csv) veri okur. `source`
+    verilirse eksik semboller o kaynaktan çekilip klasöre kaydedilir
+    (kayıt modu); böylece gerçek veriyle bir kez kaydedilen testler
+    sonradan çevrimdışı tekrar oynatılabilir.
+    """
+
+    def __init__(self, directory, source=None):
+        self.directory = directory
+        self.source = source
+
+    def _path(self, symbol):
+        return os.path.join(self.directory, re.sub(r'[^A-Za-z0-9_.^=-]+', '_', symbol) + '.csv')
+
+    def record(self, symbol, start, end):
+        """Sembolü kaynaktan çekip fixture olarak kaydeder."""
+        df = self.source.history(symbol, start, end)
+        os.makedirs(self.directory, exist_ok=True)
+        df.to_csv(self._path(symbol))
+        return df
+
+    def history(self, symbol, start, end):
+        path = self._path(symbol)
+        if not os.path.exists(path):
+            if self.source is None:
+                raise FileNotFoundError(f"{symbol} için kayıtlı veri yok: {path}")
+            self.record(symbol, start, end)
+        df = pd.read_csv(path, index_col=0)
+        df.index = pd.to_datetime(df.index, utc=True).tz_localize(None) if len(df) else pd.DatetimeIndex([])
+        return df[(df.index >= pd.Timestamp(start)) & (df.index < pd.Timestamp(end))]
+
+
+_provider = None
+
+
+def set_provider(provider):
+    """Tüm veri çağrılarının kullanacağı kaynağı ayarlar (None: varsayılanlar)."""
+    global _provider
+    _provider = provider
+
+
+def get_provider(default):
+    """Ayarlanmış kaynak varsa onu, yoksa çağıranın varsayılanını döndürür."""
+    return _provider if _provider is not None else default
+
+
+@contextlib.contextmanager
+def use_provider(provider):
+    """Blok süresince verilen kaynağı kullanır."""
+    global _provider
+    previous, _provider = _provider, provider
+    try:
+        yield provider
+    finally:
+        _provider = previous
+
+
+def from_env(value=None):
+    """DATA_PROVIDER değerinden kaynak oluşturur (tanımsızsa None)."""
+    value = value if value is not None else os.getenv('DATA_PROVIDER', '')
+    kind, _, arg = value.partition(':')
+    if not kind:
+        return None
+    if kind == 'synthetic':
+        return SyntheticProvider(seed=int(arg or 0))
+    if kind == 'fixture':
+        return FixtureProvider(arg or 'fixtures')
+    raise ValueError(f"Bilinmeyen veri kaynağı: {value}")
+
+
+set_provider(from_env())
@@ -5,8 +5,9 @@ from datetime import datetime, timedelta
 import psycopg2
 from dotenv import load_dotenv
 import warnings
-import requests
 import schedule 
+import data_providers
+import hisse_evreni
 # Uyarıları görmezden gel
 warnings.filterwarnings('ignore')
 
@@ -16,6 +17,9 @@ load_dotenv()
 # BIST hisseleri
 HISSELER = ['THYAO', 'TCELL']
 
+# Varsayılan veri kaynağı (Yahoo Finance chart API)
+_YAHOO = data_providers.YahooChartProvider(suffix='.IS')
+
 def db_baglanti():
     """Veritabanı bağlantısı oluşturur"""
     try:
@@ -33,54 +37,27 @@ def db_baglanti():
 
 def get_stock_data(symbol: str, period1: int, period2: int) -> pd.DataFrame:
     """
-    Yahoo Finance'den hisse verilerini çeker
+    Yahoo Finance'den hisse verilerini çeker. data_providers ile başka bir
+    kaynak ayarlanmışsa (sentetik, kayıtlı) veri oradan okunur.
     """
-    url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}.IS"
-    
-    params = {
-        "period1": period1,
-        "period2": period2,
-        "interval": "1d",
-        "events": "history"
-    }
-    
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-    
-    response = requests.get(url, params=params, headers=headers)
-    data = response.json()
-    
-    if "chart" not in data or "result" not in data["chart"] or not data["chart"]["result"]:
-        raise ValueError(f"Veri alınamadı: {symbol}")
-        
-    result = data["chart"]["result"][0]
-    quotes = result["indicators"]["quote"][0]
-    
-    df = pd.DataFrame({
-        "Open": quotes["open"],
-        "High": quotes["high"],
-        "Low": quotes["low"],
-        "Close": quotes["close"],
-        "Volume": quotes["volume"]
-    }, index=pd.to_datetime(result["timestamp"], unit="s"))
-    
-    return df
+    provider = data_providers.get_provider(_YAHOO)
+    return provider.history(symbol, pd.Timestamp(period1, unit='s'), pd.Timestamp(period2, unit='s'))
 
 def veri_kaydet(conn, hisse_kodu: str, df: pd.DataFrame):
     """Hisse verilerini veritabanına kaydeder"""
     try:
         cur = conn.cursor()
         
-        for tarih, row in df.iterrows():
-            # NaN değerleri kontrol et
-            if pd.isna(row['Open']) or pd.isna(row['Close']) or pd.isna(row['High']) or pd.isna(row['Low']) or pd.isna(row['Volume']):
-                print(f"UYARI: {hisse_kodu} için {tarih} tarihinde eksik veri var, bu kayıt atlanıyor.")
-                continue
-                
-            # Tarih formatını düzenle
-            tarih_str = tarih.strftime('%Y-%m-%d')
-            
+        # Eksik satırlar ve tip dönüşümleri satır satır değil sütun bazında
+        eksik = df[['Open', 'Close', 'High', 'Low', 'Volume']].isna().any(axis=1)
+        for tarih in df.index[eksik]:
+            print(f"UYARI: {hisse_kodu} için {tarih} tarihinde eksik veri var, bu kayıt atlanıyor.")
+        tam = df[~eksik]
+        tarihler = tam.index.strftime('%Y-%m-%d')
+        fiyatlar = tam[['Open', 'Close', 'High', 'Low']].to_numpy(dtype=np.float64).tolist()
+        hacimler = tam['Volume'].to_numpy().astype(np.int64).tolist()
+        
+        for tarih_str, (acilis, kapanis, en_yuksek, en_dusuk), hacim in zip(tarihler, fiyatlar, hacimler):
             # Veriyi ekle
             cur.execute("""
                 INSERT INTO hisse_verileri 
@@ -92,15 +69,7 @@ def veri_kaydet(conn, hisse_kodu: str, df: pd.DataFrame):
                     en_yuksek = EXCLUDED.en_yuksek,
                     en_dusuk = EXCLUDED.en_dusuk,
                     hacim = EXCLUDED.hacim
-            """, (
-                hisse_kodu,
-                tarih_str,
-                float(row['Open']),
-                float(row['Close']),
-                float(row['High']),
-                float(row['Low']),
-                int(row['Volume'])
-            ))
+            """, (hisse_kodu, tarih_str, acilis, kapanis, en_yuksek, en_dusuk, hacim))
         
         conn.commit()
         print(f"{hisse_kodu} için veriler kaydedildi.")
@@ -147,7 +116,9 @@ def main():
                 print(f"Hata: {hisse} için veri toplanırken bir sorun oluştu - {e}")
                 continue
         
-        print("\nGeçmiş veri toplama işlemi tamamlandı!")
+        # Hisse evreni tüm geçmiş üzerinden yeniden hesaplanır
+        guncellenen = hisse_evreni.evreni_guncelle(conn)
+        print(f"\nGeçmiş veri toplama işlemi tamamlandı! ({guncellenen} hisse evrene işlendi)")
         
     except Exception as e:
         print(f"Genel hata: {e}")
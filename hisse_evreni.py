@@ -0,0 +1,191 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+import numpy as np
+import izleme
+
+# hisse_verileri'ndeki tüm hisseleri ortalama işlem hacmi (TL), oynaklık ve
+# veri tamlığına göre ölçen ön eleme. Ölçümler tek bir küme sorgusuyla
+# hesaplanır ve hisse_evreni tablosunda tutulur; her veri kaydından sonra
+# yalnızca yeni veri gelen hisseler güncellenir. Tarayıcılar ve portföy
+# optimizasyonu abone listesi ya da açık bir hisse listesi verilmediğinde
+# hisselerini bu tablodan alır; böylece hiç işlem görmeyecek hisseler için
+# indirme ve hesaplama yapılmaz.
+
+# Ölçümlerin hesaplandığı geriye dönük pencere (takvim günü)
+PENCERE_GUN = 90
+
+# Varsayılan eleme eşikleri
+MIN_ISLEM_HACMI = 5_000_000   # Günlük ortalama işlem hacmi (TL)
+MIN_TAMLIK = 0.9              # Penceredeki işlem günlerinin en az bu oranında veri
+GECIKME_GUN = 7               # Son verisi bundan eski hisseler elenir
+
+# Getiriler kapanış/önceki kapanış ile hesaplanır; kareler toplamından
+# örneklem varyansı çıkarılır. Sorgu PostgreSQL ve SQLite'ta aynı çalışır.
+OLCUM_SORGUSU = """
+    WITH pencere AS (
+        SELECT hisse_kodu, tarih, kapanis, hacim,
+               LAG(kapanis) OVER (PARTITION BY hisse_kodu ORDER BY tarih) AS onceki
+        FROM hisse_verileri
+        WHERE tarih >= %s{filtre}
+    ), getiriler AS (
+        SELECT hisse_kodu, tarih, kapanis, hacim,
+               CASE WHEN onceki > 0 THEN kapanis * 1.0 / onceki - 1 END AS getiri
+        FROM pencere
+    )
+    SELECT hisse_kodu, COUNT(*), AVG(kapanis * hacim),
+           COUNT(getiri), SUM(getiri), SUM(getiri * getiri), MAX(tarih)
+    FROM getiriler
+    GROUP BY hisse_kodu
+"""
+
+
+@dataclass
+class HisseOlcumu:
+    """Bir hissenin pencere içindeki likidite ve aktivite ölçümleri"""
+    __slots__ = ('hisse_kodu', 'gun_sayisi', 'islem_hacmi', 'oynaklik', 'tamlik', 'son_tarih')
+    hisse_kodu: str
+    gun_sayisi: int
+    islem_hacmi: float    # Günlük ortalama kapanış × hacim (TL)
+    oynaklik: float       # Yıllık getiri standart sapması
+    tamlik: float         # Verisi olan gün / penceredeki işlem günü
+    son_tarih: date
+
+
+def _tarih(deger):
+    return date.fromisoformat(deger) if isinstance(deger, str) else deger
+
+
+def olcumleri_hesapla(conn, hisseler=None, bitis: date = None, pencere_gun: int = PENCERE_GUN) -> list:
+    """
+    hisse_verileri üzerinde tek küme sorgusuyla hisse ölçümlerini hesaplar.
+
+    Args:
+        hisseler (list): Yalnızca bu hisseler (None: tüm hisseler)
+        bitis (date): Pencerenin sonu (None: tablodaki son tarih)
+        pencere_gun (int): Geriye dönük pencere uzunluğu (takvim günü)
+
+    Returns:
+        list: HisseOlcumu listesi
+    """
+    cur = conn.cursor()
+    try:
+        if bitis is None:
+            cur.execute("SELECT MAX(tarih) FROM hisse_verileri")
+            bitis = _tarih(cur.fetchone()[0])
+            if bitis is None:
+                return []
+        baslangic = (bitis - timedelta(days=pencere_gun)).isoformat()
+
+        # Piyasa takvimi: pencerede herhangi bir hissenin işlem gördüğü günler
+        cur.execute("SELECT COUNT(DISTINCT tarih) FROM hisse_verileri WHERE tarih >= %s", (baslangic,))
+        islem_gunu = cur.fetchone()[0] or 1
+
+        filtre, parametreler = '', [baslangic]
+        if hisseler is not None:
+            if not hisseler:
+                return []
+            filtre = f" AND hisse_kodu IN ({', '.join(['%s'] * len(hisseler))})"
+            parametreler += list(hisseler)
+        cur.execute(OLCUM_SORGUSU.format(filtre=filtre), parametreler)
+        satirlar = cur.fetchall()
+    finally:
+        cur.close()
+
+    olcumler = []
+    for hisse_kodu, gun, hacim, n, toplam, kareler, son_tarih in satirlar:
+        n, toplam, kareler = int(n), float(toplam or 0), float(kareler or 0)
+        varyans = (kareler - toplam * toplam / n) / (n - 1) if n > 1 else float('nan')
+        olcumler.append(HisseOlcumu(
+            hisse_kodu, int(gun), float(hacim or 0),
+            float(np.sqrt(max(varyans, 0) * 252)) if n > 1 else float('nan'),
+            min(int(gun) / islem_gunu, 1.0), _tarih(son_tarih)
+        ))
+    return olcumler
+
+
+def evreni_guncelle(conn, hisseler=None, pencere_gun: int = PENCERE_GUN) -> int:
+    """
+    hisse_evreni tablosunu günceller. Veri kaydından sonra yalnızca yeni veri
+    gelen hisselerle çağrılması yeterlidir; hisseler verilmezse tüm tablo
+    yeniden hesaplanır.
+
+    Returns:
+        int: Güncellenen hisse sayısı
+    """
+    if conn is None:
+        return 0
+    cur = None
+    try:
+        olcumler = olcumleri_hesapla(conn, hisseler, pencere_gun=pencere_gun)
+        cur = conn.cursor()
+        if hisseler is None:
+            cur.execute("DELETE FROM hisse_evreni")
+        cur.executemany("""
+            INSERT INTO hisse_evreni (hisse_kodu, gun_sayisi, islem_hacmi, oynaklik, tamlik, son_tarih)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON CONFLICT (hisse_kodu) DO UPDATE SET
+                gun_sayisi = EXCLUDED.gun_sayisi,
+                islem_hacmi = EXCLUDED.islem_hacmi,
+                oynaklik = EXCLUDED.oynaklik,
+                tamlik = EXCLUDED.tamlik,
+                son_tarih = EXCLUDED.son_tarih,
+                guncelleme = CURRENT_TIMESTAMP
+        """, [(o.hisse_kodu, o.gun_sayisi, o.islem_hacmi, None if np.isnan(o.oynaklik) else o.oynaklik,
+               o.tamlik, o.son_tarih.isoformat()) for o in olcumler])
+        conn.commit()
+        izleme.sayac('evren_guncellenen_hisse', len(olcumler))
+        return len(olcumler)
+    except Exception as e:
+        print(f"Hisse evreni güncellenemedi: {e}")
+        conn.rollback()
+        return 0
+    finally:
+        if cur:
+            cur.close()
+
+
+def likit_hisseler(conn, limit: int = None, min_islem_hacmi: float = MIN_ISLEM_HACMI,
+                   min_tamlik: float = MIN_TAMLIK, max_oynaklik: float = None,
+                   gecikme_gun: int = GECIKME_GUN) -> list:
+    """
+    Eleme eşiklerini geçen hisseleri ortalama işlem hacmine göre sıralı
+    döndürür. Tablo boşsa ya da okunamazsa boş liste döner; çağıran taraf
+    kendi varsayılan listesine geri düşer.
+
+    Args:
+        limit (int): En likit kaç hisse (None: tümü)
+        min_islem_hacmi (float): Günlük ortalama işlem hacmi alt sınırı (TL)
+        min_tamlik (float): Veri tamlığı alt sınırı (0-1)
+        max_oynaklik (float): Yıllık oynaklık üst sınırı (None: sınırsız)
+        gecikme_gun (int): Son verisi en güncel tarihten bu kadar eski hisseler elenir
+
+    Returns:
+        list: Hisse kodları
+    """
+    if conn is None:
+        return []
+    cur = None
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT MAX(son_tarih) FROM hisse_evreni")
+        son = _tarih(cur.fetchone()[0])
+        if son is None:
+            return []
+        kosullar = ["islem_hacmi >= %s", "tamlik >= %s", "son_tarih >= %s"]
+        parametreler = [min_islem_hacmi, min_tamlik, (son - timedelta(days=gecikme_gun)).isoformat()]
+        if max_oynaklik is not None:
+            kosullar.append("oynaklik <= %s")
+            parametreler.append(max_oynaklik)
+        sorgu = f"SELECT hisse_kodu FROM hisse_evreni WHERE {' AND '.join(kosullar)} ORDER BY islem_hacmi DESC"
+        if limit:
+            sorgu += " LIMIT %s"
+            parametreler.append(limit)
+        cur.execute(sorgu, parametreler)
+        return [satir[0] for satir in cur.fetchall()]
+    except Exception as e:
+        print(f"Hisse evreni okunamadı: {e}")
+        conn.rollback()
+        return []
+    finally:
+        if cur:
+            cur.close()
@@ -0,0 +1,219 @@
+import numpy as np
+
+# Etkileşimli (plotly) HTML grafikler. Milyonlarca noktalı rastgele portföy
+# bulutu tarayıcıya ham olarak gönderilmez: bulut sunucu tarafında iki boyutlu
+# histograma (yoğunluk ızgarası) indirgenir, üzerine etkin sınır zarfı ve
+# sınırlı sayıda örnek nokta WebGL (Scattergl) ile çizilir. Korelasyon ısı
+# haritası hiyerarşik küme sırasına dizilir; büyük evrenlerde sıradaki komşu
+# hisseler bloklar halinde ortalanarak küçültülür.
+#
+# Dosyalar plotly.js gömülü, ağ erişimi olmadan açılan tek HTML dosyasıdır.
+# Diziler float32 olarak base64 gömülür; boyut bütçesini aşan dosya yazılmaz.
+
+# HTML dosyası üst sınırı (gömülü plotly.js ~4.6 MB dahil)
+HTML_SIZE_BUDGET = 8 * 2 ** 20
+
+# Yoğunluk ızgarası (risk, getiri) kutu sayısı
+FRONTIER_BINS = (300, 200)
+
+# Bulut üzerine tek tek çizilen en fazla örnek nokta
+MAX_SCATTER_POINTS = 20_000
+
+# Korelasyon ısı haritasının bir kenarındaki en fazla hücre
+MAX_HEATMAP_CELLS = 200
+
+
+def density_grid(risks, returns, bins=FRONTIER_BINS):
+    """
+    Portföy bulutunun (risk, getiri) yoğunluk ızgarası.
+
+    Returns:
+        tuple: (getiri × risk sayımları, risk kutu merkezleri, getiri kutu merkezleri)
+    """
+    counts, x_edges, y_edges = np.histogram2d(risks, returns, bins=bins)
+    return counts.T, (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2
+
+
+def frontier_envelope(risks, returns, bins=FRONTIER_BINS[0]):
+    """
+    Buluttaki etkin sınır noktaları: her risk kutusunun en yüksek getirili
+    portföyü, daha düşük riskli bir noktanın getirisini aşanlar.
+
+    Returns:
+        tuple: Riske göre sıralı (riskler, getiriler)
+    """
+    risks, returns = np.asarray(risks), np.asarray(returns)
+    if len(risks) == 0:
+        return risks, returns
+    edges = np.linspace(risks.min(), risks.max(), bins + 1)
+    bin_index = np.clip(np.searchsorted(edges, risks, side='right') - 1, 0, bins - 1)
+    order = np.lexsort((returns, bin_index))
+    last = np.r_[bin_index[order][1:] != bin_index[order][:-1], True]
+    best = order[last]
+    best = best[np.argsort(risks[best], kind='stable')]
+    efficient = returns[best] >= np.maximum.accumulate(returns[best])
+    return risks[best][efficient], returns[best][efficient]
+
+
+def frontier_figure(risks, returns, opt_risk=None, opt_return=None, bins=FRONTIER_BINS,
+                    max_points=MAX_SCATTER_POINTS, seed=0):
+    """
+    Rastgele portföy bulutunun yoğunluk haritası, etkin sınır ve optimal
+    portföyden oluşan plotly grafiği.
+
+    Args:
+        risks (array): Rastgele portföylerin yıllık riskleri
+        returns (array): Rastgele portföylerin yıllık getirileri
+        opt_risk (float): Optimal portföyün riski (None: çizilmez)
+        opt_return (float): Optimal portföyün getirisi
+        bins (tuple): Yoğunluk ızgarası (risk, getiri) kutu sayısı
+        max_points (int): Tek tek çizilecek en fazla örnek nokta
+        seed (int): Örnek seçiminin tohumu
+    """
+    import plotly.graph_objects as go
+
+    risks, returns = np.asarray(risks, dtype=float), np.asarray(returns, dtype=float)
+    counts, x, y = density_grid(risks, returns, bins)
+    with np.errstate(divide='ignore'):
+        density = np.where(counts > 0, np.log10(counts), np.nan).astype(np.float32)
+
+    fig = go.Figure()
+    fig.add_trace(go.Heatmap(
+        x=x.astype(np.float32), y=y.astype(np.float32), z=density, colorscale='Blues',
+        colorbar={'title': 'log10(portföy)'}, name='Yoğunluk',
+        hovertemplate='Risk %{x:.2%}<br>Getiri %{y:.2%}<br>log10(portföy) %{z:.2f}<extra></extra>',
+    ))
+    if len(risks) > max_points:
+        sample = np.random.default_rng(seed).choice(len(risks), max_points, replace=False)
+    else:
+        sample = np.arange(len(risks))
+    fig.add_trace(go.Scattergl(
+        x=risks[sample].astype(np.float32), y=returns[sample].astype(np.float32), mode='markers',
+        marker={'size': 2, 'color': 'rgba(30, 60, 120, 0.3)'}, name=f'Örnek ({len(sample):,} portföy)',
+    ))
+    edge_risks, edge_returns = frontier_envelope(risks, returns, bins[0])
+    fig.add_trace(go.Scattergl(
+        x=edge_risks.astype(np.float32), y=edge_returns.astype(np.float32), mode='lines+markers',
+        line={'color': 'orange'}, marker={'size': 4}, name='Etkin Sınır',
+    ))
+    if opt_risk is not None:
+        fig.add_trace(go.Scattergl(
+            x=[opt_risk], y=[opt_return], mode='markers', name='Optimal Portföy',
+            marker={'color': 'red', 'symbol': 'star', 'size': 16},
+        ))
+    fig.update_layout(
+        title=f'Etkin Sınır ve Optimal Portföy ({len(risks):,} rastgele portföy)',
+        xaxis={'title': 'Risk (Volatilite)', 'tickformat': '.0%'},
+        yaxis={'title': 'Beklenen Getiri', 'tickformat': '.0%'},
+        legend={'orientation': 'h', 'y': -0.15},
+    )
+    return fig
+
+
+def correlation_matrix(cov):
+    """Kovaryans matrisinden korelasyon matrisi"""
+    cov = np.asarray(cov, dtype=float)
+    std = np.sqrt(np.clip(np.diag(cov), np.finfo(float).tiny, None))
+    return np.clip(cov / np.outer(std, std), -1, 1)
+
+
+def block_average(matrix, order, max_cells=MAX_HEATMAP_CELLS):
+    """
+    Matrisi verilen sıraya dizer ve ardışık blokların ortalamasıyla en fazla
+    max_cells × max_cells boyutuna küçültür.
+
+    Returns:
+        tuple: (küçültülmüş matris, her bloğun orijinal indeksleri)
+    """
+    groups = [g for g in np.array_split(np.asarray(order), min(max_cells, len(order))) if len(g)]
+    if len(groups) == len(order):
+        return matrix[np.ix_(order, order)], groups
+    # (blok × hisse) ortalama matrisiyle iki çarpım: B Σ B'
+    averaging = np.zeros((len(groups), len(matrix)))
+    for i, g in enumerate(groups):
+        averaging[i, g] = 1 / len(g)
+    return averaging @ matrix @ averaging.T, groups
+
+
+def _block_label(symbols, group):
+    if len(group) == 1:
+        return str(symbols[group[0]])
+    return f"{symbols[group[0]]}…{symbols[group[-1]]} ({len(group)})"
+
+
+def correlation_figure(cov, symbols, max_cells=MAX_HEATMAP_CELLS, method='single'):
+    """
+    Hiyerarşik küme sırasına dizilmiş korelasyon ısı haritası. Hisse sayısı
+    max_cells'i aşarsa sıradaki komşu hisseler blok ortalamasıyla birleştirilir.
+
+    Args:
+        cov (ndarray): Kovaryans matrisi
+        symbols (list): Hisse kodları (kovaryans sırasında)
+        max_cells (int): Bir kenardaki en fazla hücre
+        method (str): Kümeleme bağlantı yöntemi (hrp.quasi_diagonal_order)
+    """
+    import plotly.graph_objects as go
+    from hrp import quasi_diagonal_order
+
+    corr = correlation_matrix(cov)
+    matrix, groups = block_average(corr, quasi_diagonal_order(cov, method), max_cells)
+    labels = [_block_label(symbols, g) for g in groups]
+    fig = go.Figure(go.Heatmap(
+        x=labels, y=labels, z=matrix.astype(np.float32), zmin=-1, zmax=1, colorscale='RdBu_r',
+        colorbar={'title': 'ρ'}, hovertemplate='%{y}<br>%{x}<br>ρ %{z:.2f}<extra></extra>',
+    ))
+    title = f'Korelasyon Matrisi ({len(symbols)} hisse, küme sırasında'
+    title += f', {len(groups)} blok)' if len(groups) < len(symbols) else ')'
+    fig.update_layout(
+        title=title, width=900, height=850,
+        xaxis={'showticklabels': len(groups) <= 60},
+        yaxis={'showticklabels': len(groups) <= 60, 'autorange': 'reversed'},
+    )
+    return fig
+
+
+def write_html(fig, filename, max_bytes=HTML_SIZE_BUDGET, include_plotlyjs=True):
+    """
+    Grafiği tek başına açılan HTML dosyasına yazar.
+
+    Args:
+        fig: plotly Figure
+        filename (str): HTML dosya yolu
+        max_bytes (int): Boyut bütçesi; aşılırsa ValueError ve dosya yazılmaz
+        include_plotlyjs: True (gömülü) ya da 'cdn'
+
+    Returns:
+        int: Yazılan bayt sayısı
+    """
+    html = fig.to_html(include_plotlyjs=include_plotlyjs, full_html=True,
+                       config={'displaylogo': False}).encode('utf-8')
+    if max_bytes is not None and len(html) > max_bytes:
+        raise ValueError(f"{filename} boyutu {len(html) / 2**20:.1f} MB, bütçe {max_bytes / 2**20:.1f} MB")
+    with open(filename, 'wb') as f:
+        f.write(html)
+    return len(html)
+
+
+def plot_interactive_frontier(optimizer, num_portfolios=1_000_000, filename='efficient_frontier.html',
+                              max_bytes=HTML_SIZE_BUDGET):
+    """
+    Etkin sınırı rastgele portföy bulutuyla etkileşimli HTML olarak çizer.
+
+    Args:
+        optimizer (PortfolioOptimizer): Optimize edilmiş portföy
+        num_portfolios (int): Rastgele üretilecek portföy sayısı
+        filename (str): HTML dosya adı
+        max_bytes (int): Dosya boyutu bütçesi
+    """
+    risks, returns = optimizer.sample_random_portfolios(num_portfolios)
+    opt_risk = opt_return = None
+    if optimizer.weights is not None:
+        opt_return, opt_risk, _ = optimizer.calculate_portfolio_metrics(optimizer.weights)
+    return write_html(frontier_figure(risks, returns, opt_risk, opt_return), filename, max_bytes)
+
+
+def plot_correlation_heatmap(optimizer, filename='correlation.html', max_cells=MAX_HEATMAP_CELLS,
+                             method='single', max_bytes=HTML_SIZE_BUDGET):
+    """Risk modelinin korelasyon matrisini küme sırasında etkileşimli HTML olarak çizer."""
+    fig = correlation_figure(optimizer.risk_model().cov, optimizer.symbols, max_cells, method)
+    return write_html(fig, filename, max_bytes)
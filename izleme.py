@@ -0,0 +1,290 @@
+import bisect
+import contextlib
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# Tarama ve optimizasyonların aşama bazlı süre ölçümleri. Ölçüm kapalıyken
+# aralik() paylaşılan boş bir bağlam yöneticisi döndürür, sayac() yalnızca
+# bir bayrak kontrolü yapar; böylece sıcak yollara eklenen çağrıların maliyeti
+# ihmal edilebilir düzeydedir.
+#
+# Ortam değişkenleri (ortamdan_yapilandir):
+#   IZLEME=1                 Ölçümü aç
+#   IZLEME_LOG=1             Her aralığı JSON satırı olarak logla
+#   IZLEME_PROMETHEUS=yol    disa_aktar() ile Prometheus metin dosyası yaz
+#   IZLEME_PROFIL=cprofile   Süreç boyunca cProfile (veya 'sampling') kaydı al
+#   IZLEME_PROFIL_DOSYASI    Profil çıktısının yazılacağı dosya
+
+ASAMALAR = ('fetch', 'parse', 'persist', 'indicator', 'solve', 'notify')
+
+# Saniye cinsinden histogram kova üst sınırları
+KOVALAR = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+logger = logging.getLogger('izleme')
+
+
+class Histogram:
+    """Prometheus tarzı kümülatif olmayan kova sayaçları"""
+    __slots__ = ('kovalar', 'sayilar', 'toplam', 'adet')
+
+    def __init__(self, kovalar=KOVALAR):
+        self.kovalar = kovalar
+        self.sayilar = [0] * (len(kovalar) + 1)
+        self.toplam = 0.0
+        self.adet = 0
+
+    def gozlem(self, deger: float):
+        self.sayilar[bisect.bisect_left(self.kovalar, deger)] += 1
+        self.toplam += deger
+        self.adet += 1
+
+
+class Olcumler:
+    """
+    Aşama ve hisse bazlı süre histogramlarını ve sayaçları tutar.
+    Tarayıcıdaki iş parçacıklarından güvenle güncellenebilir.
+    """
+
+    def __init__(self, kovalar=KOVALAR):
+        self.kovalar = kovalar
+        self.etkin = False
+        self.aralik_logla = False
+        self.prometheus_dosyasi = None
+        self._kilit = threading.Lock()
+        self.histogramlar = {}   # (aşama, hisse veya None) -> Histogram
+        self.sayaclar = Counter()
+
+    def gozlem(self, asama: str, sure: float, hisse: str = None, hata: bool = False):
+        with self._kilit:
+            anahtarlar = [(asama, None)] if hisse is None else [(asama, None), (asama, hisse)]
+            for anahtar in anahtarlar:
+                histogram = self.histogramlar.get(anahtar)
+                if histogram is None:
+                    histogram = self.histogramlar[anahtar] = Histogram(self.kovalar)
+                histogram.gozlem(sure)
+            if hata:
+                self.sayaclar[f"{asama}_hatalari"] += 1
+        if self.aralik_logla:
+            logger.info(json.dumps({'asama': asama, 'hisse': hisse, 'sure': round(sure, 6), 'hata': hata},
+                                   ensure_ascii=False))
+
+    def artir(self, ad: str, n: int = 1):
+        with self._kilit:
+            self.sayaclar[ad] += n
+
+    def sifirla(self):
+        with self._kilit:
+            self.histogramlar.clear()
+            self.sayaclar.clear()
+
+    def ozet(self) -> dict:
+        """Aşama başına toplam süre/adet ve sayaçlar"""
+        with self._kilit:
+            return {
+                'asamalar': {
+                    asama: {'adet': h.adet, 'toplam_sure': round(h.toplam, 6)}
+                    for (asama, hisse), h in self.histogramlar.items() if hisse is None
+                },
+                'sayaclar': dict(self.sayaclar),
+            }
+
+    def prometheus(self) -> str:
+        """Ölçümleri Prometheus metin biçiminde döndürür"""
+        satirlar = [
+            '# HELP doktora_asama_suresi_saniye Aşama süreleri',
+            '# TYPE doktora_asama_suresi_saniye histogram',
+        ]
+        with self._kilit:
+            for (asama, hisse), h in sorted(self.histogramlar.items(), key=lambda x: (x[0][0], x[0][1] or '')):
+                etiket = f'asama="{asama}"' + (f',hisse="{hisse}"' if hisse else '')
+                kumulatif = 0
+                for sinir, sayi in zip(self.kovalar, h.sayilar):
+                    kumulatif += sayi
+                    satirlar.append(f'doktora_asama_suresi_saniye_bucket{{{etiket},le="{sinir}"}} {kumulatif}')
+                satirlar.append(f'doktora_asama_suresi_saniye_bucket{{{etiket},le="+Inf"}} {h.adet}')
+                satirlar.append(f'doktora_asama_suresi_saniye_sum{{{etiket}}} {h.toplam:.6f}')
+                satirlar.append(f'doktora_asama_suresi_saniye_count{{{etiket}}} {h.adet}')
+            if self.sayaclar:
+                satirlar.append('# TYPE doktora_sayac_toplam counter')
+                for ad, deger in sorted(self.sayaclar.items()):
+                    satirlar.append(f'doktora_sayac_toplam{{ad="{ad}"}} {deger}')
+        return '\n'.join(satirlar) + '\n'
+
+    def prometheus_yaz(self, dosya: str):
+        """node_exporter textfile toplayıcısı için dosyayı atomik olarak yazar"""
+        gecici = f"{dosya}.tmp"
+        with open(gecici, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus())
+        os.replace(gecici, dosya)
+
+
+# Süreç boyunca paylaşılan ölçüm kaydı
+olcumler = Olcumler()
+
+
+class _Aralik:
+    __slots__ = ('asama', 'hisse', 'baslangic')
+
+    def __init__(self, asama, hisse):
+        self.asama = asama
+        self.hisse = hisse
+
+    def __enter__(self):
+        self.baslangic = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        olcumler.gozlem(self.asama, time.perf_counter() - self.baslangic, self.hisse, exc_type is not None)
+        return False
+
+
+_BOS = contextlib.nullcontext()
+
+
+def aralik(asama: str, hisse: str = None):
+    """
+    Bir aşamanın süresini ölçen bağlam yöneticisi:
+
+        with izleme.aralik('fetch', hisse_kodu):
+            ...
+    """
+    if not olcumler.etkin:
+        return _BOS
+    return _Aralik(asama, hisse)
+
+
+def olculen(asama: str):
+    """Fonksiyonun her çağrısını verilen aşama olarak ölçen dekoratör"""
+    def dekorator(fonk):
+        @functools.wraps(fonk)
+        def sarici(*args, **kwargs):
+            if not olcumler.etkin:
+                return fonk(*args, **kwargs)
+            with _Aralik(asama, None):
+                return fonk(*args, **kwargs)
+        return sarici
+    return dekorator
+
+
+def sayac(ad: str, n: int = 1):
+    """Sayaç artırır (yazılan satır, istek, tekrar deneme ...)"""
+    if olcumler.etkin:
+        olcumler.artir(ad, n)
+
+
+def etkinlestir(aralik_logla: bool = False, prometheus_dosyasi: str = None):
+    olcumler.etkin = True
+    olcumler.aralik_logla = aralik_logla
+    olcumler.prometheus_dosyasi = prometheus_dosyasi
+
+
+def devre_disi_birak():
+    olcumler.etkin = False
+
+
+def disa_aktar():
+    """Özeti loglar ve yapılandırılmışsa Prometheus dosyasını günceller"""
+    if not olcumler.etkin:
+        return
+    logger.info(json.dumps(olcumler.ozet(), ensure_ascii=False))
+    if olcumler.prometheus_dosyasi:
+        olcumler.prometheus_yaz(olcumler.prometheus_dosyasi)
+
+
+class OrnekleyiciProfil:
+    """
+    Tüm iş parçacıklarının yığınlarını belirli aralıklarla örnekleyen basit
+    profil aracı. Çıktı flamegraph araçlarının okuduğu katlanmış yığın
+    biçimindedir ("a;b;c adet").
+    """
+
+    def __init__(self, aralik: float = 0.005):
+        self.aralik = aralik
+        self.yiginlar = Counter()
+        self._dur = threading.Event()
+        self._is_parcacigi = None
+
+    def _ornekle(self):
+        kendi = threading.get_ident()
+        while not self._dur.wait(self.aralik):
+            for tid, cerceve in sys._current_frames().items():
+                if tid == kendi:
+                    continue
+                yigin = []
+                while cerceve is not None:
+                    kod = cerceve.f_code
+                    yigin.append(f"{os.path.basename(kod.co_filename)}:{kod.co_name}")
+                    cerceve = cerceve.f_back
+                self.yiginlar[';'.join(reversed(yigin))] += 1
+
+    def baslat(self):
+        self._dur.clear()
+        self._is_parcacigi = threading.Thread(target=self._ornekle, name='izleme-profil', daemon=True)
+        self._is_parcacigi.start()
+
+    def durdur(self):
+        self._dur.set()
+        self._is_parcacigi.join()
+
+    def yaz(self, dosya: str):
+        with open(dosya, 'w', encoding='utf-8') as f:
+            for yigin, adet in self.yiginlar.most_common():
+                f.write(f"{yigin} {adet}\n")
+
+
+@contextlib.contextmanager
+def profil(mod: str = 'cprofile', dosya: str = None, aralik: float = 0.005):
+    """
+    Bloğu profiller. 'cprofile' yalnızca çağıran iş parçacığını ölçer ve
+    pstats dosyası yazar; 'sampling' tüm iş parçacıklarını düşük maliyetle
+    örnekler ve katlanmış yığın dosyası yazar.
+    """
+    if mod == 'cprofile':
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            profiler.dump_stats(dosya or 'izleme.prof')
+            logger.info(f"cProfile çıktısı yazıldı: {dosya or 'izleme.prof'}")
+    elif mod == 'sampling':
+        profiler = OrnekleyiciProfil(aralik)
+        profiler.baslat()
+        try:
+            yield profiler
+        finally:
+            profiler.durdur()
+            profiler.yaz(dosya or 'izleme.folded')
+            logger.info(f"Örnekleme profili yazıldı: {dosya or 'izleme.folded'}")
+    else:
+        raise ValueError("Profil modu 'cprofile' veya 'sampling' olmalı")
+
+
+def ortamdan_yapilandir():
+    """
+    IZLEME* ortam değişkenlerine göre ölçümü açar.
+
+    Returns:
+        contextlib.AbstractContextManager: Profil istenmişse profil bağlamı,
+        aksi halde boş bağlam
+    """
+    if os.getenv('IZLEME', '').lower() in ('1', 'true', 'evet'):
+        if not logging.getLogger().handlers:
+            logging.basicConfig(level=logging.INFO, format='%(message)s')
+        etkinlestir(
+            aralik_logla=os.getenv('IZLEME_LOG', '').lower() in ('1', 'true', 'evet'),
+            prometheus_dosyasi=os.getenv('IZLEME_PROMETHEUS'),
+        )
+    mod = os.getenv('IZLEME_PROFIL')
+    if mod:
+        return profil(mod, os.getenv('IZLEME_PROFIL_DOSYASI'))
+    return contextlib.nullcontext()
@@ -3,12 +3,18 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import asyncio
-from telegram import Bot
 from dotenv import load_dotenv
+import bildirim
+import data_providers
+import hisse_evreni
+import izleme
+from abonelik import AbonelikKaydi, sinyalleri_dagit
+from price_panel import PricePanel
+from sinyal import Sinyal
+from sinyal_durumu import SinyalDurumDeposu, tarama_kaydet
+from zamanlayici import BistTakvimi, Zamanlayici
 import psycopg2
 import warnings
-import requests
-import schedule
 
 # Uyarıları görmezden gel
 warnings.filterwarnings('ignore')
@@ -23,6 +29,12 @@ TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 # BIST hisseleri
 HISSELER = ['THYAO', 'TCELL']
 
+# Abone listesi yoksa taranacak en likit hisse sayısı (hisse_evreni)
+EVREN_LIMITI = 30
+
+# Varsayılan veri kaynağı (Yahoo Finance chart API)
+_YAHOO = data_providers.YahooChartProvider(suffix='.IS')
+
 def db_baglanti():
     """Veritabanı bağlantısı oluşturur"""
     try:
@@ -40,97 +52,74 @@ def db_baglanti():
 
 def get_stock_data(symbol: str) -> pd.DataFrame:
     """
-    Yahoo Finance'den günlük hisse verilerini çeker
+    Yahoo Finance'den günlük hisse verilerini çeker. data_providers ile başka
+    bir kaynak ayarlanmışsa (sentetik, kayıtlı) veri oradan okunur.
     """
-    url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}.IS"
-    
-    # Bugünün tarihini al
+    # Son bir günün verisi (yerel saatten Unix zamanına)
     end_date = datetime.now()
     start_date = end_date - timedelta(days=1)
+    period1 = pd.Timestamp(int(start_date.timestamp()), unit='s')
+    period2 = pd.Timestamp(int(end_date.timestamp()), unit='s')
     
-    # Unix timestamp'e çevir
-    period1 = int(start_date.timestamp())
-    period2 = int(end_date.timestamp())
-    
-    params = {
-        "period1": period1,
-        "period2": period2,
-        "interval": "1d",
-        "events": "history"
-    }
-    
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-    
-    response = requests.get(url, params=params, headers=headers)
-    data = response.json()
-    
-    if "chart" not in data or "result" not in data["chart"] or not data["chart"]["result"]:
-        raise ValueError(f"Veri alınamadı: {symbol}")
-        
-    result = data["chart"]["result"][0]
-    quotes = result["indicators"]["quote"][0]
-    
-    df = pd.DataFrame({
-        "Open": quotes["open"],
-        "High": quotes["high"],
-        "Low": quotes["low"],
-        "Close": quotes["close"],
-        "Volume": quotes["volume"]
-    }, index=pd.to_datetime(result["timestamp"], unit="s"))
-    
-    return df
+    return data_providers.get_provider(_YAHOO).history(symbol, period1, period2)
 
 def veri_kaydet(conn, hisse_kodu: str, df: pd.DataFrame):
     """Günlük hisse verilerini veritabanına kaydeder"""
-    try:
-        cur = conn.cursor()
+    with izleme.aralik('persist', hisse_kodu):
+        cur = None
+        try:
+            cur = conn.cursor()
+            yazilan = 0
         
-        for tarih, row in df.iterrows():
-            # NaN değerleri kontrol et
-            if pd.isna(row['Open']) or pd.isna(row['Close']) or pd.isna(row['High']) or pd.isna(row['Low']) or pd.isna(row['Volume']):
+            # Eksik satırlar ve tip dönüşümleri satır satır değil sütun bazında
+            eksik = df[['Open', 'Close', 'High', 'Low', 'Volume']].isna().any(axis=1)
+            for tarih in df.index[eksik]:
                 print(f"UYARI: {hisse_kodu} için {tarih} tarihinde eksik veri var, bu kayıt atlanıyor.")
-                continue
-                
-            # Tarih formatını düzenle
-            tarih_str = tarih.strftime('%Y-%m-%d')
+            tam = df[~eksik]
+            tarihler = tam.index.strftime('%Y-%m-%d')
+            fiyatlar = tam[['Open', 'Close', 'High', 'Low']].to_numpy(dtype=np.float64).tolist()
+            hacimler = tam['Volume'].to_numpy().astype(np.int64).tolist()
             
-            # Veriyi ekle
-            cur.execute("""
-                INSERT INTO hisse_verileri 
-                (hisse_kodu, tarih, acilis, kapanis, en_yuksek, en_dusuk, hacim)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (hisse_kodu, tarih) DO UPDATE SET
-                    acilis = EXCLUDED.acilis,
-                    kapanis = EXCLUDED.kapanis,
-                    en_yuksek = EXCLUDED.en_yuksek,
-                    en_dusuk = EXCLUDED.en_dusuk,
-                    hacim = EXCLUDED.hacim
-            """, (
-                hisse_kodu,
-                tarih_str,
-                float(row['Open']),
-                float(row['Close']),
-                float(row['High']),
-                float(row['Low']),
-                int(row['Volume'])
-            ))
+            for tarih_str, (acilis, kapanis, en_yuksek, en_dusuk), hacim in zip(tarihler, fiyatlar, hacimler):
+                # Veriyi ekle
+                cur.execute("""
+                    INSERT INTO hisse_verileri 
+                    (hisse_kodu, tarih, acilis, kapanis, en_yuksek, en_dusuk, hacim)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (hisse_kodu, tarih) DO UPDATE SET
+                        acilis = EXCLUDED.acilis,
+                        kapanis = EXCLUDED.kapanis,
+                        en_yuksek = EXCLUDED.en_yuksek,
+                        en_dusuk = EXCLUDED.en_dusuk,
+                        hacim = EXCLUDED.hacim
+                """, (hisse_kodu, tarih_str, acilis, kapanis, en_yuksek, en_dusuk, hacim))
+                yazilan += 1
         
-        conn.commit()
-        print(f"{hisse_kodu} için günlük veriler kaydedildi.")
+            conn.commit()
+            izleme.sayac('yazilan_satir', yazilan)
+            print(f"{hisse_kodu} için günlük veriler kaydedildi.")
         
-    except Exception as e:
-        print(f"Veri kaydetme hatası ({hisse_kodu}): {e}")
-        conn.rollback()
-    finally:
-        if cur:
-            cur.close()
+        except Exception as e:
+            print(f"Veri kaydetme hatası ({hisse_kodu}): {e}")
+            conn.rollback()
+        finally:
+            if cur:
+                cur.close()
 
 def macd_hesapla(df: pd.DataFrame, fast=12, slow=26, signal=9) -> pd.DataFrame:
     """
     MACD indikatörünü hesaplar
+
+    PricePanel verilirse tüm hisseler tek seferde hesaplanır ve MACD, Signal,
+    Histogram alanlarını içeren yeni bir panel döndürülür. Kompakt (float32)
+    panellerde ortalamalar float64 hesaplanır, sonuç panelin tipinde saklanır.
     """
+    if isinstance(df, PricePanel):
+        close = df.frame('Close').astype(np.float64)
+        macd = close.ewm(span=fast, adjust=False).mean() - close.ewm(span=slow, adjust=False).mean()
+        sinyal = macd.ewm(span=signal, adjust=False).mean()
+        return PricePanel.from_frames({'MACD': macd, 'Signal': sinyal, 'Histogram': macd - sinyal}, df.dtype)
+    
     # EMA hesapla
     exp1 = df['Close'].ewm(span=fast, adjust=False).mean()
     exp2 = df['Close'].ewm(span=slow, adjust=False).mean()
@@ -146,20 +135,61 @@ def macd_hesapla(df: pd.DataFrame, fast=12, slow=26, signal=9) -> pd.DataFrame:
     
     return df
 
+class ArtimliMacd:
+    """
+    Canlı akışta her bar kapanışında O(1) güncellenen MACD. macd_hesapla ile
+    aynı üstel ortalamaları (adjust=False) kullanır; veritabanına gitmez.
+    """
+    __slots__ = ('alfalar', 'hizli', 'yavas', 'macd', 'sinyal', 'bar_sayisi', 'min_bar')
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.alfalar = (2 / (fast + 1), 2 / (slow + 1), 2 / (signal + 1))
+        self.hizli = self.yavas = self.macd = self.sinyal = None
+        self.bar_sayisi = 0
+        self.min_bar = slow   # Bundan önce durum üretilmez
+
+    def guncelle(self, acilis, yuksek, dusuk, kapanis):
+        """Kapanan barla ortalamaları günceller ve durumu ('AL'/'SAT') döndürür"""
+        a_hizli, a_yavas, a_sinyal = self.alfalar
+        if self.bar_sayisi == 0:
+            self.hizli = self.yavas = kapanis
+            self.macd = self.sinyal = 0.0
+        else:
+            self.hizli += a_hizli * (kapanis - self.hizli)
+            self.yavas += a_yavas * (kapanis - self.yavas)
+            self.macd = self.hizli - self.yavas
+            self.sinyal += a_sinyal * (self.macd - self.sinyal)
+        self.bar_sayisi += 1
+        if self.bar_sayisi < self.min_bar:
+            return None
+        return 'AL' if self.macd > self.sinyal else 'SAT'
+
+def macd_sinyal_satiri(hisse_kodu: str, df: pd.DataFrame) -> tuple:
+    """
+    Son günün MACD sinyal kaydını oluşturur
+    
+    Returns:
+        tuple: (hisse_kodu, tarih, sinyal_tipi, macd, sinyal, histogram)
+    """
+    son_gun = df.iloc[-1]
+    sinyal_tipi = 'AL' if son_gun['MACD'] > son_gun['Signal'] else 'SAT'
+    return (
+        hisse_kodu,
+        son_gun.name.strftime('%Y-%m-%d'),
+        sinyal_tipi,
+        float(son_gun['MACD']),
+        float(son_gun['Signal']),
+        float(son_gun['Histogram'])
+    )
+
 def macd_sinyal_kaydet(conn, hisse_kodu: str, df: pd.DataFrame):
     """MACD sinyallerini veritabanına kaydeder"""
+    cur = None
     try:
         cur = conn.cursor()
         
-        # Son günün verilerini al
-        son_gun = df.iloc[-1]
-        tarih = son_gun.name.strftime('%Y-%m-%d')
-        
-        # Sinyal tipini belirle
-        if son_gun['MACD'] > son_gun['Signal']:
-            sinyal_tipi = 'AL'
-        else:
-            sinyal_tipi = 'SAT'
+        # Son günün sinyal kaydını oluştur
+        satir = macd_sinyal_satiri(hisse_kodu, df)
         
         # Veriyi ekle
         cur.execute("""
@@ -171,17 +201,10 @@ def macd_sinyal_kaydet(conn, hisse_kodu: str, df: pd.DataFrame):
                 macd = EXCLUDED.macd,
                 sinyal = EXCLUDED.sinyal,
                 histogram = EXCLUDED.histogram
-        """, (
-            hisse_kodu,
-            tarih,
-            sinyal_tipi,
-            float(son_gun['MACD']),
-            float(son_gun['Signal']),
-            float(son_gun['Histogram'])
-        ))
+        """, satir)
         
         conn.commit()
-        return sinyal_tipi
+        return satir[2]
         
     except Exception as e:
         print(f"MACD sinyal kaydetme hatası ({hisse_kodu}): {e}")
@@ -192,31 +215,29 @@ def macd_sinyal_kaydet(conn, hisse_kodu: str, df: pd.DataFrame):
             cur.close()
 
 async def sinyal_gonder(mesaj: str):
-    """Telegram üzerinden sinyal gönderir"""
-    try:
-        bot = Bot(token=TELEGRAM_BOT_TOKEN)
-        await bot.send_message(
-            chat_id=TELEGRAM_CHAT_ID,
-            text=mesaj,
-            parse_mode='HTML'  # HTML formatında mesaj gönder
-        )
-        print("Telegram mesajı başarıyla gönderildi.")
-    except Exception as e:
-        print(f"Sinyal gönderilirken hata oluştu: {e}")
-    finally:
-        try:
-            if bot:
-                await bot.close()
-        except:
-            pass
+    """Telegram üzerinden sinyal gönderir (kalıcı bot oturumu ve giden kuyruk ile)"""
+    dagitici = await bildirim.varsayilan_dagitici()
+    await dagitici.gonder(mesaj, TELEGRAM_CHAT_ID)
 
-def hisse_analiz_et(hisse_kodu: str) -> str:
+def hisse_analiz_et(hisse_kodu: str, conn=None, durum_deposu: SinyalDurumDeposu = None,
+                    sinyal_satirlari: list = None) -> Sinyal:
     """
-    Bir hisse senedi için MACD analizi yapar
+    Bir hisse senedi için MACD analizi yapar. Yalnızca MACD sinyal çizgisini
+    kestiğinde (durum AL/SAT arasında değiştiğinde) sinyal döndürür.
+    
+    Args:
+        hisse_kodu (str): Hisse kodu
+        conn: Veritabanı bağlantısı (verilmezse yeni bağlantı açılır)
+        durum_deposu (SinyalDurumDeposu): Son sinyal durumlarını tutan depo
+        sinyal_satirlari (list): Verilirse sinyal kaydı veritabanına yazılmak
+            yerine bu listeye eklenir ve tarama sonunda toplu yazılır
     """
+    kendi_baglantimiz = conn is None
+    cur = None
     try:
         # Veritabanı bağlantısı
-        conn = db_baglanti()
+        if kendi_baglantimiz:
+            conn = db_baglanti()
         if conn is None:
             return None
         
@@ -227,16 +248,17 @@ def hisse_analiz_et(hisse_kodu: str) -> str:
         veri_kaydet(conn, hisse_kodu, df)
         
         # Son 50 günlük veriyi al
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT tarih, kapanis 
-            FROM hisse_verileri 
-            WHERE hisse_kodu = %s 
-            ORDER BY tarih DESC 
-            LIMIT 50
-        """, (hisse_kodu,))
-        
-        veriler = cur.fetchall()
+        with izleme.aralik('fetch', hisse_kodu):
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT tarih, kapanis 
+                FROM hisse_verileri 
+                WHERE hisse_kodu = %s 
+                ORDER BY tarih DESC 
+                LIMIT 50
+            """, (hisse_kodu,))
+            
+            veriler = cur.fetchall()
         if not veriler:
             return None
         
@@ -247,14 +269,36 @@ def hisse_analiz_et(hisse_kodu: str) -> str:
         df.sort_index(inplace=True)
         
         # MACD hesapla
-        df = macd_hesapla(df)
+        with izleme.aralik('indicator', hisse_kodu):
+            df = macd_hesapla(df)
+        
+        # Sinyal kaydını oluştur; toplu yazım yoksa hemen kaydet
+        satir = macd_sinyal_satiri(hisse_kodu, df)
+        if sinyal_satirlari is not None:
+            sinyal_satirlari.append(satir)
+        else:
+            macd_sinyal_kaydet(conn, hisse_kodu, df)
+        sinyal_tipi = satir[2]
         
-        # Sinyali kaydet ve döndür
-        sinyal_tipi = macd_sinyal_kaydet(conn, hisse_kodu, df)
+        # Kesişim kontrolü: depoda durum yoksa bir önceki günle karşılaştır
+        onceki_durum = None
+        if len(df) >= 2:
+            onceki_durum = 'AL' if df['MACD'].iloc[-2] > df['Signal'].iloc[-2] else 'SAT'
+        if durum_deposu is not None:
+            kesisim = durum_deposu.gecis_mi(hisse_kodu, 'MACD', sinyal_tipi, onceki_durum)
+        else:
+            kesisim = onceki_durum is not None and onceki_durum != sinyal_tipi
         
-        if sinyal_tipi:
-            son_fiyat = df['Close'].iloc[-1]
-            return f"{hisse_kodu} {sinyal_tipi} - Fiyat: {son_fiyat:.2f} TL"
+        if kesisim:
+            son_fiyat = float(df['Close'].iloc[-1])
+            return Sinyal(
+                hisse_kodu=hisse_kodu,
+                indikator='MACD',
+                sinyal_tipi=sinyal_tipi,
+                fiyat=son_fiyat,
+                metin=f"{hisse_kodu} {sinyal_tipi} - Fiyat: {son_fiyat:.2f} TL",
+                tarih=df.index[-1]
+            )
         
         return None
         
@@ -264,27 +308,59 @@ def hisse_analiz_et(hisse_kodu: str) -> str:
     finally:
         if cur:
             cur.close()
-        if conn:
+        if kendi_baglantimiz and conn:
             conn.close()
 
+# Süreç boyunca bellekte tutulan son sinyal durumları
+_durum_deposu = None
+
 async def tum_hisseleri_tara():
     """
-    Tüm hisseleri tarar ve sinyalleri gönderir
+    Tüm hisseleri tarar ve yalnızca yeni kesişimleri gönderir
     """
+    global _durum_deposu
     print(f"Tarama başladı: {datetime.now()}")
     
-    sinyaller = []
-    for hisse in HISSELER:
-        sinyal = hisse_analiz_et(hisse)
-        if sinyal:
-            sinyaller.append(sinyal)
+    # Tüm tarama için tek veritabanı bağlantısı
+    conn = db_baglanti()
+    try:
+        # Abone izleme listelerini yükle; abone yoksa tek sohbete gönderilir
+        kayit = AbonelikKaydi.veritabanindan(conn, varsayilan_chat_id=TELEGRAM_CHAT_ID)
+        if _durum_deposu is None:
+            _durum_deposu = SinyalDurumDeposu.veritabanindan(conn)
+        
+        # Her hisse, kaç abone izlerse izlesin, bir kez analiz edilir
+        # abone yoksa hisse evreninin en likit hisseleri, o da boşsa sabit liste
+        hisseler = kayit.hisseler('MACD') or hisse_evreni.likit_hisseler(conn, EVREN_LIMITI) or HISSELER
+        
+        sinyaller = []
+        sinyal_satirlari = []
+        for hisse in hisseler:
+            sinyal = hisse_analiz_et(hisse, conn, _durum_deposu, sinyal_satirlari)
+            if sinyal:
+                sinyaller.append(sinyal)
+        
+        # Sinyal kayıtlarını ve değişen durumları tek seferde yaz
+        tarama_kaydet(conn, _durum_deposu, macd_satirlari=sinyal_satirlari)
+        
+        # Yeni bar yazılan hisselerin likidite ölçümlerini yenile
+        hisse_evreni.evreni_guncelle(conn, hisseler)
+    finally:
+        if conn:
+            conn.close()
     
     if sinyaller:
-        mesaj = "🔔 <b>MACD Sinyalleri</b> 🔔\n\n" + "\n".join(sinyaller)
-        mesaj += f"\n\n📅 <i>Tarama Zamanı: {datetime.now().strftime('%Y-%m-%d %H:%M')}</i>"
-        await sinyal_gonder(mesaj)
+        dagitici = await bildirim.varsayilan_dagitici()
+        with izleme.aralik('notify'):
+            sohbet_sayisi = await sinyalleri_dagit(kayit, sinyaller, dagitici, "MACD Sinyalleri")
+        print(f"{len(sinyaller)} sinyal {sohbet_sayisi} sohbete gönderilmek üzere kuyruğa eklendi.")
     else:
-        print("Sinyal bulunamadı.")
+        print("Yeni kesişim bulunamadı.")
+    izleme.disa_aktar()
+
+def gorevleri_ekle(zamanlayici: Zamanlayici, takvim: BistTakvimi = None):
+    """MACD taramasını işlem günlerinde saat 20:00'ye (İstanbul saati) zamanlar"""
+    zamanlayici.ekle("MACD taraması", tum_hisseleri_tara, ["20:00"], takvim=takvim or BistTakvimi())
 
 async def main():
     """
@@ -296,18 +372,19 @@ async def main():
     # İlk taramayı hemen yap
     await tum_hisseleri_tara()
     
-    # Her gün saat 20:00'de tarama yap
-    schedule.every().day.at("20:00").do(
-        lambda: asyncio.create_task(tum_hisseleri_tara())
-    )
+    zamanlayici = Zamanlayici()
+    gorevleri_ekle(zamanlayici)
     
-    while True:
-        schedule.run_pending()
-        await asyncio.sleep(60)  # Her dakika kontrol et
+    try:
+        await zamanlayici.calistir()
+    finally:
+        # Kuyrukta bekleyen mesajları gönder ve bot oturumunu kapat
+        await bildirim.kapat()
 
 if __name__ == "__main__":
     print("Bot başlatılıyor...")
     try:
-        asyncio.run(main())
+        with izleme.ortamdan_yapilandir():
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("\nBot kullanıcı tarafından durduruldu.") 
\ No newline at end of file
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+import numpy as np
+from calendar_alignment import to_stamps
+from portfolio_metrics import PortfolioMetrics
+
+# Optimizasyon sonuçlarının kalıcı önbelleği. Anahtar, getiri verisinin
+# (hisseler, tarihler, değerler) ve çözücü ayarlarının özetidir; aynı veri ve
+# ayarla yapılan tekrar çalıştırmalar SLSQP'yi ve metrik hesaplarını atlar.
+# Yeni bar geldiğinde getiri özeti değişir ve aynı hisse/ayar grubunun eski
+# kaydı silinir. Bulunamayan anahtarlarda aynı gruptaki ya da hisseleri en
+# çok örtüşen kaydın ağırlıkları başlangıç noktası olarak kullanılır.
+#
+# Düzen: <klasör>/<anahtar>.json; son kullanım zamanı dosya değişiklik
+# zamanında tutulur (LRU).
+
+VARSAYILAN_KLASOR = os.getenv('OPTIMIZATION_CACHE_DIR', os.path.join('data', 'optimization_cache'))
+
+
+def returns_fingerprint(returns):
+    """Getiri tablosunun hisse, tarih ve değerlerinden özet üretir."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([str(c) for c in returns.columns]).encode())
+    digest.update(to_stamps(returns.index).tobytes())
+    digest.update(np.ascontiguousarray(returns.values, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def moments_fingerprint(symbols, moments, start_date, end_date):
+    """
+    Akış halinde hesaplanmış momentlerin (streaming_moments.Moments) özeti;
+    getiri tablosu bellekte tutulmadığında returns_fingerprint yerine kullanılır.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([[str(s) for s in symbols], str(start_date), str(end_date), int(moments.n)]).encode())
+    digest.update(np.ascontiguousarray(moments.mean, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(moments.m2, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def settings_fingerprint(symbols, settings):
+    """Hisse ve çözücü ayarı grubunun özeti (verinin tarihinden bağımsız)."""
+    payload = json.dumps({'symbols': list(symbols), 'settings': settings}, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class OptimizationCache:
+    """
+    Ağırlıkları, rapor metriklerini ve risk değerlerini saklayan LRU önbellek.
+
+    Args:
+        directory (str): Kayıt klasörü
+        max_entries (int): En fazla kayıt sayısı
+        max_bytes (int): Kayıtların toplam boyut sınırı
+    """
+
+    def __init__(self, directory=VARSAYILAN_KLASOR, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()   # anahtar -> kayıt (aynı süreçte tekrar okumayı önler)
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    @staticmethod
+    def key(returns_hash, group):
+        return f"{group}-{returns_hash}"
+
+    def _entries(self):
+        """(anahtar, yol, boyut, son kullanım) listesi, en eskiden yeniye"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((name[:-5], path, stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda e: e[3])
+
+    def get(self, key):
+        """Kaydı döndürür ve son kullanım zamanını günceller (yoksa None)."""
+        path = self._path(key)
+        entry = self._memory.get(key)
+        if entry is None:
+            try:
+                with open(path, encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._memory.pop(key, None)
+                return None
+            self._memory[key] = entry
+        elif not os.path.exists(path):
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        os.utime(path)
+        return entry
+
+    def put(self, key, entry):
+        """
+        Kaydı atomik olarak yazar, aynı gruptaki eski kayıtları (eski barlarla
+        hesaplanmış sonuçlar) siler ve sınırları aşan en eski kayıtları çıkarır.
+        """
+        group = key.split('-')[0]
+        for other, path, _, _ in self._entries():
+            if other != key and other.split('-')[0] == group:
+                self._remove(other, path)
+
+        path = self._path(key)
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        self.evict()
+
+    def update(self, key, **fields):
+        entry = self.get(key)
+        if entry is not None:
+            entry.update(fields)
+            self.put(key, entry)
+
+    def _remove(self, key, path=None):
+        self._memory.pop(key, None)
+        try:
+            os.remove(path or self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        """Kayıt sayısı ya da toplam boyut sınırı aşılırsa en eski kayıtları siler."""
+        entries = self._entries()
+        total = sum(e[2] for e in entries)
+        while entries and (len(entries) > self.max_entries or total > self.max_bytes):
+            key, path, size, _ = entries.pop(0)
+            self._remove(key, path)
+            total -= size
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        for key, path, _, _ in self._entries():
+            self._remove(key, path)
+
+    def warm_start(self, symbols, settings):
+        """
+        Aynı ayarlarla hesaplanmış, hisseleri en çok örtüşen kaydın ağırlıklarını
+        verilen hisse sırasına göre döndürür (bulunamazsa None).
+        """
+        best, best_overlap = None, 0
+        wanted = set(symbols)
+        for key, path, _, _ in reversed(self._entries()):
+            entry = self._memory.get(key)
+            if entry is None:
+                try:
+                    with open(path, encoding='utf-8') as f:
+                        entry = json.load(f)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    continue
+            if entry.get('settings') != settings:
+                continue
+            overlap = len(wanted & set(entry['symbols']))
+            if overlap > best_overlap:
+                best, best_overlap = entry, overlap
+                if overlap == len(wanted):
+                    break
+        if best is None:
+            return None
+        cached = dict(zip(best['symbols'], best['weights']))
+        weights = np.array([max(cached.get(s, 0.0), 0.0) for s in symbols])
+        # Yeni hisselere küçük pay verilir ki çözücü sınırda başlamasın
+        weights += 1 / (len(symbols) * 100)
+        return weights / weights.sum()
+
+    def metrics(self, key, weights, portfolio_value, num_portfolios):
+        """
+        Kayıtlı metrikleri PortfolioMetrics olarak döndürür. Ağırlıklar veya
+        portföy değeri farklıysa ya da istenen etkin sınır örneği yoksa None.
+        """
+        entry = self.get(key)
+        if entry is None or 'metrics' not in entry:
+            return None
+        data = entry['metrics']
+        if data['portfolio_value'] != portfolio_value or \
+                not np.allclose([w['weight'] for w in data['weights']], weights, rtol=0, atol=1e-12):
+            return None
+        frontier = entry.get('frontier')
+        if num_portfolios and (frontier is None or len(frontier[0]) != num_portfolios):
+            return None
+        metrics = PortfolioMetrics.from_dict(data)
+        if num_portfolios:
+            metrics.frontier_risks, metrics.frontier_returns = np.array(frontier[0]), np.array(frontier[1])
+        return metrics
+
+    @staticmethod
+    def metrics_fields(metrics):
+        """Metrik nesnesini kayda yazılacak alanlara dönüştürür."""
+        fields = {'metrics': metrics.to_dict()}
+        if metrics.frontier_risks is not None:
+            fields['frontier'] = [np.asarray(metrics.frontier_risks).tolist(),
+                                  np.asarray(metrics.frontier_returns).tolist()]
+        return fields
+
+    @staticmethod
+    def new_entry(symbols, settings, weights, nfev=None):
+        return {
+            'symbols': list(symbols),
+            'settings': settings,
+            'weights': [float(w) for w in weights],
+            'nfev': nfev,
+            'created': time.time(),
+        }
@@ -0,0 +1,37 @@
+import data_providers
+
+# Varsayılan kaynaklar: BIST hisseleri için .IS eklenir, geçmiş indirmelerinde
+# sembol olduğu gibi kullanılır. yfinance yalnızca ilk istekte yüklenir;
+# böylece yalnızca hesaplama yapan işler indirme bağımlılıklarının yüklenme
+# maliyetini ödemez.
+_BIST = data_providers.YFinanceProvider(suffix='.IS')
+_YFINANCE = data_providers.YFinanceProvider()
+
+
+def fetch_close_prices(symbols, start_date, end_date, provider=None):
+    """
+    Hisse senetlerinin kapanış fiyatlarını çeker (varsayılan olarak yfinance).
+
+    Args:
+        symbols (list): Hisse senedi sembolleri listesi
+        start_date (str): Başlangıç tarihi (YYYY-MM-DD formatında)
+        end_date (str): Bitiş tarihi (YYYY-MM-DD formatında)
+        provider (DataProvider): Kullanılacak veri kaynağı; verilmezse
+            data_providers ile ayarlanmış kaynak ya da yfinance
+
+    Returns:
+        pandas.DataFrame: Her sembol için bir kapanış sütunu
+    """
+    provider = provider or data_providers.get_provider(_BIST)
+    return provider.close_prices(symbols, start_date, end_date)
+
+
+def fetch_history(symbol, start_date, end_date):
+    """
+    Tek bir sembolün OHLCV geçmişini çeker (sembol olduğu gibi kullanılır).
+    PriceArchive.update için indirme fonksiyonu olarak uygundur.
+
+    Returns:
+        pandas.DataFrame: Open, High, Low, Close, Volume sütunları
+    """
+    return data_providers.get_provider(_YFINANCE).history(symbol, start_date, end_date)
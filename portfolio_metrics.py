@@ -0,0 +1,271 @@
+import json
+from dataclasses import dataclass
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+
+# Raporlarda kullanılan varsayılan güven seviyeleri
+CONFIDENCE_LEVELS = (0.95, 0.99)
+
+
+class PortfolioStats(NamedTuple):
+    """calculate_portfolio_metrics sonucu; eski (getiri, risk, sharpe) tuple'ı gibi açılabilir"""
+    expected_return: float
+    risk: float
+    sharpe: float
+
+
+@dataclass
+class WeightRecord:
+    """Portföydeki tek bir hissenin ağırlığı"""
+    __slots__ = ('symbol', 'weight')
+    symbol: str
+    weight: float
+
+
+@dataclass
+class RiskLevel:
+    """Bir güven seviyesindeki yıllık VaR ve CVaR (TL)"""
+    __slots__ = ('confidence_level', 'var', 'cvar')
+    confidence_level: float
+    var: float
+    cvar: float
+
+
+def var_cvar(portfolio_returns, confidence_level):
+    """
+    Günlük portföy getirilerinden tarihsel VaR ve CVaR değerlerini hesaplar.
+
+    Returns:
+        tuple: (günlük VaR, günlük CVaR) getiri cinsinden
+    """
+    portfolio_returns = np.asarray(portfolio_returns)
+    var = np.percentile(portfolio_returns, (1 - confidence_level) * 100)
+    cvar = portfolio_returns[portfolio_returns <= var].mean()
+    return var, cvar
+
+
+@dataclass
+class PortfolioMetrics:
+    """
+    Bir portföy için tek seferde hesaplanan tüm rapor metrikleri.
+    Metin, JSON ve HTML raporları, grafikler ve toplu dışa aktarımlar bu
+    nesneden üretilir.
+    """
+    __slots__ = ('name', 'start_date', 'end_date', 'portfolio_value', 'weights', 'expected_return',
+                 'risk', 'sharpe', 'risk_levels', 'frontier_risks', 'frontier_returns')
+    name: str
+    start_date: str
+    end_date: str
+    portfolio_value: float
+    weights: list          # [WeightRecord, ...]
+    expected_return: float
+    risk: float
+    sharpe: float
+    risk_levels: list      # [RiskLevel, ...]
+    frontier_risks: np.ndarray
+    frontier_returns: np.ndarray
+
+    @property
+    def symbols(self):
+        return [w.symbol for w in self.weights]
+
+    @property
+    def weight_array(self):
+        return np.array([w.weight for w in self.weights])
+
+    @property
+    def var(self):
+        """{güven seviyesi: VaR}"""
+        return {r.confidence_level: r.var for r in self.risk_levels}
+
+    @property
+    def cvar(self):
+        """{güven seviyesi: CVaR}"""
+        return {r.confidence_level: r.cvar for r in self.risk_levels}
+
+    def to_dict(self):
+        """Etkin sınır örnekleri hariç JSON'a uygun sözlük döndürür"""
+        return {
+            'name': self.name,
+            'start_date': str(self.start_date),
+            'end_date': str(self.end_date),
+            'portfolio_value': self.portfolio_value,
+            'weights': [{'symbol': w.symbol, 'weight': w.weight} for w in self.weights],
+            'expected_return': self.expected_return,
+            'risk': self.risk,
+            'sharpe': self.sharpe,
+            'risk_levels': [
+                {'confidence_level': r.confidence_level, 'var': r.var, 'cvar': r.cvar} for r in self.risk_levels
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            name=data['name'],
+            start_date=data['start_date'],
+            end_date=data['end_date'],
+            portfolio_value=data['portfolio_value'],
+            weights=[WeightRecord(w['symbol'], w['weight']) for w in data['weights']],
+            expected_return=data['expected_return'],
+            risk=data['risk'],
+            sharpe=data['sharpe'],
+            risk_levels=[RiskLevel(r['confidence_level'], r['var'], r['cvar']) for r in data['risk_levels']],
+            frontier_risks=None,
+            frontier_returns=None,
+        )
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+
+def compute_metrics(optimizer, name='portfolio', confidence_levels=CONFIDENCE_LEVELS, num_portfolios=1000):
+    """
+    Optimize edilmiş portföyün metriklerini bir kez hesaplar.
+
+    Args:
+        optimizer (PortfolioOptimizer): Ağırlıkları hesaplanmış optimizer
+        name (str): Portföy adı (çıktı dosya adlarında kullanılır)
+        confidence_levels (tuple): VaR/CVaR güven seviyeleri
+        num_portfolios (int): Etkin sınır için rastgele portföy sayısı (0: çizilmez)
+
+    Returns:
+        PortfolioMetrics: Hesaplanan metrikler
+    """
+    if optimizer.weights is None:
+        raise Exception("Önce portföyü optimize edin!")
+
+    stats = optimizer.calculate_portfolio_metrics(optimizer.weights)
+
+    # Tüm güven seviyeleri aynı portföy getirilerinden tek seferde hesaplanır
+    daily = optimizer.daily_var_cvar(confidence_levels)
+    annual_factor = optimizer.portfolio_value * np.sqrt(252)
+    risk_levels = []
+    for level in confidence_levels:
+        daily_var, daily_cvar = daily[level]
+        risk_levels.append(RiskLevel(level, float(daily_var * annual_factor), float(daily_cvar * annual_factor)))
+
+    frontier_risks = frontier_returns = None
+    if num_portfolios:
+        frontier_risks, frontier_returns = optimizer.sample_random_portfolios(num_portfolios)
+
+    return PortfolioMetrics(
+        name=name,
+        start_date=optimizer.start_date,
+        end_date=optimizer.end_date,
+        portfolio_value=optimizer.portfolio_value,
+        weights=[WeightRecord(s, float(w)) for s, w in zip(optimizer.symbols, optimizer.weights)],
+        expected_return=float(stats[0]),
+        risk=float(stats[1]),
+        sharpe=float(stats[2]),
+        risk_levels=risk_levels,
+        frontier_risks=frontier_risks,
+        frontier_returns=frontier_returns,
+    )
+
+
+def metrics_to_frames(metrics_list, run_id=None):
+    """
+    Metrik nesnelerini toplu yazıma uygun iki tabloya dönüştürür.
+
+    Returns:
+        tuple: (özet DataFrame'i, ağırlık DataFrame'i)
+    """
+    summary, weights = [], []
+    for m in metrics_list:
+        row = {
+            'run_id': run_id,
+            'name': m.name,
+            'start_date': str(m.start_date),
+            'end_date': str(m.end_date),
+            'portfolio_value': m.portfolio_value,
+            'expected_return': m.expected_return,
+            'risk': m.risk,
+            'sharpe': m.sharpe,
+        }
+        for r in m.risk_levels:
+            suffix = f"{r.confidence_level * 100:.0f}"
+            row[f"var_{suffix}"] = r.var
+            row[f"cvar_{suffix}"] = r.cvar
+        summary.append(row)
+        weights.extend({'run_id': run_id, 'name': m.name, 'symbol': w.symbol, 'weight': w.weight} for w in m.weights)
+    return pd.DataFrame(summary), pd.DataFrame(weights)
+
+
+def write_json(metrics_list, filename):
+    """Metrikleri tek bir JSON dosyasına yazar."""
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump([m.to_dict() for m in metrics_list], f, ensure_ascii=False, indent=2)
+
+
+def read_json(filename):
+    """write_json ile yazılmış metrikleri geri yükler."""
+    with open(filename, encoding='utf-8') as f:
+        return [PortfolioMetrics.from_dict(d) for d in json.load(f)]
+
+
+def _parquet_engine():
+    """Kurulu Parquet motoru; yoksa nasıl kurulacağını söyleyen ImportError"""
+    for engine in ('pyarrow', 'fastparquet'):
+        try:
+            __import__(engine)
+            return engine
+        except ImportError:
+            continue
+    raise ImportError("Parquet çıktısı için pyarrow gerekir: pip install .[parquet] (ya da pip install pyarrow)")
+
+
+def write_parquet(metrics_list, prefix, run_id=None):
+    """
+    Metrikleri `<prefix>_summary.parquet` ve `<prefix>_weights.parquet`
+    dosyalarına yazar (isteğe bağlı `parquet` bağımlılığı: pyarrow veya
+    fastparquet gerektirir).
+    """
+    engine = _parquet_engine()
+    summary, weights = metrics_to_frames(metrics_list, run_id)
+    summary.to_parquet(f"{prefix}_summary.parquet", engine=engine, index=False)
+    weights.to_parquet(f"{prefix}_weights.parquet", engine=engine, index=False)
+
+
+def write_to_database(conn, metrics_list, run_id):
+    """
+    Metrikleri portfoy_metrikleri, portfoy_risk_seviyeleri ve
+    portfoy_agirliklari tablolarına tek işlemde toplu yazar.
+    """
+    from psycopg2.extras import execute_values
+
+    cur = None
+    try:
+        cur = conn.cursor()
+        execute_values(cur, """
+            INSERT INTO portfoy_metrikleri
+            (calistirma, portfoy, baslangic, bitis, portfoy_degeri, beklenen_getiri, risk, sharpe)
+            VALUES %s
+            ON CONFLICT (calistirma, portfoy) DO UPDATE SET
+                beklenen_getiri = EXCLUDED.beklenen_getiri,
+                risk = EXCLUDED.risk,
+                sharpe = EXCLUDED.sharpe
+        """, [(run_id, m.name, m.start_date, m.end_date, m.portfolio_value, m.expected_return, m.risk, m.sharpe)
+              for m in metrics_list])
+        execute_values(cur, """
+            INSERT INTO portfoy_risk_seviyeleri (calistirma, portfoy, guven_seviyesi, var, cvar)
+            VALUES %s
+            ON CONFLICT (calistirma, portfoy, guven_seviyesi) DO UPDATE SET
+                var = EXCLUDED.var,
+                cvar = EXCLUDED.cvar
+        """, [(run_id, m.name, r.confidence_level, r.var, r.cvar) for m in metrics_list for r in m.risk_levels])
+        execute_values(cur, """
+            INSERT INTO portfoy_agirliklari (calistirma, portfoy, hisse_kodu, agirlik)
+            VALUES %s
+            ON CONFLICT (calistirma, portfoy, hisse_kodu) DO UPDATE SET
+                agirlik = EXCLUDED.agirlik
+        """, [(run_id, m.name, w.symbol, w.weight) for m in metrics_list for w in m.weights])
+        conn.commit()
+    except Exception as e:
+        print(f"Portföy metrikleri kaydedilemedi: {e}")
+        conn.rollback()
+        raise
+    finally:
+        if cur:
+            cur.close()
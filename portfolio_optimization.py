@@ -1,29 +1,77 @@
 import pandas as pd
 import numpy as np
-from scipy.optimize import minimize
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
-import os
-from dotenv import load_dotenv
-import time
-import yfinance as yf
-from scipy import stats
+import izleme
+from calendar_alignment import DEFAULT_FILL_LIMIT, align
+from covariance import RiskModel
+from portfolio_metrics import PortfolioStats, compute_metrics, var_cvar
+from price_panel import PricePanel
 
-# .env dosyasını yükle
-load_dotenv()
+# Hesaplama çekirdeği yalnızca numpy/pandas yükler. scipy.optimize, veri
+# indirme (yfinance) ve grafik (matplotlib) modülleri ilgili metot ilk kez
+# çağrıldığında yüklenir; böylece yalnızca sayı üreten işler hızlı açılır.
+
+# sample_random_portfolios'un bir parçada ürettiği en fazla ağırlık (eleman)
+SAMPLE_CHUNK_ELEMENTS = 2 ** 22
+
+def solve_max_sharpe(model, start_weights=None, lower=0.0):
+    """
+    Sharpe oranını en büyükleyen uzun pozisyonlu ağırlıkları SLSQP ile bulur.
+    
+    Args:
+        model (RiskModel): Yıllık getiri ve kovaryans modeli
+        start_weights (array): Başlangıç ağırlıkları (None: eşit dağılım)
+        lower (float | array): Hisse başına en küçük ağırlık
+        
+    Returns:
+        tuple: (ağırlıklar, amaç fonksiyonu değerlendirme sayısı)
+    """
+    from scipy.optimize import minimize
+    
+    n = len(model.mean)
+    init_weights = np.full(n, 1 / n)
+    
+    # Kısıtlamalar (Jacobian'lar sabit olduğundan sayısal türev alınmaz)
+    constraints = (
+        {'type': 'eq', 'fun': lambda x: np.sum(x) - 1, 'jac': lambda x: np.ones((1, n))},  # Ağırlıklar toplamı 1 olmalı
+        {'type': 'ineq', 'fun': lambda x: x, 'jac': lambda x: np.eye(n)}  # Ağırlıklar pozitif olmalı
+    )
+    result = minimize(
+        model.neg_sharpe_and_grad,
+        init_weights if start_weights is None else start_weights,
+        jac=True,
+        method='SLSQP',
+        constraints=constraints,
+        bounds=tuple((lo, 1) for lo in np.broadcast_to(lower, n))
+    )
+    
+    # Sayısal taşmalara karşı ağırlıklar geçerli bir dağılıma indirgenir; yalnızca
+    # alt sınırın üzerindeki pay ölçeklenir, böylece hiçbir ağırlık sınırın altına düşmez
+    lower = np.broadcast_to(np.asarray(lower, dtype=float), n)
+    slack = np.clip(np.nan_to_num(result.x), lower, 1) - lower
+    room = 1 - lower.sum()
+    if slack.sum() > 0:
+        return lower + slack * (room / slack.sum()), result.nfev
+    return lower + room / n, result.nfev
 
 class PortfolioOptimizer:
-    def __init__(self, symbols, start_date=None, end_date=None):
+    def __init__(self, symbols, start_date=None, end_date=None, provider=None):
         """
         Portföy optimizasyonu için gerekli parametreleri başlatır.
         
         Args:
-            symbols (list): Hisse senedi sembolleri listesi
+            symbols (list | PricePanel): Hisse senedi sembolleri listesi veya
+                fiyatları önceden yüklenmiş panel
             start_date (str): Başlangıç tarihi (YYYY-MM-DD formatında)
             end_date (str): Bitiş tarihi (YYYY-MM-DD formatında)
+            provider (DataProvider): fetch_data'nın kullanacağı veri kaynağı
+                (data_providers); verilmezse ayarlanmış kaynak ya da yfinance
         """
+        panel = symbols if isinstance(symbols, PricePanel) else None
+        if panel is not None:
+            symbols = list(panel.symbols)
+            start_date = start_date or panel.dates[0].strftime('%Y-%m-%d')
+            end_date = end_date or panel.dates[-1].strftime('%Y-%m-%d')
         self.symbols = symbols
         self.start_date = start_date or (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
         self.end_date = end_date or datetime.now().strftime('%Y-%m-%d')
@@ -31,41 +79,126 @@ class PortfolioOptimizer:
         self.returns = None
         self.weights = None
         self.portfolio_value = 1000000  # Varsayılan portföy değeri (1 milyon TL)
+        # Eksik günlü serilerin hizalanması (calendar_alignment.POLICIES);
+        # 'aggregate' boşluklu günleri atmak yerine getiriyi sonraki güne taşır.
+        # fill_limit satırdan uzun boşluklar doldurulmaz (None: sınırsız)
+        self.alignment = 'aggregate'
+        self.fill_limit = DEFAULT_FILL_LIMIT
+        self.provider = provider
+        # fetch_data çekilen fiyatları CSV dosyasına da yazar
+        self.save_csv = True
+        # Kompakt mod: fiyat ve getiriler float32 tutulur (yarı bellek); ortalama
+        # ve kovaryans yine float64 biriktirilir
+        self.compact = False
+        self._risk_model = None
+        self._risk_model_source = None
+        # Sonuç önbelleği (optimization_cache.OptimizationCache); None: kapalı
+        self.cache = None
+        # Bellekten büyük geçmişler için akış kaynağı (streaming_moments); ayarlıysa
+        # getiriler bellekte tutulmaz, VaR/CVaR kaynaktan hesaplanır
+        self.source = None
+        self._moments = None
+        self._cache_key = None
+        self._cache_key_source = None
+        if panel is not None:
+            self.load_panel(panel)
+        
+    @classmethod
+    def from_universe(cls, conn, limit=20, start_date=None, end_date=None, provider=None, **criteria):
+        """
+        Hisseleri elle vermek yerine hisse_evreni tablosundaki en likit
+        hisselerden seçer; eleme eşikleri (min_islem_hacmi, min_tamlik,
+        max_oynaklik) criteria ile değiştirilebilir.
+        
+        Returns:
+            PortfolioOptimizer: Seçilen hisselerle kurulmuş optimizer
+        """
+        from hisse_evreni import likit_hisseler
+        
+        symbols = likit_hisseler(conn, limit, **criteria)
+        if not symbols:
+            raise Exception("Hisse evreninde eleme eşiklerini geçen hisse yok!")
+        return cls(symbols, start_date, end_date, provider=provider)
+        
+    def load_panel(self, panel, field='Close'):
+        """
+        Fiyatları indirmek yerine bir PricePanel'den yükler. Panel paylaşımlı
+        bellekteyse fiyatlar kopyalanmaz; yalnızca seçilen hisseler ve
+        getiriler bu süreçte hesaplanır. Kompakt (float32) panel verilirse
+        optimizer da kompakt moda geçer.
+        """
+        if panel.dtype == np.float32:
+            self.compact = True
+        self._set_prices(panel.frame(field, self.symbols))
+        return self
+        
+    def _set_prices(self, data):
+        """Fiyatları ve günlük getirileri ayarlar (kompakt modda float32)"""
+        if self.compact:
+            data = data.astype(np.float32)
+        self.data = data
+        self.returns = data.pct_change().dropna()
+        
+    def load_moments(self, source, chunk_rows=10_000, workers=None):
+        """
+        Getiri ortalamasını ve kovaryansını fiyatları belleğe almadan, kaynaktan
+        pencere pencere okuyarak hesaplar. Bellek kullanımı geçmişin
+        uzunluğuna değil yalnızca hisse sayısına bağlıdır.
+        
+        Args:
+            source: streaming_moments kaynağı (ArchiveSource, DatabaseSource, FrameSource)
+            chunk_rows (int): Pencere başına satır sayısı
+            workers (int): Paralel süreç sayısı (None: seri)
+        """
+        from streaming_moments import stream_moments
+        
+        with izleme.aralik('fetch'):
+            moments = stream_moments(source, self.start_date, self.end_date, chunk_rows, workers)
+        if moments.n < 2:
+            raise Exception("Kaynakta yeterli getiri yok!")
+        self.symbols = list(source.symbols)
+        self.source = source
+        self.data = self.returns = None
+        self._moments = moments
+        self._risk_model = RiskModel(moments.mean * 252, moments.covariance() * 252)
+        self._risk_model_source = None
+        if self._risk_model.repaired:
+            print("Uyarı: Kovaryans matrisi pozitif tanımlı değildi, en yakın pozitif tanımlı matrise onarıldı")
+        print(f"{len(self.symbols)} hisse için {moments.n} getiri satırı akış halinde işlendi")
+        return moments
         
     def fetch_data(self):
-        """Hisse senedi verilerini yfinance kütüphanesi ile çeker ve işler."""
+        """Hisse senedi verilerini veri kaynağından (varsayılan yfinance) çeker ve işler."""
         print("Veriler çekiliyor...")
         
+        from portfolio_data import fetch_close_prices
+        
         try:
             # Tüm hisse senetleri için veri çek
-            data = {}
-            for symbol in self.symbols:
-                # BIST hisseleri için .IS ekle
-                ticker_symbol = f"{symbol}.IS" if not symbol.endswith('.IS') else symbol
-                ticker = yf.Ticker(ticker_symbol)
-                df = ticker.history(start=self.start_date, end=self.end_date)
-                if not df.empty:
-                    data[symbol] = df['Close']
-                else:
-                    print(f"Uyarı: {symbol} için veri çekilemedi!")
-            
-            if not data:
-                raise Exception("Hiçbir hisse senedi için veri çekilemedi!")
+            with izleme.aralik('fetch'):
+                prices = fetch_close_prices(self.symbols, self.start_date, self.end_date, self.provider)
             
-            # Verileri DataFrame'e dönüştür
-            self.data = pd.DataFrame(data)
+            # Farklı günlerde boşluğu olan seriler tek geçişte hizalanır
+            aligned = align(
+                {symbol: prices[symbol] for symbol in prices.columns},
+                policy=self.alignment, limit=self.fill_limit
+            ).frame()
+            # Doldurma sınırını aşan boşluklar NaN kalır; o günler getirilerden düşer
+            gaps = aligned.isna().sum()
+            for symbol, count in gaps[gaps > 0].items():
+                print(f"Uyarı: {symbol} {count} gün işlem görmemiş (doldurma sınırı {self.fill_limit} gün); "
+                      f"bu günler getirilerden çıkarıldı")
+            self._set_prices(aligned)
             
             # Verileri CSV dosyasına kaydet
-            csv_filename = f"hisse_verileri_{self.start_date}_{self.end_date}.csv"
-            self.data.to_csv(csv_filename)
-            print(f"\nVeriler {csv_filename} dosyasına kaydedildi")
+            if self.save_csv:
+                csv_filename = f"hisse_verileri_{self.start_date}_{self.end_date}.csv"
+                self.data.to_csv(csv_filename)
+                print(f"\nVeriler {csv_filename} dosyasına kaydedildi")
             
             print(f"\nToplam {len(self.data.columns)} hisse senedi için veri çekildi")
             print(f"Veri aralığı: {self.data.index[0].strftime('%Y-%m-%d')} - {self.data.index[-1].strftime('%Y-%m-%d')}")
             
-            # Getirileri hesapla
-            self.returns = self.data.pct_change().dropna()
-            
         except Exception as e:
             raise Exception(f"Veri çekme hatası: {str(e)}")
         
@@ -77,78 +210,248 @@ class PortfolioOptimizer:
             weights (array): Hisse senedi ağırlıkları
             
         Returns:
-            tuple: (getiri, risk, sharpe oranı)
+            PortfolioStats: (getiri, risk, sharpe oranı) olarak açılabilen sonuç
         """
-        returns = np.sum(self.returns.mean() * weights) * 252  # Yıllık getiri
-        risk = np.sqrt(np.dot(weights.T, np.dot(self.returns.cov() * 252, weights)))  # Yıllık risk
+        model = self.risk_model()
+        returns = float(model.mean @ weights)  # Yıllık getiri
+        risk = model.risk(weights)  # Yıllık risk
         sharpe = returns / risk if risk != 0 else 0
-        return returns, risk, sharpe
+        return PortfolioStats(returns, risk, sharpe)
+    
+    def risk_model(self):
+        """
+        Getirilerden yıllık beklenen getiri ve Cholesky çarpanı hazırlanmış
+        kovaryansı bir kez hesaplar. Kovaryans pozitif tanımlı değilse en yakın
+        pozitif tanımlı matrise onarılır. self.returns değiştirildiğinde
+        yeniden hesaplanır.
+        
+        Returns:
+            RiskModel: Hazırlanmış risk modeli
+        """
+        if self._risk_model is None or self._risk_model_source is not self.returns:
+            self._risk_model = RiskModel.from_returns(self.returns)
+            self._risk_model_source = self.returns
+            if self._risk_model.repaired:
+                print("Uyarı: Kovaryans matrisi pozitif tanımlı değildi, en yakın pozitif tanımlı matrise onarıldı")
+        return self._risk_model
+    
+    def solver_settings(self):
+        """
+        Önbellek anahtarına giren amaç ve çözücü ayarları. Pencere tarihleri
+        getiri özetinde yer aldığından buraya girmez: kayan pencere ilerlediğinde
+        aynı gruptaki önceki çözüm başlangıç noktası olur ve eski kayıt silinir.
+        """
+        return {
+            'objective': 'max_sharpe',
+            'method': 'SLSQP',
+            'bounds': [0, 1],
+            'alignment': self.alignment,
+            'fill_limit': self.fill_limit,
+        }
+    
+    def cache_key(self):
+        """
+        Getiri verisi ve çözücü ayarlarının önbellek anahtarı (getiriler
+        değişmedikçe tekrar hesaplanmaz). Getiriler akış halinde yüklendiyse
+        (load_moments) momentlerin ve tarih aralığının özeti kullanılır.
+        """
+        from optimization_cache import OptimizationCache, moments_fingerprint, returns_fingerprint, settings_fingerprint
+        
+        source = self.returns if self.returns is not None else self._moments
+        if self._cache_key is None or self._cache_key_source is not source:
+            if self.returns is not None:
+                data_key = returns_fingerprint(self.returns)
+            elif self._moments is not None:
+                data_key = moments_fingerprint(self.symbols, self._moments, self.start_date, self.end_date)
+            else:
+                raise Exception("Önce veri yükleyin!")
+            self._cache_key = OptimizationCache.key(data_key, settings_fingerprint(self.symbols, self.solver_settings()))
+            self._cache_key_source = source
+        return self._cache_key
     
     def optimize_portfolio(self):
         """Optimal portföy ağırlıklarını hesaplar."""
-        print("Portföy optimize ediliyor...")
+        if self.cache is not None:
+            entry = self.cache.get(self.cache_key())
+            if entry is not None and len(entry['weights']) == len(self.symbols):
+                print("Portföy ağırlıkları önbellekten alındı")
+                izleme.sayac('optimizasyon_onbellek_isabeti')
+                self.weights = np.array(entry['weights'])
+                return self.weights
         
-        # Kısıtlamalar
-        constraints = (
-            {'type': 'eq', 'fun': lambda x: np.sum(x) - 1},  # Ağırlıklar toplamı 1 olmalı
-            {'type': 'ineq', 'fun': lambda x: x}  # Ağırlıklar pozitif olmalı
-        )
+        print("Portföy optimize ediliyor...")
         
         # Başlangıç ağırlıkları (eşit dağılım)
         init_weights = np.array([1/len(self.symbols)] * len(self.symbols))
         
-        # Optimizasyon
-        result = minimize(
-            lambda x: -self.calculate_portfolio_metrics(x)[2],  # Sharpe oranını maksimize et
-            init_weights,
-            method='SLSQP',
-            constraints=constraints,
-            bounds=tuple((0, 1) for _ in range(len(self.symbols)))
-        )
+        # Önbellekte en yakın çözüm varsa oradan başlanır
+        start_weights = init_weights
+        if self.cache is not None:
+            warm = self.cache.warm_start(self.symbols, self.solver_settings())
+            if warm is not None:
+                start_weights = warm
+        
+        # Optimizasyon (Sharpe oranını maksimize et, analitik gradyanla)
+        with izleme.aralik('solve'):
+            self.weights, nfev = solve_max_sharpe(self.risk_model(), start_weights)
+        izleme.sayac('amac_fonksiyonu_degerlendirme', nfev)
         
-        self.weights = result.x
+        if self.cache is not None:
+            from optimization_cache import OptimizationCache
+            
+            self.cache.put(self.cache_key(), OptimizationCache.new_entry(
+                self.symbols, self.solver_settings(), self.weights, int(nfev)
+            ))
         return self.weights
     
-    def plot_efficient_frontier(self, num_portfolios=1000):
-        """Etkin sınır grafiğini çizer."""
-        print("Etkin sınır grafiği oluşturuluyor...")
+    def optimize_hrp(self, method='single'):
+        """
+        Hiyerarşik risk paritesi (HRP) ile ağırlıkları hesaplar. Matris tersi
+        ve yinelemeli çözücü kullanmadığından yüzlerce/binlerce hissede
+        SLSQP'den çok hızlı ve kararlıdır; beklenen getirileri kullanmaz.
+        
+        Args:
+            method (str): Korelasyon uzaklığı kümeleme bağlantı yöntemi
+            
+        Returns:
+            array: Hisse ağırlıkları
+        """
+        from hrp import hrp_weights
+        
+        print("Portföy hiyerarşik risk paritesiyle dağıtılıyor...")
+        with izleme.aralik('solve'):
+            self.weights = hrp_weights(self.risk_model().cov, method)
+        return self.weights
+    
+    def optimize_cardinality(self, max_holdings=15, min_weight=0.01, lot_sizes=None):
+        """
+        En fazla `max_holdings` hisse tutan ve tutulan her hissede en küçük
+        ağırlığı sağlayan en yüksek Sharpe portföyünü sezgisel arama (ileri
+        seçim ve yerel takas) ile bulur.
+        
+        Args:
+            max_holdings (int): En fazla hisse sayısı
+            min_weight (float): Tutulan hisse başına en küçük ağırlık
+            lot_sizes (dict): {sembol: lot adedi}; lot × son fiyat / portföy
+                değeri en küçük ağırlıktan büyükse o değer kullanılır
+            
+        Returns:
+            CardinalityResult: Ağırlıklar, Sharpe oranı ve tutulan hisseler
+        """
+        from cardinality import max_sharpe_cardinality
+        
+        lower = np.full(len(self.symbols), float(min_weight))
+        if lot_sizes:
+            if self.data is None:
+                raise ValueError("Lot kısıtı için fiyatların bellekte olması gerekir (fetch_data veya load_panel)")
+            last_prices = self.data.ffill().iloc[-1].reindex(self.symbols).to_numpy()
+            lots = np.array([lot_sizes.get(s, 0) for s in self.symbols], dtype=float)
+            lower = np.maximum(lower, np.nan_to_num(lots * last_prices) / self.portfolio_value)
+        
+        print(f"Portföy en fazla {max_holdings} hisseyle optimize ediliyor...")
+        with izleme.aralik('solve'):
+            result = max_sharpe_cardinality(self.risk_model(), max_holdings, lower)
+        izleme.sayac('kardinalite_alt_problem', result.subproblems)
+        self.weights = result.weights
+        return result
+    
+    def optimize_resampled(self, n_resamples=1000, block_size=None, workers=None, seed=None, confidence=0.9):
+        """
+        Getirileri blok bootstrap ile yeniden örnekleyerek her örnekte
+        optimizasyonu tekrar çözer ve ağırlıkların ortalamasını kullanır.
+        Tek örnek çözümüne göre tahmin hatasına çok daha az duyarlıdır.
+        
+        Args:
+            n_resamples (int): Örnek sayısı
+            block_size (int): Bootstrap blok uzunluğu (None: gün^(1/3))
+            workers (int): Süreç sayısı (None: CPU sayısı)
+            seed (int): Rastgele sayı tohumu
+            confidence (float): Güven aralığı düzeyi
+            
+        Returns:
+            ResampledWeights: Ortalama ağırlıklar, ağırlık ve Sharpe güven aralıkları
+        """
+        from resampling import resample_weights
         
-        returns_list = []
-        risks_list = []
-        weights_list = []
+        if self.returns is None:
+            raise ValueError("Yeniden örnekleme için getirilerin bellekte olması gerekir (fetch_data veya load_panel)")
         
-        for _ in range(num_portfolios):
-            weights = np.random.random(len(self.symbols))
-            weights = weights / np.sum(weights)
-            weights_list.append(weights)
+        print(f"Portföy {n_resamples} bootstrap örneğiyle optimize ediliyor...")
+        with izleme.aralik('solve'):
+            result = resample_weights(self.returns, n_resamples, block_size, workers, seed, confidence)
+        self.weights = result.weights
+        return result
+    
+    def sample_random_portfolios(self, num_portfolios=1000):
+        """
+        Etkin sınır için rastgele portföylerin risk ve getirilerini hesaplar.
+        
+        Args:
+            num_portfolios (int): Rastgele üretilecek portföy sayısı
             
-            returns, risk, _ = self.calculate_portfolio_metrics(weights)
-            returns_list.append(returns)
-            risks_list.append(risk)
-        
-        # Optimal portföy noktası
-        opt_returns, opt_risk, _ = self.calculate_portfolio_metrics(self.weights)
-        
-        # Grafik
-        plt.figure(figsize=(10, 6))
-        plt.scatter(risks_list, returns_list, c='blue', alpha=0.5)
-        plt.scatter(opt_risk, opt_returns, c='red', marker='*', s=200, label='Optimal Portföy')
-        plt.xlabel('Risk (Volatilite)')
-        plt.ylabel('Beklenen Getiri')
-        plt.title('Etkin Sınır ve Optimal Portföy')
-        plt.legend()
-        plt.grid(True)
-        plt.savefig('efficient_frontier.png')
-        plt.close()
+        Returns:
+            tuple: (riskler, getiriler) dizileri
+        """
+        model = self.risk_model()
+        n = len(self.symbols)
+        risks, returns = np.empty(num_portfolios), np.empty(num_portfolios)
+        
+        # Milyonlarca portföyde ağırlık matrisi parça parça üretilir (aynı rastgele dizi)
+        rows = max(SAMPLE_CHUNK_ELEMENTS // n, 1)
+        for start in range(0, num_portfolios, rows):
+            stop = min(start + rows, num_portfolios)
+            weights = np.random.random((stop - start, n))
+            weights /= weights.sum(axis=1, keepdims=True)
+            risks[start:stop] = model.risks(weights)
+            returns[start:stop] = weights @ model.mean
+        return risks, returns
+    
+    def plot_efficient_frontier(self, num_portfolios=1000):
+        """Etkin sınır grafiğini çizer."""
+        from portfolio_plots import plot_efficient_frontier
+        
+        print("Etkin sınır grafiği oluşturuluyor...")
+        plot_efficient_frontier(self, num_portfolios)
         
     def plot_portfolio_composition(self):
         """Portföy bileşimini gösteren pasta grafiği çizer."""
-        plt.figure(figsize=(10, 6))
-        plt.pie(self.weights, labels=self.symbols, autopct='%1.1f%%')
-        plt.title('Optimal Portföy Bileşimi')
-        plt.savefig('portfolio_composition.png')
-        plt.close()
+        from portfolio_plots import plot_portfolio_composition
+        
+        plot_portfolio_composition(self)
+        
+    def plot_interactive_frontier(self, num_portfolios=1_000_000, filename='efficient_frontier.html'):
+        """Etkin sınırı yoğunluk haritalı, etkileşimli HTML olarak çizer."""
+        from interactive_plots import plot_interactive_frontier
+        
+        print("Etkileşimli etkin sınır grafiği oluşturuluyor...")
+        return plot_interactive_frontier(self, num_portfolios, filename)
+        
+    def plot_correlation_heatmap(self, filename='correlation.html', max_cells=200):
+        """Küme sırasına dizilmiş korelasyon ısı haritasını HTML olarak çizer."""
+        from interactive_plots import plot_correlation_heatmap
+        
+        return plot_correlation_heatmap(self, filename, max_cells)
         
+    def daily_var_cvar(self, confidence_levels):
+        """
+        Güven seviyeleri için günlük tarihsel VaR ve CVaR (getiri cinsinden).
+        Akış kaynağı ayarlıysa portföy getirileri bellekte tutulmadan hesaplanır.
+        
+        Returns:
+            dict: {güven seviyesi: (VaR, CVaR)}
+        """
+        if self.weights is None:
+            raise Exception("Önce portföyü optimize edin!")
+        
+        if self.returns is None and self.source is not None:
+            from streaming_moments import portfolio_var_cvar
+            
+            return portfolio_var_cvar(self.source, self.weights, confidence_levels, self.start_date, self.end_date)
+        
+        # Portföy getirileri bir kez hesaplanır, tüm güven seviyeleri için kullanılır
+        portfolio_returns = self.returns.values @ self.weights
+        return {level: var_cvar(portfolio_returns, level) for level in confidence_levels}
+    
     def calculate_var(self, confidence_level=0.95, time_horizon=1):
         """
         Value at Risk (VaR) değerini hesaplar.
@@ -160,22 +463,11 @@ class PortfolioOptimizer:
         Returns:
             float: VaR değeri
         """
-        if self.weights is None:
-            raise Exception("Önce portföyü optimize edin!")
-            
-        # Portföy getirilerini hesapla
-        portfolio_returns = np.sum(self.returns * self.weights, axis=1)
-        
-        # VaR hesaplama (normal dağılım varsayımı ile)
-        var = np.percentile(portfolio_returns, (1 - confidence_level) * 100)
-        
-        # Günlük VaR'ı yıllık VaR'a çevir
-        annual_var = var * np.sqrt(252)
+        # VaR hesaplama (tarihsel simülasyon)
+        var, _ = self.daily_var_cvar((confidence_level,))[confidence_level]
         
-        # TL cinsinden VaR
-        var_amount = self.portfolio_value * annual_var
-        
-        return var_amount
+        # Günlük VaR'ı yıllık VaR'a çevir ve TL cinsinden döndür
+        return float(self.portfolio_value * var * np.sqrt(252))
     
     def calculate_cvar(self, confidence_level=0.95, time_horizon=1):
         """
@@ -188,80 +480,90 @@ class PortfolioOptimizer:
         Returns:
             float: CVaR değeri
         """
+        # CVaR hesaplama
+        _, cvar = self.daily_var_cvar((confidence_level,))[confidence_level]
+        
+        # Günlük CVaR'ı yıllık CVaR'a çevir ve TL cinsinden döndür
+        return float(self.portfolio_value * cvar * np.sqrt(252))
+    
+    def stress_test(self, scenarios=None, returns=None, recovery_horizon=None):
+        """
+        Optimize edilmiş portföyü tarihsel şok senaryolarına (stress_testing.SCENARIOS)
+        uygular. Birçok portföy için stress_testing.stress_test doğrudan
+        ağırlık matrisiyle çağrılmalıdır.
+        
+        Args:
+            scenarios (list): Scenario listesi veya adları (None: tüm kütüphane)
+            returns (DataFrame): Senaryoları kapsayan getiriler (None: veri kaynağından çekilir)
+            recovery_horizon (int): Toparlanmanın arandığı işlem günü
+            
+        Returns:
+            StressResult: Senaryo bazında kâr/zarar, en büyük düşüş ve toparlanma süresi
+        """
+        import stress_testing
+        
         if self.weights is None:
             raise Exception("Önce portföyü optimize edin!")
-            
-        # Portföy getirilerini hesapla
-        portfolio_returns = np.sum(self.returns * self.weights, axis=1)
         
-        # VaR değerini hesapla
-        var = np.percentile(portfolio_returns, (1 - confidence_level) * 100)
+        scenarios = scenarios or stress_testing.SCENARIOS
+        horizon = stress_testing.RECOVERY_HORIZON if recovery_horizon is None else recovery_horizon
+        if returns is None:
+            scenarios = [stress_testing.get_scenario(s) if isinstance(s, str) else s for s in scenarios]
+            with izleme.aralik('fetch'):
+                returns = stress_testing.load_scenario_returns(self.symbols, scenarios, horizon, self.provider)
+        # Verisi olmayan pencereler tüm çalıştırmayı durdurmaz
+        scenarios = stress_testing.scenarios_with_data(returns, scenarios)
+        if not scenarios:
+            raise Exception("Hiçbir senaryo penceresinde getiri verisi yok!")
+        weights = pd.Series(self.weights, index=self.symbols, name='portfolio')
+        return stress_testing.stress_test(weights, returns, scenarios, horizon)
+    
+    def compute_metrics(self, name='portfolio', num_portfolios=1000):
+        """
+        Rapor metriklerini (getiri, risk, Sharpe, VaR/CVaR) tek seferde hesaplar.
         
-        # CVaR hesaplama
-        cvar = portfolio_returns[portfolio_returns <= var].mean()
+        Önbellek açıksa aynı veri ve ağırlıklar için kayıtlı metrikler döndürülür.
         
-        # Günlük CVaR'ı yıllık CVaR'a çevir
-        annual_cvar = cvar * np.sqrt(252)
+        Returns:
+            PortfolioMetrics: Metin, JSON ve HTML raporlarının ortak kaynağı
+        """
+        if self.cache is None or self.weights is None:
+            return compute_metrics(self, name=name, num_portfolios=num_portfolios)
         
-        # TL cinsinden CVaR
-        cvar_amount = self.portfolio_value * annual_cvar
+        metrics = self.cache.metrics(self.cache_key(), self.weights, self.portfolio_value, num_portfolios)
+        if metrics is not None:
+            metrics.name, metrics.start_date, metrics.end_date = name, self.start_date, self.end_date
+            return metrics
         
-        return cvar_amount
+        metrics = compute_metrics(self, name=name, num_portfolios=num_portfolios)
+        self.cache.update(self.cache_key(), **self.cache.metrics_fields(metrics))
+        return metrics
     
-    def generate_report(self):
+    def generate_report(self, filename='portfolio_report.txt'):
         """Portföy optimizasyonu raporu oluşturur."""
+        from portfolio_report import render_text
+        
         if self.weights is None:
             print("Önce portföyü optimize edin!")
             return
             
-        returns, risk, sharpe = self.calculate_portfolio_metrics(self.weights)
-        
-        # VaR ve CVaR hesapla
-        var_95 = self.calculate_var(confidence_level=0.95)
-        var_99 = self.calculate_var(confidence_level=0.99)
-        cvar_95 = self.calculate_cvar(confidence_level=0.95)
-        cvar_99 = self.calculate_cvar(confidence_level=0.99)
-        
-        report = f"""
-        Portföy Optimizasyon Raporu
-        ==========================
-        
-        Tarih Aralığı: {self.start_date} - {self.end_date}
-        Portföy Değeri: {self.portfolio_value:,.2f} TL
-        
-        Optimal Portföy Ağırlıkları:
-        ---------------------------
-        """
+        metrics = self.compute_metrics(num_portfolios=0)
         
-        for symbol, weight in zip(self.symbols, self.weights):
-            report += f"{symbol}: {weight:.2%}\n"
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(render_text(metrics))
             
-        report += f"""
-        
-        Portföy Metrikleri:
-        ------------------
-        Yıllık Beklenen Getiri: {returns:.2%}
-        Yıllık Risk (Volatilite): {risk:.2%}
-        Sharpe Oranı: {sharpe:.2f}
-        
-        Risk Metrikleri:
-        --------------
-        %95 Güven Seviyesi VaR: {var_95:,.2f} TL
-        %99 Güven Seviyesi VaR: {var_99:,.2f} TL
-        %95 Güven Seviyesi CVaR: {cvar_95:,.2f} TL
-        %99 Güven Seviyesi CVaR: {cvar_99:,.2f} TL
-        """
-        
-        with open('portfolio_report.txt', 'w') as f:
-            f.write(report)
-            
-        print("Rapor oluşturuldu: portfolio_report.txt")
+        print(f"Rapor oluşturuldu: {filename}")
 
 def main():
+    from optimization_cache import OptimizationCache
+    from portfolio_report import write_reports
+    
     # Örnek kullanım
     symbols = ['THYAO', 'GARAN', 'ASELS', 'EREGL', 'KCHOL']  # BIST hisseleri
     start_date = '2023-01-01'  # 1 Ocak 2023
     optimizer = PortfolioOptimizer(symbols, start_date=start_date)
+    # Veri değişmediyse ağırlıklar ve metrikler önbellekten gelir
+    optimizer.cache = OptimizationCache()
     
     try:
         # Verileri çek
@@ -270,15 +572,16 @@ def main():
         # Portföyü optimize et
         optimizer.optimize_portfolio()
         
-        # Grafikleri oluştur
-        optimizer.plot_efficient_frontier()
-        optimizer.plot_portfolio_composition()
-        
-        # Rapor oluştur
-        optimizer.generate_report()
+        # Metrikleri bir kez hesapla; metin, JSON, HTML raporları ve
+        # grafikler reports/<çalıştırma>/ altında aynı nesneden üretilir
+        metrics = optimizer.compute_metrics(name='bist_portfoy')
+        write_reports([metrics])
         
     except Exception as e:
         print(f"Hata oluştu: {str(e)}")
+    finally:
+        izleme.disa_aktar()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    with izleme.ortamdan_yapilandir():
+        main() 
\ No newline at end of file
@@ -0,0 +1,61 @@
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# Grafikler pyplot'un global durumu yerine nesne yönelimli Agg API'si ile
+# çizilir; böylece ekran gerektirmez ve ayrı süreçlerde güvenle çalışır.
+
+
+def _save(fig, filename):
+    FigureCanvasAgg(fig)
+    fig.savefig(filename)
+
+
+def render_efficient_frontier(risks, returns, opt_risk, opt_return, filename):
+    """
+    Rastgele portföyler ve optimal portföyden etkin sınır grafiğini çizer.
+
+    Args:
+        risks (array): Rastgele portföylerin yıllık riskleri
+        returns (array): Rastgele portföylerin yıllık getirileri
+        opt_risk (float): Optimal portföyün riski
+        opt_return (float): Optimal portföyün getirisi
+        filename (str): Kaydedilecek dosya adı
+    """
+    fig = Figure(figsize=(10, 6))
+    ax = fig.add_subplot()
+    ax.scatter(risks, returns, c='blue', alpha=0.5)
+    ax.scatter(opt_risk, opt_return, c='red', marker='*', s=200, label='Optimal Portföy')
+    ax.set_xlabel('Risk (Volatilite)')
+    ax.set_ylabel('Beklenen Getiri')
+    ax.set_title('Etkin Sınır ve Optimal Portföy')
+    ax.legend()
+    ax.grid(True)
+    _save(fig, filename)
+
+
+def render_composition(symbols, weights, filename):
+    """Portföy bileşimini gösteren pasta grafiği çizer."""
+    fig = Figure(figsize=(10, 6))
+    ax = fig.add_subplot()
+    ax.pie(weights, labels=symbols, autopct='%1.1f%%')
+    ax.set_title('Optimal Portföy Bileşimi')
+    _save(fig, filename)
+
+
+def plot_efficient_frontier(optimizer, num_portfolios=1000, filename='efficient_frontier.png'):
+    """
+    Etkin sınır grafiğini çizer.
+
+    Args:
+        optimizer (PortfolioOptimizer): Optimize edilmiş portföy
+        num_portfolios (int): Rastgele üretilecek portföy sayısı
+        filename (str): Kaydedilecek dosya adı
+    """
+    risks, returns = optimizer.sample_random_portfolios(num_portfolios)
+    opt_return, opt_risk, _ = optimizer.calculate_portfolio_metrics(optimizer.weights)
+    render_efficient_frontier(risks, returns, opt_risk, opt_return, filename)
+
+
+def plot_portfolio_composition(optimizer, filename='portfolio_composition.png'):
+    """Portföy bileşimini gösteren pasta grafiği çizer."""
+    render_composition(optimizer.symbols, optimizer.weights, filename)
@@ -0,0 +1,164 @@
+import os
+import re
+import html
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+
+def run_id():
+    """Çıktı klasörü için çalıştırmaya özgü bir kimlik üretir"""
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+
+
+def _safe_name(name):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', name)
+
+
+def output_paths(metrics, directory):
+    """Portföye özgü çıktı dosya yollarını döndürür"""
+    base = os.path.join(directory, _safe_name(metrics.name))
+    return {
+        'text': f"{base}_report.txt",
+        'json': f"{base}_report.json",
+        'html': f"{base}_report.html",
+        'frontier': f"{base}_efficient_frontier.png",
+        'composition': f"{base}_composition.png",
+    }
+
+
+def render_text(metrics):
+    """Metin raporunu oluşturur."""
+    report = f"""
+        Portföy Optimizasyon Raporu
+        ==========================
+
+        Tarih Aralığı: {metrics.start_date} - {metrics.end_date}
+        Portföy Değeri: {metrics.portfolio_value:,.2f} TL
+
+        Optimal Portföy Ağırlıkları:
+        ---------------------------
+        """
+
+    for w in metrics.weights:
+        report += f"{w.symbol}: {w.weight:.2%}\n"
+
+    report += f"""
+
+        Portföy Metrikleri:
+        ------------------
+        Yıllık Beklenen Getiri: {metrics.expected_return:.2%}
+        Yıllık Risk (Volatilite): {metrics.risk:.2%}
+        Sharpe Oranı: {metrics.sharpe:.2f}
+
+        Risk Metrikleri:
+        --------------
+"""
+    for r in metrics.risk_levels:
+        report += f"        %{r.confidence_level * 100:.0f} Güven Seviyesi VaR: {r.var:,.2f} TL\n"
+    for r in metrics.risk_levels:
+        report += f"        %{r.confidence_level * 100:.0f} Güven Seviyesi CVaR: {r.cvar:,.2f} TL\n"
+    return report
+
+
+def render_json(metrics):
+    """Makine tarafından okunabilir JSON raporunu oluşturur."""
+    return metrics.to_json()
+
+
+def render_html(metrics, paths=None):
+    """Grafiklere bağlantı veren HTML raporunu oluşturur."""
+    esc = html.escape
+    weights = "".join(
+        f"<tr><td>{esc(w.symbol)}</td><td>{w.weight:.2%}</td></tr>" for w in metrics.weights
+    )
+    risk_rows = "".join(
+        f"<tr><td>%{r.confidence_level * 100:.0f}</td><td>{r.var:,.2f} TL</td><td>{r.cvar:,.2f} TL</td></tr>"
+        for r in metrics.risk_levels
+    )
+    images = ""
+    if paths:
+        for key in ('frontier', 'composition'):
+            if key in paths:
+                images += f'<img src="{esc(os.path.basename(paths[key]))}" alt="{key}">\n'
+    return f"""<!DOCTYPE html>
+<html lang="tr">
+<head><meta charset="utf-8"><title>{esc(metrics.name)} - Portföy Raporu</title></head>
+<body>
+<h1>Portföy Optimizasyon Raporu: {esc(metrics.name)}</h1>
+<p>Tarih Aralığı: {esc(str(metrics.start_date))} - {esc(str(metrics.end_date))}<br>
+Portföy Değeri: {metrics.portfolio_value:,.2f} TL</p>
+<h2>Optimal Portföy Ağırlıkları</h2>
+<table>{weights}</table>
+<h2>Portföy Metrikleri</h2>
+<p>Yıllık Beklenen Getiri: {metrics.expected_return:.2%}<br>
+Yıllık Risk (Volatilite): {metrics.risk:.2%}<br>
+Sharpe Oranı: {metrics.sharpe:.2f}</p>
+<h2>Risk Metrikleri</h2>
+<table><tr><th>Güven</th><th>VaR</th><th>CVaR</th></tr>{risk_rows}</table>
+{images}</body>
+</html>
+"""
+
+
+def render_portfolio(metrics, directory):
+    """
+    Tek bir portföyün tüm çıktılarını üretir. Süreç havuzunda çalıştırıldığı
+    için yalnızca seçilebilir (picklable) metrik nesnesini alır.
+
+    Returns:
+        dict: Üretilen dosya yolları
+    """
+    from portfolio_plots import render_composition, render_efficient_frontier
+
+    paths = output_paths(metrics, directory)
+    with open(paths['text'], 'w', encoding='utf-8') as f:
+        f.write(render_text(metrics))
+    with open(paths['json'], 'w', encoding='utf-8') as f:
+        f.write(render_json(metrics))
+
+    if metrics.frontier_risks is not None:
+        render_efficient_frontier(metrics.frontier_risks, metrics.frontier_returns,
+                                  metrics.risk, metrics.expected_return, paths['frontier'])
+    else:
+        del paths['frontier']
+    render_composition(metrics.symbols, metrics.weight_array, paths['composition'])
+
+    with open(paths['html'], 'w', encoding='utf-8') as f:
+        f.write(render_html(metrics, paths))
+    return paths
+
+
+def write_reports(metrics_list, output_dir='reports', run=None, max_workers=None):
+    """
+    Portföy raporlarını ve grafiklerini çalıştırmaya özgü bir klasöre üretir.
+    Birden fazla portföy varsa işler süreç havuzuna dağıtılır.
+
+    Args:
+        metrics_list (list): PortfolioMetrics nesneleri
+        output_dir (str): Ana çıktı klasörü
+        run (str): Çalıştırma kimliği (verilmezse zaman damgası kullanılır)
+        max_workers (int): Süreç sayısı (1: aynı süreçte çalışır)
+
+    Returns:
+        dict: {portföy adı: üretilen dosya yolları}
+    """
+    names = [m.name for m in metrics_list]
+    # Dosya adları _safe_name ile üretilir; "a/b" ve "a_b" aynı dosyalara yazar
+    files = {}
+    for name in names:
+        if _safe_name(name) in files:
+            other = files[_safe_name(name)]
+            raise ValueError(f"Portföy adları benzersiz olmalı: {other!r} ve {name!r} aynı dosya adını kullanır")
+        files[_safe_name(name)] = name
+
+    directory = os.path.join(output_dir, run or run_id())
+    os.makedirs(directory, exist_ok=True)
+
+    if len(metrics_list) <= 1 or max_workers == 1:
+        results = [render_portfolio(m, directory) for m in metrics_list]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(render_portfolio, metrics_list, [directory] * len(metrics_list)))
+
+    print(f"Raporlar oluşturuldu: {directory}")
+    return dict(zip(names, results))
@@ -0,0 +1,226 @@
+import json
+import os
+import re
+import numpy as np
+import pandas as pd
+from calendar_alignment import alignment_index, take, to_stamps
+from price_panel import PricePanel
+
+# Arşiv düzeni: <kök>/<sembol>/dates.i8 ve <kök>/<sembol>/<alan>.f8
+# Her dosya yalnızca sona eklenen ham (başlıksız) bir dizidir ve bellek
+# eşlemesiyle okunur. Tarih aralığı ikili aramayla bulunur; böylece uzun
+# geçmişlerden yalnızca istenen aralığın sayfaları diskten okunur.
+# dates.i8 her zaman en son yazılır; uzunluğu geçerli satır sayısıdır.
+
+VARSAYILAN_ARSIV = os.getenv('PRICE_ARCHIVE_DIR', os.path.join('data', 'archive'))
+
+_DATE_DTYPE = np.dtype('<i8')
+_VALUE_DTYPE = np.dtype('<f8')
+
+
+def _to_ns(value):
+    value = pd.Timestamp(value)
+    return (value.tz_localize(None) if value.tzinfo else value).value
+
+
+def _naive_index(index):
+    index = pd.DatetimeIndex(index)
+    # Saat dilimli yfinance indeksleri yerel duvar saatiyle saklanır
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index
+
+
+def _memmap(path, dtype, length=None):
+    if length is None:
+        length = os.path.getsize(path) // dtype.itemsize if os.path.exists(path) else 0
+    if length == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(length,))
+
+
+class PriceArchive:
+    """
+    Sembol ve alan başına bitişik dizilerden oluşan, yalnızca sona ekleme
+    yapılan bellek eşlemeli fiyat arşivi.
+
+    Args:
+        root (str): Arşiv klasörü
+    """
+
+    def __init__(self, root=VARSAYILAN_ARSIV):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _dir(self, symbol):
+        return os.path.join(self.root, re.sub(r'[^A-Za-z0-9_.^=-]+', '_', symbol))
+
+    def _meta(self, symbol):
+        path = os.path.join(self._dir(symbol), 'meta.json')
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_meta(self, symbol, meta):
+        with open(os.path.join(self._dir(symbol), 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    def symbols(self):
+        """Arşivdeki sembolleri döndürür."""
+        result = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name, 'meta.json')
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    result.append(json.load(f)['symbol'])
+        return sorted(result)
+
+    def fields(self, symbol):
+        meta = self._meta(symbol)
+        return tuple(meta['fields']) if meta else ()
+
+    def dates(self, symbol):
+        """Sembolün tarih dizisini (int64 nanosaniye) bellek eşlemesiyle döndürür."""
+        return _memmap(os.path.join(self._dir(symbol), 'dates.i8'), _DATE_DTYPE)
+
+    def column(self, symbol, field):
+        """Bir alanın tüm geçmişini bellek eşlemesiyle döndürür."""
+        length = len(self.dates(symbol))
+        return _memmap(os.path.join(self._dir(symbol), f'{field}.f8'), _VALUE_DTYPE, length)
+
+    def first_date(self, symbol):
+        dates = self.dates(symbol)
+        return pd.Timestamp(dates[0]) if len(dates) else None
+
+    def last_date(self, symbol):
+        dates = self.dates(symbol)
+        return pd.Timestamp(dates[-1]) if len(dates) else None
+
+    def _bounds(self, symbol, start=None, end=None):
+        """[start, end] aralığının satır sınırlarını ikili aramayla bulur."""
+        dates = self.dates(symbol)
+        i = 0 if start is None else int(np.searchsorted(dates, _to_ns(start), side='left'))
+        j = len(dates) if end is None else int(np.searchsorted(dates, _to_ns(end), side='right'))
+        return dates, i, j
+
+    # -- Yazma --
+
+    def append(self, symbol, frame):
+        """
+        Tarih indeksli OHLC tablosunu sembolün sonuna ekler. Arşivdeki son
+        tarihten eski ya da ona eşit satırlar atlanır.
+
+        Returns:
+            int: Eklenen satır sayısı
+        """
+        if frame is None or frame.empty:
+            return 0
+        frame = frame.set_axis(_naive_index(frame.index)).sort_index()
+        frame = frame[~frame.index.duplicated(keep='last')]
+
+        directory = self._dir(symbol)
+        meta = self._meta(symbol)
+        if meta is None:
+            os.makedirs(directory, exist_ok=True)
+            fields = [c for c in frame.columns if pd.api.types.is_numeric_dtype(frame[c])]
+            meta = {'symbol': symbol, 'fields': fields}
+            self._write_meta(symbol, meta)
+        fields = meta['fields']
+
+        dates = self.dates(symbol)
+        length = len(dates)
+        if length:
+            frame = frame[to_stamps(frame.index) > dates[-1]]
+        if frame.empty:
+            return 0
+
+        for field in fields:
+            path = os.path.join(directory, f'{field}.f8')
+            values = frame[field] if field in frame.columns else pd.Series(np.nan, index=frame.index)
+            with open(path, 'ab') as f:
+                # Yarım kalmış önceki bir yazımın artıklarını at
+                f.truncate(length * _VALUE_DTYPE.itemsize)
+                f.write(values.to_numpy(dtype=_VALUE_DTYPE).tobytes())
+        with open(os.path.join(directory, 'dates.i8'), 'ab') as f:
+            f.write(to_stamps(frame.index).tobytes())
+        return len(frame)
+
+    def write(self, symbol, frame):
+        """Sembolün arşivini verilen tabloyla baştan yazar (geçmişe dönük doldurma için)."""
+        directory = self._dir(symbol)
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+        return self.append(symbol, frame)
+
+    def update(self, symbol, fetch, start, end=None):
+        """
+        Arşivi [start, end] aralığını kapsayacak şekilde günceller; yalnızca
+        eksik kısım indirilir.
+
+        Args:
+            symbol (str): Sembol
+            fetch (callable): fetch(symbol, start, end) -> tarih indeksli DataFrame
+            start, end: Tarih aralığı (end verilmezse bugün)
+
+        Returns:
+            int: Eklenen satır sayısı
+        """
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end) if end is not None else pd.Timestamp.now().normalize()
+        meta = self._meta(symbol)
+        last = self.last_date(symbol)
+        # Hafta sonu/tatil başlangıçlarında her seferinde baştan indirmemek
+        # için ilk tarih yerine daha önce istenen başlangıç tarihine bakılır
+        covered = pd.Timestamp(meta['start']) if meta and 'start' in meta else self.first_date(symbol)
+
+        if covered is None or start < covered:
+            # Arşiv yalnızca sona eklenebildiği için eski tarihler gerekiyorsa baştan yazılır
+            frame = fetch(symbol, start, end)
+            if frame is None or frame.empty:
+                return 0
+            if last is not None:
+                frame = pd.concat([frame.set_axis(_naive_index(frame.index)), self.read(symbol)])
+            added = self.write(symbol, frame)
+            meta = self._meta(symbol)
+            meta['start'] = start.isoformat()
+            self._write_meta(symbol, meta)
+            return added
+        if end > last:
+            return self.append(symbol, fetch(symbol, last + pd.Timedelta(days=1), end))
+        return 0
+
+    # -- Okuma --
+
+    def read(self, symbol, start=None, end=None, fields=None):
+        """Sembolün [start, end] aralığını DataFrame olarak döndürür."""
+        dates, i, j = self._bounds(symbol, start, end)
+        fields = fields or self.fields(symbol)
+        return pd.DataFrame(
+            {field: np.array(self.column(symbol, field)[i:j]) for field in fields},
+            index=pd.DatetimeIndex(np.array(dates[i:j]).view('datetime64[ns]'), name='Date'),
+        )
+
+    def panel(self, symbols, start=None, end=None, fields=('Close',), policy='intersection',
+              limit=None, calendar=None):
+        """
+        Sembolleri ortak bir tarih ekseninde hizalayarak PricePanel üretir.
+        Her sembolden yalnızca [start, end] aralığının dilimi okunur.
+
+        Args:
+            policy (str): calendar_alignment politikası ('intersection',
+                'ffill' veya 'aggregate')
+            limit (int): 'ffill' için en fazla kaç satır doldurulacağı
+                (0: doldurma yok, eksikler NaN)
+            calendar (array): Hedef takvim (verilmezse politikaya göre)
+        """
+        bounds = [self._bounds(symbol, start, end) for symbol in symbols]
+        calendar, index = alignment_index(
+            [np.asarray(dates[i:j]) for dates, i, j in bounds], policy, calendar, limit
+        )
+        values = np.empty((len(fields), len(calendar), len(symbols)))
+        for k, (symbol, (_, i, j)) in enumerate(zip(symbols, bounds)):
+            for fi, field in enumerate(fields):
+                values[fi, :, k] = take(self.column(symbol, field)[i:j], index[:, k])
+        return PricePanel(values, symbols, calendar.view('datetime64[ns]'), fields)
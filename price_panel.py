@@ -0,0 +1,230 @@
+import json
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+
+# Fiyat paneli (alan × tarih × hisse) float64 dizisi olarak tutulur. Paylaşımlı
+# bellek veya bellek eşlemeli .npy dosyası üzerindeki paneller süreçlere
+# yalnızca meta verileriyle aktarılır; işçiler aynı belleğe salt okunur
+# olarak bağlanır, veri kopyalanmaz.
+#
+# Kompakt panel (compact()) değerleri float32 tutar ve belleği yarıya indirir.
+# Fiyatın ~7 anlamlı basamağı korunur; kovaryans ve EMA gibi birikimli
+# hesaplar float64'e çevrilerek yapılır (covariance.RiskModel.from_returns,
+# macd_analiz.macd_hesapla). Tarihler epoch günü, hisseler tamsayı kodu olarak
+# da okunabilir.
+
+OHLCV = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+# Kompakt panel değer tipi
+COMPACT_DTYPE = np.float32
+
+_NS_PER_DAY = 86_400 * 10 ** 9
+
+
+def _attach_shared(name, shape, dtype, symbols, dates, fields):
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: bağlanan süreç de kaynak izleyiciye kaydedilir,
+        # segmenti yalnızca sahibi unlink eder
+        shm = shared_memory.SharedMemory(name=name)
+    values = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    values.flags.writeable = False
+    panel = PricePanel(values, symbols, dates, fields)
+    panel._shm = shm
+    return panel
+
+
+def _attach_file(path, symbols, dates, fields):
+    panel = PricePanel(np.load(path, mmap_mode='r'), symbols, dates, fields)
+    panel._path = path
+    return panel
+
+
+class PricePanel:
+    """
+    Hisse ve tarih meta verisini taşıyan üç boyutlu fiyat paneli.
+
+    Args:
+        values (ndarray): (alan, tarih, hisse) boyutlu dizi
+        symbols (list): Hisse kodları
+        dates (array): Tarih indeksi
+        fields (tuple): Alan adları ('Close', 'High' ...)
+    """
+    __slots__ = ('values', 'symbols', 'dates', 'fields', '_shm', '_path', '_owner', '_codes')
+
+    def __init__(self, values, symbols, dates, fields=('Close',)):
+        values = np.asanyarray(values)
+        if values.ndim == 2:
+            values = values[np.newaxis]
+        self.values = values
+        self.symbols = tuple(symbols)
+        self.dates = pd.DatetimeIndex(dates)
+        self.fields = tuple(fields)
+        if values.shape != (len(self.fields), len(self.dates), len(self.symbols)):
+            raise ValueError(f"Panel boyutu {values.shape} meta veriyle uyuşmuyor")
+        self._shm = None
+        self._path = None
+        self._owner = False
+        self._codes = None
+
+    @classmethod
+    def from_frame(cls, frame, field='Close', dtype=np.float64):
+        """Tarih × hisse DataFrame'inden tek alanlı panel oluşturur."""
+        return cls(frame.to_numpy(dtype=dtype), frame.columns, frame.index, (field,))
+
+    @classmethod
+    def from_frames(cls, frames, dtype=np.float64):
+        """
+        {alan: tarih × hisse DataFrame} sözlüğünden panel oluşturur.
+        Tüm tablolar ilk tablonun tarih ve hisse sırasına hizalanır.
+        """
+        first = next(iter(frames.values()))
+        values = np.empty((len(frames), len(first.index), len(first.columns)), dtype=dtype)
+        for i, f in enumerate(frames.values()):
+            values[i] = f.reindex(index=first.index, columns=first.columns).to_numpy()
+        return cls(values, first.columns, first.index, tuple(frames))
+
+    @classmethod
+    def from_ohlc(cls, data, fields=OHLCV, dtype=np.float64):
+        """
+        {hisse: OHLC DataFrame} sözlüğünden panel oluşturur; tarihler
+        birleştirilir, eksik günler NaN kalır.
+        """
+        fields = [f for f in fields if all(f in df.columns for df in data.values())]
+        return cls.from_frames({
+            f: pd.DataFrame({symbol: df[f] for symbol, df in data.items()}).sort_index()
+            for f in fields
+        }, dtype)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    @property
+    def epoch_days(self):
+        """Tarihler, 1970-01-01'den bu yana gün sayısı (int64) olarak"""
+        dates = self.dates if self.dates.tz is None else self.dates.tz_localize(None)
+        return dates.values.astype('datetime64[ns]').view(np.int64) // _NS_PER_DAY
+
+    def codes(self, symbols):
+        """Hisse kodlarının paneldeki tamsayı sütun kodları"""
+        if self._codes is None:
+            self._codes = {symbol: i for i, symbol in enumerate(self.symbols)}
+        try:
+            return np.array([self._codes[s] for s in symbols], dtype=np.int64)
+        except KeyError as e:
+            raise KeyError(f"Panelde {e} hissesi yok") from None
+
+    def astype(self, dtype):
+        """Değerleri verilen tipe çevrilmiş yeni (bellek içi) panel"""
+        return PricePanel(self.values.astype(dtype), self.symbols, self.dates, self.fields)
+
+    def compact(self):
+        """Değerleri float32 olan, yarı bellek kaplayan kopya"""
+        return self if self.dtype == COMPACT_DTYPE else self.astype(COMPACT_DTYPE)
+
+    def _field_index(self, field):
+        try:
+            return self.fields.index(field)
+        except ValueError:
+            raise KeyError(f"Panelde '{field}' alanı yok: {self.fields}") from None
+
+    def field(self, field='Close'):
+        """Bir alanın tarih × hisse dizisini kopyasız döndürür."""
+        return self.values[self._field_index(field)]
+
+    def frame(self, field='Close', symbols=None):
+        """
+        Bir alanı tarih × hisse DataFrame'i olarak döndürür. Tüm hisseler
+        istenirse kopya alınmaz; symbols verilirse sütunlar tamsayı
+        kodlarıyla seçilir.
+        """
+        values = self.field(field)
+        if symbols is None or list(symbols) == list(self.symbols):
+            return pd.DataFrame(values, index=self.dates, columns=list(self.symbols), copy=False)
+        return pd.DataFrame(values[:, self.codes(symbols)], index=self.dates, columns=list(symbols), copy=False)
+
+    def symbol_frame(self, symbol):
+        """Tek hissenin tüm alanlarını (Open, High, ... sütunları) döndürür."""
+        j = self.codes([symbol])[0]
+        return pd.DataFrame(self.values[:, :, j].T, index=self.dates, columns=list(self.fields))
+
+    # -- Paylaşım --
+
+    def to_shared_memory(self):
+        """
+        Paneli yeni bir paylaşımlı bellek segmentine kopyalar. Dönen panel
+        segmentin sahibidir; iş bitince close() ile serbest bırakılmalıdır.
+        """
+        shm = shared_memory.SharedMemory(create=True, size=max(self.nbytes, 1))
+        values = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+        values[:] = self.values
+        values.flags.writeable = False
+        panel = PricePanel(values, self.symbols, self.dates, self.fields)
+        panel._shm = shm
+        panel._owner = True
+        return panel
+
+    def save(self, path):
+        """
+        Paneli `<path>` (.npy) ve `<path>.json` meta dosyasına yazar;
+        load() ile bellek eşlemeli olarak açılabilir.
+        """
+        np.save(path, np.ascontiguousarray(self.values))
+        meta = {
+            'symbols': list(self.symbols),
+            'dates': [d.isoformat() for d in self.dates],
+            'fields': list(self.fields),
+        }
+        with open(f"{path}.json", 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        """save() ile yazılmış paneli salt okunur bellek eşlemesiyle açar."""
+        with open(f"{path}.json", encoding='utf-8') as f:
+            meta = json.load(f)
+        return _attach_file(path, meta['symbols'], pd.DatetimeIndex(meta['dates']), meta['fields'])
+
+    def __reduce__(self):
+        # Paylaşımlı ya da dosya tabanlı paneller yalnızca meta veriyle taşınır
+        if self._shm is not None:
+            return _attach_shared, (self._shm.name, self.shape, self.values.dtype.str,
+                                    self.symbols, self.dates, self.fields)
+        if self._path is not None:
+            return _attach_file, (self._path, self.symbols, self.dates, self.fields)
+        return PricePanel, (self.values, self.symbols, self.dates, self.fields)
+
+    def close(self):
+        """Paylaşımlı belleği bırakır; sahibi ise segmenti de siler."""
+        if self._shm is None:
+            return
+        shm, self._shm = self._shm, None
+        self.values = np.empty((0,) * self.values.ndim)
+        try:
+            shm.close()
+        except BufferError:
+            # Dışarıda hâlâ görünüm varsa eşleme onlarla birlikte kapanır
+            pass
+        if self._owner:
+            shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __repr__(self):
+        return (f"PricePanel({len(self.fields)} alan, {len(self.dates)} gün, "
+                f"{len(self.symbols)} hisse, {self.dtype})")
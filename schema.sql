@@ -29,6 +29,19 @@ CREATE TABLE IF NOT EXISTS hisse_verileri (
     UNIQUE(hisse_kodu, tarih)
 );
 
+-- Hisse evreni: likidite ve aktivite ön eleme ölçümleri (hisse_evreni.py)
+CREATE TABLE IF NOT EXISTS hisse_evreni (
+    hisse_kodu VARCHAR(10) PRIMARY KEY,
+    gun_sayisi INTEGER NOT NULL,
+    islem_hacmi DOUBLE PRECISION NOT NULL,   -- Günlük ortalama kapanış × hacim (TL)
+    oynaklik DOUBLE PRECISION,               -- Yıllık getiri standart sapması
+    tamlik DOUBLE PRECISION NOT NULL,        -- Verisi olan gün / işlem günü
+    son_tarih DATE NOT NULL,
+    guncelleme TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_hisse_evreni_hacim ON hisse_evreni (islem_hacmi DESC);
+
 -- MACD sinyalleri tablosu
 CREATE TABLE IF NOT EXISTS macd_sinyalleri (
     id SERIAL PRIMARY KEY,
@@ -48,4 +61,66 @@ CREATE TABLE IF NOT EXISTS alpha_trend_sinyalleri (
     sinyal_tipi VARCHAR(10) NOT NULL,  -- 'AL' veya 'SAT'
     fiyat DECIMAL(10,2) NOT NULL,
     tarih TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-); 
\ No newline at end of file
+); 
+
+-- Telegram aboneleri tablosu
+CREATE TABLE IF NOT EXISTS aboneler (
+    chat_id BIGINT PRIMARY KEY,
+    aktif BOOLEAN NOT NULL DEFAULT TRUE,
+    kayit_tarihi TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Abone izleme listeleri tablosu (hangi sohbet hangi hisse/indikatörü takip ediyor)
+CREATE TABLE IF NOT EXISTS abone_izleme_listeleri (
+    chat_id BIGINT NOT NULL REFERENCES aboneler(chat_id) ON DELETE CASCADE,
+    hisse_kodu VARCHAR(10) NOT NULL,
+    indikator VARCHAR(20) NOT NULL,  -- 'MACD' veya 'ALPHATREND'
+    PRIMARY KEY (chat_id, hisse_kodu, indikator)
+);
+
+CREATE INDEX IF NOT EXISTS idx_izleme_hisse_indikator
+    ON abone_izleme_listeleri (hisse_kodu, indikator);
+
+-- Son sinyal durumları tablosu (yalnızca durum değişiminde sinyal göndermek için)
+CREATE TABLE IF NOT EXISTS sinyal_durumlari (
+    hisse_kodu VARCHAR(10) NOT NULL,
+    indikator VARCHAR(20) NOT NULL,  -- 'MACD' veya 'ALPHATREND'
+    durum VARCHAR(10) NOT NULL,      -- 'AL' veya 'SAT'
+    guncelleme TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (hisse_kodu, indikator)
+);
+
+-- Portföy optimizasyon sonuçları (her çalıştırmada portföy başına bir satır)
+CREATE TABLE IF NOT EXISTS portfoy_metrikleri (
+    calistirma VARCHAR(40) NOT NULL,
+    portfoy VARCHAR(100) NOT NULL,
+    baslangic DATE NOT NULL,
+    bitis DATE NOT NULL,
+    portfoy_degeri DECIMAL(18,2) NOT NULL,
+    beklenen_getiri DOUBLE PRECISION NOT NULL,
+    risk DOUBLE PRECISION NOT NULL,
+    sharpe DOUBLE PRECISION NOT NULL,
+    olusturma TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (calistirma, portfoy)
+);
+
+-- Portföy VaR/CVaR değerleri (güven seviyesi başına)
+CREATE TABLE IF NOT EXISTS portfoy_risk_seviyeleri (
+    calistirma VARCHAR(40) NOT NULL,
+    portfoy VARCHAR(100) NOT NULL,
+    guven_seviyesi DECIMAL(4,3) NOT NULL,
+    var DECIMAL(18,2) NOT NULL,
+    cvar DECIMAL(18,2) NOT NULL,
+    PRIMARY KEY (calistirma, portfoy, guven_seviyesi),
+    FOREIGN KEY (calistirma, portfoy) REFERENCES portfoy_metrikleri (calistirma, portfoy) ON DELETE CASCADE
+);
+
+-- Portföy ağırlıkları
+CREATE TABLE IF NOT EXISTS portfoy_agirliklari (
+    calistirma VARCHAR(40) NOT NULL,
+    portfoy VARCHAR(100) NOT NULL,
+    hisse_kodu VARCHAR(20) NOT NULL,
+    agirlik DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (calistirma, portfoy, hisse_kodu),
+    FOREIGN KEY (calistirma, portfoy) REFERENCES portfoy_metrikleri (calistirma, portfoy) ON DELETE CASCADE
+);
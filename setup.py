@@ -3,16 +3,19 @@ from setuptools import setup, find_packages
 setup(
     name="portfolio-optimization",
     version="0.1.0",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "tests"]),
     install_requires=[
         "pandas>=1.5.0",
         "numpy>=1.21.0",
         "scipy>=1.7.0",
         "matplotlib>=3.5.0",
-        "seaborn>=0.11.0",
-        "plotly>=5.3.0",
+        "plotly>=6.0.0",
         "python-dotenv>=0.19.0",
         "yfinance>=0.2.0",
+        "python-telegram-bot>=20.0",
+        "psycopg2-binary>=2.9.0",
+        # zoneinfo sistem saat dilimi veritabanı olmayan Windows'ta tzdata'ya düşer
+        'tzdata>=2023.3; platform_system == "Windows"',
     ],
     extras_require={
         "dev": [
@@ -21,6 +24,12 @@ setup(
             "flake8>=6.0.0",
             "bandit>=1.7.0",
         ],
+        "parquet": [
+            "pyarrow>=10.0.0",
+        ],
+        "live": [
+            "websockets>=11.0",
+        ],
     },
     author="Ali Yüksel",
     author_email="ali.yuksel@bahcesehir.edu.tr",
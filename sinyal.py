@@ -0,0 +1,21 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+
+
+@dataclass(frozen=True)
+class Sinyal:
+    """Bir hisse için bir indikatörün ürettiği tek sinyal"""
+    hisse_kodu: str
+    indikator: str          # 'MACD' veya 'ALPHATREND'
+    sinyal_tipi: str        # 'AL' veya 'SAT'
+    fiyat: float
+    metin: str              # Telegram mesajındaki satır
+    tarih: datetime = field(default=None, compare=False)
+
+
+def sinyal_mesaji(baslik: str, sinyaller: list, tarama_zamani: datetime = None) -> str:
+    """Sinyal satırlarından Telegram mesajını oluşturur"""
+    tarama_zamani = tarama_zamani or datetime.now()
+    mesaj = f"🔔 <b>{baslik}</b> 🔔\n\n" + "\n".join(s.metin for s in sinyaller)
+    mesaj += f"\n\n📅 <i>Tarama Zamanı: {tarama_zamani.strftime('%Y-%m-%d %H:%M')}</i>"
+    return mesaj
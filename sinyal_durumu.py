@@ -0,0 +1,118 @@
+from psycopg2.extras import execute_values
+import izleme
+
+
+class SinyalDurumDeposu:
+    """
+    Her (hisse, indikatör) çifti için son sinyal durumunu ('AL'/'SAT') bellekte
+    tutar ve veritabanına kalıcı olarak yazar. Yalnızca durum değiştiğinde,
+    yani gerçek bir kesişim olduğunda sinyal üretilmesini sağlar.
+    """
+
+    def __init__(self, durumlar: dict = None):
+        """
+        Args:
+            durumlar (dict): {(hisse_kodu, indikator): durum}
+        """
+        self.durumlar = dict(durumlar or {})
+        self.degisenler = {}
+
+    @classmethod
+    def veritabanindan(cls, conn):
+        """Kayıtlı son durumları tek sorguyla yükler"""
+        depo = cls()
+        if conn is None:
+            return depo
+        cur = None
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT hisse_kodu, indikator, durum FROM sinyal_durumlari")
+            depo.durumlar = {(hisse, indikator): durum for hisse, indikator, durum in cur.fetchall()}
+        except Exception as e:
+            print(f"Sinyal durumları yüklenemedi: {e}")
+            conn.rollback()
+        finally:
+            if cur:
+                cur.close()
+        return depo
+
+    def durum(self, hisse_kodu: str, indikator: str):
+        return self.durumlar.get((hisse_kodu, indikator))
+
+    def gecis_mi(self, hisse_kodu: str, indikator: str, yeni_durum: str, onceki_durum: str = None) -> bool:
+        """
+        Yeni durumu kaydeder ve bir önceki durumdan farklıysa True döndürür.
+
+        Args:
+            yeni_durum (str): Son bardaki durum
+            onceki_durum (str): Depoda kayıt yoksa kullanılacak önceki bar durumu
+
+        Returns:
+            bool: Gerçek bir durum değişimi (kesişim) olup olmadığı
+        """
+        if yeni_durum is None:
+            return False
+        anahtar = (hisse_kodu, indikator)
+        eski = self.durumlar.get(anahtar, onceki_durum)
+        if self.durumlar.get(anahtar) != yeni_durum:
+            self.durumlar[anahtar] = yeni_durum
+            self.degisenler[anahtar] = yeni_durum
+        return eski is not None and eski != yeni_durum
+
+    def kaydet(self, cur):
+        """
+        Değişen durumları tek toplu sorguyla yazar. Commit ve ardından
+        degisenler sözlüğünün temizlenmesi çağıran tarafa aittir.
+        """
+        if not self.degisenler:
+            return 0
+        execute_values(cur, """
+            INSERT INTO sinyal_durumlari (hisse_kodu, indikator, durum)
+            VALUES %s
+            ON CONFLICT (hisse_kodu, indikator) DO UPDATE SET
+                durum = EXCLUDED.durum,
+                guncelleme = CURRENT_TIMESTAMP
+        """, [(hisse, indikator, durum) for (hisse, indikator), durum in self.degisenler.items()])
+        return len(self.degisenler)
+
+
+def tarama_kaydet(conn, depo: SinyalDurumDeposu, macd_satirlari=(), alpha_trend_satirlari=()):
+    """
+    Bir taramada üretilen sinyal kayıtlarını ve değişen durumları tek işlemde yazar.
+
+    Args:
+        macd_satirlari (list): (hisse_kodu, tarih, sinyal_tipi, macd, sinyal, histogram)
+        alpha_trend_satirlari (list): (hisse_kodu, sinyal_tipi, fiyat)
+    """
+    if conn is None:
+        return
+    with izleme.aralik('persist'):
+        cur = None
+        try:
+            cur = conn.cursor()
+            if macd_satirlari:
+                execute_values(cur, """
+                    INSERT INTO macd_sinyalleri
+                    (hisse_kodu, tarih, sinyal_tipi, macd, sinyal, histogram)
+                    VALUES %s
+                    ON CONFLICT (hisse_kodu, tarih) DO UPDATE SET
+                        sinyal_tipi = EXCLUDED.sinyal_tipi,
+                        macd = EXCLUDED.macd,
+                        sinyal = EXCLUDED.sinyal,
+                        histogram = EXCLUDED.histogram
+                """, list(macd_satirlari))
+            if alpha_trend_satirlari:
+                execute_values(cur, """
+                    INSERT INTO alpha_trend_sinyalleri (hisse_kodu, sinyal_tipi, fiyat)
+                    VALUES %s
+                """, list(alpha_trend_satirlari))
+            depo.kaydet(cur)
+            conn.commit()
+            izleme.sayac('yazilan_satir', len(macd_satirlari) + len(alpha_trend_satirlari) + len(depo.degisenler))
+            depo.degisenler.clear()
+        except Exception as e:
+            print(f"Tarama sonuçları kaydedilemedi: {e}")
+            conn.rollback()
+        finally:
+            if cur:
+                cur.close()
@@ -1,14 +1,17 @@
-import yfinance as yf
 import pandas as pd
+from portfolio_data import fetch_history
+from price_archive import PriceArchive
 from datetime import datetime, timedelta
 
-def get_spy_data(start_date=None, end_date=None):
+def get_spy_data(start_date=None, end_date=None, archive=None):
     """
-    SPY (S&P 500 ETF) verilerini çeker.
+    SPY (S&P 500 ETF) verilerini çeker. Veriler tarih aralığı başına ayrı
+    CSV yerine ortak fiyat arşivinde tutulur; yalnızca eksik günler indirilir.
     
     Args:
         start_date (str): Başlangıç tarihi (YYYY-MM-DD formatında)
         end_date (str): Bitiş tarihi (YYYY-MM-DD formatında)
+        archive (PriceArchive): Fiyat arşivi (verilmezse varsayılan klasör)
         
     Returns:
         pandas.DataFrame: SPY verileri
@@ -23,11 +26,11 @@ def get_spy_data(start_date=None, end_date=None):
     print(f"Tarih aralığı: {start_date} - {end_date}")
     
     try:
-        # SPY ticker'ını oluştur
-        spy = yf.Ticker("SPY")
+        archive = archive or PriceArchive()
         
-        # Verileri çek
-        df = spy.history(start=start_date, end=end_date)
+        # Eksik günleri indir, istenen aralığı arşivden oku
+        archive.update("SPY", fetch_history, start_date, end_date)
+        df = archive.read("SPY", start_date, end_date)
         
         if df.empty:
             raise Exception("SPY için veri çekilemedi!")
@@ -39,10 +42,7 @@ def get_spy_data(start_date=None, end_date=None):
         print("\nSon 5 veri noktası:")
         print(df.tail())
         
-        # Verileri CSV dosyasına kaydet
-        csv_filename = f"spy_data_{start_date}_{end_date}.csv"
-        df.to_csv(csv_filename)
-        print(f"\nVeriler {csv_filename} dosyasına kaydedildi.")
+        print(f"\nVeriler {archive.root} arşivine kaydedildi.")
         
         return df
         
@@ -0,0 +1,339 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+# Bellekten büyük fiyat geçmişleri için tek geçişli ortalama/kovaryans.
+# Fiyatlar kaynaktan (fiyat arşivi, veritabanı ya da bellek içi tablo) tarih
+# pencereleri halinde okunur; her pencerenin getirileri kendi içinde iki
+# geçişle özetlenir ve pencereler Chan'ın birleştirme formülüyle toplanır.
+# Bellekte aynı anda yalnızca bir pencere ve (hisse × hisse) boyutlu
+# ara toplamlar bulunur.
+#
+# Pencereler ardışık bölümlere ayrılıp işçi süreçlerde de özetlenebilir;
+# bölüm sınırındaki tek getiri üst süreçte eklendiği için sonuç seri
+# hesapla aynıdır.
+
+
+class Moments:
+    """
+    Getiri satırlarının sayısı, ortalaması ve çapraz moment matrisi
+    (M2 = Σ (x - ortalama)(x - ortalama)').
+    """
+    __slots__ = ('n', 'mean', 'm2')
+
+    def __init__(self, k):
+        self.n = 0
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros((k, k))
+
+    @classmethod
+    def from_array(cls, x):
+        """(satır, hisse) dizisinin momentlerini iki geçişle hesaplar."""
+        moments = cls(x.shape[1])
+        if len(x):
+            moments.n = len(x)
+            moments.mean = x.mean(axis=0)
+            centered = x - moments.mean
+            moments.m2 = centered.T @ centered
+        return moments
+
+    def merge(self, other):
+        """Başka bir parçanın momentlerini ekler (Chan vd. paralel birleştirme)."""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean, self.m2 = other.n, other.mean.copy(), other.m2.copy()
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.n / n)
+        self.m2 = self.m2 + other.m2 + np.outer(delta, delta) * (self.n * other.n / n)
+        self.n = n
+        return self
+
+    def update(self, x):
+        """(satır, hisse) getiri parçasını ekler."""
+        return self.merge(Moments.from_array(np.asarray(x, dtype=float)))
+
+    def covariance(self, ddof=1):
+        return self.m2 / (self.n - ddof) if self.n > ddof else np.full_like(self.m2, np.nan)
+
+
+# -- Kaynaklar --
+# Her kaynak symbols niteliği, windows(start, end, chunk_rows) ve
+# read(pencere_başı, pencere_sonu) metotları sağlar. read, [baş, son) aralığında
+# tüm hisselerin fiyatı olan satırları (kesişim) sıralı DataFrame olarak döndürür.
+# Kaynaklar işçi süreçlere gönderilebilmek için seçilebilir (picklable) olmalıdır.
+
+
+def _row_windows(dates, chunk_rows, end):
+    """Sıralı tarih dizisini chunk_rows satırlık [baş, son) pencerelerine böler."""
+    if len(dates) == 0:
+        return []
+    starts = [pd.Timestamp(d) for d in dates[::chunk_rows]]
+    ends = starts[1:] + [pd.Timestamp(end) + pd.Timedelta(1, 'ns') if end is not None
+                         else pd.Timestamp(dates[-1]) + pd.Timedelta(1, 'ns')]
+    return list(zip(starts, ends))
+
+
+class FrameSource:
+    """Bellekteki tarih × hisse fiyat tablosu (testler ve küçük veriler için)"""
+
+    def __init__(self, prices):
+        self.prices = prices.dropna()
+        self.symbols = list(prices.columns)
+
+    def windows(self, start=None, end=None, chunk_rows=10_000):
+        index = self.prices.loc[start:end].index
+        return _row_windows(index.values, chunk_rows, end)
+
+    def read(self, start, end):
+        index = self.prices.index
+        return self.prices[(index >= start) & (index < end)]
+
+
+class ArchiveSource:
+    """
+    PriceArchive'den okunan, kesişim takvimine hizalanmış fiyatlar. Pencereler
+    ilk sembolün bellek eşlemeli tarih dizisinden belirlenir.
+    """
+
+    def __init__(self, root, symbols, field='Close'):
+        self.root = root
+        self.symbols = list(symbols)
+        self.field = field
+
+    def _archive(self):
+        from price_archive import PriceArchive
+        return PriceArchive(self.root)
+
+    def windows(self, start=None, end=None, chunk_rows=10_000):
+        archive = self._archive()
+        dates, i, j = archive._bounds(self.symbols[0], start, end)
+        return _row_windows(dates[i:j], chunk_rows, end)
+
+    def read(self, start, end):
+        panel = self._archive().panel(self.symbols, start, end - pd.Timedelta(1, 'ns'), fields=(self.field,))
+        return panel.frame(self.field).dropna()
+
+
+class DatabaseSource:
+    """
+    hisse_verileri tablosundan tarih pencereleriyle okunan kapanış fiyatları.
+
+    Args:
+        connect (callable): Veritabanı bağlantısı açan fonksiyon (ör. db_sorgu.db_baglanti)
+        symbols (list): Hisse kodları
+        chunk_days (int): Pencere uzunluğu (takvim günü); windows()'daki chunk_rows yerine kullanılır
+    """
+
+    def __init__(self, connect, symbols, chunk_days=365):
+        self.connect = connect
+        self.symbols = list(symbols)
+        self.chunk_days = chunk_days
+        self._conn = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_conn'] = None
+        return state
+
+    def _cursor(self):
+        if self._conn is None:
+            self._conn = self.connect()
+        return self._conn.cursor()
+
+    def _placeholders(self):
+        return ', '.join(['%s'] * len(self.symbols))
+
+    def windows(self, start=None, end=None, chunk_rows=None):
+        cur = self._cursor()
+        try:
+            cur.execute(f"SELECT MIN(tarih), MAX(tarih) FROM hisse_verileri WHERE hisse_kodu IN ({self._placeholders()})",
+                        self.symbols)
+            first, last = cur.fetchone()
+        finally:
+            cur.close()
+        if first is None:
+            return []
+        first = max(pd.Timestamp(first), pd.Timestamp(start)) if start is not None else pd.Timestamp(first)
+        last = min(pd.Timestamp(last), pd.Timestamp(end)) if end is not None else pd.Timestamp(last)
+        starts = list(pd.date_range(first, last, freq=f'{self.chunk_days}D'))
+        return list(zip(starts, starts[1:] + [last + pd.Timedelta(days=1)]))
+
+    def read(self, start, end):
+        cur = self._cursor()
+        try:
+            cur.execute(f"""
+                SELECT tarih, hisse_kodu, kapanis FROM hisse_verileri
+                WHERE hisse_kodu IN ({self._placeholders()}) AND tarih >= %s AND tarih < %s
+            """, self.symbols + [start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')])
+            rows = cur.fetchall()
+        finally:
+            cur.close()
+        if not rows:
+            return pd.DataFrame(columns=self.symbols, dtype=float)
+        frame = pd.DataFrame(rows, columns=['tarih', 'hisse_kodu', 'kapanis'])
+        frame['tarih'] = pd.to_datetime(frame['tarih'])
+        frame['kapanis'] = frame['kapanis'].astype(float)
+        prices = frame.pivot(index='tarih', columns='hisse_kodu', values='kapanis')
+        return prices.reindex(columns=self.symbols).sort_index().dropna()
+
+
+# -- Hesaplama --
+
+def _return_chunks(source, windows):
+    """
+    Pencerelerin fiyatlarını okuyup getirilere çevirir; pencere sınırındaki
+    getiri için önceki pencerenin son satırı taşınır.
+
+    Yields:
+        tuple: (getiriler, pencerenin ilk fiyat satırı, son fiyat satırı)
+    """
+    previous = None
+    for start, end in windows:
+        prices = source.read(start, end).to_numpy(dtype=float)
+        if not len(prices):
+            continue
+        block = prices if previous is None else np.vstack([previous, prices])
+        yield block[1:] / block[:-1] - 1, prices[0], prices[-1]
+        previous = prices[-1:]
+
+
+def _segment_moments(source, windows):
+    """Bir bölümün momentleri ile bölümün ilk ve son fiyat satırları"""
+    moments = Moments(len(source.symbols))
+    first = last = None
+    for returns, head, tail in _return_chunks(source, windows):
+        moments.update(returns)
+        first = head if first is None else first
+        last = tail
+    return moments, first, last
+
+
+def _split(items, parts):
+    size = -(-len(items) // parts)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def stream_moments(source, start=None, end=None, chunk_rows=10_000, workers=None):
+    """
+    Kaynağın günlük getiri ortalamasını ve kovaryansını tek geçişte hesaplar.
+
+    Args:
+        source: FrameSource, ArchiveSource veya DatabaseSource
+        start, end: Tarih aralığı
+        chunk_rows (int): Pencere başına satır sayısı
+        workers (int): Bölümleri paralel özetleyecek süreç sayısı (None: seri)
+
+    Returns:
+        Moments: Getiri momentleri
+    """
+    windows = source.windows(start, end, chunk_rows)
+    if workers and workers > 1 and len(windows) > 1:
+        segments = _split(windows, workers)
+        with ProcessPoolExecutor(max_workers=len(segments)) as pool:
+            results = list(pool.map(_segment_moments, [source] * len(segments), segments))
+    else:
+        results = [_segment_moments(source, windows)]
+
+    moments = Moments(len(source.symbols))
+    previous_last = None
+    for segment, first, last in results:
+        if first is None:
+            continue
+        if previous_last is not None:
+            # Bölüm sınırındaki getiri (önceki bölümün son, bu bölümün ilk satırı)
+            moments.update((first / previous_last - 1)[None, :])
+        moments.merge(segment)
+        previous_last = last
+    return moments
+
+
+def _range(chunks):
+    """Birinci geçiş: getiri sayısı, en küçük ve en büyük getiri"""
+    n, low, high = 0, np.inf, -np.inf
+    for r in chunks:
+        n += len(r)
+        if len(r):
+            low, high = min(low, r.min()), max(high, r.max())
+    return n, low, high
+
+
+def _histogram(chunks, bucket_of, bins):
+    """İkinci geçiş: kova başına getiri sayıları"""
+    counts = np.zeros(bins, dtype=np.int64)
+    for r in chunks:
+        counts += np.bincount(bucket_of(r), minlength=bins)
+    return counts
+
+
+def _bucket_contents(chunks, bucket_of, wanted):
+    """Üçüncü geçiş: seçilen kovalardaki getiriler ile her kovanın altındaki toplamlar"""
+    inside = {b: [] for b in wanted}
+    below_sum = {b: 0.0 for b in wanted}
+    for r in chunks:
+        bucket = bucket_of(r)
+        for b in wanted:
+            inside[b].append(r[bucket == b])
+            below_sum[b] += r[bucket < b].sum()
+    return inside, below_sum
+
+
+def portfolio_var_cvar(source, weights, confidence_levels, start=None, end=None, chunk_rows=10_000, bins=4096):
+    """
+    Portföy getirilerinin tarihsel VaR ve CVaR değerlerini getirileri
+    bellekte tutmadan hesaplar. Birinci geçiş aralığı, ikinci geçiş
+    histogramı bulur; üçüncü geçişte yalnızca istenen yüzdeliklerin düştüğü
+    kovalardaki getiriler toplanır. Sonuç np.percentile (doğrusal) ile aynıdır.
+
+    Returns:
+        dict: {güven seviyesi: (günlük VaR, günlük CVaR)}
+    """
+    weights = np.asarray(weights, dtype=float)
+    windows = source.windows(start, end, chunk_rows)
+
+    def portfolio_returns():
+        for returns, _, _ in _return_chunks(source, windows):
+            yield returns @ weights
+
+    n, low, high = _range(portfolio_returns())
+    if n == 0:
+        raise ValueError("Kaynakta getiri yok")
+    if low == high:
+        return {level: (float(low), float(low)) for level in confidence_levels}
+
+    edges = np.linspace(low, high, bins + 1)
+
+    def bucket_of(r):
+        return np.clip(np.searchsorted(edges, r, side='right') - 1, 0, bins - 1)
+
+    cumulative = np.cumsum(_histogram(portfolio_returns(), bucket_of, bins))
+
+    # Her seviye için gereken sıra istatistiklerinin (0 tabanlı) kovaları
+    targets = {}
+    for level in confidence_levels:
+        position = (n - 1) * (1 - level)
+        ranks = (int(np.floor(position)), min(int(np.floor(position)) + 1, n - 1))
+        targets[level] = (position, ranks, [int(np.searchsorted(cumulative, k, side='right')) for k in ranks])
+    wanted = sorted({b for _, _, buckets in targets.values() for b in buckets})
+    inside, below_sum = _bucket_contents(portfolio_returns(), bucket_of, wanted)
+
+    result = {}
+    for level, (position, ranks, buckets) in targets.items():
+        values = []
+        for k, b in zip(ranks, buckets):
+            in_bucket = np.sort(np.concatenate(inside[b]))
+            values.append(in_bucket[k - (cumulative[b - 1] if b else 0)])
+        var = values[0] + (position - ranks[0]) * (values[1] - values[0])
+
+        # CVaR: VaR'a eşit ya da küçük tüm getirilerin ortalaması. VaR alt sıra
+        # istatistiği ile bir sonraki arasında olduğundan bu getiriler alt
+        # istatistiğin kovası ve altındaki kovalardadır
+        b = buckets[0]
+        in_bucket = np.concatenate(inside[b])
+        selected = in_bucket[in_bucket <= var]
+        count = (cumulative[b - 1] if b else 0) + len(selected)
+        cvar = (below_sum[b] + selected.sum()) / count
+        result[level] = (float(var), float(cvar))
+    return result
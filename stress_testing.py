@@ -0,0 +1,209 @@
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+# Tarihsel stres testi. Kütüphanedeki şok pencerelerinin günlük getirileri
+# tek bir (senaryo günleri × hisse) matrisinde toplanır ve tüm portföylerin
+# ağırlık matrisiyle (hisse × portföy) tek çarpımda uygulanır. Yol kârı/zararı,
+# en büyük düşüş ve toparlanma süresi her senaryo ve portföy için aynı
+# geçişte hesaplanır; yüzlerce müşteri portföyü için PortfolioOptimizer
+# örnekleri döngüyle çalıştırılmaz.
+#
+# Ağırlıklar her gün sabit tutulur (günlük yeniden dengeleme). Senaryo
+# penceresinde verisi olmayan hisselerin getirisi sıfır (nakit) sayılır.
+
+# Şok penceresinden sonra toparlanmanın aranacağı en fazla işlem günü
+RECOVERY_HORIZON = 252
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Tarihsel şok penceresi (başlangıç ve bitiş dahil)"""
+    name: str
+    start: str
+    end: str
+    description: str = ''
+
+
+SCENARIOS = (
+    Scenario('gfc_2008', '2008-09-01', '2008-11-21', "Küresel finans krizi, Lehman sonrası çöküş"),
+    Scenario('taper_2013', '2013-05-22', '2013-06-24', "Fed parasal sıkılaştırma sinyali ve Gezi olayları"),
+    Scenario('coup_attempt_2016', '2016-07-15', '2016-07-29', "15 Temmuz darbe girişimi"),
+    Scenario('try_crisis_2018', '2018-08-01', '2018-09-14', "2018 Türk lirası krizi"),
+    Scenario('covid_crash_2020', '2020-02-20', '2020-03-23', "Mart 2020 pandemi çöküşü"),
+    Scenario('try_crisis_2021', '2021-11-15', '2021-12-20', "Kasım-Aralık 2021 kur şoku"),
+)
+
+
+def get_scenario(name):
+    """Kütüphanedeki senaryoyu adıyla döndürür."""
+    for scenario in SCENARIOS:
+        if scenario.name == name:
+            return scenario
+    raise KeyError(f"Bilinmeyen senaryo: {name}")
+
+
+def load_scenario_returns(symbols, scenarios=SCENARIOS, recovery_horizon=RECOVERY_HORIZON, provider=None):
+    """
+    Senaryo pencerelerinin (ve sonrasındaki toparlanma döneminin) günlük
+    getirilerini veri kaynağından çeker. Her pencere ayrı istenir; aradaki
+    yıllar indirilmez. Hiçbir hissenin verisi olmayan pencereler uyarıyla
+    atlanır; penceresinde verisi olmayan hisselerin sütunu NaN kalır.
+
+    Returns:
+        DataFrame: Tarih × hisse günlük getiriler (eksik günler NaN)
+    """
+    from portfolio_data import fetch_close_prices
+
+    frames = []
+    for scenario in scenarios:
+        # Toparlanma dönemi işlem günü cinsinden; takvim gününe yaklaşık çevrilir
+        start = pd.Timestamp(scenario.start) - pd.Timedelta(days=7)
+        end = pd.Timestamp(scenario.end) + pd.Timedelta(days=int(recovery_horizon * 1.5) + 7)
+        try:
+            prices = fetch_close_prices(symbols, start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'), provider)
+        except Exception as e:
+            print(f"Uyarı: {scenario.name} penceresi için veri yok, senaryo atlanıyor ({e})")
+            continue
+        frames.append(prices.pct_change(fill_method=None).iloc[1:])
+    if not frames:
+        return pd.DataFrame(columns=list(symbols), index=pd.DatetimeIndex([]), dtype=float)
+    returns = pd.concat(frames).reindex(columns=list(symbols))
+    return returns[~returns.index.duplicated()].sort_index()
+
+
+def scenarios_with_data(returns, scenarios=SCENARIOS):
+    """Şok penceresinde en az bir getiri satırı olan senaryolar; diğerleri uyarıyla çıkarılır."""
+    kept = []
+    for scenario in scenarios:
+        scenario = get_scenario(scenario) if isinstance(scenario, str) else scenario
+        window = (returns.index >= pd.Timestamp(scenario.start)) & (returns.index <= pd.Timestamp(scenario.end))
+        if window.any():
+            kept.append(scenario)
+        else:
+            print(f"Uyarı: {scenario.name} penceresinde getiri verisi yok, senaryo atlanıyor")
+    return kept
+
+
+def _weight_matrix(weights, returns):
+    """
+    Ağırlıkları (hisse × portföy) matrisine ve portföy adlarına çevirir.
+    Getirilerde olmayan hisseler sıfır getirili (nakit) sütun olarak eklenir.
+
+    Returns:
+        tuple: (ağırlık matrisi, portföy adları, ağırlıklarla hizalı getiriler)
+    """
+    if isinstance(weights, pd.Series):
+        weights = weights.to_frame(weights.name or 'portfolio')
+    if isinstance(weights, pd.DataFrame):
+        missing = weights.index.difference(returns.columns, sort=False)
+        if len(missing):
+            print(f"Uyarı: Senaryo verisi olmayan hisseler nakit sayılıyor: {list(missing)}")
+            returns = returns.reindex(columns=list(returns.columns) + list(missing), fill_value=0.0)
+        W = weights.reindex(returns.columns, fill_value=0.0).to_numpy(dtype=float)
+        return W, list(weights.columns), returns
+    weights = np.asarray(weights, dtype=float)
+    if weights.ndim == 1:
+        weights = weights[:, None]
+    return weights, [f"portfolio_{i}" for i in range(weights.shape[1])], returns
+
+
+@dataclass
+class StressResult:
+    """
+    Senaryo × portföy stres testi sonuçları.
+
+    pnl şok penceresi sonundaki birikimli getiri, max_drawdown pencere
+    içindeki en büyük düşüş, recovery_days dipten önceki zirveye dönüş için
+    geçen işlem günüdür (toparlanma yoksa NaN).
+    """
+    __slots__ = ('scenarios', 'portfolios', 'pnl', 'max_drawdown', 'recovery_days', 'paths')
+    scenarios: list        # [Scenario, ...]
+    portfolios: list       # Portföy adları
+    pnl: np.ndarray        # (senaryo, portföy)
+    max_drawdown: np.ndarray
+    recovery_days: np.ndarray
+    paths: dict            # senaryo adı -> (gün × portföy) servet yolu DataFrame'i
+
+    def to_frame(self):
+        """Her (senaryo, portföy) çifti için bir satır"""
+        index = pd.MultiIndex.from_product([[s.name for s in self.scenarios], self.portfolios],
+                                           names=['scenario', 'portfolio'])
+        return pd.DataFrame({
+            'pnl': self.pnl.ravel(),
+            'max_drawdown': self.max_drawdown.ravel(),
+            'recovery_days': self.recovery_days.ravel(),
+        }, index=index)
+
+    def worst(self, metric='max_drawdown'):
+        """Her portföyün en kötü senaryosu ve değeri"""
+        values = getattr(self, metric)
+        worst = np.argmin(values, axis=0)
+        return pd.DataFrame({
+            'scenario': [self.scenarios[i].name for i in worst],
+            metric: values[worst, np.arange(values.shape[1])],
+        }, index=pd.Index(self.portfolios, name='portfolio'))
+
+
+def stress_test(weights, returns, scenarios=SCENARIOS, recovery_horizon=RECOVERY_HORIZON):
+    """
+    Senaryoları tüm portföylere tek matris çarpımıyla uygular.
+
+    Args:
+        weights: (hisse × portföy) DataFrame, tek portföy için Series ya da
+            returns sütun sırasında ndarray
+        returns (DataFrame): Senaryo pencerelerini kapsayan günlük getiriler
+        scenarios (list): Scenario listesi ya da senaryo adları
+        recovery_horizon (int): Şoktan sonra toparlanmanın arandığı işlem günü
+
+    Returns:
+        StressResult: Senaryo × portföy sonuçları
+    """
+    scenarios = [get_scenario(s) if isinstance(s, str) else s for s in scenarios]
+    W, names, returns = _weight_matrix(weights, returns)
+
+    # Her senaryonun şok ve toparlanma satırları tek indeks dizisinde toplanır
+    dates = returns.index
+    segments, rows = [], []
+    offset = 0
+    for scenario in scenarios:
+        first = dates.searchsorted(pd.Timestamp(scenario.start))
+        shock_end = dates.searchsorted(pd.Timestamp(scenario.end), side='right')
+        last = min(shock_end + recovery_horizon, len(dates))
+        if shock_end <= first:
+            raise ValueError(f"{scenario.name} penceresinde getiri verisi yok ({scenario.start} - {scenario.end})")
+        rows.append(np.arange(first, last))
+        segments.append((offset, offset + shock_end - first, offset + last - first))
+        offset += last - first
+
+    # (senaryo günleri × hisse) @ (hisse × portföy)
+    X = np.nan_to_num(returns.to_numpy(dtype=float)[np.concatenate(rows)])
+    wealth_all = X @ W
+    np.log1p(wealth_all, out=wealth_all)
+
+    n_scenarios, n_portfolios = len(scenarios), W.shape[1]
+    pnl = np.empty((n_scenarios, n_portfolios))
+    max_drawdown = np.empty((n_scenarios, n_portfolios))
+    recovery_days = np.full((n_scenarios, n_portfolios), np.nan)
+    paths = {}
+    columns = np.arange(n_portfolios)
+    for k, (scenario, (begin, shock_end, end)) in enumerate(zip(scenarios, segments)):
+        wealth = np.exp(np.cumsum(wealth_all[begin:end], axis=0))
+        shock = wealth[:shock_end - begin]
+        peak = np.maximum.accumulate(np.vstack([np.ones(n_portfolios), shock]), axis=0)[1:]
+        drawdown = shock / peak - 1
+
+        pnl[k] = shock[-1] - 1
+        trough = np.argmin(drawdown, axis=0)
+        max_drawdown[k] = drawdown[trough, columns]
+
+        # Dipten sonra dip öncesi zirveye ilk dönülen gün
+        target = peak[trough, columns]
+        after = np.arange(len(wealth))[:, None] > trough
+        recovered = (wealth >= target) & after
+        found = recovered.any(axis=0)
+        recovery_days[k] = np.where(found, np.argmax(recovered, axis=0) - trough, np.nan)
+        recovery_days[k][max_drawdown[k] == 0] = 0
+
+        paths[scenario.name] = pd.DataFrame(wealth, index=dates[rows[k]], columns=names)
+    return StressResult(scenarios, names, pnl, max_drawdown, recovery_days, paths)
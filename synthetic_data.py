@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+# Ağ erişimi gerektirmeyen, tohumla tekrarlanabilir sentetik fiyat verisi.
+# Getiriler bir piyasa faktörü ve sektör faktörleriyle ilişkili, kalın
+# kuyruklu (Student-t) ve hisseye özgü oynaklıklarla üretilir; böylece
+# kovaryans ve VaR hesapları gerçek verideki gibi davranır.
+
+TRADING_DAYS = 252
+
+
+def symbols(n):
+    """Sentetik hisse kodları (S0000, S0001, ...)"""
+    return [f"S{i:04d}" for i in range(n)]
+
+
+def daily_returns(n_symbols, n_days, seed=0, n_sectors=10, dof=5):
+    """
+    İlişkili günlük getiri matrisi üretir.
+
+    Args:
+        n_symbols (int): Hisse sayısı
+        n_days (int): Gün sayısı
+        seed (int): Rastgele sayı tohumu
+        n_sectors (int): Sektör faktörü sayısı
+        dof (int): Student-t serbestlik derecesi (küçüldükçe kuyruk kalınlaşır)
+
+    Returns:
+        ndarray: (gün, hisse) boyutlu getiriler
+    """
+    rng = np.random.default_rng(seed)
+    scale = np.sqrt((dof - 2) / dof)
+
+    market = rng.standard_t(dof, n_days) * scale * 0.012
+    sectors = rng.standard_t(dof, (n_days, n_sectors)) * scale * 0.008
+    sector_of = rng.integers(0, n_sectors, n_symbols)
+    beta = rng.uniform(0.6, 1.4, n_symbols)
+    idio_vol = rng.uniform(0.008, 0.025, n_symbols)
+    drift = rng.normal(0.0004, 0.0003, n_symbols)
+
+    idio = rng.standard_t(dof, (n_days, n_symbols)) * scale * idio_vol
+    return drift + market[:, None] * beta + sectors[:, sector_of] + idio
+
+
+def price_frame(n_symbols, years=1, seed=0, start='2005-01-03'):
+    """
+    Tarih × hisse kapanış fiyatı tablosu üretir (iş günleri).
+
+    Returns:
+        pandas.DataFrame: Her hisse için bir kapanış sütunu
+    """
+    n_days = int(years * TRADING_DAYS)
+    returns = daily_returns(n_symbols, n_days, seed)
+    prices = 100 * np.exp(np.cumsum(np.log1p(returns), axis=0))
+    index = pd.bdate_range(start, periods=n_days, name='Date')
+    return pd.DataFrame(prices, index=index, columns=symbols(n_symbols))
+
+
+def ohlc_panel(n_symbols, years=1, seed=0, start='2005-01-03'):
+    """
+    High/Low/Close alanlı panel üretir (gösterge ve panel ölçümleri için).
+
+    Returns:
+        PricePanel: ('High', 'Low', 'Close') alanları
+    """
+    from price_panel import PricePanel
+
+    close = price_frame(n_symbols, years, seed, start)
+    spread = 1 + np.abs(np.random.default_rng([seed, 1]).normal(0, 0.01, close.shape))
+    return PricePanel.from_frames({'High': close * spread, 'Low': close / spread, 'Close': close})
+
+
+def close_series(index, seed=0):
+    """
+    Verilen tarihlerde tek hisse kapanış serisi (farklı takvimli seriler için).
+
+    Returns:
+        pandas.Series: Tarih indeksli kapanış fiyatları
+    """
+    index = pd.DatetimeIndex(index)
+    return pd.Series(100 * np.exp(np.cumsum(np.log1p(daily_returns(1, len(index), seed)[:, 0]))), index=index)
+
+
+def ohlc_frame(days=250, seed=0, start='2005-01-03', index=None):
+    """
+    Tek hisse için Open/High/Low/Close/Volume tablosu üretir.
+
+    Args:
+        index: Tarihler (verilirse days ve start yok sayılır; saat dilimli olabilir)
+
+    Returns:
+        pandas.DataFrame: yfinance history() ile aynı sütunlar
+    """
+    if index is None:
+        index = pd.bdate_range(start, periods=days, name='Date')
+    rng = np.random.default_rng(seed)
+    close = close_series(index, seed).to_numpy()
+    prev = np.concatenate([[close[0]], close[:-1]])
+    open_ = prev * (1 + rng.normal(0, 0.004, len(close)))
+    spread = np.abs(rng.normal(0, 0.01, len(close)))
+    high = np.maximum(open_, close) * (1 + spread)
+    low = np.minimum(open_, close) * (1 - spread)
+    volume = rng.lognormal(14, 0.5, len(close)).astype(np.int64)
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}, index=index)
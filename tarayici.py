@@ -0,0 +1,369 @@
+import os
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import pandas as pd
+from dotenv import load_dotenv
+import bildirim
+import hisse_evreni
+import izleme
+from abonelik import AbonelikKaydi, sinyalleri_dagit
+from bist_alpha_trend import ArtimliAlphaTrend, alpha_trend, get_stock_data, trend_durumu
+from canli_akis import CanliGorev, CanliTarayici, WebSocketKaynagi
+from db_sorgu import db_baglanti
+from macd_analiz import ArtimliMacd, macd_hesapla, macd_sinyal_satiri, veri_kaydet
+from sinyal import Sinyal
+from sinyal_durumu import SinyalDurumDeposu, tarama_kaydet
+from zamanlayici import BistTakvimi, Zamanlayici
+
+# .env dosyasından değişkenleri yükle
+load_dotenv()
+
+TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
+
+# Gün içi canlı akış (ayarlanmamışsa yalnızca zamanlanmış taramalar çalışır)
+CANLI_AKIS_URL = os.getenv('CANLI_AKIS_URL')
+CANLI_BAR_SANIYE = float(os.getenv('CANLI_BAR_SANIYE', '60'))
+
+# Abone yoksa taranacak BIST hisseleri
+VARSAYILAN_HISSELER = [
+    'THYAO', 'GARAN', 'ASELS', 'SASA', 'KRDMD',
+    'EREGL', 'BIMAS', 'AKBNK', 'YKBNK', 'PGSUS', 'TCELL'
+]
+
+
+def yahoo_bar_cek(hisse_kodu: str, gun: int) -> pd.DataFrame:
+    """Son `gun` günün günlük barlarını Yahoo Finance'den çeker"""
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=gun)
+    return get_stock_data(f"{hisse_kodu}.IS", int(start_date.timestamp()), int(end_date.timestamp()))
+
+
+class PiyasaVeriOnbellegi:
+    """
+    Stratejilerin ortak kullandığı bar önbelleği. Bir tarama döngüsünde her
+    hissenin barları yalnızca bir kez çekilir ve tüm stratejiler aynı bellekteki
+    veriyi kullanır.
+    """
+
+    def __init__(self, cekici=yahoo_bar_cek, gun: int = 90, gecerlilik: float = 300,
+                 eszamanlilik: int = 8, saat=time.monotonic):
+        """
+        Args:
+            cekici (callable): (hisse_kodu, gun) alıp OHLCV DataFrame döndüren fonksiyon
+            gun (int): Çekilecek geçmiş gün sayısı
+            gecerlilik (float): Önbellekteki verinin saniye cinsinden geçerlilik süresi
+            eszamanlilik (int): Aynı anda yapılacak en fazla HTTP isteği
+        """
+        self.cekici = cekici
+        self.gun = gun
+        self.gecerlilik = gecerlilik
+        self.eszamanlilik = eszamanlilik
+        self.saat = saat
+        self.veriler = {}
+        self.istek_sayisi = 0
+
+    def _taze_mi(self, hisse_kodu: str) -> bool:
+        kayit = self.veriler.get(hisse_kodu)
+        return kayit is not None and self.saat() - kayit[0] < self.gecerlilik
+
+    def _cek(self, hisse_kodu: str):
+        try:
+            self.istek_sayisi += 1
+            return hisse_kodu, self.cekici(hisse_kodu, self.gun)
+        except Exception as e:
+            print(f"Hata: {hisse_kodu} verisi alınamadı - {e}")
+            return hisse_kodu, None
+
+    def getir(self, hisseler) -> dict:
+        """
+        Hisselerin barlarını döndürür; önbellekte taze olmayanları paralel çeker.
+
+        Returns:
+            dict: {hisse_kodu: DataFrame}
+        """
+        eksikler = [h for h in dict.fromkeys(hisseler) if not self._taze_mi(h)]
+        if eksikler:
+            with ThreadPoolExecutor(max_workers=self.eszamanlilik) as havuz:
+                for hisse_kodu, df in havuz.map(self._cek, eksikler):
+                    if df is not None and not df.empty:
+                        self.veriler[hisse_kodu] = (self.saat(), df)
+        return {h: self.veriler[h][1] for h in hisseler if h in self.veriler}
+
+
+class Strateji(ABC):
+    """
+    Tarayıcıya eklenen strateji eklentilerinin temel sınıfı. Alt sınıflar
+    indikatörü hesaplar ve son iki barın durumunu ('AL'/'SAT') belirler.
+    """
+    indikator = None      # Abonelik ve durum deposundaki indikatör adı
+    baslik = None         # Telegram mesaj başlığı
+    kayit_anahtari = None  # tarama_kaydet() içindeki toplu kayıt listesi
+    saatler = ()          # Stratejinin çalıştığı saatler ('SS:DD')
+
+    def __init__(self, hisseler=None, saatler=None):
+        # Liste verilmezse hisseler hisse_evreni'nden, o da boşsa varsayılandan alınır
+        self.evrenden = not hisseler
+        self.hisseler = list(hisseler or VARSAYILAN_HISSELER)
+        if saatler is not None:
+            self.saatler = tuple(saatler)
+
+    @abstractmethod
+    def hesapla(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Ortak bar verisinin kopyası üzerinde indikatörü hesaplar"""
+
+    @abstractmethod
+    def durumlar(self, df: pd.DataFrame) -> tuple:
+        """Hesaplanmış veriden (onceki_durum, guncel_durum) döndürür"""
+
+    def sinyal_metni(self, hisse_kodu: str, durum: str, fiyat: float) -> str:
+        return f"{hisse_kodu} {durum} - Fiyat: {fiyat:.2f} TL"
+
+    def kayit_satiri(self, hisse_kodu: str, df: pd.DataFrame, durum: str, fiyat: float, kesisim: bool):
+        """Sinyal tablosuna yazılacak satırı döndürür (yazılmayacaksa None)"""
+        return None
+
+    def canli_gosterge(self):
+        """
+        Canlı akışta bar kapanışlarıyla güncellenen artımlı göstergeyi döndürür
+        (guncelle(acilis, yuksek, dusuk, kapanis) -> durum). Desteklenmiyorsa None.
+        """
+        return None
+
+
+class MacdStratejisi(Strateji):
+    indikator = 'MACD'
+    baslik = "MACD Sinyalleri"
+    kayit_anahtari = 'macd_satirlari'
+    saatler = ("20:00",)
+
+    def hesapla(self, df):
+        return macd_hesapla(df[['Close']].dropna().copy())
+
+    def durumlar(self, df):
+        if len(df) < 2:
+            return None, None
+        durumlar = ['AL' if m > s else 'SAT' for m, s in zip(df['MACD'].iloc[-2:], df['Signal'].iloc[-2:])]
+        return durumlar[0], durumlar[1]
+
+    def kayit_satiri(self, hisse_kodu, df, durum, fiyat, kesisim):
+        # Her günün MACD durumu macd_sinyalleri tablosuna yazılır
+        return macd_sinyal_satiri(hisse_kodu, df)
+
+    def canli_gosterge(self):
+        return ArtimliMacd()
+
+
+class AlphaTrendStratejisi(Strateji):
+    indikator = 'ALPHATREND'
+    baslik = "AlphaTrend Sinyalleri"
+    kayit_anahtari = 'alpha_trend_satirlari'
+    saatler = tuple(f"{saat:02d}:00" for saat in range(10, 19))
+
+    def hesapla(self, df):
+        # Tekil bot ile aynı pencere: son 30 takvim günü
+        return alpha_trend(df[df.index >= df.index[-1] - timedelta(days=30)].copy())
+
+    def durumlar(self, df):
+        if len(df) < 2:
+            return None, None
+        return trend_durumu(df['AlphaTrend'].iloc[-2]), trend_durumu(df['AlphaTrend'].iloc[-1])
+
+    def sinyal_metni(self, hisse_kodu, durum, fiyat):
+        if durum == 'AL':
+            return f"🟢 <b>AL Sinyali:</b> {hisse_kodu} - Fiyat: {fiyat:.2f} TL"
+        return f"🔴 <b>SAT Sinyali:</b> {hisse_kodu} - Fiyat: {fiyat:.2f} TL"
+
+    def kayit_satiri(self, hisse_kodu, df, durum, fiyat, kesisim):
+        # Yalnızca kesişimler alpha_trend_sinyalleri tablosuna yazılır
+        return (hisse_kodu, durum, fiyat) if kesisim else None
+
+    def canli_gosterge(self):
+        return ArtimliAlphaTrend()
+
+
+class TaramaServisi:
+    """
+    Tüm stratejileri tek süreçte çalıştıran tarayıcı. Her döngüde hisse
+    barları bir kez çekilir, kayıtlı tüm stratejiler aynı veri üzerinde
+    çalışır ve sinyaller tek bildirim hattından gönderilir.
+    """
+
+    def __init__(self, onbellek: PiyasaVeriOnbellegi = None, baglanti=db_baglanti,
+                 dagitici=None, varsayilan_chat_id=TELEGRAM_CHAT_ID, kayit_bar_sayisi: int = 5,
+                 evren_limiti: int = 30):
+        """
+        Args:
+            onbellek (PiyasaVeriOnbellegi): Ortak bar önbelleği
+            baglanti (callable): Veritabanı bağlantısı açan fonksiyon
+            dagitici (BildirimDagitici): Verilmezse paylaşılan dağıtıcı kullanılır
+            kayit_bar_sayisi (int): Her taramada hisse_verileri'ne yazılacak son bar sayısı
+            evren_limiti (int): Hisse listesi verilmeyen stratejilerin taradığı en likit hisse sayısı
+        """
+        self.onbellek = onbellek or PiyasaVeriOnbellegi()
+        self.baglanti = baglanti
+        self.dagitici = dagitici
+        self.varsayilan_chat_id = varsayilan_chat_id
+        self.kayit_bar_sayisi = kayit_bar_sayisi
+        self.evren_limiti = evren_limiti
+        self.stratejiler = []
+        self.durum_deposu = None
+        # Farklı görevlerin taramaları ortak durum deposu ve bar önbelleği
+        # üzerinde aynı anda çalışmaz (ilk taramada oluşturulur)
+        self._kilit = None
+
+    def strateji_ekle(self, strateji: Strateji):
+        self.stratejiler.append(strateji)
+        return strateji
+
+    @staticmethod
+    def _hisseler(strateji, kayit, evren):
+        """Abone listesi, yoksa likit hisse evreni, o da yoksa stratejinin listesi"""
+        return kayit.hisseler(strateji.indikator) or (strateji.evrenden and evren) or strateji.hisseler
+
+    def _hisseleri_analiz_et(self, stratejiler, kayit, veriler, evren=()):
+        sinyaller = defaultdict(list)
+        satirlar = defaultdict(list)
+        for strateji in stratejiler:
+            hisseler = self._hisseler(strateji, kayit, evren)
+            for hisse_kodu in hisseler:
+                df = veriler.get(hisse_kodu)
+                if df is None:
+                    continue
+                try:
+                    with izleme.aralik('indicator', hisse_kodu):
+                        hesaplanan = strateji.hesapla(df)
+                        onceki_durum, guncel_durum = strateji.durumlar(hesaplanan)
+                    if guncel_durum is None:
+                        continue
+                    fiyat = float(hesaplanan['Close'].iloc[-1])
+                    kesisim = self.durum_deposu.gecis_mi(hisse_kodu, strateji.indikator, guncel_durum, onceki_durum)
+                    satir = strateji.kayit_satiri(hisse_kodu, hesaplanan, guncel_durum, fiyat, kesisim)
+                    if satir is not None:
+                        satirlar[strateji.kayit_anahtari].append(satir)
+                    if kesisim:
+                        sinyaller[strateji].append(Sinyal(
+                            hisse_kodu, strateji.indikator, guncel_durum, fiyat,
+                            strateji.sinyal_metni(hisse_kodu, guncel_durum, fiyat), df.index[-1]
+                        ))
+                except Exception as e:
+                    print(f"Hata: {hisse_kodu} için {strateji.indikator} hesaplanamadı - {e}")
+        return sinyaller, satirlar
+
+    async def tara(self, stratejiler=None):
+        """Bir tarama döngüsü çalıştırır ve gönderilen sinyal sayısını döndürür"""
+        if self._kilit is None:
+            self._kilit = asyncio.Lock()
+        async with self._kilit:
+            return await self._tara(stratejiler)
+
+    async def _tara(self, stratejiler=None):
+        stratejiler = stratejiler or self.stratejiler
+        print(f"Tarama başladı: {datetime.now()} ({', '.join(s.indikator for s in stratejiler)})")
+
+        conn = self.baglanti()
+        try:
+            kayit = AbonelikKaydi.veritabanindan(conn, varsayilan_chat_id=self.varsayilan_chat_id)
+            if self.durum_deposu is None:
+                self.durum_deposu = SinyalDurumDeposu.veritabanindan(conn)
+
+            evren = hisse_evreni.likit_hisseler(conn, self.evren_limiti)
+
+            # Tüm stratejilerin ihtiyaç duyduğu hisseler bir kez çekilir
+            hisseler = sorted({h for s in stratejiler for h in self._hisseler(s, kayit, evren)})
+            veriler = await asyncio.to_thread(self.onbellek.getir, hisseler)
+
+            sinyaller, satirlar = self._hisseleri_analiz_et(stratejiler, kayit, veriler, evren)
+
+            if conn is not None:
+                for hisse_kodu, df in veriler.items():
+                    veri_kaydet(conn, hisse_kodu, df.tail(self.kayit_bar_sayisi))
+                # Yalnızca yeni bar yazılan hisselerin ölçümleri yenilenir
+                hisse_evreni.evreni_guncelle(conn, list(veriler))
+            tarama_kaydet(conn, self.durum_deposu, **satirlar)
+        finally:
+            if conn:
+                conn.close()
+
+        toplam = sum(len(s) for s in sinyaller.values())
+        if toplam:
+            dagitici = self.dagitici or await bildirim.varsayilan_dagitici()
+            with izleme.aralik('notify'):
+                for strateji, strateji_sinyalleri in sinyaller.items():
+                    await sinyalleri_dagit(kayit, strateji_sinyalleri, dagitici, strateji.baslik)
+            print(f"{toplam} sinyal gönderilmek üzere kuyruğa eklendi.")
+        else:
+            print("Yeni kesişim bulunamadı.")
+        izleme.disa_aktar()
+        return toplam
+
+    def gorevleri_ekle(self, zamanlayici: Zamanlayici, takvim: BistTakvimi = None):
+        """
+        Aynı saatlerde çalışan stratejileri tek tarama görevinde birleştirir;
+        böylece birlikte çalışan stratejiler aynı veri üzerinde çalışır. Her
+        görev tüm saatleriyle tek kez eklenir; önceki tarama sürüyorsa yeni
+        tetikleme atlanır.
+        """
+        takvim = takvim or BistTakvimi()
+        saatlere_gore = defaultdict(list)
+        for strateji in self.stratejiler:
+            if strateji.saatler:
+                saatlere_gore[tuple(sorted(strateji.saatler))].append(strateji)
+
+        for saatler, stratejiler in sorted(saatlere_gore.items()):
+            adlar = ", ".join(s.indikator for s in stratejiler)
+            zamanlayici.ekle(f"{adlar} taraması ({', '.join(saatler)})", lambda s=stratejiler: self.tara(s),
+                             list(saatler), takvim=takvim, cakisma='atla')
+
+
+async def main():
+    """
+    Tüm stratejileri tek süreçte çalıştırır
+    """
+    servis = TaramaServisi()
+    servis.strateji_ekle(MacdStratejisi())
+    servis.strateji_ekle(AlphaTrendStratejisi())
+
+    print("Tarayıcı başlatıldı!")
+
+    # İlk taramayı hemen yap
+    await servis.tara()
+
+    zamanlayici = Zamanlayici()
+    servis.gorevleri_ekle(zamanlayici)
+
+    canli = None
+    if CANLI_AKIS_URL:
+        # Gün içi sinyaller: her bar kapanışında, veritabanına gitmeden
+        conn = servis.baglanti()
+        try:
+            kayit = AbonelikKaydi.veritabanindan(conn, varsayilan_chat_id=servis.varsayilan_chat_id)
+            evren = hisse_evreni.likit_hisseler(conn, servis.evren_limiti)
+        finally:
+            if conn:
+                conn.close()
+        tarayici = CanliTarayici(servis.stratejiler, WebSocketKaynagi(CANLI_AKIS_URL), aralik=CANLI_BAR_SANIYE,
+                                 kayit=kayit, evren=evren, saat=time.time)
+        canli = CanliGorev(tarayici)
+        canli.baslat()
+        print(f"Canlı akış başlatıldı: {len(tarayici.akislar)} hisse, {CANLI_BAR_SANIYE:g} sn bar")
+
+    try:
+        await zamanlayici.calistir()
+    finally:
+        if canli is not None:
+            await canli.durdur()
+        # Kuyrukta bekleyen mesajları gönder ve bot oturumunu kapat
+        await bildirim.kapat()
+
+
+if __name__ == "__main__":
+    print("Tarayıcı başlatılıyor...")
+    try:
+        with izleme.ortamdan_yapilandir():
+            asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\nTarayıcı kullanıcı tarafından durduruldu.")
@@ -1,8 +1,7 @@
 import os
 from dotenv import load_dotenv
-from telegram import Bot
 import asyncio
-from telegram.error import RetryAfter
+import bildirim
 
 # .env dosyasından değişkenleri yükle
 load_dotenv()
@@ -13,29 +12,18 @@ TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 async def mesaj_gonder(mesaj: str):
     """Telegram üzerinden mesaj gönderir"""
-    bot = None
     try:
-        # Bot nesnesini oluştur
-        bot = Bot(token=TELEGRAM_BOT_TOKEN)
+        # Kalıcı bot oturumunu kullan, RetryAfter durumunda dağıtıcı tekrar dener
+        dagitici = await bildirim.varsayilan_dagitici()
+        onceki_hata = dagitici.basarisiz
+        await dagitici.gonder(mesaj, TELEGRAM_CHAT_ID, parse_mode=None)
+        await dagitici.bekle()
         
-        # Mesajı gönder
-        await bot.send_message(
-            chat_id=TELEGRAM_CHAT_ID,
-            text=mesaj
-        )
+        if dagitici.basarisiz == onceki_hata:
+            print("Mesaj başarıyla gönderildi!")
         
-        print("Mesaj başarıyla gönderildi!")
-        
-    except RetryAfter as e:
-        print(f"Çok fazla mesaj gönderildi. {e.retry_after} saniye sonra tekrar deneyin.")
     except Exception as e:
         print(f"Mesaj gönderilirken bir hata oluştu: {e}")
-    finally:
-        if bot:
-            try:
-                await bot.close()
-            except Exception:
-                pass
 
 async def main():
     while True:
@@ -52,6 +40,9 @@ async def main():
             
         except Exception as e:
             print(f"Bir hata oluştu: {e}")
+    
+    # Bot oturumunu kapat
+    await bildirim.kapat()
 
 if __name__ == "__main__":
     try:
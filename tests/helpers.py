@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import synthetic_data
+from portfolio_optimization import PortfolioOptimizer
+
+# Birden fazla test modülünün kullandığı sahte nesneler ve veri hazırlayıcıları.
+# Rastgele fiyatlar synthetic_data'dan gelir; burada yalnızca testlere özgü
+# biçimler (belirli şekilli seriler, hazır optimizer) bulunur.
+
+
+class SahteDagitici:
+    """Gönderilen (chat_id, mesaj) çiftlerini kaydeden sahte bildirim dağıtıcısı"""
+
+    def __init__(self):
+        self.mesajlar = []
+
+    async def gonder(self, mesaj, chat_id=None):
+        self.mesajlar.append((chat_id, mesaj))
+
+
+def sahte_barlar(hisse_kodu, gun):
+    """Son günde yön değiştiren sentetik kapanış fiyatları (PiyasaVeriOnbellegi çekicisi)"""
+    kapanis = np.concatenate([np.linspace(100, 80, gun - 1), [95.0]])
+    return pd.DataFrame({
+        'Open': kapanis, 'High': kapanis + 1, 'Low': kapanis - 1, 'Close': kapanis, 'Volume': 1000
+    }, index=pd.date_range('2024-01-01', periods=gun))
+
+
+def sentetik_optimizer(symbols, seed=0):
+    """Ağ erişimi olmadan synthetic_data fiyatlarıyla hazırlanmış, eşit ağırlıklı optimizer"""
+    optimizer = PortfolioOptimizer(symbols, '2023-01-01', '2023-12-31')
+    prices = synthetic_data.price_frame(len(symbols), seed=seed, start='2023-01-02')
+    prices.columns = list(symbols)
+    optimizer.data = prices
+    optimizer.returns = prices.pct_change().dropna()
+    optimizer.weights = np.full(len(symbols), 1 / len(symbols))
+    return optimizer
@@ -0,0 +1,50 @@
+import unittest
+from abonelik import AbonelikKaydi, sinyalleri_dagit
+from sinyal import Sinyal
+from tests.helpers import SahteDagitici
+
+
+def sinyal(hisse, indikator='MACD'):
+    return Sinyal(hisse, indikator, 'AL', 10.0, f"{hisse} AL - Fiyat: 10.00 TL")
+
+
+class TestAbonelikKaydi(unittest.TestCase):
+    def setUp(self):
+        self.kayit = AbonelikKaydi({
+            ('THYAO', 'MACD'): {1, 2},
+            ('GARAN', 'MACD'): {2},
+            ('GARAN', 'ALPHATREND'): {3},
+        })
+
+    def test_benzersiz_hisseler(self):
+        """Her hisse abone sayısından bağımsız olarak bir kez taranmalı"""
+        self.assertEqual(self.kayit.hisseler('MACD'), ['GARAN', 'THYAO'])
+        self.assertEqual(self.kayit.hisseler('ALPHATREND'), ['GARAN'])
+
+    def test_yonlendirme(self):
+        """Sinyaller yalnızca ilgili hisse ve indikatörü izleyen sohbetlere gitmeli"""
+        sohbetler = self.kayit.yonlendir([sinyal('THYAO'), sinyal('GARAN')])
+        self.assertEqual([s.hisse_kodu for s in sohbetler[1]], ['THYAO'])
+        self.assertEqual([s.hisse_kodu for s in sohbetler[2]], ['THYAO', 'GARAN'])
+        self.assertNotIn(3, sohbetler)
+
+    def test_abone_yoksa_varsayilan_sohbet(self):
+        """Abone yoksa tüm sinyaller varsayılan sohbete gitmeli"""
+        kayit = AbonelikKaydi(varsayilan_chat_id=99)
+        self.assertEqual(list(kayit.yonlendir([sinyal('THYAO')])), [99])
+
+
+class TestSinyalleriDagit(unittest.IsolatedAsyncioTestCase):
+    async def test_binlerce_abone(self):
+        """Her aboneye tek mesaj gönderilmeli"""
+        kayit = AbonelikKaydi({('THYAO', 'MACD'): set(range(5000))})
+        dagitici = SahteDagitici()
+        sayi = await sinyalleri_dagit(kayit, [sinyal('THYAO')], dagitici, "MACD Sinyalleri")
+        self.assertEqual(sayi, 5000)
+        self.assertEqual(len(dagitici.mesajlar), 5000)
+        self.assertEqual({chat_id for chat_id, _ in dagitici.mesajlar}, set(range(5000)))
+        self.assertIn("THYAO AL", dagitici.mesajlar[0][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+import synthetic_data
+from benchmarks.compact import measure_compact
+from benchmarks.local_db import SqliteBaglanti
+from benchmarks.run import compare, import_times, main
+from macd_analiz import veri_kaydet
+
+
+class TestSyntheticData(unittest.TestCase):
+    def test_tekrarlanabilir(self):
+        a = synthetic_data.price_frame(20, years=2, seed=3)
+        b = synthetic_data.price_frame(20, years=2, seed=3)
+        self.assertEqual(a.shape, (504, 20))
+        np.testing.assert_array_equal(a.to_numpy(), b.to_numpy())
+
+    def test_gercekci_iliski(self):
+        """Ortak piyasa faktörü nedeniyle hisseler pozitif ilişkili olmalı"""
+        returns = synthetic_data.price_frame(30, years=3).pct_change().dropna()
+        corr = returns.corr().to_numpy()
+        self.assertGreater(corr[np.triu_indices(30, 1)].mean(), 0.1)
+
+    def test_ohlc_tutarli(self):
+        df = synthetic_data.ohlc_frame(300)
+        self.assertEqual(len(df), 300)
+        self.assertTrue((df['High'] >= df[['Open', 'Close']].max(axis=1)).all())
+        self.assertTrue((df['Low'] <= df[['Open', 'Close']].min(axis=1)).all())
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_gerileme_esigi(self):
+        baseline = {'results': {'a': {'min': 0.010}, 'b': {'min': 0.010}, 'c': {'min': 0.0001}}}
+        current = {'results': {'a': {'min': 0.011}, 'b': {'min': 0.020}, 'c': {'min': 0.0004}, 'd': {'min': 1}}}
+        self.assertEqual([r[0] for r in compare(current, baseline, threshold=0.25)], ['b'])
+
+    def test_calistirma_ve_karsilastirma(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'sonuc.json')
+            self.assertEqual(main(['--filter', 'macd_hesapla', '--output', output, '--min-time', '0']), 0)
+            with open(output, encoding='utf-8') as f:
+                results = json.load(f)
+            self.assertIn('macd_hesapla[symbols=50,years=5]', results['results'])
+
+            # Temel çizgi 100 kat hızlıysa çalıştırma başarısız olmalı (50×5 yıl MACD > 1 ms)
+            for r in results['results'].values():
+                r['min'] /= 100
+            baseline = os.path.join(directory, 'temel.json')
+            with open(baseline, 'w', encoding='utf-8') as f:
+                json.dump(results, f)
+            self.assertEqual(main(['--filter', 'macd_hesapla', '--output', output, '--min-time', '0',
+                                   '--baseline', baseline]), 1)
+
+    def test_ice_aktarma_suresi(self):
+        """-X importtime çıktısı ayrıştırılır; önceden yüklenen paketler ölçüme girmez"""
+        times = import_times('portfolio_optimization', preload=('numpy', 'pandas'))
+        self.assertGreater(times['portfolio_optimization'], 0)
+        # pandas önceden yüklendiği için modülün kümülatif süresine girmez
+        self.assertLess(times['portfolio_optimization'], times['pandas'])
+
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'sonuc.json')
+            self.assertEqual(main(['--filter', 'import_', '--output', output, '--min-time', '0']), 0)
+            with open(output, encoding='utf-8') as f:
+                results = json.load(f)['results']
+        self.assertEqual(list(results), ['import_portfolio_optimization'])
+        # Bağımsız alt süreç ölçümü yüksek gürültü alt sınırıyla karşılaştırılır
+        self.assertGreater(results['import_portfolio_optimization']['noise_floor'], 0.001)
+
+    def test_kompakt_bellek_ve_sapma(self):
+        sonuc = measure_compact(20, years=2)
+        self.assertAlmostEqual(sonuc['memory_ratio'], 0.5, places=2)
+        for anahtar in ('mean', 'cov', 'weights', 'sharpe', 'var', 'macd'):
+            self.assertLess(sonuc[anahtar], 1e-4, anahtar)
+
+    def test_veri_kaydet_eksik_satirlari_atlar(self):
+        conn = SqliteBaglanti()
+        df = synthetic_data.ohlc_frame(10).astype(np.float32)
+        df.iloc[3, df.columns.get_loc('Volume')] = np.nan
+        veri_kaydet(conn, 'S0000', df)
+        cur = conn.cursor()
+        cur.execute("SELECT tarih, hacim FROM hisse_verileri ORDER BY tarih")
+        satirlar = cur.fetchall()
+        cur.close()
+        self.assertEqual(len(satirlar), 9)
+        self.assertNotIn(df.index[3].strftime('%Y-%m-%d'), [t for t, _ in satirlar])
+        self.assertEqual(satirlar[0][1], int(df['Volume'].iloc[0]))
+        self.assertIsInstance(satirlar[0][1], int)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from telegram.error import RetryAfter
+from bildirim import BildirimDagitici, TokenBucket, mesaj_bol
+
+
+class SahteBot:
+    """Gönderilen mesajları kaydeden sahte Telegram botu"""
+
+    def __init__(self, retry_after_sayisi=0):
+        self.mesajlar = []
+        self.retry_after_sayisi = retry_after_sayisi
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        if self.retry_after_sayisi > 0:
+            self.retry_after_sayisi -= 1
+            raise RetryAfter(0)
+        self.mesajlar.append((chat_id, text))
+
+
+class TestMesajBol(unittest.TestCase):
+    def test_kisa_mesaj(self):
+        """Sınırın altındaki mesaj bölünmemeli"""
+        self.assertEqual(mesaj_bol("merhaba"), ["merhaba"])
+
+    def test_uzun_mesaj_satirlardan_bolunur(self):
+        """Uzun mesaj sınırı aşmayan parçalara satır bazında bölünmeli"""
+        satirlar = [f"THYAO AL - Fiyat: {i:.2f} TL" for i in range(1000)]
+        mesaj = "\n".join(satirlar)
+        parcalar = mesaj_bol(mesaj, limit=4096)
+        self.assertGreater(len(parcalar), 1)
+        self.assertTrue(all(len(p) <= 4096 for p in parcalar))
+        self.assertEqual("\n".join(parcalar), mesaj)
+
+    def test_tek_uzun_satir(self):
+        """Sınırı tek başına aşan satır karakter bazında bölünmeli"""
+        parcalar = mesaj_bol("x" * 250, limit=100)
+        self.assertEqual([len(p) for p in parcalar], [100, 100, 50])
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_hiz_siniri(self):
+        """Jetonlar bitince bekleme süresi hıza göre hesaplanmalı"""
+        zaman = [0.0]
+        kova = TokenBucket(hiz=2, kapasite=2, saat=lambda: zaman[0])
+        self.assertEqual(kova.bekleme_suresi(), 0)
+        self.assertEqual(kova.bekleme_suresi(), 0)
+        self.assertAlmostEqual(kova.bekleme_suresi(), 0.5)
+        zaman[0] = 0.5
+        self.assertEqual(kova.bekleme_suresi(), 0)
+
+
+class TestBildirimDagitici(unittest.IsolatedAsyncioTestCase):
+    async def test_tum_mesajlar_gonderilir(self):
+        """Kuyruğa eklenen tüm mesajlar sırası korunarak gönderilmeli"""
+        bot = SahteBot()
+        async with BildirimDagitici(bot=bot, global_hiz=1000, sohbet_hizi=1000) as dagitici:
+            for i in range(50):
+                await dagitici.gonder(f"sinyal {i}", chat_id=i % 5)
+        self.assertEqual(len(bot.mesajlar), 50)
+        for chat_id in range(5):
+            sohbet = [t for c, t in bot.mesajlar if c == chat_id]
+            self.assertEqual(sohbet, [f"sinyal {i}" for i in range(chat_id, 50, 5)])
+
+    async def test_retry_after_sonrasi_tekrar_dener(self):
+        """RetryAfter alınan mesaj kaybolmamalı"""
+        bot = SahteBot(retry_after_sayisi=2)
+        async with BildirimDagitici(bot=bot, global_hiz=1000, sohbet_hizi=1000) as dagitici:
+            await dagitici.gonder("önemli sinyal", chat_id=1)
+        self.assertEqual(bot.mesajlar, [(1, "önemli sinyal")])
+        self.assertEqual(dagitici.basarisiz, 0)
+
+    async def test_uzun_mesaj_parcalanir(self):
+        """4096 karakteri aşan mesaj birden fazla mesaj olarak gönderilmeli"""
+        bot = SahteBot()
+        mesaj = "\n".join(["a" * 100] * 100)
+        async with BildirimDagitici(bot=bot, global_hiz=1000, sohbet_hizi=1000) as dagitici:
+            await dagitici.gonder(mesaj, chat_id=1)
+        self.assertEqual(len(bot.mesajlar), 3)
+        self.assertEqual("\n".join(t for _, t in bot.mesajlar), mesaj)
+
+
+if __name__ == '__main__':
+    unittest.main()
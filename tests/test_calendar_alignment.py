@@ -0,0 +1,62 @@
+import unittest
+import numpy as np
+import pandas as pd
+import synthetic_data
+from calendar_alignment import align, alignment_index, build_calendar, to_stamps
+
+
+class TestCalendarAlignment(unittest.TestCase):
+    def setUp(self):
+        self.btc = synthetic_data.close_series(pd.date_range('2024-01-01', '2024-01-31'), seed=1)
+        self.spy = synthetic_data.close_series(pd.bdate_range('2024-01-01', '2024-01-31'), seed=2)
+        # GARAN 2024-01-16 ve 17'de işlem görmemiş
+        garan = synthetic_data.close_series(pd.bdate_range('2024-01-01', '2024-01-31'), seed=3)
+        self.garan = garan.drop([pd.Timestamp('2024-01-16'), pd.Timestamp('2024-01-17')])
+
+    def test_kesisim_eski_dropna_ile_ayni(self):
+        panel = align({'SPY': self.spy, 'BTC': self.btc, 'GARAN': self.garan})
+        eski = pd.DataFrame({'SPY': self.spy, 'BTC': self.btc, 'GARAN': self.garan}).dropna()
+        self.assertEqual(list(panel.dates), list(eski.index))
+        np.testing.assert_array_equal(panel.frame()[list(eski.columns)].to_numpy(), eski.to_numpy())
+
+    def test_limitli_doldurma(self):
+        panel = align({'SPY': self.spy, 'GARAN': self.garan}, policy='ffill', limit=1)
+        frame = panel.frame()
+        self.assertEqual(frame.loc['2024-01-16', 'GARAN'], self.garan.loc['2024-01-15'])
+        self.assertTrue(np.isnan(frame.loc['2024-01-17', 'GARAN']))
+        self.assertEqual(len(frame), len(self.spy))
+
+    def test_hafta_sonu_getirisi_pazartesiye_eklenir(self):
+        """aggregate: takvim borsa günleri, BTC'nin cuma→pazartesi getirisi hafta sonunu kapsar"""
+        panel = align({'SPY': self.spy, 'BTC': self.btc}, policy='aggregate')
+        self.assertEqual(list(panel.dates), list(self.spy.index))
+        getiriler = panel.frame().pct_change()
+        beklenen = self.btc.loc['2024-01-08'] / self.btc.loc['2024-01-05'] - 1
+        self.assertAlmostEqual(getiriler.loc['2024-01-08', 'BTC'], beklenen)
+
+    def test_eksik_gunler_veri_kaybettirmez(self):
+        """Tek hissedeki boşluk diğer hisselerin günlerini silmemeli"""
+        seriler = {'SPY': self.spy, 'GARAN': self.garan, 'AKBNK': synthetic_data.close_series(self.spy.index, seed=4)}
+        eski = pd.DataFrame(seriler).pct_change().dropna()
+        yeni = align(seriler, policy='aggregate').frame().pct_change().dropna()
+        self.assertGreater(len(yeni), len(eski))
+        toplam = (1 + yeni['GARAN']).prod()
+        self.assertAlmostEqual(toplam, self.garan.iloc[-1] / self.garan.iloc[0])
+
+    def test_tamsayi_dizileri(self):
+        tarihler = [np.array([1, 2, 3, 5], dtype=np.int64), np.array([2, 3, 4, 5], dtype=np.int64)]
+        np.testing.assert_array_equal(build_calendar(tarihler, 'intersection'), [2, 3, 5])
+        takvim, indeks = alignment_index(tarihler, 'ffill')
+        np.testing.assert_array_equal(takvim, [1, 2, 3, 4, 5])
+        np.testing.assert_array_equal(indeks[:, 0], [0, 1, 2, 2, 3])
+        np.testing.assert_array_equal(indeks[:, 1], [-1, 0, 1, 2, 3])
+        with self.assertRaises(ValueError):
+            build_calendar(tarihler, 'union')
+
+    def test_saat_dilimli_indeks(self):
+        idx = pd.date_range('2024-01-02', periods=2, tz='Europe/Istanbul')
+        self.assertEqual(to_stamps(idx)[0], pd.Timestamp('2024-01-02').value)
+
+
+if __name__ == '__main__':
+    unittest.main()
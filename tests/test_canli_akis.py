@@ -0,0 +1,202 @@
+import asyncio
+import importlib.util
+import sys
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+import synthetic_data
+from abonelik import AbonelikKaydi
+from bist_alpha_trend import ArtimliAlphaTrend, alpha_trend_dizisi
+from canli_akis import (CanliGorev, CanliTarayici, HalkaTampon, SembolAkisi, TekrarKaynagi, Tick, TickKaynagi,
+                        WebSocketKaynagi)
+from macd_analiz import ArtimliMacd, macd_hesapla
+from tarayici import AlphaTrendStratejisi, MacdStratejisi
+from tests.helpers import SahteDagitici
+
+
+class SahteWebSocket:
+    """Mesaj listesini sırayla veren WebSocket bağlantısı yerine geçen nesne"""
+
+    def __init__(self, mesajlar, hata=None):
+        self.mesajlar = mesajlar
+        self.hata = hata
+        self.gonderilen = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def send(self, mesaj):
+        self.gonderilen.append(mesaj)
+
+    async def __aiter__(self):
+        for mesaj in self.mesajlar:
+            yield mesaj
+        if self.hata is not None:
+            raise self.hata
+
+
+def tickler(kapanislar, hisse_kodu='THYAO', aralik=60, tick_sayisi=3):
+    """Her barda kapanışa doğru ilerleyen `tick_sayisi` tick"""
+    sonuc, onceki = [], kapanislar[0]
+    for i, kapanis in enumerate(kapanislar):
+        for j, fiyat in enumerate(np.linspace(onceki, kapanis, tick_sayisi)):
+            sonuc.append(Tick(hisse_kodu, i * aralik + j * aralik / tick_sayisi, float(fiyat), 10.0))
+        onceki = kapanis
+    return sonuc
+
+
+class TestHalkaTampon(unittest.TestCase):
+    def test_dolunca_en_eski_silinir(self):
+        tampon = HalkaTampon(4, ('zaman', 'deger'))
+        for i in range(10):
+            tampon.ekle((i, i * 10))
+        self.assertEqual(len(tampon), 4)
+        np.testing.assert_array_equal(tampon.son()[:, 0], [6, 7, 8, 9])
+        np.testing.assert_array_equal(tampon.son(2)[:, 1], [80, 90])
+
+
+class TestSembolAkisi(unittest.TestCase):
+    def test_bar_birlestirme(self):
+        akis = SembolAkisi(60, tick_kapasitesi=8, bar_kapasitesi=8)
+        self.assertIsNone(akis.ekle(0, 10.0, 1))
+        akis.ekle(20, 12.0, 2)
+        akis.ekle(40, 9.0, 3)
+        bar = akis.ekle(61, 11.0, 4)
+        self.assertEqual(bar, (0, 10.0, 12.0, 9.0, 9.0, 6))
+        # Kapanmış bara ait geç tick yok sayılır
+        self.assertIsNone(akis.ekle(59, 100.0, 1))
+        self.assertEqual(akis.acik[2], 11.0)
+        self.assertEqual(akis.bitis, 120)
+
+
+class TestArtimliGostergeler(unittest.TestCase):
+    def setUp(self):
+        df = synthetic_data.ohlc_frame(300, seed=3)
+        self.kapanis, self.yuksek, self.dusuk = (df[c].to_numpy() for c in ('Close', 'High', 'Low'))
+
+    def test_macd_toplu_hesapla_ayni(self):
+        beklenen = macd_hesapla(pd.DataFrame({'Close': self.kapanis}))
+        gosterge, macd, sinyal = ArtimliMacd(), [], []
+        for c in self.kapanis:
+            gosterge.guncelle(c, c, c, c)
+            macd.append(gosterge.macd)
+            sinyal.append(gosterge.sinyal)
+        np.testing.assert_allclose(macd, beklenen['MACD'], atol=1e-10)
+        np.testing.assert_allclose(sinyal, beklenen['Signal'], atol=1e-10)
+
+    def test_alpha_trend_toplu_hesapla_ayni(self):
+        beklenen = alpha_trend_dizisi(self.yuksek, self.dusuk, self.kapanis, multiplier=0.5)
+        gosterge, trend = ArtimliAlphaTrend(multiplier=0.5), []
+        for h, l, c in zip(self.yuksek, self.dusuk, self.kapanis):
+            gosterge.guncelle(c, h, l, c)
+            trend.append(gosterge.trend)
+        np.testing.assert_array_equal(trend, beklenen)
+        self.assertTrue((beklenen == 1).any() and (beklenen == -1).any())
+
+
+class TestCanliTarayici(unittest.IsolatedAsyncioTestCase):
+    async def test_bar_kapanisinda_sinyal(self):
+        """Düşüşten sonra sert yükselişte MACD kesişimi bar kapanışında gönderilmeli"""
+        kapanislar = np.concatenate([np.linspace(120, 100, 40), np.linspace(100, 115, 10)])
+        dagitici = SahteDagitici()
+        tarayici = CanliTarayici([MacdStratejisi(hisseler=['THYAO'])], TekrarKaynagi(tickler(kapanislar)),
+                                 aralik=60, tick_kapasitesi=16, kayit=AbonelikKaydi(varsayilan_chat_id=42),
+                                 dagitici=dagitici)
+        toplam = await tarayici.calistir()
+
+        self.assertEqual(toplam, 1)
+        self.assertEqual(dagitici.mesajlar[0][0], 42)
+        self.assertIn("THYAO AL", dagitici.mesajlar[0][1])
+        barlar = tarayici.barlar('THYAO')
+        self.assertEqual(len(barlar), 50)
+        np.testing.assert_allclose(barlar['Close'], kapanislar)
+        # Bellek sabit: halka kapasitesinden fazla tick tutulmaz
+        self.assertEqual(len(tarayici.akislar['THYAO'].tickler), 16)
+
+    async def test_izlenmeyen_hisse_ve_kapanmis_barlar(self):
+        tarayici = CanliTarayici([MacdStratejisi(hisseler=['THYAO', 'GARAN']), AlphaTrendStratejisi(hisseler=['THYAO'])],
+                                 TekrarKaynagi([]), aralik=60)
+        self.assertEqual(tarayici.isle(Tick('SASA', 0, 10.0)), [])
+        self.assertNotIn('SASA', tarayici.akislar)
+
+        tarayici.isle(Tick('GARAN', 0, 10.0))
+        tarayici.isle(Tick('THYAO', 30, 20.0))
+        # Tick gelmeyen GARAN'ın barı da aralık dolunca kapanır
+        tarayici.isle(Tick('THYAO', 65, 21.0))
+        self.assertEqual(len(tarayici.barlar('GARAN')), 1)
+        self.assertEqual(tarayici.gostergeler[('THYAO', 'ALPHATREND')].bar_sayisi, 1)
+
+    def test_akis_tanimlamayan_kaynak_olusturulamaz(self):
+        class EksikKaynak(TickKaynagi):
+            pass
+
+        with self.assertRaises(TypeError):
+            EksikKaynak()
+
+    async def test_websocket_kaynagi(self):
+        ws = SahteWebSocket([
+            '{"hisse_kodu": "THYAO", "zaman": 1, "fiyat": 10.5, "hacim": 3}',
+            'bozuk mesaj',
+            '[{"hisse_kodu": "GARAN", "zaman": 2, "fiyat": 5}]',
+        ])
+        kaynak = WebSocketKaynagi('ws://yerel', abonelik='THYAO,GARAN', baglan=lambda url: ws, yeniden_baglan=None)
+        gelenler = [tick async for tick in kaynak.akis()]
+        self.assertEqual(gelenler, [Tick('THYAO', 1.0, 10.5, 3.0), Tick('GARAN', 2.0, 5.0, 0.0)])
+        self.assertEqual(ws.gonderilen, ['THYAO,GARAN'])
+
+    async def test_websockets_yoksa_kurulum_mesaji(self):
+        kaynak = WebSocketKaynagi('ws://yerel', yeniden_baglan=None)
+        with mock.patch.dict(sys.modules, {'websockets': None, 'websockets.exceptions': None}):
+            with self.assertRaisesRegex(ImportError, r"pip install \.\[live\]"):
+                async for _ in kaynak.akis():
+                    pass
+
+    @unittest.skipUnless(importlib.util.find_spec('websockets'), "websockets kurulu değil")
+    async def test_anormal_kapanista_yeniden_baglanir(self):
+        from websockets.exceptions import ConnectionClosedError
+
+        baglantilar = [
+            SahteWebSocket(['{"hisse_kodu": "THYAO", "zaman": 1, "fiyat": 10}'], hata=ConnectionClosedError(None, None)),
+            SahteWebSocket(['{"hisse_kodu": "THYAO", "zaman": 2, "fiyat": 11}']),
+        ]
+        kaynak = WebSocketKaynagi('ws://yerel', baglan=lambda url: baglantilar.pop(0), yeniden_baglan=0)
+        akis = kaynak.akis()
+        gelenler = [await akis.__anext__(), await akis.__anext__()]
+        await akis.aclose()
+        self.assertEqual([t.zaman for t in gelenler], [1.0, 2.0])
+
+    async def test_canli_gorev_hatada_yeniden_baslar(self):
+        class HataliKaynak(TekrarKaynagi):
+            def __init__(self):
+                super().__init__(tickler([10, 11]))
+                self.calisma = 0
+
+            async def akis(self):
+                self.calisma += 1
+                async for tick in super().akis():
+                    yield tick
+                if self.calisma == 1:
+                    raise RuntimeError("akış bozuldu")
+                await asyncio.Event().wait()   # İkinci çalışma iptale kadar sürer
+
+        kaynak = HataliKaynak()
+        tarayici = CanliTarayici([MacdStratejisi(hisseler=['THYAO'])], kaynak, aralik=60,
+                                 kayit=AbonelikKaydi(varsayilan_chat_id=42), dagitici=SahteDagitici())
+        gorev = CanliGorev(tarayici, yeniden_baslat=0)
+        gorev.baslat()
+        for _ in range(100):
+            if gorev.baslatma_sayisi == 2 and kaynak.calisma == 2:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(gorev.baslatma_sayisi, 2)
+        ikinci = gorev.gorev
+        await gorev.durdur()
+        self.assertTrue(ikinci.cancelled())
+
+
+if __name__ == '__main__':
+    unittest.main()
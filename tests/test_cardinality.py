@@ -0,0 +1,80 @@
+import itertools
+import unittest
+import numpy as np
+import pandas as pd
+import synthetic_data
+from cardinality import max_sharpe_cardinality
+from covariance import RiskModel
+from portfolio_optimization import PortfolioOptimizer, solve_max_sharpe
+from price_panel import PricePanel
+
+
+class TestCardinality(unittest.TestCase):
+    def setUp(self):
+        self.model = RiskModel.from_returns(pd.DataFrame(synthetic_data.daily_returns(40, 504, seed=2)))
+
+    def test_kisitlar_saglanir(self):
+        result = max_sharpe_cardinality(self.model, max_holdings=5, min_weight=0.05)
+        held = result.weights > 0
+        self.assertLessEqual(held.sum(), 5)
+        self.assertEqual(sorted(np.flatnonzero(held)), result.holdings)
+        self.assertTrue((result.weights[held] >= 0.05 - 1e-9).all())
+        self.assertAlmostEqual(result.weights.sum(), 1.0)
+        self.assertAlmostEqual(result.sharpe, self.model.sharpe(result.weights))
+
+        # Kısıtsız çözüm üst sınırdır; sezgisel çözüm ona yakın olmalı
+        unconstrained, _ = solve_max_sharpe(self.model)
+        self.assertLessEqual(result.sharpe, self.model.sharpe(unconstrained) + 1e-6)
+        self.assertGreater(result.sharpe, 0.95 * self.model.sharpe(unconstrained))
+
+    def test_kucuk_evrende_tam_arama_ile_ayni(self):
+        idx = np.arange(8)
+        model = RiskModel(self.model.mean[idx], self.model.cov[np.ix_(idx, idx)])
+        best = -np.inf
+        for k in (1, 2, 3):
+            for subset in itertools.combinations(range(8), k):
+                s = np.array(subset)
+                sub = RiskModel(model.mean[s], model.cov[np.ix_(s, s)])
+                weights, _ = solve_max_sharpe(sub, lower=0.1)
+                best = max(best, sub.sharpe(weights))
+        result = max_sharpe_cardinality(model, max_holdings=3, min_weight=0.1)
+        self.assertGreaterEqual(result.sharpe, best - 1e-4)
+
+    def test_lot_kisiti(self):
+        optimizer = PortfolioOptimizer(PricePanel.from_frame(synthetic_data.price_frame(20, 2)))
+        optimizer.portfolio_value = 100_000
+        # Her hissenin bir lotu portföyün yaklaşık %30'u: en fazla 3 hisse tutulabilir
+        last = optimizer.data.iloc[-1]
+        lots = {s: int(np.ceil(0.3 * 100_000 / last[s])) for s in optimizer.symbols}
+        result = optimizer.optimize_cardinality(max_holdings=6, min_weight=0.02, lot_sizes=lots)
+        self.assertIs(optimizer.weights, result.weights)
+        self.assertLessEqual(len(result.holdings), 3)
+        for i in result.holdings:
+            symbol = optimizer.symbols[i]
+            self.assertGreaterEqual(result.weights[i], lots[symbol] * last[symbol] / 100_000 - 1e-9)
+
+        with self.assertRaises(ValueError):
+            max_sharpe_cardinality(self.model, min_weight=1.5)
+
+    def test_karsilanamayan_en_iyi_hisse_baslangic_olmaz(self):
+        # Tek başına Sharpe'ı en yüksek hisse en küçük ağırlığı sağlayamıyor (ör. pahalı lot)
+        mean, cov = self.model.mean, self.model.cov
+        best = int(np.argmax(mean / np.sqrt(np.diag(cov))))
+        min_weight = np.full(len(mean), 0.01)
+        min_weight[best] = 1.5
+        result = max_sharpe_cardinality(self.model, max_holdings=5, min_weight=min_weight)
+        self.assertNotIn(best, result.holdings)
+        self.assertEqual(result.weights[best], 0)
+        self.assertAlmostEqual(result.weights.sum(), 1.0)
+
+    def test_alt_sinir_normalizasyonda_korunur(self):
+        idx = np.arange(6)
+        model = RiskModel(self.model.mean[idx], self.model.cov[np.ix_(idx, idx)])
+        lower = np.array([0.3, 0.25, 0.2, 0.1, 0.05, 0.05])
+        weights, _ = solve_max_sharpe(model, lower=lower)
+        self.assertAlmostEqual(weights.sum(), 1.0)
+        self.assertTrue((weights >= lower - 1e-12).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+import pandas as pd
+from covariance import RiskModel, cholesky_factor, nearest_psd
+from data_providers import SyntheticProvider
+from portfolio_optimization import PortfolioOptimizer
+
+
+class TestNearestPsd(unittest.TestCase):
+    def test_belirsiz_matris_onarilir(self):
+        cov = np.array([[1.0, 0.9, 0.7],
+                        [0.9, 1.0, -0.9],
+                        [0.7, -0.9, 1.0]])
+        self.assertLess(np.linalg.eigvalsh(cov).min(), 0)
+        repaired = nearest_psd(cov)
+        self.assertGreater(np.linalg.eigvalsh(repaired).min(), 0)
+        np.testing.assert_allclose(np.diag(repaired), np.diag(cov))
+        np.testing.assert_allclose(repaired, repaired.T)
+
+        L, used, onarildi = cholesky_factor(cov)
+        self.assertTrue(onarildi)
+        np.testing.assert_allclose(L @ L.T, used, atol=1e-12)
+
+    def test_pozitif_tanimli_matris_degismez(self):
+        rng = np.random.default_rng(0)
+        a = rng.normal(size=(50, 4))
+        cov = a.T @ a
+        L, used, onarildi = cholesky_factor(cov)
+        self.assertFalse(onarildi)
+        self.assertIs(used, cov)
+        w = np.array([0.1, 0.2, 0.3, 0.4])
+        self.assertAlmostEqual(RiskModel(np.zeros(4), cov).risk(w), np.sqrt(w @ cov @ w))
+
+    def test_analitik_gradyan(self):
+        rng = np.random.default_rng(1)
+        a = rng.normal(size=(100, 5))
+        model = RiskModel(rng.normal(0.1, 0.05, 5), a.T @ a / 100)
+        w = rng.dirichlet(np.ones(5))
+        _, grad = model.neg_sharpe_and_grad(w)
+        h = 1e-6
+        numeric = [(model.neg_sharpe_and_grad(w + h * e)[0] - model.neg_sharpe_and_grad(w - h * e)[0]) / (2 * h)
+                   for e in np.eye(5)]
+        np.testing.assert_allclose(grad, numeric, rtol=1e-5, atol=1e-8)
+
+    def test_float32_getiriler_float64_biriktirilir(self):
+        rng = np.random.default_rng(3)
+        returns = pd.DataFrame(rng.normal(0.0005, 0.02, (10_000, 6)))
+        tam = RiskModel.from_returns(returns)
+        kompakt = RiskModel.from_returns(returns.astype(np.float32), chunk_rows=1000)
+        self.assertEqual(kompakt.cov.dtype, np.float64)
+        # Kalan fark yalnızca getirilerin float32'ye yuvarlanmasından gelir
+        yuvarlanmis = RiskModel.from_returns(returns.astype(np.float32).astype(np.float64))
+        np.testing.assert_allclose(kompakt.mean, yuvarlanmis.mean, rtol=1e-10)
+        np.testing.assert_allclose(kompakt.cov, yuvarlanmis.cov, rtol=1e-10)
+        np.testing.assert_allclose(kompakt.cov, tam.cov, rtol=1e-5)
+
+
+class TestCollinearOptimization(unittest.TestCase):
+    def test_dogrusal_bagimli_ve_eksik_veride_gecerli_agirliklar(self):
+        prices = SyntheticProvider(seed=2).close_prices(['GARAN', 'AKBNK', 'THYAO'], '2022-01-01', '2023-01-01')
+        # YKBNK, GARAN'ın kopyası; eksik günler ikili kovaryansı belirsiz yapabilir
+        prices['YKBNK'] = prices['GARAN'] * 1.5
+        returns = prices.pct_change().iloc[1:]
+        returns.iloc[::7, 1] = np.nan
+        returns.iloc[3::11, 3] = np.nan
+
+        optimizer = PortfolioOptimizer(list(returns.columns), '2022-01-01', '2023-01-01')
+        optimizer.returns = returns
+        weights = optimizer.optimize_portfolio()
+        self.assertFalse(np.isnan(weights).any())
+        self.assertAlmostEqual(weights.sum(), 1.0)
+        self.assertTrue((weights >= 0).all())
+        stats = optimizer.calculate_portfolio_metrics(weights)
+        self.assertTrue(np.isfinite(stats.risk) and stats.risk > 0)
+        risks, _ = optimizer.sample_random_portfolios(100)
+        self.assertTrue(np.isfinite(risks).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
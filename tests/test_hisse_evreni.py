@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+import pandas as pd
+import hisse_evreni
+from benchmarks.local_db import HISSE_EVRENI, HISSE_VERILERI, SqliteBaglanti
+from data_providers import SyntheticProvider
+from portfolio_optimization import PortfolioOptimizer
+
+
+def satirlar(hisse_kodu, df, hacim_carpani=1.0):
+    return [(hisse_kodu, tarih.strftime('%Y-%m-%d'), r.Open, r.Close, r.High, r.Low, int(r.Volume * hacim_carpani))
+            for tarih, r in df.iterrows()]
+
+
+class TestHisseEvreni(unittest.TestCase):
+    def setUp(self):
+        self.conn = SqliteBaglanti(tablolar=(HISSE_VERILERI, HISSE_EVRENI))
+        self.kaynak = SyntheticProvider(seed=4, gaps={'BOSLUK': pd.bdate_range('2024-02-01', '2024-03-15')})
+        self.yaz('LIKIT', '2024-01-01', '2024-04-01', 10)
+        self.yaz('ORTA', '2024-01-01', '2024-04-01', 1)
+        self.yaz('SIG', '2024-01-01', '2024-04-01', 0.001)
+        self.yaz('BOSLUK', '2024-01-01', '2024-04-01', 10)
+        self.yaz('ESKI', '2024-01-01', '2024-03-01', 10)
+
+    def yaz(self, hisse, baslangic, bitis, hacim_carpani):
+        cur = self.conn.cursor()
+        cur.executemany("""
+            INSERT INTO hisse_verileri (hisse_kodu, tarih, acilis, kapanis, en_yuksek, en_dusuk, hacim)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """, satirlar(hisse, self.kaynak.history(hisse, baslangic, bitis), hacim_carpani))
+        self.conn.commit()
+
+    def test_olcumler(self):
+        olcumler = {o.hisse_kodu: o for o in hisse_evreni.olcumleri_hesapla(self.conn)}
+        self.assertEqual(set(olcumler), {'LIKIT', 'ORTA', 'SIG', 'BOSLUK', 'ESKI'})
+
+        df = self.kaynak.history('LIKIT', '2024-01-01', '2024-04-01')
+        pencere = df[df.index >= pd.Timestamp('2024-03-29') - pd.Timedelta(days=hisse_evreni.PENCERE_GUN)]
+        likit = olcumler['LIKIT']
+        self.assertAlmostEqual(likit.islem_hacmi, (pencere['Close'] * (pencere['Volume'] * 10).astype(int)).mean(),
+                               delta=likit.islem_hacmi * 1e-9)
+        self.assertAlmostEqual(likit.oynaklik, pencere['Close'].pct_change().std() * np.sqrt(252), places=9)
+        self.assertEqual(likit.tamlik, 1.0)
+        self.assertLess(olcumler['BOSLUK'].tamlik, 0.6)
+
+    def test_likit_hisseler_sirali_ve_elenmis(self):
+        self.assertEqual(hisse_evreni.likit_hisseler(self.conn), [])
+        self.assertEqual(hisse_evreni.evreni_guncelle(self.conn), 5)
+        secilen = hisse_evreni.likit_hisseler(self.conn, min_islem_hacmi=1e6)
+        # SIG hacimden, BOSLUK tamlıktan, ESKI güncellikten elenir
+        self.assertEqual(secilen, ['LIKIT', 'ORTA'])
+        self.assertEqual(hisse_evreni.likit_hisseler(self.conn, limit=1, min_islem_hacmi=0), ['LIKIT'])
+        self.assertEqual(hisse_evreni.likit_hisseler(self.conn, min_islem_hacmi=1e6, max_oynaklik=0.01), [])
+
+    def test_artimli_guncelleme(self):
+        hisse_evreni.evreni_guncelle(self.conn)
+        self.yaz('ESKI', '2024-03-01', '2024-04-01', 10)
+        self.assertEqual(hisse_evreni.evreni_guncelle(self.conn, ['ESKI']), 1)
+        self.assertIn('ESKI', hisse_evreni.likit_hisseler(self.conn, min_islem_hacmi=1e6))
+        self.assertEqual(hisse_evreni.evreni_guncelle(None, ['ESKI']), 0)
+
+    def test_optimizer_evrenden_kurulur(self):
+        hisse_evreni.evreni_guncelle(self.conn)
+        optimizer = PortfolioOptimizer.from_universe(self.conn, limit=2, min_islem_hacmi=1e6,
+                                                     provider=self.kaynak)
+        self.assertEqual(optimizer.symbols, ['LIKIT', 'ORTA'])
+        with self.assertRaises(Exception):
+            PortfolioOptimizer.from_universe(self.conn, min_islem_hacmi=1e15)
+
+
+if __name__ == '__main__':
+    unittest.main()
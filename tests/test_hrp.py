@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+import synthetic_data
+from benchmarks.allocation import compare_allocators
+from hrp import correlation_distance, hrp_weights, quasi_diagonal_order
+from portfolio_optimization import PortfolioOptimizer
+from price_panel import PricePanel
+
+
+class TestHrp(unittest.TestCase):
+    def test_kosegen_kovaryansta_ters_varyans(self):
+        """İlişkisiz hisselerde HRP ters varyans ağırlıklarını verir"""
+        variances = np.array([0.04, 0.01, 0.09, 0.02, 0.05])
+        weights = hrp_weights(np.diag(variances))
+        expected = (1 / variances) / (1 / variances).sum()
+        np.testing.assert_allclose(weights, expected)
+
+    def test_kumeler_yan_yana_siralanir(self):
+        # İki blok: {0, 2, 4} ve {1, 3}; blok içi ilişki yüksek, bloklar arası sıfır
+        corr = np.eye(5)
+        for group in ([0, 2, 4], [1, 3]):
+            for i in group:
+                for j in group:
+                    if i != j:
+                        corr[i, j] = 0.9
+        order = list(quasi_diagonal_order(corr))
+        positions = sorted(order.index(i) for i in (1, 3))
+        self.assertEqual(positions[1] - positions[0], 1)
+
+        dist = correlation_distance(corr)
+        self.assertAlmostEqual(dist[0, 2], np.sqrt(0.05))
+        self.assertAlmostEqual(dist[0, 1], np.sqrt(0.5))
+        weights = hrp_weights(corr)
+        self.assertAlmostEqual(weights.sum(), 1.0)
+        self.assertTrue((weights > 0).all())
+
+    def test_optimizer_ve_karsilastirma(self):
+        optimizer = PortfolioOptimizer(PricePanel.from_frame(synthetic_data.price_frame(30, 2)))
+        weights = optimizer.optimize_hrp()
+        self.assertIs(optimizer.weights, weights)
+        self.assertAlmostEqual(weights.sum(), 1.0)
+        self.assertTrue((weights > 0).all())
+
+        rows = compare_allocators((8,), years=1)
+        self.assertEqual([r['engine'] for r in rows], ['slsqp', 'hrp', 'k15'])
+        self.assertTrue(all(r['volatility'] > 0 for r in rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
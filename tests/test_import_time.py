@@ -0,0 +1,32 @@
+import json
+import subprocess
+import sys
+import unittest
+
+# Hesaplama çekirdeğini içe aktarırken yüklenmemesi gereken ağır paketler
+AGIR_PAKETLER = ['matplotlib', 'seaborn', 'plotly', 'yfinance', 'scipy', 'dotenv']
+
+
+def yuklenen_paketler(modul):
+    """
+    Modülü temiz bir Python sürecinde içe aktarır.
+
+    Returns:
+        set: sys.modules'taki üst düzey paket adları
+    """
+    kod = f"import json, sys, {modul}; print(json.dumps(sorted(sys.modules)))"
+    sonuc = subprocess.run([sys.executable, '-c', kod], capture_output=True, text=True, check=True)
+    return {ad.split('.')[0] for ad in json.loads(sonuc.stdout)}
+
+
+class TestImportTime(unittest.TestCase):
+    def test_agir_moduller_yuklenmez(self):
+        """Çekirdek modüller içe aktarılırken grafik, optimizasyon ve indirme paketleri yüklenmemeli"""
+        for modul in ('portfolio_optimization', 'portfolio_metrics', 'portfolio_report'):
+            with self.subTest(modul=modul):
+                yuklenenler = sorted(yuklenen_paketler(modul) & set(AGIR_PAKETLER))
+                self.assertEqual(yuklenenler, [], f"Gereksiz yüklenen paketler: {yuklenenler}")
+
+
+if __name__ == '__main__':
+    unittest.main()
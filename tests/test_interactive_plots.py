@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import synthetic_data
+from interactive_plots import (HTML_SIZE_BUDGET, block_average, correlation_figure, density_grid,
+                               frontier_envelope, frontier_figure, write_html)
+from portfolio_optimization import PortfolioOptimizer
+from price_panel import PricePanel
+
+
+class TestFrontier(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.risks = rng.uniform(0.1, 0.4, 1_000_000)
+        self.returns = rng.normal(0.5 * self.risks, 0.05)
+
+    def test_yogunluk_tum_noktalari_sayar(self):
+        counts, x, y = density_grid(self.risks, self.returns, bins=(50, 40))
+        self.assertEqual(counts.shape, (40, 50))
+        self.assertEqual(counts.sum(), len(self.risks))
+        self.assertTrue(np.all(np.diff(x) > 0) and np.all(np.diff(y) > 0))
+
+    def test_etkin_sinir_baskin_noktalar(self):
+        risks, returns = frontier_envelope(self.risks, self.returns, bins=100)
+        self.assertTrue(np.all(np.diff(risks) >= 0))
+        self.assertTrue(np.all(np.diff(returns) >= 0))
+        # Hiçbir bulut noktası sınırdaki bir noktadan hem az riskli hem çok getirili değil
+        for r, ret in zip(risks[::10], returns[::10]):
+            self.assertFalse(np.any((self.risks < r) & (self.returns > ret)))
+        self.assertEqual(returns[-1], self.returns.max())
+
+    def test_milyon_nokta_butce_altinda(self):
+        fig = frontier_figure(self.risks, self.returns, 0.2, 0.15, max_points=5_000)
+        scatter = [t for t in fig.data if t.type == 'scattergl']
+        self.assertEqual(len(scatter[0].x), 5_000)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'frontier.html')
+            size = write_html(fig, path)
+            self.assertEqual(os.path.getsize(path), size)
+            self.assertLess(size, HTML_SIZE_BUDGET)
+            with open(path, encoding='utf-8') as f:
+                html = f.read()
+            # plotly.js gömülü: ağdan betik yüklenmez
+            self.assertFalse('<script src=' in html)
+            self.assertTrue('plotly.js v' in html)
+
+    def test_butce_asilirsa_yazilmaz(self):
+        fig = frontier_figure(self.risks[:1000], self.returns[:1000])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'frontier.html')
+            with self.assertRaises(ValueError):
+                write_html(fig, path, max_bytes=100_000)
+            self.assertFalse(os.path.exists(path))
+
+
+class TestCorrelationHeatmap(unittest.TestCase):
+    def test_blok_ortalama(self):
+        matrix = np.arange(36, dtype=float).reshape(6, 6)
+        order = np.array([5, 4, 3, 2, 1, 0])
+        reduced, groups = block_average(matrix, order, max_cells=3)
+        self.assertEqual(reduced.shape, (3, 3))
+        self.assertEqual([list(g) for g in groups], [[5, 4], [3, 2], [1, 0]])
+        self.assertAlmostEqual(reduced[0, 1], matrix[np.ix_([5, 4], [3, 2])].mean())
+        full, groups = block_average(matrix, order, max_cells=10)
+        np.testing.assert_array_equal(full, matrix[np.ix_(order, order)])
+
+    def test_kumeler_bitisik_siralanir(self):
+        # Aynı sektördeki hisseler küme sırasında yan yana gelmeli
+        rng = np.random.default_rng(1)
+        sectors = np.repeat(np.arange(3), 4)
+        rng.shuffle(sectors)
+        factors = rng.normal(size=(500, 3))
+        returns = factors[:, sectors] + 0.3 * rng.normal(size=(500, 12))
+        symbols = [f"H{i}" for i in range(12)]
+        fig = correlation_figure(np.cov(returns, rowvar=False), symbols)
+        sirali = [sectors[symbols.index(s)] for s in fig.data[0].x]
+        self.assertEqual(sum(a != b for a, b in zip(sirali, sirali[1:])), 2)
+
+    def test_buyuk_evren_kucultulur(self):
+        optimizer = PortfolioOptimizer(PricePanel.from_frame(synthetic_data.price_frame(600, 2)))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'correlation.html')
+            size = optimizer.plot_correlation_heatmap(path, max_cells=150)
+            self.assertLess(size, HTML_SIZE_BUDGET)
+        fig = correlation_figure(optimizer.risk_model().cov, optimizer.symbols, max_cells=150)
+        self.assertEqual(np.asarray(fig.data[0].z).shape, (150, 150))
+        self.assertEqual(sum(int(label.rsplit('(', 1)[1][:-1]) for label in fig.data[0].x), 600)
+
+
+class TestSampling(unittest.TestCase):
+    def test_parcali_ornekleme_ayni_dizi(self):
+        import portfolio_optimization
+
+        optimizer = PortfolioOptimizer(PricePanel.from_frame(synthetic_data.price_frame(5, 1)))
+        np.random.seed(0)
+        risks, returns = optimizer.sample_random_portfolios(1000)
+        eski = portfolio_optimization.SAMPLE_CHUNK_ELEMENTS
+        portfolio_optimization.SAMPLE_CHUNK_ELEMENTS = 37
+        try:
+            np.random.seed(0)
+            parcali = optimizer.sample_random_portfolios(1000)
+        finally:
+            portfolio_optimization.SAMPLE_CHUNK_ELEMENTS = eski
+        np.testing.assert_allclose(parcali[0], risks, rtol=1e-12)
+        np.testing.assert_allclose(parcali[1], returns, rtol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+import izleme
+from tarayici import MacdStratejisi, PiyasaVeriOnbellegi, TaramaServisi
+from tests.helpers import SahteDagitici, sahte_barlar
+
+
+def _yogun_is(sure):
+    bitis = time.perf_counter() + sure
+    while time.perf_counter() < bitis:
+        pass
+
+
+class TestIzleme(unittest.TestCase):
+    def setUp(self):
+        izleme.olcumler.sifirla()
+        izleme.etkinlestir()
+
+    def tearDown(self):
+        izleme.devre_disi_birak()
+        izleme.olcumler.sifirla()
+
+    def test_kapaliyken_kayit_tutulmaz(self):
+        izleme.devre_disi_birak()
+        self.assertIs(izleme.aralik('fetch', 'THYAO'), izleme.aralik('solve'))
+        with izleme.aralik('fetch', 'THYAO'):
+            izleme.sayac('http_istekleri')
+        self.assertEqual(izleme.olcumler.histogramlar, {})
+        self.assertEqual(izleme.olcumler.sayaclar, {})
+
+    def test_kapaliyken_ek_yuk_ihmal_edilebilir(self):
+        izleme.devre_disi_birak()
+        baslangic = time.perf_counter()
+        for _ in range(100000):
+            with izleme.aralik('indicator', 'THYAO'):
+                pass
+            izleme.sayac('yazilan_satir')
+        # Çağrı başına birkaç mikrosaniyenin altında
+        self.assertLess((time.perf_counter() - baslangic) / 100000, 5e-6)
+
+    def test_hisse_bazli_histogram_ve_sayaclar(self):
+        for hisse in ('THYAO', 'THYAO', 'GARAN'):
+            with izleme.aralik('fetch', hisse):
+                pass
+        with self.assertRaises(ValueError):
+            with izleme.aralik('persist'):
+                raise ValueError("hata")
+        izleme.sayac('yazilan_satir', 5)
+
+        h = izleme.olcumler.histogramlar
+        self.assertEqual(h[('fetch', None)].adet, 3)
+        self.assertEqual(h[('fetch', 'THYAO')].adet, 2)
+        self.assertEqual(izleme.olcumler.sayaclar['persist_hatalari'], 1)
+        ozet = izleme.olcumler.ozet()
+        self.assertEqual(ozet['asamalar']['fetch']['adet'], 3)
+        self.assertEqual(ozet['sayaclar']['yazilan_satir'], 5)
+
+    def test_dekorator(self):
+        @izleme.olculen('solve')
+        def coz(x):
+            return x * 2
+
+        self.assertEqual(coz(3), 6)
+        self.assertEqual(izleme.olcumler.histogramlar[('solve', None)].adet, 1)
+
+    def test_prometheus_metni(self):
+        with izleme.aralik('fetch', 'THYAO'):
+            pass
+        izleme.sayac('http_istekleri', 2)
+        metin = izleme.olcumler.prometheus()
+        self.assertIn('doktora_asama_suresi_saniye_count{asama="fetch",hisse="THYAO"} 1', metin)
+        self.assertIn('doktora_asama_suresi_saniye_bucket{asama="fetch",le="+Inf"} 1', metin)
+        self.assertIn('doktora_sayac_toplam{ad="http_istekleri"} 2', metin)
+        with tempfile.TemporaryDirectory() as klasor:
+            dosya = os.path.join(klasor, 'doktora.prom')
+            izleme.olcumler.prometheus_yaz(dosya)
+            with open(dosya, encoding='utf-8') as f:
+                self.assertEqual(f.read(), metin)
+            self.assertEqual(os.listdir(klasor), ['doktora.prom'])
+
+    def test_profil_modlari(self):
+        with tempfile.TemporaryDirectory() as klasor:
+            prof = os.path.join(klasor, 'tarama.prof')
+            with izleme.profil('cprofile', prof):
+                _yogun_is(0.01)
+            self.assertGreater(os.path.getsize(prof), 0)
+
+            folded = os.path.join(klasor, 'tarama.folded')
+            is_parcacigi = threading.Thread(target=_yogun_is, args=(0.1,))
+            with izleme.profil('sampling', folded, aralik=0.002):
+                is_parcacigi.start()
+                is_parcacigi.join()
+            with open(folded, encoding='utf-8') as f:
+                self.assertIn('_yogun_is', f.read())
+
+
+class TestTaramaIzleme(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        izleme.olcumler.sifirla()
+        izleme.etkinlestir()
+
+    def tearDown(self):
+        izleme.devre_disi_birak()
+        izleme.olcumler.sifirla()
+
+    async def test_tarama_asamalari(self):
+        servis = TaramaServisi(
+            onbellek=PiyasaVeriOnbellegi(cekici=sahte_barlar, gun=60),
+            baglanti=lambda: None, dagitici=SahteDagitici(), varsayilan_chat_id=42
+        )
+        servis.strateji_ekle(MacdStratejisi(hisseler=['THYAO', 'GARAN']))
+        await servis.tara()
+        h = izleme.olcumler.histogramlar
+        self.assertEqual(h[('indicator', None)].adet, 2)
+        self.assertIn(('indicator', 'GARAN'), h)
+        self.assertEqual(h[('notify', None)].adet, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from data_providers import SyntheticProvider
+from optimization_cache import OptimizationCache
+from portfolio_optimization import PortfolioOptimizer
+
+SYMBOLS = ['THYAO', 'GARAN', 'ASELS', 'EREGL']
+
+
+def optimizer(cache, end_date='2023-12-31', symbols=SYMBOLS, start_date='2023-01-01'):
+    o = PortfolioOptimizer(symbols, start_date, end_date, provider=SyntheticProvider(seed=11))
+    o.save_csv = False
+    o.cache = cache
+    o.fetch_data()
+    return o
+
+
+class TestOptimizationCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = OptimizationCache(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_ayni_veri_onbellekten_doner(self):
+        ilk = optimizer(self.cache)
+        agirliklar = ilk.optimize_portfolio()
+        metrikler = ilk.compute_metrics(name='a', num_portfolios=200)
+
+        # Yeni süreç: yalnızca disk kaydı üzerinden
+        ikinci = optimizer(OptimizationCache(self.tmp.name))
+        # İsabette ne çözücü ne metrik hesabı çalışır
+        with mock.patch('portfolio_optimization.solve_max_sharpe') as cozucu, \
+                mock.patch('portfolio_optimization.compute_metrics') as hesap:
+            np.testing.assert_array_equal(ikinci.optimize_portfolio(), agirliklar)
+            tekrar = ikinci.compute_metrics(name='b', num_portfolios=200)
+        cozucu.assert_not_called()
+        hesap.assert_not_called()
+        self.assertEqual(tekrar.name, 'b')
+        self.assertEqual(tekrar.sharpe, metrikler.sharpe)
+        self.assertEqual(tekrar.var, metrikler.var)
+        np.testing.assert_array_equal(tekrar.frontier_risks, metrikler.frontier_risks)
+
+        # Ağırlıklar elle değiştirilirse kayıtlı metrikler kullanılmaz
+        ikinci.weights = np.full(len(SYMBOLS), 1 / len(SYMBOLS))
+        self.assertNotEqual(ikinci.compute_metrics(num_portfolios=0).sharpe, metrikler.sharpe)
+
+    def test_yeni_bar_eski_kaydi_gecersiz_kilar(self):
+        optimizer(self.cache, '2023-12-01').optimize_portfolio()
+        self.assertEqual(len(os.listdir(self.tmp.name)), 1)
+        yeni = optimizer(self.cache, '2023-12-31')
+        self.assertIsNone(self.cache.get(yeni.cache_key()))
+        yeni.optimize_portfolio()
+        self.assertEqual(os.listdir(self.tmp.name), [f"{yeni.cache_key()}.json"])
+
+    def test_kayan_pencere_onceki_cozumden_baslar(self):
+        eski = optimizer(self.cache, '2023-12-01')
+        eski.optimize_portfolio()
+        yeni = optimizer(self.cache, '2023-12-31', start_date='2023-02-01')
+        self.assertIsNone(self.cache.get(yeni.cache_key()))
+        np.testing.assert_allclose(self.cache.warm_start(SYMBOLS, yeni.solver_settings()),
+                                   (eski.weights + 1 / 400) / (1 + 4 / 400))
+        yeni.optimize_portfolio()
+        # Önceki pencerenin kaydı aynı grupta olduğundan silinir
+        self.assertEqual(os.listdir(self.tmp.name), [f"{yeni.cache_key()}.json"])
+
+    def test_en_yakin_cozumden_baslar(self):
+        optimizer(self.cache, symbols=SYMBOLS).optimize_portfolio()
+        baslangic = self.cache.warm_start(SYMBOLS + ['AKBNK'], optimizer(None).solver_settings())
+        self.assertEqual(len(baslangic), 5)
+        self.assertAlmostEqual(baslangic.sum(), 1.0)
+        self.assertLess(baslangic[-1], 0.05)
+        self.assertIsNone(self.cache.warm_start(SYMBOLS, {'objective': 'baska'}))
+
+    def test_lru_ve_boyut_siniri(self):
+        cache = OptimizationCache(self.tmp.name, max_entries=3)
+        for i in range(5):
+            cache.put(f"g{i}-x", cache.new_entry(['A'], {}, [1.0]))
+            os.utime(cache._path(f"g{i}-x"), (i, i))
+        cache.get('g2-x')   # son kullanılan olur
+        cache.put('g5-x', cache.new_entry(['A'], {}, [1.0]))
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ['g2-x.json', 'g4-x.json', 'g5-x.json'])
+
+        kucuk = OptimizationCache(self.tmp.name, max_bytes=1)
+        kucuk.evict()
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
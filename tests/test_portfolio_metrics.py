@@ -0,0 +1,111 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+from benchmarks import local_db
+from benchmarks.local_db import PORTFOY_TABLOLARI, SqliteBaglanti
+from portfolio_metrics import (PortfolioMetrics, metrics_to_frames, read_json, write_json, write_parquet,
+                               write_to_database)
+from tests.helpers import sentetik_optimizer
+
+
+class TestPortfolioMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = [
+            sentetik_optimizer(['THYAO', 'GARAN', 'ASELS'], seed=i).compute_metrics(name=f"p{i}", num_portfolios=0)
+            for i in range(2)
+        ]
+
+    def test_kayitlar_slots_kullanir(self):
+        """Kayıtlar __dict__ taşımamalı"""
+        m = self.metrics[0]
+        self.assertFalse(hasattr(m, '__dict__'))
+        self.assertFalse(hasattr(m.weights[0], '__dict__'))
+        self.assertFalse(hasattr(m.risk_levels[0], '__dict__'))
+
+    def test_portfolio_stats_tuple_gibi_acilir(self):
+        """calculate_portfolio_metrics eski tuple arayüzünü korumalı"""
+        optimizer = sentetik_optimizer(['THYAO', 'GARAN'])
+        returns, risk, sharpe = optimizer.calculate_portfolio_metrics(optimizer.weights)
+        stats = optimizer.calculate_portfolio_metrics(optimizer.weights)
+        self.assertEqual(stats.sharpe, sharpe)
+        self.assertEqual(stats.expected_return, returns)
+
+    def test_json_gidis_donus(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'metrics.json')
+            write_json(self.metrics, filename)
+            loaded = read_json(filename)
+        self.assertEqual([m.to_dict() for m in loaded], [m.to_dict() for m in self.metrics])
+        self.assertIsInstance(loaded[0], PortfolioMetrics)
+
+    def test_toplu_tablolar(self):
+        summary, weights = metrics_to_frames(self.metrics, run_id='gece')
+        self.assertEqual(len(summary), 2)
+        self.assertEqual(len(weights), 6)
+        self.assertIn('var_95', summary.columns)
+        self.assertIn('cvar_99', summary.columns)
+        self.assertEqual(set(summary['run_id']), {'gece'})
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), "pyarrow kurulu değil")
+    def test_parquet_gidis_donus(self):
+        summary, weights = metrics_to_frames(self.metrics, run_id='gece')
+        with tempfile.TemporaryDirectory() as directory:
+            prefix = os.path.join(directory, 'metrics')
+            write_parquet(self.metrics, prefix, run_id='gece')
+            pd.testing.assert_frame_equal(pd.read_parquet(f"{prefix}_summary.parquet"), summary)
+            pd.testing.assert_frame_equal(pd.read_parquet(f"{prefix}_weights.parquet"), weights)
+
+    def test_parquet_motoru_yoksa_kurulum_mesaji(self):
+        with tempfile.TemporaryDirectory() as directory:
+            prefix = os.path.join(directory, 'metrics')
+            with mock.patch.dict(sys.modules, {'pyarrow': None, 'fastparquet': None}):
+                with self.assertRaisesRegex(ImportError, r"pip install \.\[parquet\]"):
+                    write_parquet(self.metrics, prefix)
+            self.assertEqual(os.listdir(directory), [])
+
+
+@mock.patch('psycopg2.extras.execute_values', local_db.execute_values)
+class TestWriteToDatabase(unittest.TestCase):
+    def setUp(self):
+        self.metrics = [
+            sentetik_optimizer(['THYAO', 'GARAN', 'ASELS'], seed=i).compute_metrics(name=f"p{i}", num_portfolios=0)
+            for i in range(2)
+        ]
+        self.conn = SqliteBaglanti(tablolar=PORTFOY_TABLOLARI)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def sorgu(self, sql):
+        cur = self.conn.cursor()
+        cur.execute(sql)
+        return cur.fetchall()
+
+    def test_uc_tabloya_yazar(self):
+        write_to_database(self.conn, self.metrics, 'gece')
+        self.assertEqual(self.sorgu("SELECT portfoy, sharpe FROM portfoy_metrikleri ORDER BY portfoy"),
+                         [(m.name, m.sharpe) for m in self.metrics])
+        self.assertEqual(len(self.sorgu("SELECT * FROM portfoy_risk_seviyeleri")), 4)
+        self.assertEqual(self.sorgu("SELECT hisse_kodu, agirlik FROM portfoy_agirliklari WHERE portfoy = 'p0'"),
+                         [(w.symbol, w.weight) for w in self.metrics[0].weights])
+
+        # Aynı çalıştırma tekrar yazılırsa satırlar güncellenir, çoğalmaz
+        self.metrics[0].sharpe = 9.0
+        write_to_database(self.conn, self.metrics, 'gece')
+        self.assertEqual(self.sorgu("SELECT sharpe FROM portfoy_metrikleri WHERE portfoy = 'p0'"), [(9.0,)])
+        self.assertEqual(len(self.sorgu("SELECT * FROM portfoy_agirliklari")), 6)
+
+    def test_hatada_geri_alinir(self):
+        self.metrics[1].weights[0].weight = None   # agirlik NOT NULL
+        with self.assertRaises(Exception):
+            write_to_database(self.conn, self.metrics, 'gece')
+        self.assertEqual(self.sorgu("SELECT * FROM portfoy_metrikleri"), [])
+        self.assertEqual(self.sorgu("SELECT * FROM portfoy_risk_seviyeleri"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 import pandas as pd
 import numpy as np
+from data_providers import SyntheticProvider
 from portfolio_optimization import PortfolioOptimizer
 
 class TestPortfolioOptimizer(unittest.TestCase):
@@ -9,7 +10,10 @@ class TestPortfolioOptimizer(unittest.TestCase):
         self.symbols = ['THYAO', 'GARAN', 'ASELS']
         self.start_date = '2023-01-01'
         self.end_date = '2023-12-31'
-        self.optimizer = PortfolioOptimizer(self.symbols, self.start_date, self.end_date)
+        # Ağ yerine tohumlu sentetik fiyatlar; testler çevrimdışı ve tekrarlanabilir
+        self.optimizer = PortfolioOptimizer(self.symbols, self.start_date, self.end_date,
+                                            provider=SyntheticProvider(seed=42))
+        self.optimizer.save_csv = False
         
     def test_initialization(self):
         """Optimizer'ın doğru başlatıldığını kontrol eder"""
@@ -27,6 +31,26 @@ class TestPortfolioOptimizer(unittest.TestCase):
         self.assertTrue(isinstance(self.optimizer.data, pd.DataFrame))
         self.assertEqual(len(self.optimizer.data.columns), len(self.symbols))
         
+    def test_islemden_kalkan_hisse_dusuk_riskli_gorunmez(self):
+        """250 günün 50'sinden sonra işlem görmeyen hissenin fiyatı sınırsız taşınmamalı"""
+        tum_gunler = SyntheticProvider(seed=42).history('ASELS', self.start_date, self.end_date).index
+        kaynak = SyntheticProvider(seed=42, gaps={'ASELS': tum_gunler[50:]})
+        gercek = kaynak.history('ASELS', self.start_date, self.end_date)['Close'].pct_change().std()
+
+        optimizer = PortfolioOptimizer(self.symbols, self.start_date, self.end_date, provider=kaynak)
+        optimizer.save_csv = False
+        optimizer.fetch_data()
+        getiriler = optimizer.returns['ASELS']
+        self.assertFalse(getiriler.isna().any())
+        # Doldurma sınırı kadar sahte %0 gün kalabilir; oynaklık neredeyse aynı
+        self.assertLessEqual((getiriler == 0).sum(), optimizer.fill_limit)
+        self.assertGreater(getiriler.std(), 0.9 * gercek)
+
+        # Sınırsız doldurma eski hatayı yeniden üretir
+        optimizer.fill_limit = None
+        optimizer.fetch_data()
+        self.assertLess(optimizer.returns['ASELS'].std(), 0.5 * gercek)
+
     def test_calculate_returns(self):
         """Getiri hesaplama fonksiyonunu test eder"""
         self.optimizer.fetch_data()
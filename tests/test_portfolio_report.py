@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+import unittest
+from portfolio_report import write_reports
+from tests.helpers import sentetik_optimizer
+
+
+class TestPortfolioReport(unittest.TestCase):
+    def test_metrikler_tek_kaynaktan(self):
+        """Metrik nesnesindeki VaR/CVaR değerleri optimizer ile aynı olmalı"""
+        optimizer = sentetik_optimizer(['THYAO', 'GARAN', 'ASELS'])
+        metrics = optimizer.compute_metrics(num_portfolios=100)
+        self.assertAlmostEqual(metrics.var[0.95], optimizer.calculate_var(0.95))
+        self.assertAlmostEqual(metrics.cvar[0.99], optimizer.calculate_cvar(0.99))
+        self.assertEqual(len(metrics.frontier_risks), 100)
+
+    def test_paralel_raporlar(self):
+        """Her portföy için ayrı adlandırılmış dosyalar süreç havuzunda üretilmeli"""
+        metrics_list = [
+            sentetik_optimizer(['THYAO', 'GARAN', 'ASELS'], seed=i).compute_metrics(name=f"musteri_{i}", num_portfolios=50)
+            for i in range(3)
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            results = write_reports(metrics_list, output_dir=directory, run='test', max_workers=2)
+            self.assertEqual(sorted(results), ['musteri_0', 'musteri_1', 'musteri_2'])
+            for paths in results.values():
+                for path in paths.values():
+                    self.assertTrue(os.path.exists(path), path)
+            with open(results['musteri_1']['json'], encoding='utf-8') as f:
+                report = json.load(f)
+            self.assertAlmostEqual(sum(w['weight'] for w in report['weights']), 1.0)
+            self.assertEqual(report['risk_levels'][0]['var'], metrics_list[1].var[0.95])
+
+    def test_ayni_dosya_adina_donusen_adlar_reddedilir(self):
+        metrics_list = [sentetik_optimizer(['THYAO', 'GARAN']).compute_metrics(name=name, num_portfolios=0)
+                        for name in ('a/b', 'a_b')]
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaisesRegex(ValueError, 'a/b'):
+                write_reports(metrics_list, output_dir=directory, run='test', max_workers=1)
+            with self.assertRaises(ValueError):
+                write_reports(metrics_list[:1] * 2, output_dir=directory, run='test', max_workers=1)
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_bulutsuz_rapor_olmayan_grafige_baglanmaz(self):
+        """num_portfolios=0 ise etkin sınır çizilmez ve HTML ona bağlantı vermez"""
+        metrics = sentetik_optimizer(['THYAO', 'GARAN']).compute_metrics(name='bulutsuz', num_portfolios=0)
+        with tempfile.TemporaryDirectory() as directory:
+            paths = write_reports([metrics], output_dir=directory, run='test', max_workers=1)['bulutsuz']
+            self.assertNotIn('frontier', paths)
+            for path in paths.values():
+                self.assertTrue(os.path.exists(path), path)
+            with open(paths['html'], encoding='utf-8') as f:
+                html = f.read()
+            self.assertNotIn('efficient_frontier', html)
+            self.assertIn(os.path.basename(paths['composition']), html)
+
+
+if __name__ == '__main__':
+    unittest.main()
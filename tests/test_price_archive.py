@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import synthetic_data
+from price_archive import PriceArchive
+
+
+class SayacliIndirici:
+    """Her çağrıyı kaydeden sahte indirme fonksiyonu"""
+    def __init__(self, frame):
+        self.frame = frame
+        self.cagrilar = []
+
+    def __call__(self, symbol, start, end):
+        self.cagrilar.append((pd.Timestamp(start), pd.Timestamp(end)))
+        return self.frame[(self.frame.index >= start) & (self.frame.index <= end)]
+
+
+class TestPriceArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.archive = PriceArchive(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_sona_ekleme_ve_aralik_okuma(self):
+        data = synthetic_data.ohlc_frame(index=pd.bdate_range('2020-01-01', periods=500))
+        self.assertEqual(self.archive.append('SPY', data.iloc[:300]), 300)
+        # Çakışan satırlar tekrar yazılmaz
+        self.assertEqual(self.archive.append('SPY', data.iloc[250:]), 200)
+
+        self.assertIsInstance(self.archive.column('SPY', 'Close'), np.memmap)
+        sonuc = self.archive.read('SPY', '2020-06-01', '2020-06-30')
+        beklenen = data.loc['2020-06-01':'2020-06-30']
+        np.testing.assert_array_equal(sonuc.index.values, beklenen.index.values)
+        np.testing.assert_allclose(sonuc['Close'], beklenen['Close'])
+        self.assertEqual(self.archive.symbols(), ['SPY'])
+
+    def test_saat_dilimli_indeks(self):
+        """yfinance'in saat dilimli günlük indeksleri takvim gününde saklanmalı"""
+        data = synthetic_data.ohlc_frame(index=pd.date_range('2024-01-02', periods=5, tz='America/New_York'))
+        self.archive.append('SPY', data)
+        self.assertEqual(self.archive.first_date('SPY'), pd.Timestamp('2024-01-02'))
+
+    def test_yarim_kalan_yazim_temizlenir(self):
+        data = synthetic_data.ohlc_frame(index=pd.bdate_range('2021-01-01', periods=20))
+        self.archive.append('GLD', data.iloc[:10])
+        # Tarih dosyası yazılmadan kesilen bir ekleme: alan dosyasında fazladan satır
+        with open(os.path.join(self.tmp.name, 'GLD', 'Close.f8'), 'ab') as f:
+            f.write(np.zeros(3).tobytes())
+        self.assertEqual(len(self.archive.column('GLD', 'Close')), 10)
+        self.archive.append('GLD', data.iloc[10:])
+        np.testing.assert_allclose(self.archive.read('GLD')['Close'], data['Close'])
+
+    def test_capraz_varlik_hizalama(self):
+        """7/24 işlem gören varlık ile borsa günleri kesişim ve doldurmasız birleşimle hizalanmalı"""
+        self.archive.append('SPY', synthetic_data.ohlc_frame(index=pd.bdate_range('2024-01-01', '2024-01-31'), seed=1))
+        self.archive.append('BTC-USD', synthetic_data.ohlc_frame(index=pd.date_range('2023-12-01', '2024-02-29'), seed=2))
+
+        ic = self.archive.panel(['SPY', 'BTC-USD'], '2024-01-10', '2024-02-10')
+        self.assertEqual(ic.symbols, ('SPY', 'BTC-USD'))
+        self.assertEqual(list(ic.dates), list(pd.bdate_range('2024-01-10', '2024-01-31')))
+        self.assertFalse(np.isnan(ic.values).any())
+        np.testing.assert_allclose(
+            ic.frame()['BTC-USD'], self.archive.read('BTC-USD')['Close'].reindex(ic.dates)
+        )
+
+        dis = self.archive.panel(['SPY', 'BTC-USD'], '2024-01-10', '2024-02-10', policy='ffill', limit=0)
+        self.assertEqual(len(dis.dates), 32)
+        self.assertTrue(np.isnan(dis.frame().loc['2024-01-13', 'SPY']))
+
+    def test_guncelleme_yalnizca_eksik_gunleri_indirir(self):
+        kaynak = synthetic_data.ohlc_frame(index=pd.bdate_range('2022-01-03', '2022-12-30'))
+        indir = SayacliIndirici(kaynak)
+        self.archive.update('SPY', indir, '2022-01-01', '2022-06-30')
+        self.archive.update('SPY', indir, '2022-01-01', '2022-06-30')
+        self.archive.update('SPY', indir, '2022-01-01', '2022-12-30')
+        self.assertEqual(len(indir.cagrilar), 2)
+        self.assertEqual(indir.cagrilar[1][0], pd.Timestamp('2022-07-01'))
+        # Daha eski bir başlangıç istenirse geçmiş baştan yazılır
+        self.archive.update('SPY', SayacliIndirici(synthetic_data.ohlc_frame(index=pd.bdate_range('2021-12-01', '2021-12-31'))),
+                            '2021-12-01', '2022-12-30')
+        self.assertEqual(self.archive.first_date('SPY'), pd.Timestamp('2021-12-01'))
+        self.assertEqual(self.archive.last_date('SPY'), pd.Timestamp('2022-12-30'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import pickle
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import synthetic_data
+from bist_alpha_trend import alpha_trend
+from macd_analiz import macd_hesapla
+from portfolio_optimization import PortfolioOptimizer
+from price_panel import PricePanel
+
+
+def _isci_ozeti(panel):
+    """İşçi süreçte panelin kopyasız ve salt okunur olduğunu doğrular"""
+    close = panel.field('Close')
+    return close.flags.writeable, float(close.sum()), os.getpid()
+
+
+def _isci_optimize(panel, symbols):
+    optimizer = PortfolioOptimizer(symbols).load_panel(panel)
+    return optimizer.calculate_portfolio_metrics(np.full(len(symbols), 1 / len(symbols))).sharpe
+
+
+class TestPricePanel(unittest.TestCase):
+    def setUp(self):
+        self.panel = synthetic_data.ohlc_panel(5, seed=0, start='2023-01-02')
+
+    def test_frame_kopyasiz(self):
+        frame = self.panel.frame('Close')
+        self.assertTrue(np.shares_memory(frame.to_numpy(), self.panel.values))
+        self.assertEqual(list(frame.columns), list(self.panel.symbols))
+
+    def test_paylasimli_bellek_yalnizca_meta_ile_tasinir(self):
+        with self.panel.to_shared_memory() as shared:
+            self.assertLess(len(pickle.dumps(shared)), len(pickle.dumps(self.panel)) // 10)
+            with ProcessPoolExecutor(max_workers=2) as pool:
+                sonuclar = list(pool.map(_isci_ozeti, [shared] * 4))
+        for writeable, toplam, _ in sonuclar:
+            self.assertFalse(writeable)
+            self.assertAlmostEqual(toplam, float(self.panel.field('Close').sum()))
+
+    def test_bellek_eslemeli_dosya(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'panel.npy')
+            self.panel.save(path)
+            loaded = PricePanel.load(path)
+            self.assertIsInstance(loaded.values, np.memmap)
+            self.assertEqual(loaded.symbols, self.panel.symbols)
+            self.assertTrue(loaded.dates.equals(self.panel.dates))
+            with ProcessPoolExecutor(max_workers=2) as pool:
+                (writeable, toplam, _), = pool.map(_isci_ozeti, [loaded])
+            self.assertFalse(writeable)
+            self.assertAlmostEqual(toplam, float(self.panel.field('Close').sum()))
+            del loaded
+
+    def test_optimizer_paneli_dogrudan_kabul_eder(self):
+        optimizer = PortfolioOptimizer(self.panel)
+        self.assertEqual(optimizer.symbols, list(self.panel.symbols))
+        self.assertEqual(optimizer.start_date, '2023-01-02')
+        beklenen = self.panel.frame('Close').pct_change().dropna()
+        pd.testing.assert_frame_equal(optimizer.returns, beklenen)
+        with self.panel.to_shared_memory() as shared, ProcessPoolExecutor(max_workers=2) as pool:
+            sharpe = list(pool.map(_isci_optimize, [shared], [['S0001', 'S0003']]))[0]
+        self.assertAlmostEqual(sharpe, _isci_optimize(self.panel, ['S0001', 'S0003']))
+
+    def test_kompakt_panel(self):
+        kompakt = self.panel.compact()
+        self.assertEqual(kompakt.dtype, np.float32)
+        self.assertEqual(kompakt.nbytes * 2, self.panel.nbytes)
+        self.assertIs(kompakt.compact(), kompakt)
+        np.testing.assert_allclose(kompakt.field('Close'), self.panel.field('Close'), rtol=1e-7)
+        with kompakt.to_shared_memory() as shared:
+            self.assertEqual(pickle.loads(pickle.dumps(shared)).dtype, np.float32)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'panel.npy')
+            kompakt.save(path)
+            loaded = PricePanel.load(path)
+            self.assertEqual(loaded.dtype, np.float32)
+            del loaded
+
+    def test_epoch_gunu_ve_hisse_kodlari(self):
+        self.assertEqual(self.panel.epoch_days[0], (pd.Timestamp('2023-01-02') - pd.Timestamp(0)).days)
+        self.assertEqual(self.panel.epoch_days.dtype, np.int64)
+        np.testing.assert_array_equal(self.panel.codes(['S0003', 'S0000']), [3, 0])
+        with self.assertRaises(KeyError):
+            self.panel.codes(['YOK'])
+        pd.testing.assert_frame_equal(self.panel.frame('Close', ['S0003', 'S0000']), self.panel.frame('Close')[['S0003', 'S0000']])
+
+    def test_optimizer_kompakt_mod(self):
+        optimizer = PortfolioOptimizer(['S0001', 'S0003'], '2023-01-02').load_panel(self.panel.compact())
+        self.assertTrue(optimizer.compact)
+        self.assertEqual(optimizer.returns.dtypes.unique().tolist(), [np.float32])
+        agirlik = np.array([0.4, 0.6])
+        tam = PortfolioOptimizer(['S0001', 'S0003'], '2023-01-02').load_panel(self.panel)
+        self.assertAlmostEqual(optimizer.calculate_portfolio_metrics(agirlik).sharpe,
+                               tam.calculate_portfolio_metrics(agirlik).sharpe, places=5)
+
+    def test_macd_kompakt_panel_float64_ile_yakin(self):
+        tam = macd_hesapla(self.panel)
+        kompakt = macd_hesapla(self.panel.compact())
+        self.assertEqual(kompakt.dtype, np.float32)
+        np.testing.assert_allclose(kompakt.field('MACD'), tam.field('MACD'), atol=1e-4)
+
+    def test_macd_panel_tek_hisseyle_ayni(self):
+        sonuc = macd_hesapla(self.panel)
+        tek = macd_hesapla(self.panel.symbol_frame('S0002')[['Close']].copy())
+        np.testing.assert_allclose(sonuc.frame('MACD')['S0002'].to_numpy(), tek['MACD'].to_numpy())
+        np.testing.assert_allclose(sonuc.frame('Histogram')['S0002'].to_numpy(), tek['Histogram'].to_numpy())
+
+    def test_alpha_trend_panel_tek_hisseyle_ayni(self):
+        """Tarih indeksli tek hisse ve panel hesapları aynı trendi vermeli"""
+        sonuc = alpha_trend(self.panel)
+        tek = alpha_trend(self.panel.symbol_frame('S0004'))
+        np.testing.assert_array_equal(sonuc.frame('AlphaTrend')['S0004'].to_numpy(), tek['AlphaTrend'].to_numpy())
+        self.assertTrue(set(np.unique(tek['AlphaTrend'].dropna())) <= {1.0, -1.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
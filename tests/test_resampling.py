@@ -0,0 +1,62 @@
+import unittest
+import numpy as np
+import synthetic_data
+from covariance import RiskModel
+from portfolio_optimization import PortfolioOptimizer, solve_max_sharpe
+from price_panel import PricePanel
+from resampling import block_bootstrap_indices, max_sharpe_nnls, resample_weights
+
+
+class TestBlockBootstrap(unittest.TestCase):
+    def test_bloklar_ardisik(self):
+        indices = block_bootstrap_indices(100, 50, block_size=5, seed=0)
+        self.assertEqual(indices.shape, (50, 100))
+        self.assertTrue(((indices >= 0) & (indices < 100)).all())
+        # Blok içindeki indeksler (dairesel) ardışıktır
+        blocks = indices.reshape(50, 20, 5)
+        self.assertTrue((np.diff(blocks, axis=2) % 100 == 1).all())
+        np.testing.assert_array_equal(indices, block_bootstrap_indices(100, 50, block_size=5, seed=0))
+
+
+class TestResampling(unittest.TestCase):
+    def setUp(self):
+        self.returns = synthetic_data.price_frame(10, 2).pct_change().dropna()
+
+    def test_nnls_slsqp_ile_ayni_optimum(self):
+        sample = self.returns.values
+        model = RiskModel(sample.mean(axis=0) * 252, np.cov(sample, rowvar=False) * 252)
+        weights, _ = solve_max_sharpe(model)
+        nnls_weights = max_sharpe_nnls(sample)
+        self.assertAlmostEqual(nnls_weights.sum(), 1.0)
+        self.assertGreaterEqual(model.sharpe(nnls_weights), model.sharpe(weights) - 1e-6)
+
+    def test_pozitif_getiri_yoksa_slsqp(self):
+        weights = max_sharpe_nnls(-np.abs(self.returns.values))
+        self.assertAlmostEqual(weights.sum(), 1.0)
+        self.assertTrue((weights >= 0).all())
+
+    def test_paralel_seri_ayni(self):
+        seri = resample_weights(self.returns, 40, workers=1, seed=3)
+        paralel = resample_weights(self.returns, 40, workers=2, seed=3)
+        np.testing.assert_allclose(paralel.samples, seri.samples)
+        np.testing.assert_allclose(seri.weights, seri.samples.mean(axis=0) / seri.samples.mean(axis=0).sum())
+
+        intervals = seri.weight_intervals()
+        self.assertEqual(list(intervals.index), list(self.returns.columns))
+        self.assertTrue((intervals['lower'] <= intervals['weight'] + 1e-12).all())
+        self.assertTrue((intervals['weight'] <= intervals['upper'] + 1e-12).all())
+        lower, upper = seri.sharpe_interval()
+        self.assertLess(lower, upper)
+
+    def test_optimizer(self):
+        optimizer = PortfolioOptimizer(PricePanel.from_frame(synthetic_data.price_frame(6, 2)))
+        result = optimizer.optimize_resampled(n_resamples=30, workers=1, seed=0)
+        self.assertIs(optimizer.weights, result.weights)
+        self.assertAlmostEqual(optimizer.weights.sum(), 1.0)
+        # Ortalama ağırlıklar tek örnek çözümünden daha dağınıktır
+        tekil = optimizer.optimize_portfolio()
+        self.assertGreaterEqual((result.weights > 1e-3).sum(), (tekil > 1e-3).sum())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+from sinyal_durumu import SinyalDurumDeposu
+
+
+class TestSinyalDurumDeposu(unittest.TestCase):
+    def test_ayni_durum_tekrar_gonderilmez(self):
+        """Durum değişmedikçe sinyal üretilmemeli"""
+        depo = SinyalDurumDeposu({('THYAO', 'MACD'): 'AL'})
+        self.assertFalse(depo.gecis_mi('THYAO', 'MACD', 'AL'))
+        self.assertFalse(depo.gecis_mi('THYAO', 'MACD', 'AL'))
+        self.assertEqual(depo.degisenler, {})
+
+    def test_kesisim(self):
+        """Durum değiştiğinde bir kez sinyal üretilmeli ve değişiklik yazılmak üzere işaretlenmeli"""
+        depo = SinyalDurumDeposu({('THYAO', 'MACD'): 'AL'})
+        self.assertTrue(depo.gecis_mi('THYAO', 'MACD', 'SAT'))
+        self.assertFalse(depo.gecis_mi('THYAO', 'MACD', 'SAT'))
+        self.assertEqual(depo.degisenler, {('THYAO', 'MACD'): 'SAT'})
+
+    def test_ilk_gorulen_hisse(self):
+        """Kayıt yoksa önceki bar durumu ile karşılaştırılmalı"""
+        depo = SinyalDurumDeposu()
+        self.assertFalse(depo.gecis_mi('GARAN', 'MACD', 'AL'))
+        self.assertTrue(depo.gecis_mi('AKBNK', 'MACD', 'AL', onceki_durum='SAT'))
+        self.assertFalse(depo.gecis_mi('YKBNK', 'MACD', 'AL', onceki_durum='AL'))
+        self.assertEqual(depo.durum('GARAN', 'MACD'), 'AL')
+
+    def test_indikatorler_bagimsiz(self):
+        """Aynı hissenin farklı indikatör durumları birbirini etkilememeli"""
+        depo = SinyalDurumDeposu({('THYAO', 'MACD'): 'AL', ('THYAO', 'ALPHATREND'): 'SAT'})
+        self.assertFalse(depo.gecis_mi('THYAO', 'ALPHATREND', 'SAT'))
+        self.assertTrue(depo.gecis_mi('THYAO', 'ALPHATREND', 'AL'))
+        self.assertEqual(depo.durum('THYAO', 'MACD'), 'AL')
+
+
+if __name__ == '__main__':
+    unittest.main()
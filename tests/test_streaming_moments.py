@@ -0,0 +1,109 @@
+import tempfile
+import unittest
+import numpy as np
+import synthetic_data
+from benchmarks.local_db import HISSE_VERILERI, SqliteBaglanti
+from optimization_cache import OptimizationCache
+from portfolio_metrics import var_cvar
+from portfolio_optimization import PortfolioOptimizer
+from price_archive import PriceArchive
+from price_panel import PricePanel
+from streaming_moments import (ArchiveSource, DatabaseSource, FrameSource, Moments,
+                               portfolio_var_cvar, stream_moments)
+
+
+class TestMoments(unittest.TestCase):
+    def test_parcali_birlestirme(self):
+        rng = np.random.default_rng(0)
+        # Büyük ortalama, küçük varyans: naif toplamların hassasiyet kaybettiği durum
+        x = 1e6 + rng.normal(0, 1e-3, (1000, 4))
+        moments = Moments(4)
+        for parca in np.array_split(x, 13):
+            moments.update(parca)
+        self.assertEqual(moments.n, 1000)
+        np.testing.assert_allclose(moments.mean, x.mean(axis=0))
+        np.testing.assert_allclose(moments.covariance(), np.cov(x, rowvar=False), rtol=1e-6, atol=1e-12)
+
+
+class TestStreamMoments(unittest.TestCase):
+    def setUp(self):
+        self.prices = synthetic_data.price_frame(12, 3)
+        self.returns = self.prices.pct_change().dropna()
+
+    def assert_moments(self, moments, returns):
+        self.assertEqual(moments.n, len(returns))
+        np.testing.assert_allclose(moments.mean, returns.mean().values, rtol=1e-10)
+        np.testing.assert_allclose(moments.covariance(), returns.cov().values, rtol=1e-10)
+
+    def test_bellek_ici_kaynak_ve_paralel(self):
+        source = FrameSource(self.prices)
+        self.assert_moments(stream_moments(source, chunk_rows=50), self.returns)
+        self.assert_moments(stream_moments(source, chunk_rows=50, workers=3), self.returns)
+
+    def test_arsiv_kaynagi(self):
+        with tempfile.TemporaryDirectory() as root:
+            archive = PriceArchive(root)
+            for symbol in self.prices.columns:
+                archive.append(symbol, self.prices[[symbol]].rename(columns={symbol: 'Close'}))
+            source = ArchiveSource(root, list(self.prices.columns))
+            self.assert_moments(stream_moments(source, '2005-06-01', '2006-06-01', chunk_rows=40),
+                                self.prices.loc['2005-06-01':'2006-06-01'].pct_change().dropna())
+
+    def test_veritabani_kaynagi(self):
+        conn = SqliteBaglanti(tablolar=(HISSE_VERILERI,))
+        cur = conn.cursor()
+        cur.executemany("""
+            INSERT INTO hisse_verileri (hisse_kodu, tarih, acilis, kapanis, en_yuksek, en_dusuk, hacim)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """, [(s, d.strftime('%Y-%m-%d'), p, p, p, p, 1) for s in self.prices.columns
+              for d, p in self.prices[s].items()])
+        source = DatabaseSource(lambda: conn, list(self.prices.columns), chunk_days=90)
+        self.assert_moments(stream_moments(source), self.returns)
+
+    def test_var_cvar_kesin(self):
+        weights = np.random.default_rng(1).dirichlet(np.ones(12))
+        portfolio = self.returns.values @ weights
+        sonuc = portfolio_var_cvar(FrameSource(self.prices), weights, (0.9, 0.95, 0.99), chunk_rows=64, bins=32)
+        for level in (0.9, 0.95, 0.99):
+            np.testing.assert_allclose(sonuc[level], var_cvar(portfolio, level), rtol=1e-12)
+
+
+class TestOptimizerStreaming(unittest.TestCase):
+    def test_akis_ile_bellek_ici_ayni_sonuc(self):
+        prices = synthetic_data.price_frame(8, 2)
+        bellek = PortfolioOptimizer(PricePanel.from_frame(prices))
+        akis = PortfolioOptimizer(list(prices.columns), bellek.start_date, bellek.end_date)
+        akis.load_moments(FrameSource(prices), chunk_rows=100)
+        self.assertIsNone(akis.returns)
+
+        np.testing.assert_allclose(akis.optimize_portfolio(), bellek.optimize_portfolio(), atol=1e-6)
+        akis.weights = bellek.weights
+        self.assertAlmostEqual(akis.calculate_var(0.95), bellek.calculate_var(0.95))
+        self.assertAlmostEqual(akis.calculate_cvar(0.99), bellek.calculate_cvar(0.99))
+        self.assertAlmostEqual(akis.compute_metrics(num_portfolios=0).sharpe,
+                               bellek.compute_metrics(num_portfolios=0).sharpe)
+
+    def test_akis_onbellekle_calisir(self):
+        prices = synthetic_data.price_frame(6, 2)
+        with tempfile.TemporaryDirectory() as directory:
+            cache = OptimizationCache(directory)
+            ilk = PortfolioOptimizer(list(prices.columns), '2005-01-03', '2007-01-01')
+            ilk.load_moments(FrameSource(prices), chunk_rows=100)
+            ilk.cache = cache
+            weights = ilk.optimize_portfolio()
+
+            ikinci = PortfolioOptimizer(list(prices.columns), '2005-01-03', '2007-01-01')
+            ikinci.load_moments(FrameSource(prices), chunk_rows=100)
+            ikinci.cache = cache
+            self.assertEqual(ikinci.cache_key(), ilk.cache_key())
+            self.assertIsNotNone(cache.get(ikinci.cache_key()))
+            np.testing.assert_allclose(ikinci.optimize_portfolio(), weights)
+
+            # Farklı geçmiş farklı anahtar üretir
+            ucuncu = PortfolioOptimizer(list(prices.columns), '2005-01-03', '2006-01-01')
+            ucuncu.load_moments(FrameSource(prices), chunk_rows=100)
+            self.assertNotEqual(ucuncu.cache_key(), ilk.cache_key())
+
+
+if __name__ == '__main__':
+    unittest.main()
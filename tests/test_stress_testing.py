@@ -0,0 +1,114 @@
+import unittest
+import numpy as np
+import pandas as pd
+from data_providers import SyntheticProvider
+from portfolio_optimization import PortfolioOptimizer
+from stress_testing import SCENARIOS, Scenario, get_scenario, load_scenario_returns, stress_test
+
+
+def loop_reference(path_returns, shock_days):
+    """Tek portföy için döngüyle yol, düşüş ve toparlanma"""
+    wealth, peak, worst, trough, target = 1.0, 1.0, 0.0, None, None
+    values = []
+    for day, r in enumerate(path_returns):
+        wealth *= 1 + r
+        values.append(wealth)
+        if day < shock_days:
+            peak = max(peak, wealth)
+            if wealth / peak - 1 < worst:
+                worst, trough, target = wealth / peak - 1, day, peak
+    recovery = 0.0 if trough is None else np.nan
+    if trough is not None:
+        for day in range(trough + 1, len(values)):
+            if values[day] >= target:
+                recovery = float(day - trough)
+                break
+    return values[shock_days - 1] - 1, worst, recovery
+
+
+class TestStressTest(unittest.TestCase):
+    def setUp(self):
+        dates = pd.bdate_range('2020-01-01', periods=120)
+        rng = np.random.default_rng(0)
+        self.returns = pd.DataFrame(rng.normal(0, 0.02, (120, 4)), index=dates, columns=['A', 'B', 'C', 'D'])
+        # B şok penceresinden önce işlem görmüyor
+        self.returns.loc[:'2020-01-20', 'B'] = np.nan
+        self.scenarios = [Scenario('s1', '2020-01-15', '2020-02-14'), Scenario('s2', '2020-03-02', '2020-03-20')]
+        self.weights = pd.DataFrame(rng.dirichlet(np.ones(4), 50).T, index=['A', 'B', 'C', 'D'])
+
+    def test_dongu_ile_ayni(self):
+        result = stress_test(self.weights, self.returns, self.scenarios, recovery_horizon=30)
+        portfolio_returns = self.returns.fillna(0).values @ self.weights.values
+        for k, scenario in enumerate(self.scenarios):
+            window = (self.returns.index >= scenario.start) & (self.returns.index <= scenario.end)
+            first, shock_days = np.flatnonzero(window)[0], window.sum()
+            for j in range(self.weights.shape[1]):
+                path = portfolio_returns[first:first + shock_days + 30, j]
+                pnl, drawdown, recovery = loop_reference(path, shock_days)
+                self.assertAlmostEqual(result.pnl[k, j], pnl)
+                self.assertAlmostEqual(result.max_drawdown[k, j], drawdown)
+                np.testing.assert_equal(result.recovery_days[k, j], recovery)
+
+        frame = result.to_frame()
+        self.assertEqual(len(frame), 2 * 50)
+        self.assertEqual(result.paths['s2'].shape, (15 + 30, 50))
+        worst = result.worst()
+        self.assertEqual(len(worst), 50)
+        self.assertTrue(set(worst['scenario']) <= {'s1', 's2'})
+
+    def test_agirlik_bicimleri(self):
+        series = self.weights[0].rename('tek')
+        a = stress_test(series, self.returns, self.scenarios)
+        b = stress_test(self.weights[0].values, self.returns, self.scenarios)
+        self.assertEqual(a.portfolios, ['tek'])
+        np.testing.assert_allclose(a.pnl, b.pnl)
+
+        # Getirilerde olmayan hisse nakit sayılır
+        nakit = stress_test(pd.Series({'A': 0.5, 'X': 0.5}), self.returns, self.scenarios)
+        yalniz_a = stress_test(pd.Series({'A': 0.5}), self.returns, self.scenarios)
+        np.testing.assert_allclose(nakit.pnl, yalniz_a.pnl)
+        np.testing.assert_allclose(stress_test(pd.Series({'X': 1.0}), self.returns, self.scenarios).pnl, 0)
+        with self.assertRaises(ValueError):
+            stress_test(series, self.returns, [Scenario('bos', '2019-01-01', '2019-02-01')])
+
+    def test_kutuphane_ve_optimizer(self):
+        self.assertEqual(get_scenario('try_crisis_2018').start, '2018-08-01')
+        symbols = ['THYAO', 'GARAN', 'ASELS']
+        provider = SyntheticProvider(seed=1)
+        returns = load_scenario_returns(symbols, SCENARIOS, provider=provider)
+        for scenario in SCENARIOS:
+            self.assertTrue(((returns.index >= scenario.start) & (returns.index <= scenario.end)).any())
+
+        optimizer = PortfolioOptimizer(symbols, '2023-01-01', '2024-01-01', provider=provider)
+        optimizer.weights = np.array([0.5, 0.3, 0.2])
+        result = optimizer.stress_test(['covid_crash_2020', 'try_crisis_2018'], returns=returns)
+        self.assertEqual([s.name for s in result.scenarios], ['covid_crash_2020', 'try_crisis_2018'])
+        expected = stress_test(pd.Series(optimizer.weights, index=symbols), returns,
+                               ['covid_crash_2020', 'try_crisis_2018'])
+        np.testing.assert_allclose(result.max_drawdown, expected.max_drawdown)
+
+    def test_verisi_olmayan_hisse_nakit_sayilir(self):
+        provider = SyntheticProvider(seed=1, missing=['YENI'])
+        optimizer = PortfolioOptimizer(['THYAO', 'YENI'], '2023-01-01', '2024-01-01', provider=provider)
+        optimizer.weights = np.array([0.6, 0.4])
+        result = optimizer.stress_test(['covid_crash_2020'])
+        returns = load_scenario_returns(['THYAO'], [get_scenario('covid_crash_2020')], provider=provider)
+        expected = stress_test(pd.Series({'THYAO': 0.6}), returns, ['covid_crash_2020'])
+        np.testing.assert_allclose(result.pnl, expected.pnl)
+
+    def test_verisiz_pencere_atlanir(self):
+        class YeniProvider(SyntheticProvider):
+            """2010 öncesi hiç veri döndürmeyen kaynak"""
+            def close_prices(self, symbols, start, end):
+                if pd.Timestamp(start) < pd.Timestamp('2010-01-01'):
+                    raise Exception("Hiçbir hisse senedi için veri çekilemedi!")
+                return super().close_prices(symbols, start, end)
+
+        optimizer = PortfolioOptimizer(['THYAO', 'GARAN'], provider=YeniProvider(seed=1))
+        optimizer.weights = np.array([0.5, 0.5])
+        result = optimizer.stress_test()
+        self.assertEqual([s.name for s in result.scenarios], [s.name for s in SCENARIOS if s.name != 'gfc_2008'])
+
+
+if __name__ == '__main__':
+    unittest.main()
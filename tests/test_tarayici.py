@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+import unittest
+from tarayici import AlphaTrendStratejisi, MacdStratejisi, PiyasaVeriOnbellegi, Strateji, TaramaServisi
+from tests.helpers import SahteDagitici, sahte_barlar
+from zamanlayici import Zamanlayici
+
+
+class SayanStrateji(Strateji):
+    """Kaç kez çağrıldığını sayan, her zaman 'AL' durumunda kalan strateji"""
+    indikator = 'SAYAC'
+    baslik = "Sayaç"
+    saatler = ("20:00",)
+
+    def __init__(self, hisseler):
+        super().__init__(hisseler)
+        self.cagrilar = 0
+
+    def hesapla(self, df):
+        self.cagrilar += 1
+        return df
+
+    def durumlar(self, df):
+        return 'AL', 'AL'
+
+
+class TestTaramaServisi(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.cekilenler = []
+
+        def cekici(hisse_kodu, gun):
+            self.cekilenler.append(hisse_kodu)
+            return sahte_barlar(hisse_kodu, gun)
+
+        self.dagitici = SahteDagitici()
+        self.servis = TaramaServisi(
+            onbellek=PiyasaVeriOnbellegi(cekici=cekici, gun=60),
+            baglanti=lambda: None,
+            dagitici=self.dagitici,
+            varsayilan_chat_id=42
+        )
+
+    async def test_her_hisse_bir_kez_cekilir(self):
+        """Ortak hisseler tüm stratejiler için tek seferde çekilmeli"""
+        self.servis.strateji_ekle(MacdStratejisi(hisseler=['THYAO', 'GARAN']))
+        sayac = self.servis.strateji_ekle(SayanStrateji(hisseler=['GARAN', 'ASELS']))
+
+        await self.servis.tara()
+
+        self.assertEqual(sorted(self.cekilenler), ['ASELS', 'GARAN', 'THYAO'])
+        self.assertEqual(sayac.cagrilar, 2)
+
+    async def test_kesisimler_tek_hattan_gonderilir(self):
+        """Yalnızca kesişim olan strateji için mesaj gönderilmeli"""
+        self.servis.strateji_ekle(MacdStratejisi(hisseler=['THYAO']))
+        self.servis.strateji_ekle(SayanStrateji(hisseler=['THYAO']))
+
+        toplam = await self.servis.tara()
+
+        self.assertEqual(toplam, 1)
+        self.assertEqual(len(self.dagitici.mesajlar), 1)
+        self.assertIn("MACD Sinyalleri", self.dagitici.mesajlar[0][1])
+
+        # Aynı veriyle ikinci tarama yeni sinyal üretmemeli ve veri tekrar çekilmemeli
+        self.assertEqual(await self.servis.tara(), 0)
+        self.assertEqual(self.cekilenler, ['THYAO'])
+
+    def test_ayni_saatteki_stratejiler_birlesir(self):
+        """Aynı saatte çalışan stratejiler tek görevde toplanmalı"""
+        self.servis.strateji_ekle(MacdStratejisi())
+        self.servis.strateji_ekle(SayanStrateji(hisseler=['THYAO']))
+        zamanlayici = Zamanlayici()
+        self.servis.gorevleri_ekle(zamanlayici)
+        self.assertEqual(len(zamanlayici.gorevler), 1)
+
+    def test_eksik_strateji_olusturulamaz(self):
+        """hesapla/durumlar tanımlamayan eklenti kayıt sırasında değil, oluşturulurken reddedilmeli"""
+        class EksikStrateji(Strateji):
+            indikator = 'EKSIK'
+
+            def hesapla(self, df):
+                return df
+
+        with self.assertRaises(TypeError):
+            EksikStrateji(hisseler=['THYAO'])
+        with self.assertRaises(TypeError):
+            Strateji()
+
+    def test_saatlik_tarama_tek_gorev(self):
+        """10:00-18:00 AlphaTrend taramaları çakışma korumalı tek görev olmalı"""
+        self.servis.strateji_ekle(MacdStratejisi())
+        self.servis.strateji_ekle(AlphaTrendStratejisi())
+        zamanlayici = Zamanlayici()
+        self.servis.gorevleri_ekle(zamanlayici)
+        self.assertEqual(len(zamanlayici.gorevler), 2)
+        alpha = next(g for g in zamanlayici.gorevler if 'ALPHATREND' in g.ad)
+        self.assertEqual(len(alpha.saatler), 9)
+        self.assertEqual(alpha.cakisma, 'atla')
+
+    async def test_taramalar_sirayla_calisir(self):
+        """Farklı görevlerden gelen taramalar ortak durum üzerinde çakışmamalı"""
+        aktif, en_fazla, kilit = [0], [0], threading.Lock()
+
+        def yavas_cekici(hisse_kodu, gun):
+            with kilit:
+                aktif[0] += 1
+                en_fazla[0] = max(en_fazla[0], aktif[0])
+            time.sleep(0.05)
+            with kilit:
+                aktif[0] -= 1
+            return sahte_barlar(hisse_kodu, gun)
+
+        self.servis.onbellek = PiyasaVeriOnbellegi(cekici=yavas_cekici, gun=60, gecerlilik=0)
+        self.servis.strateji_ekle(MacdStratejisi(hisseler=['THYAO']))
+        await asyncio.gather(self.servis.tara(), self.servis.tara())
+        self.assertEqual(en_fazla[0], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import asyncio
+import unittest
+from datetime import date, datetime, timedelta
+from zamanlayici import ISTANBUL, BistTakvimi, Gorev, Zamanlayici
+
+
+class SahteSaat:
+    """Uyku süresi kadar ileri alınan sahte saat"""
+
+    def __init__(self, baslangic: datetime):
+        self.simdi = baslangic
+        self.uykular = []
+
+    def __call__(self):
+        return self.simdi
+
+    async def uyu(self, saniye):
+        self.uykular.append(saniye)
+        # Önce tetiklenen görevlerin çalışmasına izin ver, sonra saati ilerlet
+        await asyncio.sleep(0)
+        self.simdi += timedelta(seconds=saniye)
+
+
+class TestBistTakvimi(unittest.TestCase):
+    def test_islem_gunleri(self):
+        takvim = BistTakvimi(ek_tatiller=[date(2024, 4, 10)])
+        self.assertTrue(takvim.islem_gunu_mu(date(2024, 4, 8)))    # Pazartesi
+        self.assertFalse(takvim.islem_gunu_mu(date(2024, 4, 6)))   # Cumartesi
+        self.assertFalse(takvim.islem_gunu_mu(date(2024, 10, 29)))  # Cumhuriyet Bayramı
+        self.assertFalse(takvim.islem_gunu_mu(date(2024, 4, 10)))  # Ek tatil
+
+    def test_sonraki_calisma_hafta_sonunu_atlar(self):
+        """Cuma 20:00'den sonraki çalışma Pazartesi olmalı"""
+        gorev = Gorev("test", None, ["20:00"], takvim=BistTakvimi())
+        cuma = datetime(2024, 4, 5, 20, 0, tzinfo=ISTANBUL)
+        self.assertEqual(gorev.sonraki_calisma(cuma), datetime(2024, 4, 8, 20, 0, tzinfo=ISTANBUL))
+
+
+class TestZamanlayici(unittest.IsolatedAsyncioTestCase):
+    async def test_tam_zamaninda_uyanir(self):
+        """Dakikalık yoklama yerine doğrudan çalışma zamanına kadar uyumalı"""
+        saat = SahteSaat(datetime(2024, 4, 8, 9, 30, tzinfo=ISTANBUL))
+        zamanlayici = Zamanlayici(saat=saat, uyu=saat.uyu)
+        zamanlar = []
+
+        async def tara():
+            zamanlar.append(saat())
+
+        zamanlayici.ekle("tarama", tara, ["10:00", "11:00"], takvim=BistTakvimi())
+        await zamanlayici.calistir(bitis=datetime(2024, 4, 9, 10, 30, tzinfo=ISTANBUL))
+
+        self.assertEqual([z.strftime('%d %H:%M') for z in zamanlar], ['08 10:00', '08 11:00', '09 10:00'])
+        self.assertEqual(saat.uykular[:2], [1800, 3600])
+
+    async def test_cakisan_calisma_atlanir(self):
+        """Önceki çalışma sürerken gelen tetikleme atlanmalı"""
+        saat = SahteSaat(datetime(2024, 4, 8, 9, 59, tzinfo=ISTANBUL))
+        zamanlayici = Zamanlayici(saat=saat, uyu=saat.uyu)
+        bitir = asyncio.Event()
+
+        async def yavas_tarama():
+            await bitir.wait()
+
+        gorev = zamanlayici.ekle("yavaş", yavas_tarama, ["10:00", "11:00", "12:00"])
+        calisma = asyncio.create_task(zamanlayici.calistir(bitis=datetime(2024, 4, 8, 12, 30, tzinfo=ISTANBUL)))
+        while saat() < datetime(2024, 4, 8, 12, 30, tzinfo=ISTANBUL) and not calisma.done():
+            await asyncio.sleep(0)
+            if gorev.atlanan == 2:
+                break
+        bitir.set()
+        await calisma
+
+        self.assertEqual(gorev.calisma_sayisi, 1)
+        self.assertEqual(gorev.atlanan, 2)
+
+    async def test_cakisan_calismalar_birlestirilir(self):
+        """Birleştirme politikasında bekleyen tetiklemeler tek çalışmaya indirgenmeli"""
+        saat = SahteSaat(datetime(2024, 4, 8, 9, 59, tzinfo=ISTANBUL))
+        zamanlayici = Zamanlayici(saat=saat, uyu=saat.uyu)
+        bitir = asyncio.Event()
+
+        async def yavas_tarama():
+            await bitir.wait()
+
+        gorev = zamanlayici.ekle("yavaş", yavas_tarama, ["10:00", "11:00", "12:00"], cakisma='birlestir')
+        calisma = asyncio.create_task(zamanlayici.calistir(bitis=datetime(2024, 4, 8, 12, 30, tzinfo=ISTANBUL)))
+        while saat() < datetime(2024, 4, 8, 12, 0, tzinfo=ISTANBUL):
+            await asyncio.sleep(0)
+        bitir.set()
+        await calisma
+
+        self.assertEqual(gorev.calisma_sayisi, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
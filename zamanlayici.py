@@ -0,0 +1,167 @@
+import asyncio
+from datetime import datetime, date, time, timedelta
+from zoneinfo import ZoneInfo
+
+# Borsa İstanbul saat dilimi
+ISTANBUL = ZoneInfo('Europe/Istanbul')
+
+# Her yıl aynı tarihe denk gelen resmi tatiller (ay, gün)
+SABIT_TATILLER = {
+    (1, 1),    # Yılbaşı
+    (4, 23),   # Ulusal Egemenlik ve Çocuk Bayramı
+    (5, 1),    # Emek ve Dayanışma Günü
+    (5, 19),   # Atatürk'ü Anma, Gençlik ve Spor Bayramı
+    (7, 15),   # Demokrasi ve Milli Birlik Günü
+    (8, 30),   # Zafer Bayramı
+    (10, 29),  # Cumhuriyet Bayramı
+}
+
+
+class BistTakvimi:
+    """Borsa İstanbul işlem günlerini belirler"""
+
+    def __init__(self, ek_tatiller=()):
+        """
+        Args:
+            ek_tatiller (iterable): Dini bayramlar gibi yıla göre değişen tatil günleri (date)
+        """
+        self.ek_tatiller = set(ek_tatiller)
+
+    def islem_gunu_mu(self, gun: date) -> bool:
+        if gun.weekday() >= 5:
+            return False
+        if (gun.month, gun.day) in SABIT_TATILLER:
+            return False
+        return gun not in self.ek_tatiller
+
+
+class Gorev:
+    """Zamanlayıcıda belirli saatlerde çalışan asenkron görev"""
+
+    def __init__(self, ad: str, fonk, saatler, takvim: BistTakvimi = None,
+                 cakisma: str = 'atla', tz=ISTANBUL):
+        """
+        Args:
+            ad (str): Görev adı
+            fonk: Argümansız asenkron fonksiyon
+            saatler (list): 'SS:DD' biçiminde çalışma saatleri
+            takvim (BistTakvimi): Verilirse yalnızca işlem günlerinde çalışır
+            cakisma (str): Önceki çalışma sürerken tetiklenirse 'atla' veya
+                bitince bir kez daha çalıştırmak için 'birlestir'
+        """
+        if cakisma not in ('atla', 'birlestir'):
+            raise ValueError(f"Geçersiz çakışma politikası: {cakisma}")
+        self.ad = ad
+        self.fonk = fonk
+        self.saatler = sorted(time.fromisoformat(s) for s in saatler)
+        self.takvim = takvim
+        self.cakisma = cakisma
+        self.tz = tz
+        self.calisan = None
+        self.bekleyen = False
+        self.calisma_sayisi = 0
+        self.atlanan = 0
+
+    def sonraki_calisma(self, simdi: datetime) -> datetime:
+        """simdi'den sonraki ilk çalışma zamanını döndürür"""
+        simdi = simdi.astimezone(self.tz)
+        for i in range(370):
+            gun = simdi.date() + timedelta(days=i)
+            if self.takvim is not None and not self.takvim.islem_gunu_mu(gun):
+                continue
+            for saat in self.saatler:
+                zaman = datetime.combine(gun, saat, tzinfo=self.tz)
+                if zaman > simdi:
+                    return zaman
+        raise ValueError(f"{self.ad} için bir yıl içinde çalışma zamanı bulunamadı")
+
+
+class Zamanlayici:
+    """
+    Görevleri tam çalışma zamanlarında uyanarak tetikleyen asyncio zamanlayıcısı.
+    Çalışan görevlerin referanslarını tutar ve aynı görevin üst üste binmesini engeller.
+    """
+
+    def __init__(self, tz=ISTANBUL, saat=None, uyu=asyncio.sleep, max_uyku: float = 3600):
+        """
+        Args:
+            tz: Zaman dilimi
+            saat (callable): Saat dilimli şimdiki zamanı döndürür (testlerde sahte saat)
+            uyu: Saniye alan asenkron bekleme fonksiyonu
+            max_uyku (float): Saat değişikliklerine karşı tek seferde en uzun bekleme
+        """
+        self.tz = tz
+        self.saat = saat or (lambda: datetime.now(self.tz))
+        self.uyu = uyu
+        self.max_uyku = max_uyku
+        self.gorevler = []
+        self.calisanlar = set()
+        self._durdur = False
+
+    def ekle(self, ad: str, fonk, saatler, takvim: BistTakvimi = None, cakisma: str = 'atla') -> Gorev:
+        """Yeni görev ekler"""
+        gorev = Gorev(ad, fonk, saatler, takvim=takvim, cakisma=cakisma, tz=self.tz)
+        self.gorevler.append(gorev)
+        return gorev
+
+    def durdur(self):
+        self._durdur = True
+
+    async def calistir(self, bitis: datetime = None):
+        """
+        Görevleri zamanı geldikçe tetikler.
+
+        Args:
+            bitis (datetime): Verilirse bu zamandan sonraki çalışmalar tetiklenmez
+        """
+        self._durdur = False
+        simdi = self.saat()
+        sonrakiler = {id(g): g.sonraki_calisma(simdi) for g in self.gorevler}
+
+        while not self._durdur and self.gorevler:
+            en_yakin = min(sonrakiler.values())
+            if bitis is not None and en_yakin > bitis:
+                break
+
+            bekleme = (en_yakin - self.saat()).total_seconds()
+            if bekleme > 0:
+                await self.uyu(min(bekleme, self.max_uyku))
+                continue
+
+            simdi = self.saat()
+            for gorev in self.gorevler:
+                if sonrakiler[id(gorev)] <= simdi:
+                    self._tetikle(gorev)
+                    sonrakiler[id(gorev)] = gorev.sonraki_calisma(simdi)
+
+        await self.bekle()
+
+    async def bekle(self):
+        """Çalışmakta olan görevlerin bitmesini bekler"""
+        while self.calisanlar:
+            await asyncio.gather(*list(self.calisanlar), return_exceptions=True)
+
+    def _tetikle(self, gorev: Gorev):
+        if gorev.calisan is not None and not gorev.calisan.done():
+            if gorev.cakisma == 'birlestir':
+                gorev.bekleyen = True
+            else:
+                gorev.atlanan += 1
+                print(f"{gorev.ad} hâlâ çalışıyor, bu çalışma atlandı.")
+            return
+
+        gorev.calisan = asyncio.create_task(self._yurut(gorev))
+        self.calisanlar.add(gorev.calisan)
+        gorev.calisan.add_done_callback(self.calisanlar.discard)
+
+    async def _yurut(self, gorev: Gorev):
+        while True:
+            gorev.bekleyen = False
+            try:
+                await gorev.fonk()
+            except Exception as e:
+                print(f"{gorev.ad} görevi çalışırken hata oluştu: {e}")
+            gorev.calisma_sayisi += 1
+            # Çalışma sırasında gelen tetiklemeler tek bir çalışmada birleştirilir
+            if not gorev.bekleyen:
+                break